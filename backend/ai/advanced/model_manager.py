@@ -6,13 +6,15 @@ import os
 import json
 import pickle
 import shutil
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Sequence, Tuple
 from datetime import datetime, timedelta
 import logging
 from pathlib import Path
 import hashlib
 from enum import Enum
 import asyncio
+import threading
+from collections import deque
 import aiofiles
 
 # 모델 관리
@@ -41,6 +43,14 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
+# 모델 아티팩트 (mmap 로드 / 콘텐츠 해시)
+from ..model_artifacts import (
+    save_artifact, load_artifact, read_manifest, file_sha256
+)
+
+# 스트리밍 통계 (드리프트 모니터링)
+from core.streaming_stats import RunningStats, QuantileSketch, Reservoir, WindowedHistogram
+
 logger = logging.getLogger(__name__)
 
 
@@ -192,6 +202,14 @@ class ModelRegistry:
         dest_path = model_dir / Path(model_path).name
         shutil.copy2(model_path, dest_path)
         
+        # 콘텐츠 해시 기록 (로드 시 캐시 검증용)
+        manifest = read_manifest(model_path)
+        if manifest:
+            shutil.copy2(model_path + '.manifest.json', str(dest_path) + '.manifest.json')
+        metadata = dict(metadata)
+        metadata['content_hash'] = manifest['content_hash'] if manifest else file_sha256(str(dest_path))
+        metadata['artifact_format'] = manifest['format'] if manifest else 'pickle'
+        
         # 모델 버전 생성
         model_version = ModelVersion(
             model_id=model_id,
@@ -231,6 +249,33 @@ class ModelRegistry:
             
         return self.models[model_id][version]
         
+    def register_model_object(self, model_id: str, version: str, model: Any,
+                              metadata: Dict[str, Any]) -> ModelVersion:
+        """학습된 모델 객체를 mmap 가능한 아티팩트로 저장 후 등록"""
+        staging_path = self.registry_path / '_staging' / f"{model_id}-{version}.joblib"
+        save_artifact(model, str(staging_path), metadata={'model_id': model_id, 'version': version})
+        try:
+            return self.register_model(model_id, version, str(staging_path), metadata)
+        finally:
+            for path in (staging_path, Path(str(staging_path) + '.manifest.json')):
+                if path.exists():
+                    path.unlink()
+    
+    def load_model_object(self, model_id: str, version: Optional[str] = None,
+                          mmap: bool = True) -> Any:
+        """
+        모델 객체 로드
+        
+        레지스트리에 기록된 콘텐츠 해시로 검증하며, 같은 프로세스에서는 한 번만 로드한다.
+        joblib 아티팩트의 배열은 mmap 으로 로드되어 워커 간 메모리를 공유한다.
+        """
+        model_version = self.get_model(model_id, version)
+        return load_artifact(
+            model_version.model_path,
+            mmap=mmap,
+            expected_hash=model_version.metadata.get('content_hash')
+        )
+        
     def list_models(self) -> List[Dict[str, Any]]:
         """모델 목록"""
         models_list = []
@@ -246,22 +291,164 @@ class ModelRegistry:
         return models_list
 
 
+class _ModelStreamState:
+    """
+    모델별 스트리밍 모니터링 상태
+
+    예측 수와 무관하게 메모리가 고정된다. 처음 reference_size 개 예측으로 참조 분포
+    구간을 만들고, 이후 예측은 롤링 윈도 히스토그램에 쌓아 참조 분포와 PSI / KS 로 비교한다.
+    """
+
+    def __init__(self, reference_size: int, drift_bins: int, window_size: int,
+                 num_windows: int, reservoir_size: int):
+        self.reference_size = reference_size
+        self.drift_bins = drift_bins
+        self.window_size = window_size
+        self.num_windows = num_windows
+
+        self.prediction_stats = RunningStats()
+        self.error_stats = RunningStats()
+        self.prediction_sketch = QuantileSketch()
+        self.abs_error_sketch = QuantileSketch()
+        self.labeled = 0
+        self.classified = 0
+        self.correct = 0
+        self.samples = Reservoir(reservoir_size)
+
+        self._reference_buffer: List[float] = []
+        self.reference_counts: Optional[List[int]] = None
+        self.window: Optional[WindowedHistogram] = None
+        self.lock = threading.Lock()
+
+    def set_reference(self, values):
+        """참조 분포 설정 (학습/검증 데이터 예측값 등)"""
+        values = [float(v) for v in values]
+        window = WindowedHistogram.from_reference(
+            values, bins=self.drift_bins,
+            window_size=self.window_size, num_windows=self.num_windows
+        )
+        counts = [0] * (len(window.edges) + 1)
+        for value in values:
+            counts[window.bin_of(value)] += 1
+        self.window = window
+        self.reference_counts = counts
+        self._reference_buffer = []
+
+    def add(self, prediction: float, actual: Optional[float] = None, classification: bool = False):
+        """예측 1건 반영 (호출자가 lock 보유)"""
+        self.prediction_stats.update(prediction)
+        self.prediction_sketch.add(prediction)
+
+        if actual is not None:
+            self.labeled += 1
+            if classification:
+                self.classified += 1
+                if prediction == actual:
+                    self.correct += 1
+            else:
+                error = actual - prediction
+                self.error_stats.update(error)
+                self.abs_error_sketch.add(abs(error))
+        self.samples.add((prediction, actual))
+
+        if self.window is not None:
+            self.window.add(prediction)
+        else:
+            self._reference_buffer.append(prediction)
+            if len(self._reference_buffer) >= self.reference_size:
+                self.set_reference(self._reference_buffer)
+
+    def drift(self) -> Dict[str, float]:
+        if self.window is None:
+            return {'psi': 0.0, 'ks': 0.0}
+        return {
+            'psi': self.window.psi(self.reference_counts),
+            'ks': self.window.ks(self.reference_counts)
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        result = {
+            'predictions': self.prediction_stats.to_dict(),
+            'prediction_quantiles': self.prediction_sketch.to_dict(),
+            'labeled': self.labeled,
+            'drift': self.drift(),
+            'reference_ready': self.window is not None,
+            'sample_size': len(self.samples.samples)
+        }
+        if self.error_stats.count:
+            result['error'] = self.error_stats.to_dict()
+            result['abs_error_quantiles'] = self.abs_error_sketch.to_dict()
+        if self.classified:
+            result['accuracy'] = self.correct / self.classified
+        return result
+
+
 class ModelMonitor:
     """모델 모니터링"""
     
-    def __init__(self):
+    def __init__(self, history_size: int = 1000, reference_size: int = 1000,
+                 drift_bins: int = 10, window_size: int = 500, num_windows: int = 10,
+                 reservoir_size: int = 1000):
+        # 모델별 배치 요약 (최근 history_size 건만 보관)
         self.monitoring_data = {}
+        self.history_size = history_size
+        # 모델별 스트리밍 상태 (고정 메모리)
+        self.stream_states: Dict[str, _ModelStreamState] = {}
+        self._stream_config = {
+            'reference_size': reference_size,
+            'drift_bins': drift_bins,
+            'window_size': window_size,
+            'num_windows': num_windows,
+            'reservoir_size': reservoir_size
+        }
+        self._states_lock = threading.Lock()
         self.alert_thresholds = {
             'accuracy_drop': 0.1,  # 10% 정확도 하락
             'latency_increase': 2.0,  # 2배 지연 증가
             'error_rate': 0.05,  # 5% 오류율
-            'memory_usage': 0.9  # 90% 메모리 사용
+            'memory_usage': 0.9,  # 90% 메모리 사용
+            'drift_ks': 0.1,  # KS 통계량
+            'drift_psi': 0.25  # PSI (0.25 이상 큰 분포 변화)
         }
         self.alert_callbacks = []
         
     def add_alert_callback(self, callback):
         """알림 콜백 추가"""
         self.alert_callbacks.append(callback)
+
+    def _get_stream_state(self, model_id: str) -> _ModelStreamState:
+        state = self.stream_states.get(model_id)
+        if state is None:
+            with self._states_lock:
+                state = self.stream_states.get(model_id)
+                if state is None:
+                    state = _ModelStreamState(**self._stream_config)
+                    self.stream_states[model_id] = state
+        return state
+
+    def set_reference(self, model_id: str, values: np.ndarray):
+        """드리프트 비교 기준 분포 설정 (미설정 시 처음 reference_size 개 예측 사용)"""
+        state = self._get_stream_state(model_id)
+        with state.lock:
+            state.set_reference(np.asarray(values, dtype=float).ravel())
+
+    def record_prediction(self, model_id: str, prediction: float,
+                          actual: Optional[float] = None, classification: bool = False):
+        """
+        예측 1건 기록 (추론 경로용)
+
+        관측당 O(1) 갱신만 하므로 예측마다 호출해도 된다.
+        """
+        state = self._get_stream_state(model_id)
+        with state.lock:
+            state.add(float(prediction), None if actual is None else float(actual), classification)
+
+    def record_predictions(self, model_id: str, predictions: Sequence[float]):
+        """예측 배치 기록 (추론 서버 배치 단위, 잠금 1회)"""
+        state = self._get_stream_state(model_id)
+        with state.lock:
+            for prediction in predictions:
+                state.add(float(prediction))
         
     async def monitor_performance(self, model_id: str, predictions: np.ndarray,
                                  actuals: np.ndarray, model_type: ModelType) -> Dict[str, float]:
@@ -276,13 +463,22 @@ class ModelMonitor:
             metrics['rmse'] = np.sqrt(metrics['mse'])
             metrics['mae'] = np.mean(np.abs(actuals - predictions))
             
+        # 스트리밍 상태 갱신
+        state = self._get_stream_state(model_id)
+        classification = model_type == ModelType.CLASSIFICATION
+        with state.lock:
+            for prediction, actual in zip(np.asarray(predictions, dtype=float).ravel().tolist(),
+                                          np.asarray(actuals, dtype=float).ravel().tolist()):
+                state.add(prediction, actual, classification)
+
         # 데이터 드리프트 감지
-        drift_score = self._detect_drift(predictions, actuals)
-        metrics['drift_score'] = drift_score
+        drift = self._detect_drift(model_id)
+        metrics['drift_score'] = drift['ks']
+        metrics['psi'] = drift['psi']
         
         # 모니터링 데이터 저장
         if model_id not in self.monitoring_data:
-            self.monitoring_data[model_id] = []
+            self.monitoring_data[model_id] = deque(maxlen=self.history_size)
             
         monitoring_entry = {
             'timestamp': datetime.now(),
@@ -296,12 +492,11 @@ class ModelMonitor:
         
         return metrics
         
-    def _detect_drift(self, predictions: np.ndarray, actuals: np.ndarray) -> float:
-        """데이터 드리프트 감지"""
-        # 간단한 KS 테스트 기반 드리프트 점수
-        from scipy import stats
-        ks_statistic, p_value = stats.ks_2samp(predictions, actuals)
-        return ks_statistic
+    def _detect_drift(self, model_id: str) -> Dict[str, float]:
+        """데이터 드리프트 감지 (참조 분포 대비 최근 롤링 윈도 PSI / KS)"""
+        state = self._get_stream_state(model_id)
+        with state.lock:
+            return state.drift()
         
     async def _check_alerts(self, model_id: str, metrics: Dict[str, float]):
         """알림 확인"""
@@ -324,7 +519,14 @@ class ModelMonitor:
                     })
                     
         # 드리프트 확인
-        if metrics.get('drift_score', 0) > 0.1:
+        if metrics.get('psi', 0) > self.alert_thresholds['drift_psi']:
+            alerts.append({
+                'type': 'data_drift',
+                'severity': 'high',
+                'message': f'Prediction distribution shift (PSI): {metrics["psi"]:.3f}',
+                'current_value': metrics['psi']
+            })
+        elif metrics.get('drift_score', 0) > self.alert_thresholds['drift_ks']:
             alerts.append({
                 'type': 'data_drift',
                 'severity': 'medium',
@@ -339,16 +541,30 @@ class ModelMonitor:
                 
     def get_monitoring_report(self, model_id: str, hours: int = 24) -> Dict[str, Any]:
         """모니터링 리포트"""
-        if model_id not in self.monitoring_data:
+        if model_id not in self.monitoring_data and model_id not in self.stream_states:
             return {'error': 'No monitoring data found'}
+
+        streaming = None
+        if model_id in self.stream_states:
+            state = self.stream_states[model_id]
+            with state.lock:
+                streaming = state.summary()
             
         cutoff = datetime.now() - timedelta(hours=hours)
         recent_data = [
-            entry for entry in self.monitoring_data[model_id]
+            entry for entry in self.monitoring_data.get(model_id, ())
             if entry['timestamp'] >= cutoff
         ]
         
         if not recent_data:
+            if streaming is not None:
+                return {
+                    'model_id': model_id,
+                    'period_hours': hours,
+                    'total_predictions': streaming['predictions']['count'],
+                    'metrics_summary': {},
+                    'streaming': streaming
+                }
             return {'error': 'No recent data'}
             
         # 메트릭 집계
@@ -368,6 +584,7 @@ class ModelMonitor:
             'period_hours': hours,
             'total_predictions': sum(entry['sample_size'] for entry in recent_data),
             'metrics_summary': metrics_summary,
+            'streaming': streaming,
             'last_updated': recent_data[-1]['timestamp']
         }
 
@@ -432,9 +649,8 @@ class ModelDeployer:
             raise
             
     async def _load_model(self, model_path: str):
-        """모델 로드"""
-        with open(model_path, 'rb') as f:
-            return pickle.load(f)
+        """모델 로드 (joblib 은 pickle 파일도 읽을 수 있음)"""
+        return load_artifact(model_path)
             
     async def _health_check(self, model, config: Dict[str, Any]) -> Dict[str, Any]:
         """헬스 체크"""
@@ -7,12 +7,15 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Dict, List, Any, Optional
 from datetime import datetime
+import asyncio
+import functools
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from ai.analytics_engine import AIAnalyticsEngine
 from ai.recommendation_engine import RecommendationEngine
+from ai.inference_server import InferenceServer
 from core import get_logger
 from db.connection_pool import init_database_pool, get_database_pool
 from core.error_handlers import (
@@ -60,6 +63,22 @@ db_pool = init_database_pool(DB_CONFIG)
 analytics_engine = AIAnalyticsEngine(DB_CONFIG)
 recommendation_engine = RecommendationEngine(DB_CONFIG)
 
+# 추천 유사도 인덱스 (워커 간 mmap 공유)
+RECOMMENDATION_INDEX_PATH = os.getenv(
+    'RECOMMENDATION_INDEX_PATH', 'models/recommendation_index.joblib'
+)
+RECOMMENDATION_INDEX_MAX_AGE = 3600
+
+# 추론 서버 (모델 호출 마이크로 배치)
+inference_server = InferenceServer(max_batch_size=256, max_wait_ms=5)
+analytics_engine.set_inference_server(inference_server)
+
+
+async def run_in_threadpool(func, *args, **kwargs):
+    """동기 엔진 호출을 스레드에서 실행 (이벤트 루프 블로킹 방지)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
 
 # Request/Response 모델
 class TrainModelsRequest(BaseModel):
@@ -89,14 +108,27 @@ async def startup_event():
     """API 서버 시작 시 실행"""
     logger.info("AI Business Intelligence API 시작")
     
-    # 추천 엔진 특성 행렬 구축
+    # 추론 서버 배치 루프 시작
+    await inference_server.start()
+    
+    # 추천 엔진 특성 행렬 (최근 인덱스가 있으면 mmap 로드, 없으면 구축 후 저장)
     try:
-        recommendation_engine.build_product_features()
+        if not recommendation_engine.load_index(
+            RECOMMENDATION_INDEX_PATH, max_age_seconds=RECOMMENDATION_INDEX_MAX_AGE
+        ):
+            recommendation_engine.build_product_features()
+            recommendation_engine.save_index(RECOMMENDATION_INDEX_PATH)
         logger.info("추천 엔진 초기화 완료")
     except Exception as e:
         logger.error(f"추천 엔진 초기화 실패: {e}")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """API 서버 종료 시 실행"""
+    await inference_server.shutdown()
+
+
 @app.get("/health")
 async def health_check():
     """헬스 체크"""
@@ -136,7 +168,8 @@ async def predict_sales(request: SalesPredictionRequest):
         if request.days > 365:
             raise ValidationError("예측 일수는 365일을 초과할 수 없습니다.", field="days")
         
-        predictions = analytics_engine.predict_sales(
+        predictions = await run_in_threadpool(
+            analytics_engine.predict_sales,
             product_id=request.product_id,
             days=request.days
         )
@@ -163,7 +196,8 @@ async def predict_sales(request: SalesPredictionRequest):
 async def detect_anomalies(request: AnomalyDetectionRequest):
     """이상치 탐지"""
     try:
-        anomalies = analytics_engine.detect_anomalies(
+        anomalies = await run_in_threadpool(
+            analytics_engine.detect_anomalies,
             data_type=request.data_type
         )
         
@@ -181,7 +215,7 @@ async def detect_anomalies(request: AnomalyDetectionRequest):
 async def get_insights():
     """비즈니스 인사이트 조회"""
     try:
-        insights = analytics_engine.get_insights()
+        insights = await run_in_threadpool(analytics_engine.get_insights)
         return insights
         
     except Exception as e:
@@ -266,10 +300,20 @@ async def get_model_status():
     }
 
 
+@app.get("/inference/stats")
+async def get_inference_stats():
+    """추론 서버 통계 (모델별 지연시간 / 배치 크기 히스토그램)"""
+    return inference_server.get_stats()
+
+
 @app.post("/rebuild-recommendations")
 async def rebuild_recommendations(background_tasks: BackgroundTasks):
     """추천 시스템 재구축"""
-    background_tasks.add_task(recommendation_engine.build_product_features)
+    def rebuild():
+        recommendation_engine.build_product_features()
+        recommendation_engine.save_index(RECOMMENDATION_INDEX_PATH)
+    
+    background_tasks.add_task(rebuild)
     
     return {
         "message": "추천 시스템 재구축이 시작되었습니다",
@@ -15,6 +15,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from ai.ml_models import SalesPredictionModel, AnomalyDetectionModel
 from core import get_logger
+from cache.memory_cache import get_memory_cache, make_key
 
 logger = get_logger(__name__)
 
@@ -30,6 +31,17 @@ AI 기반 비즈니스 분석 엔진
         self.anomaly_model = AnomalyDetectionModel()
         self.models_path = "models/"
         
+        # 분석 결과 캐시 (프로세스 내 엔진 공유)
+        self.cache = get_memory_cache(
+            'ai_analytics',
+            max_entries=256,
+            max_bytes=64 * 1024 * 1024,
+            default_ttl=300
+        )
+        
+        # 추론 서버 (설정 시 모델 호출을 마이크로 배치로 처리)
+        self.inference_server = None
+        
         # 모델 로드 시도
         self._load_models()
     
@@ -48,6 +60,27 @@ AI 기반 비즈니스 분석 엔진
         except Exception as e:
             logger.warning(f"모델 로드 실패: {e}")
     
+    def set_inference_server(self, server):
+        """
+        추론 서버 연결
+        
+        매출 예측 모델을 서버에 등록하고, 이후 예측 호출은 서버의 배치 큐를 거친다.
+        이상 탐지는 특성 전처리(결측치 평균 대체, dtype 별 컬럼 선택)가 입력 배치에
+        따라 달라져 다른 요청과 묶으면 결과가 바뀌므로 등록하지 않고 직접 호출한다.
+        """
+        self.inference_server = server
+        server.register('sales_prediction', self.sales_model.predict)
+    
+    def _predict_sales_rows(self, data: pd.DataFrame) -> np.ndarray:
+        """매출 예측 모델 호출 (추론 서버 경유)"""
+        if self.inference_server is not None:
+            return self.inference_server.predict_sync('sales_prediction', data)
+        return self.sales_model.predict(data)
+    
+    def _detect_anomaly_rows(self, data: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """이상 탐지 모델 호출 (배치 의존 전처리라 추론 서버를 거치지 않음)"""
+        return self.anomaly_model.detect(data)
+    
     def get_sales_data(self, days: int = 90) -> pd.DataFrame:
         """판매 데이터 조회"""
         conn = psycopg2.connect(**self.db_config)
@@ -109,11 +142,28 @@ AI 모델 학습
             logger.error(f"이상 탐지 모델 학습 실패: {e}")
             results['anomaly_detection'] = {"error": str(e)}
         
+        # 재학습된 모델 기준으로 다시 계산되도록 캐시 비움
+        self.cache.clear()
+        
         logger.info("AI 모델 학습 완료")
         return results
     
+    @staticmethod
+    def _is_cacheable_result(result: Any) -> bool:
+        """오류/데이터 없음 결과는 캐싱하지 않음"""
+        return bool(result) and 'error' not in result and 'message' not in result
+    
     def predict_sales(self, product_id: Optional[int] = None, days: int = 7) -> Dict[str, Any]:
-        """매출 예측"""
+        """매출 예측 (10분 캐시)"""
+        return self.cache.get_or_load(
+            make_key('sales_prediction', product_id=product_id, days=days),
+            lambda: self._compute_sales_prediction(product_id, days),
+            ttl=600,
+            cache_if=self._is_cacheable_result
+        )
+    
+    def _compute_sales_prediction(self, product_id: Optional[int], days: int) -> Dict[str, Any]:
+        """매출 예측 계산"""
         if not self.sales_model.is_trained:
             return {"error": "매출 예측 모델이 학습되지 않았습니다"}
         
@@ -142,10 +192,9 @@ AI 모델 학습
         
         predictions = []
         
+        # 전체 상품 x 날짜 행을 만들어 모델을 한 번만 호출
+        prediction_data = []
         for product in products:
-            # 각 날짜별 예측 데이터 생성
-            prediction_data = []
-            
             for date in future_dates:
                 row = {
                     'date': date,
@@ -160,23 +209,27 @@ AI 모델 학습
                     'avg_sales_last_30days': 0  # TODO: 실제 계산
                 }
                 prediction_data.append(row)
-            
-            # 예측 수행
-            df = pd.DataFrame(prediction_data)
-            predicted_sales = self.sales_model.predict(df)
-            
-            # 결과 저장
-            for i, (date, sales) in enumerate(zip(future_dates, predicted_sales)):
-                predictions.append({
-                    'date': date.strftime('%Y-%m-%d'),
-                    'product_id': product['id'],
-                    'product_name': product['name'],
-                    'predicted_sales': float(sales),
-                    'predicted_revenue': float(sales * product['price'])
-                })
         
         conn.close()
         
+        # 예측 수행
+        predicted_sales = (
+            self._predict_sales_rows(pd.DataFrame(prediction_data))
+            if prediction_data else []
+        )
+        
+        # 결과 저장
+        for i, sales in enumerate(predicted_sales):
+            product = products[i // days]
+            date = future_dates[i % days]
+            predictions.append({
+                'date': date.strftime('%Y-%m-%d'),
+                'product_id': product['id'],
+                'product_name': product['name'],
+                'predicted_sales': float(sales),
+                'predicted_revenue': float(sales * product['price'])
+            })
+        
         # 집계
         total_by_date = {}
         for pred in predictions:
@@ -195,7 +248,16 @@ AI 모델 학습
         }
     
     def detect_anomalies(self, data_type: str = 'sales') -> Dict[str, Any]:
-        """이상치 탐지"""
+        """이상치 탐지 (5분 캐시)"""
+        return self.cache.get_or_load(
+            make_key('anomaly_detection', data_type=data_type),
+            lambda: self._compute_anomalies(data_type),
+            ttl=300,
+            cache_if=self._is_cacheable_result
+        )
+    
+    def _compute_anomalies(self, data_type: str) -> Dict[str, Any]:
+        """이상치 탐지 계산"""
         if not self.anomaly_model.is_trained:
             return {"error": "이상 탐지 모델이 학습되지 않았습니다"}
         
@@ -210,7 +272,7 @@ AI 모델 학습
             return {"anomalies": [], "message": "분석할 데이터가 없습니다"}
         
         # 이상치 탐지
-        predictions, scores = self.anomaly_model.detect(data)
+        predictions, scores = self._detect_anomaly_rows(data)
         
         # 이상치 필터링
         anomalies = []
@@ -237,7 +299,11 @@ AI 모델 학습
         }
     
     def get_insights(self) -> Dict[str, Any]:
-        """비즈니스 인사이트 생성"""
+        """비즈니스 인사이트 생성 (5분 캐시)"""
+        return self.cache.get_or_load(make_key('insights'), self._compute_insights, ttl=300)
+    
+    def _compute_insights(self) -> Dict[str, Any]:
+        """비즈니스 인사이트 계산"""
         insights = {
             'generated_at': datetime.now().isoformat(),
             'insights': []
@@ -19,6 +19,7 @@ import time
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from ai.enhanced_models import EnhancedSalesPredictionModel, EnhancedAnomalyDetectionModel
 from core import get_logger
+from cache.memory_cache import get_memory_cache, make_key
 
 logger = get_logger(__name__)
 
@@ -38,10 +39,13 @@ class EnhancedAIAnalyticsEngine:
         self.anomaly_model = EnhancedAnomalyDetectionModel(db_config)
         self.models_path = "models/enhanced/"
         
-        # 캐시 시스템
-        self.cache = {}
-        self.cache_ttl = {}
-        self.cache_lock = threading.Lock()
+        # 캐시 시스템 (프로세스 내 엔진 공유, 항목 수/메모리 상한)
+        self.cache = get_memory_cache(
+            'enhanced_ai_analytics',
+            max_entries=512,
+            max_bytes=128 * 1024 * 1024,
+            default_ttl=300
+        )
         
         # 성능 모니터링
         self.performance_metrics = {
@@ -92,20 +96,10 @@ class EnhancedAIAnalyticsEngine:
         """캐시 정리 워커"""
         while True:
             time.sleep(300)  # 5분마다 실행
-            current_time = time.time()
+            expired_count = self.cache.purge_expired()
             
-            with self.cache_lock:
-                expired_keys = [
-                    key for key, ttl in self.cache_ttl.items()
-                    if current_time > ttl
-                ]
-                
-                for key in expired_keys:
-                    del self.cache[key]
-                    del self.cache_ttl[key]
-                
-                if expired_keys:
-                    logger.info(f"캐시 정리 완료: {len(expired_keys)}개 항목 삭제")
+            if expired_count:
+                logger.info(f"캐시 정리 완료: {expired_count}개 항목 삭제")
     
     def _auto_retrain_worker(self):
         """자동 재학습 워커"""
@@ -153,34 +147,33 @@ class EnhancedAIAnalyticsEngine:
             logger.error(f"데이터 변화량 확인 오류: {e}")
             return 0.0
     
-    def _get_cache_key(self, operation: str, **kwargs) -> str:
+    def _get_cache_key(self, operation: str, **kwargs) -> tuple:
         """캐시 키 생성"""
-        key_parts = [operation]
-        for k, v in sorted(kwargs.items()):
-            key_parts.append(f"{k}_{v}")
-        return "_".join(key_parts)
+        return make_key(operation, **kwargs)
     
-    def _set_cache(self, key: str, value: Any, ttl_seconds: int = 300):
+    def _set_cache(self, key: tuple, value: Any, ttl_seconds: int = 300):
         """캐시 설정"""
-        with self.cache_lock:
-            self.cache[key] = value
-            self.cache_ttl[key] = time.time() + ttl_seconds
+        self.cache.set(key, value, ttl_seconds)
     
-    def _get_cache(self, key: str) -> Optional[Any]:
+    def _get_cache(self, key: tuple) -> Optional[Any]:
         """캐시 조회"""
-        with self.cache_lock:
-            if key in self.cache and time.time() <= self.cache_ttl[key]:
-                return self.cache[key]
-            return None
+        return self.cache.get(key)
+    
+    @staticmethod
+    def _is_cacheable_result(result: Any) -> bool:
+        """오류/데이터 없음 결과는 캐싱하지 않음"""
+        return bool(result) and 'error' not in result and 'message' not in result
     
     def get_business_summary(self) -> Dict[str, Any]:
-        """비즈니스 요약 정보 (캐시 적용)"""
-        cache_key = self._get_cache_key("business_summary")
-        cached_result = self._get_cache(cache_key)
-        
-        if cached_result:
-            return cached_result
-        
+        """비즈니스 요약 정보 (캐시 적용, 동시 요청 병합)"""
+        return self.cache.get_or_load(
+            self._get_cache_key("business_summary"),
+            self._compute_business_summary,
+            ttl=300  # 5분
+        )
+    
+    def _compute_business_summary(self) -> Dict[str, Any]:
+        """비즈니스 요약 정보 계산"""
         conn = psycopg2.connect(**self.db_config)
         cursor = conn.cursor(cursor_factory=RealDictCursor)
         
@@ -241,9 +234,6 @@ class EnhancedAIAnalyticsEngine:
         
         conn.close()
         
-        # 캐시 저장 (5분)
-        self._set_cache(cache_key, summary, 300)
-        
         return summary
     
     def train_models(self) -> Dict[str, Any]:
@@ -287,6 +277,9 @@ class EnhancedAIAnalyticsEngine:
             model_name, result = future.result()
             results['models'][model_name] = result
         
+        # 재학습된 모델 기준으로 다시 계산되도록 캐시 비움 (자동 재학습 포함)
+        self.cache.clear()
+        
         training_time = time.time() - start_time
         results['training_time'] = training_time
         results['completed_at'] = datetime.now().isoformat()
@@ -301,15 +294,17 @@ class EnhancedAIAnalyticsEngine:
     
     def predict_sales_advanced(self, product_id: Optional[int] = None, days: int = 7) -> Dict[str, Any]:
         """고급 매출 예측 (캐시 및 성능 모니터링)"""
+        return self.cache.get_or_load(
+            self._get_cache_key("sales_prediction", product_id=product_id, days=days),
+            lambda: self._compute_sales_prediction(product_id, days),
+            ttl=600,  # 10분
+            cache_if=self._is_cacheable_result
+        )
+    
+    def _compute_sales_prediction(self, product_id: Optional[int], days: int) -> Dict[str, Any]:
+        """고급 매출 예측 계산"""
         start_time = time.time()
         
-        # 캐시 확인
-        cache_key = self._get_cache_key("sales_prediction", product_id=product_id, days=days)
-        cached_result = self._get_cache(cache_key)
-        
-        if cached_result:
-            return cached_result
-        
         try:
             if not self.sales_model.is_trained:
                 return {"error": "향상된 매출 예측 모델이 학습되지 않았습니다"}
@@ -419,9 +414,6 @@ class EnhancedAIAnalyticsEngine:
                 }
             }
             
-            # 캐시 저장 (10분)
-            self._set_cache(cache_key, result, 600)
-            
             # 성능 메트릭 업데이트
             prediction_time = time.time() - start_time
             self.performance_metrics['prediction_count'] += 1
@@ -436,12 +428,15 @@ class EnhancedAIAnalyticsEngine:
     
     def detect_anomalies_advanced(self, data_type: str = 'sales') -> Dict[str, Any]:
         """고급 이상 탐지 (다중 알고리즘 앙상블)"""
-        cache_key = self._get_cache_key("anomaly_detection", data_type=data_type)
-        cached_result = self._get_cache(cache_key)
-        
-        if cached_result:
-            return cached_result
-        
+        return self.cache.get_or_load(
+            self._get_cache_key("anomaly_detection", data_type=data_type),
+            lambda: self._compute_anomalies(data_type),
+            ttl=300,  # 5분
+            cache_if=self._is_cacheable_result
+        )
+    
+    def _compute_anomalies(self, data_type: str) -> Dict[str, Any]:
+        """고급 이상 탐지 계산"""
         try:
             if not self.anomaly_model.is_trained:
                 return {"error": "향상된 이상 탐지 모델이 학습되지 않았습니다"}
@@ -508,9 +503,6 @@ class EnhancedAIAnalyticsEngine:
                 'analyzed_period': '14 days'
             }
             
-            # 캐시 저장 (5분)
-            self._set_cache(cache_key, result, 300)
-            
             return result
             
         except Exception as e:
@@ -561,9 +553,6 @@ class EnhancedAIAnalyticsEngine:
                 ),
                 'last_training': self.performance_metrics['last_training_time']
             },
-            'cache_stats': {
-                'cached_items': len(self.cache),
-                'cache_hit_rate': 'N/A'  # TODO: 캐시 히트율 추적
-            },
+            'cache_stats': self.cache.get_stats(),
             'model_accuracy': self.performance_metrics['model_accuracy']
         }
\ No newline at end of file
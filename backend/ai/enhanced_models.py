@@ -9,13 +9,13 @@ from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
-import joblib
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 import logging
-import os
+
+from ai.model_artifacts import save_artifact, load_artifact
 
 logger = logging.getLogger(__name__)
 
@@ -261,20 +261,19 @@ class EnhancedSalesPredictionModel:
     
     def save(self, path: str):
         """모델 저장"""
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        joblib.dump({
+        save_artifact({
             'models': self.models,
             'scalers': self.scalers,
             'encoders': self.encoders,
             'feature_names': self.feature_names,
             'performance_metrics': self.performance_metrics,
             'is_trained': self.is_trained
-        }, path)
+        }, path, metadata={'model_class': type(self).__name__})
         logger.info(f"향상된 모델 저장 완료: {path}")
     
     def load(self, path: str):
         """모델 로드"""
-        data = joblib.load(path)
+        data = load_artifact(path)
         self.models = data['models']
         self.scalers = data['scalers']
         self.encoders = data['encoders']
@@ -442,18 +441,17 @@ class EnhancedAnomalyDetectionModel:
     
     def save(self, path: str):
         """모델 저장"""
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        joblib.dump({
+        save_artifact({
             'models': self.models,
             'scaler': self.scaler,
             'thresholds': self.thresholds,
             'is_trained': self.is_trained
-        }, path)
+        }, path, metadata={'model_class': type(self).__name__})
         logger.info(f"향상된 이상 탐지 모델 저장 완료: {path}")
     
     def load(self, path: str):
         """모델 로드"""
-        data = joblib.load(path)
+        data = load_artifact(path)
         self.models = data['models']
         self.scaler = data['scaler']
         self.thresholds = data['thresholds']
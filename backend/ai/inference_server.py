@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+"""
+모델 추론 서버
+- ModelRegistry 모델은 시작 시(또는 관리 API에서) (모델 ID, 버전) 별로 한 번만 로드
+- 동시 요청을 마이크로 배치로 묶어 predict 1회로 처리 (max_batch_size / max_wait_ms)
+- 전용 스레드풀에서 실행해 이벤트 루프를 막지 않음
+- 모델별 지연시간 / 배치 크기 히스토그램
+- ModelMonitor 가 주어지면 배치 결과를 드리프트 모니터링에 기록
+"""
+import asyncio
+import bisect
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 히스토그램 버킷 상한
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+class Histogram:
+    """고정 버킷 히스토그램 (마지막 버킷은 +Inf)"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[idx] += 1
+            self.count += 1
+            self.total += value
+
+    def percentile(self, q: float) -> float:
+        """버킷 상한 기준 근사 백분위수"""
+        with self._lock:
+            if self.count == 0:
+                return 0.0
+            target = q / 100 * self.count
+            cumulative = 0
+            for idx, bucket_count in enumerate(self.counts):
+                cumulative += bucket_count
+                if cumulative >= target:
+                    return float(self.buckets[idx]) if idx < len(self.buckets) else float('inf')
+        return float('inf')
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            buckets = {str(b): c for b, c in zip(self.buckets, self.counts)}
+            buckets['+Inf'] = self.counts[-1]
+            count, total = self.count, self.total
+        return {
+            'count': count,
+            'sum': round(total, 3),
+            'avg': round(total / count, 3) if count else 0,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'buckets': buckets
+        }
+
+
+class _Request:
+    """배치 대기 중인 단일 요청"""
+    __slots__ = ('inputs', 'rows', 'future', 'enqueued_at')
+
+    def __init__(self, inputs: Any, rows: int, future: asyncio.Future):
+        self.inputs = inputs
+        self.rows = rows
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+
+
+class _ModelWorker:
+    """모델(버전) 하나에 대한 요청 큐와 배치 루프"""
+
+    def __init__(self, name: str, version: Optional[str], predict_fn: Callable[[Any], Any],
+                 max_batch_size: int, max_wait_ms: float):
+        self.name = name
+        self.version = version
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+        # 교체/해제된 워커 (큐에 남은 요청만 처리하고 종료)
+        self.closed = False
+
+        self.latency_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.queue_wait_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.batch_size = Histogram(BATCH_SIZE_BUCKETS)
+        self.request_count = 0
+        self.batch_count = 0
+        self.error_count = 0
+
+    @property
+    def label(self) -> str:
+        return f"{self.name}@{self.version}" if self.version else self.name
+
+
+# 워커 종료 신호 (큐에 넣으면 앞선 요청을 모두 처리한 뒤 배치 루프 종료)
+_STOP = object()
+
+
+def _count_rows(inputs: Any) -> int:
+    if isinstance(inputs, (pd.DataFrame, np.ndarray)):
+        return len(inputs)
+    if isinstance(inputs, dict):
+        return 1
+    return len(inputs)
+
+
+def _combine_inputs(inputs: List[Any]) -> Any:
+    """요청 입력을 하나의 배치 입력으로 결합"""
+    if all(isinstance(x, pd.DataFrame) for x in inputs):
+        return inputs[0] if len(inputs) == 1 else pd.concat(inputs, ignore_index=True)
+    if all(isinstance(x, np.ndarray) for x in inputs):
+        return inputs[0] if len(inputs) == 1 else np.concatenate(inputs, axis=0)
+
+    rows: List[Any] = []
+    for x in inputs:
+        if isinstance(x, dict):
+            rows.append(x)
+        elif isinstance(x, pd.DataFrame):
+            rows.extend(x.to_dict('records'))
+        else:
+            rows.extend(list(x))
+    if rows and isinstance(rows[0], dict):
+        return pd.DataFrame(rows)
+    return np.asarray(rows)
+
+
+def _prediction_values(outputs: Any) -> Optional[np.ndarray]:
+    """모니터링에 기록할 1차원 수치 예측값 (튜플/다차원/비수치 결과는 None)"""
+    if isinstance(outputs, tuple):
+        return None
+    if isinstance(outputs, (pd.Series, pd.DataFrame)):
+        outputs = outputs.to_numpy()
+    values = np.asarray(outputs)
+    if values.ndim == 2 and values.shape[1] == 1:
+        values = values.ravel()
+    if values.ndim != 1 or values.dtype.kind not in 'biuf':
+        return None
+    return values
+
+
+def _split_outputs(outputs: Any, offsets: List[Tuple[int, int]], total_rows: int) -> List[Any]:
+    """배치 결과를 요청별로 분할 (튜플 결과는 원소별로 분할)"""
+    def _slice(value: Any, start: int, end: int) -> Any:
+        if isinstance(value, (np.ndarray, list, pd.Series, pd.DataFrame)) and len(value) == total_rows:
+            if isinstance(value, (pd.Series, pd.DataFrame)):
+                return value.iloc[start:end]
+            return value[start:end]
+        # 행 단위가 아닌 결과 (요약 dict 등)는 그대로 전달
+        return value
+
+    if isinstance(outputs, tuple):
+        return [tuple(_slice(v, s, e) for v in outputs) for s, e in offsets]
+    return [_slice(outputs, s, e) for s, e in offsets]
+
+
+class InferenceServer:
+    """
+    마이크로 배치 추론 서버
+
+    워커는 (모델 ID, 버전) 별로 하나씩 두므로 한 배치에 다른 버전의 입력이 섞이지 않는다.
+    버전 없이 요청하면 기본 버전(마지막으로 기본으로 로드한 버전)으로 처리한다.
+
+    Args:
+        registry: ai.advanced.model_manager.ModelRegistry (선택)
+        max_batch_size: 배치당 최대 행 수
+        max_wait_ms: 첫 요청 이후 배치를 채우기 위해 기다리는 최대 시간
+        max_workers: 추론 전용 스레드 수
+        monitor: ai.advanced.model_manager.ModelMonitor (선택, 배치 예측값을 모델 ID 별로 기록)
+
+    Examples:
+        server = InferenceServer(model_manager.registry)
+        await server.start()
+        await server.load_production_models()
+        server.register('sales_prediction', engine.sales_model.predict)
+        predictions = await server.predict('sales_prediction', df)
+    """
+
+    def __init__(self, registry: Any = None, max_batch_size: int = 64,
+                 max_wait_ms: float = 5, max_workers: int = 2, monitor: Any = None):
+        self.registry = registry
+        self.monitor = monitor
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix='inference')
+        self._workers: Dict[Tuple[str, Optional[str]], _ModelWorker] = {}
+        self._default_versions: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self):
+        """이벤트 루프에 바인딩하고 등록된 모델의 배치 루프 시작"""
+        self._loop = asyncio.get_running_loop()
+        for worker in list(self._workers.values()):
+            self._start_worker(worker)
+        logger.info(f"추론 서버 시작 (max_batch_size={self.max_batch_size}, "
+                    f"max_wait_ms={self.max_wait_ms})")
+
+    async def shutdown(self):
+        """배치 루프 중지 및 스레드풀 종료 (대기 중인 요청은 실패 처리)"""
+        tasks = [w.task for w in self._workers.values() if w.task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.executor.shutdown(wait=False)
+        logger.info("추론 서버 종료")
+
+    def register(self, name: str, predict_fn: Callable[[Any], Any],
+                 version: Optional[str] = None,
+                 max_batch_size: Optional[int] = None,
+                 max_wait_ms: Optional[float] = None):
+        """
+        예측 함수 등록
+
+        predict_fn 은 결합된 배치 입력(DataFrame/ndarray)을 받아 행 수와 같은 길이의
+        결과(또는 그런 결과의 튜플)를 반환해야 한다. 행끼리 독립적으로 계산되는
+        모델만 등록한다.
+
+        같은 (name, version) 워커가 이미 있으면 교체하며, 기존 워커는 이미 받은
+        요청을 모두 처리한 뒤 종료한다.
+        """
+        worker = _ModelWorker(
+            name, version, predict_fn,
+            max_batch_size or self.max_batch_size,
+            self.max_wait_ms if max_wait_ms is None else max_wait_ms
+        )
+        with self._lock:
+            old = self._workers.get((name, version))
+            self._workers[(name, version)] = worker
+        if old is not None:
+            self._retire_worker(old)
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._start_worker, worker)
+        return worker
+
+    def unregister(self, name: str, version: Optional[str] = None):
+        """워커 해제 (대기 중인 요청은 처리 후 종료)"""
+        with self._lock:
+            worker = self._workers.pop((name, version), None)
+            if version is not None and self._default_versions.get(name) == version:
+                del self._default_versions[name]
+        if worker is not None:
+            self._retire_worker(worker)
+
+    async def load_model(self, model_id: str, version: Optional[str] = None,
+                         make_default: bool = True) -> str:
+        """
+        레지스트리 모델을 로드해 등록 (같은 버전이 이미 로드되어 있으면 재사용)
+
+        시작 시나 관리 API에서만 호출한다. 디스크 I/O 는 기본 스레드풀에서 실행한다.
+
+        Args:
+            model_id: 모델 ID
+            version: 버전 (None 이면 레지스트리 기본 버전)
+            make_default: 버전 없는 요청을 이 버전으로 처리할지 여부
+
+        Returns:
+            로드된 모델 버전
+        """
+        if self.registry is None:
+            raise ValueError("ModelRegistry 가 설정되지 않았습니다")
+
+        loop = asyncio.get_running_loop()
+        model_version = await loop.run_in_executor(None, self.registry.get_model, model_id, version)
+        version = model_version.version
+
+        if (model_id, version) not in self._workers:
+            model = await loop.run_in_executor(None, self._read_model, model_version)
+            if not hasattr(model, 'predict'):
+                raise ValueError(f"Model {model_id} has no predict method")
+            self.register(model_id, model.predict, version=version)
+            logger.info(f"추론 모델 로드: {model_id} v{version}")
+
+        if make_default:
+            self._default_versions[model_id] = version
+        return version
+
+    async def load_production_models(self) -> Dict[str, str]:
+        """
+        레지스트리의 프로덕션 버전을 모두 로드 (모델별 가장 최근 버전이 기본)
+
+        Returns:
+            {모델 ID: 기본 버전}
+        """
+        if self.registry is None:
+            return {}
+
+        loaded = {}
+        for model_id, versions in list(self.registry.models.items()):
+            production = sorted(
+                (mv for mv in versions.values() if getattr(mv.status, 'value', mv.status) == 'production'),
+                key=lambda mv: mv.created_at
+            )
+            for model_version in production:
+                try:
+                    loaded[model_id] = await self.load_model(model_id, model_version.version)
+                except Exception as e:
+                    logger.error(f"추론 모델 로드 실패 ({model_id} v{model_version.version}): {e}")
+        return loaded
+
+    def _read_model(self, model_version: Any) -> Any:
+        if hasattr(self.registry, 'load_model_object'):
+            # 콘텐츠 해시 검증 + mmap 로드 (워커 간 배열 공유)
+            return self.registry.load_model_object(model_version.model_id, model_version.version)
+        with open(model_version.model_path, 'rb') as f:
+            return pickle.load(f)
+
+    def loaded_version(self, model_id: str) -> Optional[str]:
+        """버전 없는 요청에 사용되는 기본 버전"""
+        return self._default_versions.get(model_id)
+
+    def is_registered(self, name: str, version: Optional[str] = None) -> bool:
+        return self._find_worker(name, version) is not None
+
+    def _find_worker(self, name: str, version: Optional[str] = None) -> Optional[_ModelWorker]:
+        if version is None:
+            version = self._default_versions.get(name)
+        return self._workers.get((name, version))
+
+    def _get_worker(self, name: str, version: Optional[str] = None) -> _ModelWorker:
+        worker = self._find_worker(name, version)
+        if worker is None:
+            label = f"{name}@{version}" if version else name
+            raise KeyError(f"로드되지 않은 모델: {label}")
+        return worker
+
+    async def predict(self, name: str, inputs: Any, version: Optional[str] = None) -> Any:
+        """예측 요청 (같은 모델/버전에 대한 동시 요청은 하나의 배치로 처리)"""
+        worker = self._get_worker(name, version)
+        if worker.task is None:
+            self._start_worker(worker)
+
+        future = asyncio.get_running_loop().create_future()
+        worker.queue.put_nowait(_Request(inputs, _count_rows(inputs), future))
+        return await future
+
+    def predict_sync(self, name: str, inputs: Any, version: Optional[str] = None,
+                     timeout: Optional[float] = 30) -> Any:
+        """
+        동기 코드(스레드)에서의 예측 요청
+
+        서버 이벤트 루프가 다른 스레드에서 실행 중이면 배치 큐를 거치고,
+        루프 스레드 자신이거나 서버가 시작되지 않았으면 직접 호출한다.
+        """
+        loop = self._loop
+        in_loop_thread = False
+        if loop is not None:
+            try:
+                in_loop_thread = asyncio.get_running_loop() is loop
+            except RuntimeError:
+                in_loop_thread = False
+
+        if loop is None or not loop.is_running() or in_loop_thread:
+            return self._get_worker(name, version).predict_fn(inputs)
+
+        return asyncio.run_coroutine_threadsafe(
+            self.predict(name, inputs, version), loop
+        ).result(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """모델(버전)별 지연시간 / 배치 크기 통계"""
+        stats = {}
+        for worker in list(self._workers.values()):
+            stats[worker.label] = {
+                'model_id': worker.name,
+                'version': worker.version,
+                'default': worker.version is not None and
+                           self._default_versions.get(worker.name) == worker.version,
+                'requests': worker.request_count,
+                'batches': worker.batch_count,
+                'errors': worker.error_count,
+                'queue_depth': worker.queue.qsize() if worker.queue else 0,
+                'max_batch_size': worker.max_batch_size,
+                'max_wait_ms': worker.max_wait * 1000,
+                'latency_ms': worker.latency_ms.to_dict(),
+                'queue_wait_ms': worker.queue_wait_ms.to_dict(),
+                'batch_size': worker.batch_size.to_dict()
+            }
+        return stats
+
+    def _start_worker(self, worker: _ModelWorker):
+        if worker.closed or (worker.task is not None and not worker.task.done()):
+            return
+        worker.queue = asyncio.Queue()
+        worker.task = asyncio.get_running_loop().create_task(self._batch_loop(worker))
+
+    def _retire_worker(self, worker: _ModelWorker):
+        """교체/해제된 워커 종료 (이미 받은 요청은 처리한 뒤 배치 루프 종료)"""
+        worker.closed = True
+        if worker.queue is not None and self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(worker.queue.put_nowait, _STOP)
+
+    @staticmethod
+    def _fail_pending(worker: _ModelWorker, batch: List[_Request], error: Exception):
+        """처리 중인 배치와 큐에 남은 요청을 모두 실패 처리"""
+        pending = list(batch)
+        while worker.queue is not None and not worker.queue.empty():
+            item = worker.queue.get_nowait()
+            if item is not _STOP:
+                pending.append(item)
+        for request in pending:
+            if not request.future.done():
+                request.future.set_exception(error)
+
+    async def _collect_batch(self, worker: _ModelWorker, batch: List[_Request]) -> bool:
+        """
+        첫 요청을 기다린 뒤 max_batch_size 또는 max_wait 까지 요청 수집
+
+        Returns:
+            종료 신호를 받았는지 여부
+        """
+        first = await worker.queue.get()
+        if first is _STOP:
+            return True
+        batch.append(first)
+        rows = first.rows
+        deadline = time.perf_counter() + worker.max_wait
+
+        while rows < worker.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                request = await asyncio.wait_for(worker.queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            if request is _STOP:
+                return True
+            batch.append(request)
+            rows += request.rows
+
+        return False
+
+    async def _batch_loop(self, worker: _ModelWorker):
+        batch: List[_Request] = []
+        try:
+            while True:
+                batch = []
+                stop = await self._collect_batch(worker, batch)
+                if batch:
+                    await self._run_batch(worker, batch)
+                if stop:
+                    break
+        except asyncio.CancelledError:
+            self._fail_pending(worker, batch, RuntimeError(f"추론 서버 종료: {worker.label}"))
+            raise
+
+        # 종료 신호 이후 들어온 요청 (정상 경로에서는 없음)
+        self._fail_pending(worker, [], RuntimeError(f"모델 워커가 교체되었습니다: {worker.label}"))
+        logger.info(f"추론 워커 종료: {worker.label}")
+
+    def _record_predictions(self, worker: _ModelWorker, outputs: Any):
+        """응답 후 추론 스레드에서 모니터에 기록 (이벤트 루프를 막지 않음)"""
+        values = _prediction_values(outputs)
+        if values is None or not len(values):
+            return
+
+        def record():
+            try:
+                self.monitor.record_predictions(worker.name, values)
+            except Exception as e:
+                logger.warning(f"예측 모니터링 기록 실패 ({worker.label}): {e}")
+
+        try:
+            self.executor.submit(record)
+        except RuntimeError:
+            # 종료 중인 스레드풀
+            pass
+
+    async def _run_batch(self, worker: _ModelWorker, batch: List[_Request]):
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+
+        offsets = []
+        start = 0
+        for request in batch:
+            offsets.append((start, start + request.rows))
+            start += request.rows
+            worker.queue_wait_ms.observe((started - request.enqueued_at) * 1000)
+
+        try:
+            combined = _combine_inputs([r.inputs for r in batch])
+            outputs = await loop.run_in_executor(self.executor, worker.predict_fn, combined)
+            results = _split_outputs(outputs, offsets, start)
+            for request, result in zip(batch, results):
+                if not request.future.done():
+                    request.future.set_result(result)
+            if self.monitor is not None:
+                self._record_predictions(worker, outputs)
+        except Exception as e:
+            worker.error_count += 1
+            logger.error(f"배치 추론 실패 ({worker.label}): {e}")
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+
+        finished = time.perf_counter()
+        worker.batch_count += 1
+        worker.request_count += len(batch)
+        worker.batch_size.observe(start)
+        for request in batch:
+            worker.latency_ms.observe((finished - request.enqueued_at) * 1000)
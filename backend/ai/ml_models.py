@@ -7,12 +7,12 @@ import pandas as pd
 from sklearn.ensemble import RandomForestRegressor, IsolationForest
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
-import joblib
-import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 import logging
 
+from ai.model_artifacts import save_artifact, load_artifact
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,6 +32,9 @@ class SalesPredictionModel:
             'supplier_encoded', 'promotion_active', 'season',
             'avg_sales_last_7days', 'avg_sales_last_30days'
         ]
+        # 학습 시점의 범주 목록 (예측 배치 구성과 무관하게 같은 코드로 인코딩)
+        self.category_levels: Optional[List[str]] = None
+        self.supplier_levels: Optional[List[str]] = None
         self.is_trained = False
     
     def prepare_features(self, data: pd.DataFrame) -> pd.DataFrame:
@@ -58,11 +61,15 @@ class SalesPredictionModel:
         
         # 카테고리 인코딩
         if 'category' in data.columns:
-            features['category_encoded'] = pd.Categorical(data['category']).codes
+            features['category_encoded'] = pd.Categorical(
+                data['category'], categories=self.category_levels
+            ).codes
         
         # 공급업체 인코딩
         if 'supplier' in data.columns:
-            features['supplier_encoded'] = pd.Categorical(data['supplier']).codes
+            features['supplier_encoded'] = pd.Categorical(
+                data['supplier'], categories=self.supplier_levels
+            ).codes
         
         # 프로모션 상태
         if 'promotion_active' in data.columns:
@@ -93,6 +100,12 @@ class SalesPredictionModel:
         """모델 학습"""
         logger.info("매출 예측 모델 학습 시작")
         
+        # 범주 목록 고정
+        if 'category' in training_data.columns:
+            self.category_levels = sorted(training_data['category'].dropna().unique().tolist())
+        if 'supplier' in training_data.columns:
+            self.supplier_levels = sorted(training_data['supplier'].dropna().unique().tolist())
+        
         # 특성 준비
         X = self.prepare_features(training_data)
         y = training_data['sales']
@@ -139,21 +152,24 @@ class SalesPredictionModel:
     
     def save(self, path: str):
         """모델 저장"""
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        joblib.dump({
+        save_artifact({
             'model': self.model,
             'scaler': self.scaler,
             'feature_names': self.feature_names,
+            'category_levels': self.category_levels,
+            'supplier_levels': self.supplier_levels,
             'is_trained': self.is_trained
-        }, path)
+        }, path, metadata={'model_class': type(self).__name__})
         logger.info(f"모델 저장 완료: {path}")
     
     def load(self, path: str):
-        """모델 로드"""
-        data = joblib.load(path)
+        """모델 로드 (배열은 mmap, 워커 간 페이지 공유)"""
+        data = load_artifact(path)
         self.model = data['model']
         self.scaler = data['scaler']
         self.feature_names = data['feature_names']
+        self.category_levels = data.get('category_levels')
+        self.supplier_levels = data.get('supplier_levels')
         self.is_trained = data['is_trained']
         logger.info(f"모델 로드 완료: {path}")
 
@@ -227,17 +243,16 @@ class AnomalyDetectionModel:
     
     def save(self, path: str):
         """모델 저장"""
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        joblib.dump({
+        save_artifact({
             'model': self.model,
             'scaler': self.scaler,
             'is_trained': self.is_trained
-        }, path)
+        }, path, metadata={'model_class': type(self).__name__})
         logger.info(f"이상 탐지 모델 저장 완료: {path}")
     
     def load(self, path: str):
         """모델 로드"""
-        data = joblib.load(path)
+        data = load_artifact(path)
         self.model = data['model']
         self.scaler = data['scaler']
         self.is_trained = data['is_trained']
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+모델 아티팩트 저장/로드
+- 비압축 joblib 포맷으로 저장해 NumPy 배열(스케일러, 임베딩, 유사도 행렬 등)을
+  mmap 으로 로드 → 여러 uvicorn 워커가 OS 페이지 캐시를 공유
+  (sklearn 트리 노드 배열은 Tree.__setstate__ 에서 복사되므로 프로세스별로 생성됨)
+- 아티팩트 옆에 매니페스트(<path>.manifest.json) 저장: 포맷 버전, 콘텐츠 해시, 파일 식별자, 메타데이터
+- 프로세스 내 캐시 (경로 + 콘텐츠 해시 기준) 및 지연 로딩
+"""
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import joblib
+import logging
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMAT = 'joblib-mmap'
+ARTIFACT_FORMAT_VERSION = 1
+MANIFEST_SUFFIX = '.manifest.json'
+
+# (실제 경로, 콘텐츠 해시, mmap 여부) -> 로드된 객체
+_loaded: Dict[Tuple[str, str, bool], Any] = {}
+_loaded_lock = threading.Lock()
+
+
+class ArtifactIntegrityError(Exception):
+    """아티팩트 콘텐츠 해시 불일치"""
+    pass
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """파일 콘텐츠 SHA-256 (스트리밍)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def manifest_path(path: str) -> str:
+    return path + MANIFEST_SUFFIX
+
+
+def _file_id(stat: os.stat_result) -> str:
+    """파일 식별자 (os.replace 로 옮겨도 유지되는 장치/inode)"""
+    return f"{stat.st_dev}:{stat.st_ino}"
+
+
+def _file_version(stat: os.stat_result) -> str:
+    """파일 식별자 + 수정 시각/크기 (제자리 수정까지 구분)"""
+    return f"{_file_id(stat)}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def read_manifest(path: str) -> Optional[Dict[str, Any]]:
+    """매니페스트 조회 (없으면 None - 이전 포맷 pickle)"""
+    try:
+        with open(manifest_path(path), 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_artifact(obj: Any, path: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    아티팩트 저장
+
+    비압축으로 저장해야 배열을 mmap 으로 읽을 수 있다. 임시 파일에 쓴 뒤
+    os.replace 로 교체하므로 로드 중인 다른 워커는 이전 파일을 계속 사용한다.
+
+    매니페스트를 먼저 교체하고 데이터 파일을 나중에 교체한다. 매니페스트에는
+    새 데이터 파일의 식별자(file_id)가 들어 있어, 그 사이에 로드하는 쪽은
+    식별자가 다른 매니페스트를 무시하므로 이전 데이터가 새 해시로 캐시되지 않는다.
+
+    Returns:
+        매니페스트
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    joblib.dump(obj, tmp_path, compress=0)
+    stat = os.stat(tmp_path)
+
+    manifest = {
+        'format': ARTIFACT_FORMAT,
+        'format_version': ARTIFACT_FORMAT_VERSION,
+        'content_hash': file_sha256(tmp_path),
+        'size_bytes': stat.st_size,
+        'file_id': _file_id(stat),
+        'created_at': datetime.now().isoformat(),
+        'metadata': metadata or {}
+    }
+
+    tmp_manifest = f"{manifest_path(path)}.tmp.{os.getpid()}"
+    with open(tmp_manifest, 'w') as f:
+        json.dump(manifest, f, indent=2, default=str)
+    os.replace(tmp_manifest, manifest_path(path))
+    os.replace(tmp_path, path)
+
+    return manifest
+
+
+def load_artifact(path: str, mmap: bool = True, verify: bool = False,
+                  expected_hash: Optional[str] = None) -> Any:
+    """
+    아티팩트 로드
+
+    같은 프로세스에서 같은 콘텐츠를 다시 로드하면 캐시된 객체를 반환한다.
+    mmap=True 이면 배열은 읽기 전용 memmap 으로 로드된다.
+
+    Args:
+        path: 아티팩트 경로
+        mmap: 배열 memory-map 여부
+        verify: 파일 해시를 다시 계산해 매니페스트와 비교
+        expected_hash: 기대 콘텐츠 해시 (레지스트리 기록 등)
+    """
+    for _ in range(3):
+        manifest = read_manifest(path)
+        stat = os.stat(path)
+        file_id = _file_id(stat)
+        if manifest and manifest.get('file_id', file_id) != file_id:
+            # 저장 중 (매니페스트만 교체됨) - 실제 파일 기준으로 판단
+            manifest = None
+        content_hash = manifest['content_hash'] if manifest else None
+
+        if expected_hash and content_hash and expected_hash != content_hash:
+            raise ArtifactIntegrityError(
+                f"콘텐츠 해시 불일치: {path} (expected {expected_hash[:12]}, manifest {content_hash[:12]})"
+            )
+
+        if verify or (expected_hash and not content_hash):
+            actual_hash = file_sha256(path)
+            for recorded_hash in (content_hash, expected_hash):
+                if recorded_hash and recorded_hash != actual_hash:
+                    raise ArtifactIntegrityError(f"콘텐츠 해시 불일치: {path}")
+            content_hash = actual_hash
+
+        if content_hash is None:
+            # 매니페스트 없는 이전 포맷: 파일 식별자/수정 시각/크기로 캐시 구분
+            content_hash = f"file:{_file_version(stat)}"
+
+        key = (os.path.realpath(path), content_hash, mmap)
+        with _loaded_lock:
+            if key in _loaded:
+                return _loaded[key]
+
+        obj = joblib.load(path, mmap_mode='r' if mmap else None)
+        if _file_version(os.stat(path)) == _file_version(stat):
+            break
+        # 로드 중 파일이 교체됨 - 키와 내용이 어긋날 수 있으므로 다시 로드
+    else:
+        # 계속 교체되는 중: 캐시하지 않고 반환
+        return obj
+
+    with _loaded_lock:
+        # 같은 경로의 이전 버전 캐시 해제
+        for old_key in [k for k in _loaded if k[0] == key[0] and k != key]:
+            del _loaded[old_key]
+        _loaded[key] = obj
+
+    return obj
+
+
+def clear_loaded_artifacts():
+    """프로세스 내 아티팩트 캐시 비우기"""
+    with _loaded_lock:
+        _loaded.clear()
+
+
+class LazyArtifact:
+    """
+    지연 로딩 아티팩트
+
+    첫 get() 호출 시 로드하고, 이후 아티팩트 파일이 교체되면 다시 로드한다.
+
+    Examples:
+        index = LazyArtifact('models/similarity_index.joblib')
+        matrix = index.get()['similarity_matrix']
+    """
+
+    def __init__(self, path: str, mmap: bool = True):
+        self.path = path
+        self.mmap = mmap
+        self._obj = None
+        self._file_version = None
+        self._lock = threading.Lock()
+
+    @property
+    def content_hash(self) -> Optional[str]:
+        manifest = read_manifest(self.path)
+        return manifest['content_hash'] if manifest else None
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def get(self) -> Any:
+        current_version = _file_version(os.stat(self.path))
+        with self._lock:
+            if self._obj is None or current_version != self._file_version:
+                self._obj = load_artifact(self.path, mmap=self.mmap)
+                self._file_version = current_version
+            return self._obj
@@ -11,6 +11,12 @@ import psycopg2
 from psycopg2.extras import RealDictCursor
 import logging
 from datetime import datetime, timedelta
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cache.memory_cache import get_memory_cache, make_key
+from ai.model_artifacts import save_artifact, load_artifact, read_manifest
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +34,14 @@ class RecommendationEngine:
             max_features=100,
             stop_words='english'
         )
+        
+        # 추천 결과 캐시 (프로세스 내 엔진 공유)
+        self.cache = get_memory_cache(
+            'ai_recommendation',
+            max_entries=4096,
+            max_bytes=64 * 1024 * 1024,
+            default_ttl=600
+        )
     
     def build_product_features(self):
         """상품 특성 행렬 구축"""
@@ -82,6 +96,42 @@ class RecommendationEngine:
         
         logger.info(f"상품 특성 행렬 구축 완료: {len(self.product_features)}개 상품")
     
+    def save_index(self, path: str):
+        """유사도 인덱스를 mmap 가능한 아티팩트로 저장 (float32)"""
+        if self.similarity_matrix is None:
+            raise ValueError("유사도 인덱스가 구축되지 않았습니다")
+        
+        save_artifact({
+            'product_features': self.product_features,
+            'similarity_matrix': np.ascontiguousarray(self.similarity_matrix, dtype=np.float32)
+        }, path, metadata={'product_count': len(self.product_features)})
+        logger.info(f"유사도 인덱스 저장 완료: {path}")
+    
+    def load_index(self, path: str, max_age_seconds: Optional[int] = None) -> bool:
+        """
+        저장된 유사도 인덱스 로드
+        
+        유사도 행렬은 mmap 으로 로드되어 같은 서버의 워커들이 한 벌의 메모리를 공유한다.
+        
+        Returns:
+            로드 성공 여부 (파일이 없거나 max_age_seconds 보다 오래되었으면 False)
+        """
+        manifest = read_manifest(path)
+        if not manifest or not os.path.exists(path):
+            return False
+        
+        if max_age_seconds is not None:
+            age = (datetime.now() - datetime.fromisoformat(manifest['created_at'])).total_seconds()
+            if age > max_age_seconds:
+                return False
+        
+        index = load_artifact(path)
+        self.product_features = index['product_features']
+        self.similarity_matrix = index['similarity_matrix']
+        self.cache.clear()
+        logger.info(f"유사도 인덱스 로드 완료: {len(self.product_features)}개 상품")
+        return True
+    
     def get_similar_products(self, product_id: int, n: int = 5) -> List[Dict[str, Any]]:
         """유사 상품 추천"""
         if self.similarity_matrix is None:
@@ -117,7 +167,14 @@ class RecommendationEngine:
         return recommendations
     
     def get_cross_sell_recommendations(self, product_ids: List[int], n: int = 5) -> List[Dict[str, Any]]:
-        """교차 판매 추천 (함께 구매된 상품)"""
+        """교차 판매 추천 (함께 구매된 상품, 10분 캐시)"""
+        return self.cache.get_or_load(
+            make_key('cross_sell', product_ids=tuple(sorted(product_ids)), n=n),
+            lambda: self._query_cross_sell_recommendations(product_ids, n)
+        )
+    
+    def _query_cross_sell_recommendations(self, product_ids: List[int], n: int) -> List[Dict[str, Any]]:
+        """교차 판매 추천 조회"""
         conn = psycopg2.connect(**self.db_config)
         cursor = conn.cursor(cursor_factory=RealDictCursor)
         
@@ -164,7 +221,14 @@ class RecommendationEngine:
         return recommendations
     
     def get_personalized_recommendations(self, customer_id: str, n: int = 10) -> List[Dict[str, Any]]:
-        """개인화된 추천"""
+        """개인화된 추천 (10분 캐시)"""
+        return self.cache.get_or_load(
+            make_key('personalized', customer_id=customer_id, n=n),
+            lambda: self._query_personalized_recommendations(customer_id, n)
+        )
+    
+    def _query_personalized_recommendations(self, customer_id: str, n: int) -> List[Dict[str, Any]]:
+        """개인화된 추천 조회"""
         conn = psycopg2.connect(**self.db_config)
         cursor = conn.cursor(cursor_factory=RealDictCursor)
         
@@ -247,7 +311,15 @@ class RecommendationEngine:
         return recommendations
     
     def get_trending_products(self, n: int = 10, days: int = 7) -> List[Dict[str, Any]]:
-        """트렌딩 상품 추천"""
+        """트렌딩 상품 추천 (5분 캐시)"""
+        return self.cache.get_or_load(
+            make_key('trending', n=n, days=days),
+            lambda: self._query_trending_products(n, days),
+            ttl=300
+        )
+    
+    def _query_trending_products(self, n: int, days: int) -> List[Dict[str, Any]]:
+        """트렌딩 상품 조회"""
         conn = psycopg2.connect(**self.db_config)
         cursor = conn.cursor(cursor_factory=RealDictCursor)
         
@@ -11,16 +11,20 @@ import pandas as pd
 from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.model_selection import train_test_split
-import joblib
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 from datetime import datetime, timedelta
 import logging
 import json
 from typing import Dict, List, Any, Optional, Tuple
 import warnings
+import sys
+import os
 warnings.filterwarnings('ignore')
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ai.model_artifacts import save_artifact, load_artifact
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -357,65 +361,199 @@ class SupplierProductAI:
                 'category_rank': 0
             }
     
-    def batch_analyze_products(self, supplier_name: Optional[str] = None) -> List[Dict]:
-        """배치 상품 분석"""
+    def batch_analyze_products(self, supplier_name: Optional[str] = None,
+                               chunk_size: int = 5000,
+                               limit: Optional[int] = None,
+                               collect_results: bool = True) -> List[Dict]:
+        """배치 상품 분석
+
+        서버 사이드 커서로 상품을 chunk_size 단위로 스트리밍하면서
+        청크마다 특성 행렬을 한 번에 만들고 model.predict 를 한 번만 호출한 뒤
+        결과를 일괄 저장한다. 커서는 WITH HOLD 로 열어 청크마다 커밋하므로
+        중간에 실패해도 앞선 청크의 결과는 남는다. 전체 카탈로그 야간 분석 시에는
+        collect_results=False 로 호출해 결과 리스트를 메모리에 쌓지 않는다.
+        """
+        total = 0
         try:
             logger.info(f"🔄 배치 분석 시작: {supplier_name or '전체'}")
             
-            # 상품 조회
+            if self.price_model is None or self.demand_model is None:
+                self._load_models()
+            
+            # 상품 조회 (카테고리 내 순위는 윈도 함수로 한 번에 계산)
             query = """
-            SELECT 
-                sp.*,
-                s.name as supplier_name
-            FROM supplier_products sp
-            JOIN suppliers s ON sp.supplier_id = s.id
-            WHERE sp.status = 'active'
+            SELECT *
+            FROM (
+                SELECT 
+                    sp.*,
+                    s.name as supplier_name,
+                    RANK() OVER (PARTITION BY sp.category ORDER BY sp.price) as category_rank
+                FROM supplier_products sp
+                JOIN suppliers s ON sp.supplier_id = s.id
+                WHERE sp.status = 'active'
+            ) ranked
             """
+            params: List[Any] = []
             
             if supplier_name:
-                query += f" AND s.name = '{supplier_name}'"
+                query += " WHERE supplier_name = %s"
+                params.append(supplier_name)
             
-            query += " LIMIT 100"  # 테스트용 제한
+            query += " ORDER BY id"
             
-            with self.conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(query)
-                products = cursor.fetchall()
+            if limit:
+                query += " LIMIT %s"
+                params.append(limit)
             
             results = []
             
-            for product in products:
-                # 가격 예측
-                price_analysis = self.predict_price(product)
-                
-                # 수요 분석
-                demand_analysis = self.analyze_demand(product)
-                
-                # 종합 결과 (Decimal 타입을 float로 변환)
-                result = {
-                    'product_id': int(product['id']),
-                    'supplier_product_id': str(product['supplier_product_id']),
-                    'product_name': str(product['product_name']),
-                    'category': str(product['category']) if product['category'] else '기타',
-                    'current_price': float(product['price']),
-                    'cost_price': float(product['cost_price']),
-                    **price_analysis,
-                    **demand_analysis,
-                    'analysis_timestamp': datetime.now().isoformat()
-                }
+            # 이름 있는 커서 = PostgreSQL 서버 사이드 커서 (WITH HOLD: 커밋 후에도 유지)
+            with self.conn.cursor(name='supplier_ai_batch',
+                                  cursor_factory=RealDictCursor,
+                                  withhold=True) as cursor:
+                cursor.itersize = chunk_size
+                cursor.execute(query, params)
                 
-                results.append(result)
-                
-                # DB에 저장
-                self._save_analysis_result(result)
+                while True:
+                    products = cursor.fetchmany(chunk_size)
+                    if not products:
+                        break
+                    
+                    chunk_results = self._analyze_chunk(products)
+                    self._save_analysis_results(chunk_results)
+                    self.conn.commit()
+                    
+                    total += len(chunk_results)
+                    if collect_results:
+                        results.extend(chunk_results)
+                    
+                    logger.info(f"   - {total}개 상품 분석 진행")
+            
+            # WITH HOLD 커서 종료(CLOSE) 트랜잭션 정리
+            self.conn.commit()
             
-            logger.info(f"✅ {len(results)}개 상품 분석 완료")
+            logger.info(f"✅ {total}개 상품 분석 완료")
             
             return results
             
         except Exception as e:
-            logger.error(f"배치 분석 실패: {e}")
+            logger.error(f"배치 분석 실패 (커밋된 분석 결과: {total}개): {e}")
+            self.conn.rollback()
             return []
     
+    def _analyze_chunk(self, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """상품 청크 일괄 분석 (청크당 predict 1회)"""
+        df = pd.DataFrame(products)
+        features = self._prepare_feature_matrix(df)
+        
+        predicted_price = self.price_model.predict(features)
+        demand_score = self.demand_model.predict(features)
+        
+        # 가격 분석 (predict_price 와 동일한 계산을 벡터로 수행)
+        cost_price = self._numeric_column(df, 'cost_price', 0)
+        current_price = self._numeric_column(df, 'price', 0)
+        current_price = np.where(current_price > 0, current_price, predicted_price)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            suggested_margin = np.where(
+                cost_price > 0, (predicted_price - cost_price) / cost_price, 0)
+            price_competitiveness = np.where(
+                predicted_price > 0, current_price / predicted_price, 1)
+            price_adjustment = np.where(
+                current_price > 0,
+                (predicted_price - current_price) / current_price * 100, 0)
+        
+        # 수요 분석 (analyze_demand 와 동일한 등급 기준)
+        grade_conditions = [
+            demand_score >= 80, demand_score >= 60,
+            demand_score >= 40, demand_score >= 20
+        ]
+        demand_grade = np.select(grade_conditions, ['A', 'B', 'C', 'D'], 'E')
+        demand_level = np.select(grade_conditions,
+                                 ['매우 높음', '높음', '보통', '낮음'], '매우 낮음')
+        
+        # 추천 재고 (_calculate_recommended_stock 벡터 버전)
+        weight = self._numeric_column(df, 'weight', 0)
+        price = self._numeric_column(df, 'price', 0)
+        base_stock = demand_score * 2
+        base_stock = np.where(price > 100000, base_stock * 0.5,
+                              np.where(price < 10000, base_stock * 1.5, base_stock))
+        base_stock = np.where(weight > 10, base_stock * 0.7, base_stock)
+        recommended_stock = np.maximum(10, base_stock.astype(int))
+        stock_quantity = self._numeric_column(df, 'stock_quantity', 0)
+        reorder_point = np.maximum(10, (recommended_stock * 0.3).astype(int))
+        
+        if 'category_rank' in df:
+            category_rank = df['category_rank'].fillna(0).astype(int).to_numpy()
+        else:
+            category_rank = np.zeros(len(df), dtype=int)
+        
+        categories = df['category'].where(df['category'].notna() & (df['category'] != ''), '기타')
+        timestamp = datetime.now().isoformat()
+        
+        results = []
+        for i, product in enumerate(products):
+            results.append({
+                'product_id': int(product['id']),
+                'supplier_product_id': str(product['supplier_product_id']),
+                'product_name': str(product['product_name']),
+                'category': str(categories.iat[i]),
+                'current_price': float(product['price']),
+                'cost_price': float(product['cost_price']),
+                'predicted_price': round(float(predicted_price[i]), -2),
+                'suggested_margin': round(float(suggested_margin[i]) * 100, 1),
+                'price_competitiveness': round(float(price_competitiveness[i]), 2),
+                'price_adjustment': round(float(price_adjustment[i]), 1),
+                'demand_score': round(float(demand_score[i]), 1),
+                'demand_grade': str(demand_grade[i]),
+                'demand_level': str(demand_level[i]),
+                'recommended_stock': int(recommended_stock[i]),
+                'stock_adjustment': float(recommended_stock[i] - stock_quantity[i]),
+                'reorder_point': int(reorder_point[i]),
+                'category_rank': int(category_rank[i]),
+                'analysis_timestamp': timestamp
+            })
+        
+        return results
+    
+    @staticmethod
+    def _numeric_column(df: pd.DataFrame, column: str, default: float) -> np.ndarray:
+        """DataFrame 컬럼을 float 배열로 변환 (Decimal/None 처리)"""
+        if column not in df:
+            return np.full(len(df), float(default))
+        return pd.to_numeric(df[column], errors='coerce').fillna(default).to_numpy(dtype=float)
+    
+    def _prepare_feature_matrix(self, df: pd.DataFrame) -> np.ndarray:
+        """특성 행렬 준비 (_prepare_features 의 벡터 버전)"""
+        now = datetime.now()
+        n = len(df)
+        
+        columns = [
+            self._numeric_column(df, 'cost_price', 0),
+            self._numeric_column(df, 'weight', 0),
+            self._numeric_column(df, 'stock_quantity', 0),
+            self._numeric_column(df, 'category_avg_price', 50000),
+            self._numeric_column(df, 'brand_avg_price', 50000),
+            self._numeric_column(df, 'supplier_avg_margin', 0.3),
+            self._numeric_column(df, 'price_to_category_avg', 1.0),
+            self._numeric_column(df, 'price_to_brand_avg', 1.0),
+            self._numeric_column(df, 'stock_value', 0),
+            np.full(n, now.hour, dtype=float),
+            np.full(n, now.weekday(), dtype=float),
+            np.full(n, now.month, dtype=float)
+        ]
+        
+        # 범주형 변수 인코딩 (미등록 값은 0)
+        for col in ['supplier_name', 'category', 'brand']:
+            if col in self.encoders and col in df:
+                mapping = {label: idx for idx, label in enumerate(self.encoders[col].classes_)}
+                encoded = df[col].map(mapping).fillna(0).to_numpy(dtype=float)
+            else:
+                encoded = np.zeros(n, dtype=float)
+            columns.append(encoded)
+        
+        return self.scaler.transform(np.column_stack(columns))
+    
     def _prepare_features(self, product_data: Dict[str, Any]) -> np.ndarray:
         """특성 벡터 준비"""
         # 기본 특성 (Decimal 타입을 float로 변환)
@@ -510,34 +648,60 @@ class SupplierProductAI:
             logger.error(f"분석 결과 저장 실패: {e}")
             self.conn.rollback()
     
+    def _save_analysis_results(self, results: List[Dict[str, Any]]):
+        """분석 결과 일괄 저장 (청크당 INSERT 1회)"""
+        if not results:
+            return
+        
+        try:
+            now = datetime.now()
+            with self.conn.cursor() as cursor:
+                execute_values(
+                    cursor,
+                    """
+                    INSERT INTO supplier_product_analysis 
+                    (product_id, analysis_type, analysis_result, created_at)
+                    VALUES %s
+                    ON CONFLICT (product_id, analysis_type) 
+                    DO UPDATE SET 
+                        analysis_result = EXCLUDED.analysis_result,
+                        updated_at = NOW()
+                    """,
+                    [
+                        (result['product_id'], 'price_demand', json.dumps(result), now)
+                        for result in results
+                    ],
+                    page_size=1000
+                )
+            
+            # 커밋은 호출자가 청크마다 수행
+            
+        except Exception as e:
+            logger.error(f"분석 결과 일괄 저장 실패: {e}")
+            raise
+    
     def _save_models(self):
         """모델 저장"""
-        import os
-        
-        # 디렉토리 생성
-        os.makedirs('models', exist_ok=True)
-        
-        # 모델 저장
+        # 모델 저장 (비압축 아티팩트 + 매니페스트)
         if self.price_model:
-            joblib.dump(self.price_model, self.model_path['price'])
+            save_artifact(self.price_model, self.model_path['price'])
         if self.demand_model:
-            joblib.dump(self.demand_model, self.model_path['demand'])
+            save_artifact(self.demand_model, self.model_path['demand'])
         
-        joblib.dump(self.scaler, self.model_path['scaler'])
-        joblib.dump(self.encoders, self.model_path['encoders'])
+        save_artifact(self.scaler, self.model_path['scaler'])
+        save_artifact(self.encoders, self.model_path['encoders'])
         
         logger.info("✅ 모델 저장 완료")
     
     def _load_models(self):
         """모델 로드"""
         try:
-            import os
-            
             if os.path.exists(self.model_path['price']):
-                self.price_model = joblib.load(self.model_path['price'])
-                self.demand_model = joblib.load(self.model_path['demand'])
-                self.scaler = joblib.load(self.model_path['scaler'])
-                self.encoders = joblib.load(self.model_path['encoders'])
+                # 스케일러 배열만 mmap 으로 공유됨 (트리 노드 배열은 sklearn 이 로드 시 복사)
+                self.price_model = load_artifact(self.model_path['price'])
+                self.demand_model = load_artifact(self.model_path['demand'])
+                self.scaler = load_artifact(self.model_path['scaler'])
+                self.encoders = load_artifact(self.model_path['encoders'])
                 logger.info("✅ 모델 로드 완료")
             else:
                 logger.warning("⚠️ 저장된 모델이 없습니다. 학습이 필요합니다.")
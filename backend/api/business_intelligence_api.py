@@ -23,6 +23,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from bi.profitability_analyzer import ProfitabilityAnalyzer
 from bi.competitor_monitor import CompetitorMonitor
 from bi.market_trend_analyzer import MarketTrendAnalyzer
+from services.realtime_snapshot import read_snapshot
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -61,11 +62,15 @@ class DemandPredictionRequest(BaseModel):
 profitability_analyzer = None
 competitor_monitor = None
 trend_analyzer = None
+redis_client = None
 
 @app.on_event("startup")
 async def startup_event():
     """서버 시작 시 초기화"""
-    global profitability_analyzer, competitor_monitor, trend_analyzer
+    global profitability_analyzer, competitor_monitor, trend_analyzer, redis_client
+    
+    import redis
+    redis_client = redis.Redis(host='localhost', port=6379, decode_responses=True)
     
     profitability_analyzer = ProfitabilityAnalyzer()
     competitor_monitor = CompetitorMonitor()
@@ -364,6 +369,14 @@ async def get_bi_dashboard_summary():
         logger.error(f"대시보드 요약 생성 실패: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/bi/dashboard/realtime")
+async def get_realtime_dashboard():
+    """실시간 매출/주문/재고 지표 (스냅샷 생성기가 발행한 값, DB 조회 없음)"""
+    snapshot = read_snapshot(redis_client) if redis_client else None
+    if snapshot is None:
+        raise HTTPException(status_code=503, detail="실시간 스냅샷이 아직 발행되지 않았습니다")
+    return snapshot
+
 # 백그라운드 태스크
 async def run_competitor_monitoring(
     product_ids: Optional[List[int]] = None,
@@ -422,10 +435,8 @@ async def run_competitor_monitoring(
         
         conn.close()
         
-        # 경쟁사 가격 수집
-        for product in products:
-            prices = await competitor_monitor.collect_competitor_prices(product)
-            competitor_monitor.save_competitor_prices(prices)
+        # 경쟁사 가격 수집 (동시 수집, 배치 단위 COPY 저장)
+        await competitor_monitor.collect_and_save(products)
         
         # 알림 생성
         alerts = competitor_monitor.detect_price_alerts()
@@ -1,14 +1,17 @@
 """
 모니터링 API 라우트
 """
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from typing import Optional
 from datetime import datetime, timedelta
 
-from ..monitoring.metrics_collector import get_metrics_collector
-from ..core.structured_logger import get_logger
+from monitoring.metrics_collector import get_metrics_collector
+from monitoring.prometheus_exporter import render_metrics
+from core import get_logger
 
 router = APIRouter(prefix="/api/monitoring", tags=["monitoring"])
+# Prometheus 스크레이프용 (표준 경로 /metrics)
+metrics_router = APIRouter(tags=["monitoring"])
 logger = get_logger(__name__)
 
 
@@ -197,4 +200,11 @@ async def stop_metrics_collection():
         return {"status": "success", "message": "Metrics collection stopped"}
     except Exception as e:
         logger.error(f"메트릭 수집 중지 실패: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(request: Request):
+    """Prometheus / OpenMetrics 노출 (사전 집계 상태, DB 조회 없음)"""
+    body, content_type = render_metrics(request.headers.get("accept", ""))
+    return Response(content=body, media_type=content_type)
@@ -4,14 +4,22 @@
 - 실시간 가격 추적
 - 가격 변동 알림
 - 경쟁력 분석
+
+대량 처리
+- 가격 저장은 COPY → 임시 스테이징 테이블 → 이력/최신가 테이블 반영 (배치당 왕복 몇 번)
+- competitor_latest_prices: (상품, 경쟁사) 별 최신 가격을 저장 시점에 함께 갱신
+  → 최신가 조회가 이력 테이블 DISTINCT ON 스캔 대신 기본키 조회
+- 가격 포지션은 전체 상품을 한 번의 집계 쿼리로 계산
 """
 
 import asyncio
 import aiohttp
+import csv
+import io
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 import psycopg2
-from psycopg2.extras import RealDictCursor, Json
+from psycopg2.extras import RealDictCursor, Json, execute_values
 import logging
 import json
 from dataclasses import dataclass
@@ -31,6 +39,57 @@ class PriceComparison:
     price_gap: float  # 시장 평균 대비 차이 (%)
     recommendation: str
 
+
+# COPY 로 적재하는 가격 컬럼 순서
+PRICE_COLUMNS = ('product_id', 'competitor_name', 'competitor_price', 'competitor_url',
+                 'shipping_fee', 'availability')
+
+
+def classify_price_position(our_price: float, market_average: float,
+                            min_price: float, max_price: float) -> Tuple[str, float, str]:
+    """
+    시장 가격 대비 우리 가격 포지션 판단
+
+    Args:
+        our_price: 우리 가격
+        market_average: 경쟁사 평균 (재고 있는 경쟁사 기준, 없으면 전체)
+        min_price / max_price: 평균 계산에 사용한 경쟁사 가격의 최소/최대
+
+    Returns:
+        (포지션, 시장 평균 대비 차이 %, 추천)
+    """
+    price_gap = ((our_price - market_average) / market_average) * 100 if market_average else 0.0
+    
+    if our_price <= min_price:
+        return 'lowest', price_gap, "최저가 유지 중. 마진 확인 필요"
+    if our_price < market_average * 0.95:
+        return 'below_average', price_gap, "경쟁력 있는 가격. 현 수준 유지 권장"
+    if abs(price_gap) <= 5:
+        return 'average', price_gap, "시장 평균 수준. 차별화 전략 검토"
+    if our_price < max_price:
+        return 'above_average', price_gap, "가격 인하 검토 또는 프리미엄 전략 강화"
+    return 'highest', price_gap, "긴급 가격 조정 필요. 경쟁력 상실 위험"
+
+
+def build_copy_buffer(prices: Iterable[Dict]) -> Tuple[io.StringIO, int]:
+    """
+    COPY FROM STDIN (CSV) 용 버퍼 생성
+
+    같은 배치 안의 (상품, 경쟁사) 중복은 마지막 값만 사용
+    (이력 테이블의 유니크 키와 최신가 upsert 가 한 배치에서 같은 키를 두 번 다루지 않도록)
+    """
+    latest = {}
+    for price in prices:
+        latest[(price['product_id'], price['competitor_name'])] = price
+    
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for price in latest.values():
+        writer.writerow(['' if price.get(column) is None else price[column] for column in PRICE_COLUMNS])
+    buffer.seek(0)
+    return buffer, len(latest)
+
+
 class CompetitorMonitor:
     """경쟁사 모니터링 클래스"""
     
@@ -95,10 +154,39 @@ class CompetitorMonitor:
                     UNIQUE(category, analysis_date)
                 );
                 
+                -- (상품, 경쟁사) 별 최신 가격 - save_competitor_prices 에서 함께 갱신
+                CREATE TABLE IF NOT EXISTS competitor_latest_prices (
+                    product_id INTEGER NOT NULL,
+                    competitor_name VARCHAR(100) NOT NULL,
+                    competitor_price DECIMAL(12, 2),
+                    competitor_url TEXT,
+                    shipping_fee DECIMAL(10, 2),
+                    availability VARCHAR(50),
+                    collected_at TIMESTAMP NOT NULL,
+                    PRIMARY KEY (product_id, competitor_name)
+                );
+                
                 CREATE INDEX IF NOT EXISTS idx_competitor_prices_product ON competitor_prices(product_id, collected_at DESC);
+                CREATE INDEX IF NOT EXISTS idx_competitor_latest_collected ON competitor_latest_prices(collected_at);
                 CREATE INDEX IF NOT EXISTS idx_price_alerts_created ON price_alerts(created_at DESC) WHERE acknowledged = FALSE;
                 CREATE INDEX IF NOT EXISTS idx_market_analysis_category ON market_analysis(category, analysis_date DESC);
             """)
+            
+            # 최신가 테이블이 비어 있으면 기존 이력에서 한 번 채움
+            cursor.execute("""
+                INSERT INTO competitor_latest_prices
+                    (product_id, competitor_name, competitor_price, competitor_url,
+                     shipping_fee, availability, collected_at)
+                SELECT DISTINCT ON (product_id, competitor_name)
+                    product_id, competitor_name, competitor_price, competitor_url,
+                    shipping_fee, availability, collected_at
+                FROM competitor_prices
+                WHERE product_id IS NOT NULL
+                  AND competitor_name IS NOT NULL
+                  AND collected_at IS NOT NULL
+                  AND NOT EXISTS (SELECT 1 FROM competitor_latest_prices)
+                ORDER BY product_id, competitor_name, collected_at DESC
+            """)
             self.conn.commit()
     
     async def collect_competitor_prices(self, product: Dict) -> List[Dict]:
@@ -129,95 +217,186 @@ class CompetitorMonitor:
         
         return competitor_prices
     
-    def save_competitor_prices(self, prices: List[Dict]):
-        """경쟁사 가격 저장"""
+    def save_competitor_prices(self, prices: List[Dict]) -> int:
+        """
+        경쟁사 가격 저장 (COPY 대량 적재)
         
-        with self.conn.cursor() as cursor:
-            for price in prices:
+        스테이징 테이블에 COPY 한 뒤 한 트랜잭션에서 이력 테이블과 최신가 테이블에 반영
+        
+        Returns:
+            적재한 가격 수
+        """
+        buffer, count = build_copy_buffer(prices)
+        if not count:
+            return 0
+        
+        try:
+            with self.conn.cursor() as cursor:
+                cursor.execute("""
+                    CREATE TEMP TABLE IF NOT EXISTS competitor_prices_stage (
+                        product_id INTEGER,
+                        competitor_name VARCHAR(100),
+                        competitor_price DECIMAL(12, 2),
+                        competitor_url TEXT,
+                        shipping_fee DECIMAL(10, 2),
+                        availability VARCHAR(50)
+                    ) ON COMMIT DELETE ROWS
+                """)
+                cursor.copy_expert(
+                    f"COPY competitor_prices_stage ({', '.join(PRICE_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                    buffer
+                )
+                
                 cursor.execute("""
                     INSERT INTO competitor_prices 
                     (product_id, competitor_name, competitor_price, competitor_url, 
                      shipping_fee, availability)
-                    VALUES (%s, %s, %s, %s, %s, %s)
+                    SELECT product_id, competitor_name, competitor_price, competitor_url,
+                           shipping_fee, availability
+                    FROM competitor_prices_stage
                     ON CONFLICT (product_id, competitor_name, collected_at) DO NOTHING
-                """, (
-                    price['product_id'],
-                    price['competitor_name'],
-                    price['competitor_price'],
-                    price['competitor_url'],
-                    price['shipping_fee'],
-                    price['availability']
-                ))
+                """)
+                
+                cursor.execute("""
+                    INSERT INTO competitor_latest_prices
+                    (product_id, competitor_name, competitor_price, competitor_url,
+                     shipping_fee, availability, collected_at)
+                    SELECT product_id, competitor_name, competitor_price, competitor_url,
+                           shipping_fee, availability, LOCALTIMESTAMP
+                    FROM competitor_prices_stage
+                    ON CONFLICT (product_id, competitor_name) DO UPDATE SET
+                        competitor_price = EXCLUDED.competitor_price,
+                        competitor_url = EXCLUDED.competitor_url,
+                        shipping_fee = EXCLUDED.shipping_fee,
+                        availability = EXCLUDED.availability,
+                        collected_at = EXCLUDED.collected_at
+                    WHERE competitor_latest_prices.collected_at <= EXCLUDED.collected_at
+                """)
             
             self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        
+        return count
+    
+    async def collect_and_save(self, products: List[Dict], batch_size: int = 1000,
+                               concurrency: int = 20) -> int:
+        """
+        여러 상품의 경쟁사 가격을 동시에 수집하고 batch_size 상품 단위로 묶어 저장
+        
+        Returns:
+            저장한 가격 수
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def collect(product: Dict) -> List[Dict]:
+            async with semaphore:
+                try:
+                    return await self.collect_competitor_prices(product)
+                except Exception as e:
+                    logger.warning(f"경쟁사 가격 수집 실패 (상품 {product.get('id')}): {e}")
+                    return []
+        
+        saved = 0
+        for start in range(0, len(products), batch_size):
+            batch = products[start:start + batch_size]
+            results = await asyncio.gather(*(collect(product) for product in batch))
+            saved += self.save_competitor_prices([price for prices in results for price in prices])
+        
+        logger.info(f"경쟁사 가격 저장 완료: {len(products)}개 상품, {saved}건")
+        return saved
     
     def analyze_price_position(self, product_id: int, our_price: float) -> PriceComparison:
         """가격 포지션 분석"""
+        return self.analyze_price_positions({product_id: our_price}).get(product_id)
+    
+    def analyze_price_positions(self, our_prices: Optional[Dict[int, float]] = None,
+                                max_age_hours: int = 24) -> Dict[int, PriceComparison]:
+        """
+        여러 상품의 가격 포지션을 한 번에 분석
         
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cursor:
-            # 최근 경쟁사 가격 조회
-            cursor.execute("""
-                SELECT DISTINCT ON (competitor_name)
-                    competitor_name,
-                    competitor_price,
-                    shipping_fee,
-                    availability
-                FROM competitor_prices
-                WHERE product_id = %s
-                AND collected_at > NOW() - INTERVAL '24 hours'
-                ORDER BY competitor_name, collected_at DESC
-            """, (product_id,))
-            
-            competitor_data = cursor.fetchall()
+        경쟁사 평균/최소/최대는 최신가 테이블에서 상품별로 한 번의 집계 쿼리로 계산
+        (재고 있는 경쟁사 기준, 재고 있는 경쟁사가 없으면 전체 경쟁사 기준)
         
-        if not competitor_data:
-            return None
+        Args:
+            our_prices: {상품 ID: 우리 가격} (None 이면 활성 상품 전체와 현재 판매가)
+            max_age_hours: 이보다 오래된 경쟁사 가격은 제외
         
-        # 경쟁사 가격 분석
-        competitor_prices = {}
-        available_prices = []
+        Returns:
+            {상품 ID: PriceComparison} (최근 경쟁사 가격이 없는 상품은 제외)
+        """
+        if our_prices is not None:
+            if not our_prices:
+                return {}
+            product_filter = "AND l.product_id = ANY(%(product_ids)s)"
+            our_price_sql = "NULL::NUMERIC"
+            join_sql = ""
+        else:
+            product_filter = ""
+            our_price_sql = "sp.price"
+            join_sql = "JOIN supplier_products sp ON sp.id = a.product_id AND sp.status = 'active'"
         
-        for comp in competitor_data:
-            total_price = float(comp['competitor_price']) + float(comp['shipping_fee'])
-            competitor_prices[comp['competitor_name']] = total_price
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(f"""
+                WITH latest AS (
+                    SELECT 
+                        l.product_id,
+                        l.competitor_name,
+                        l.competitor_price + COALESCE(l.shipping_fee, 0) as total_price,
+                        l.availability = 'in_stock' as in_stock
+                    FROM competitor_latest_prices l
+                    WHERE l.collected_at > NOW() - make_interval(hours => %(max_age_hours)s)
+                    {product_filter}
+                ),
+                agg AS (
+                    SELECT 
+                        product_id,
+                        jsonb_object_agg(competitor_name, total_price) as competitor_prices,
+                        BOOL_OR(in_stock) as any_in_stock,
+                        AVG(total_price) FILTER (WHERE in_stock) as avg_in_stock,
+                        MIN(total_price) FILTER (WHERE in_stock) as min_in_stock,
+                        MAX(total_price) FILTER (WHERE in_stock) as max_in_stock,
+                        AVG(total_price) as avg_all,
+                        MIN(total_price) as min_all,
+                        MAX(total_price) as max_all
+                    FROM latest
+                    GROUP BY product_id
+                )
+                SELECT 
+                    a.product_id,
+                    {our_price_sql} as our_price,
+                    a.competitor_prices,
+                    CASE WHEN a.any_in_stock THEN a.avg_in_stock ELSE a.avg_all END as market_average,
+                    CASE WHEN a.any_in_stock THEN a.min_in_stock ELSE a.min_all END as min_price,
+                    CASE WHEN a.any_in_stock THEN a.max_in_stock ELSE a.max_all END as max_price
+                FROM agg a
+                {join_sql}
+            """, {
+                'max_age_hours': max_age_hours,
+                'product_ids': list(our_prices) if our_prices is not None else None
+            })
             
-            if comp['availability'] == 'in_stock':
-                available_prices.append(total_price)
-        
-        if not available_prices:
-            available_prices = list(competitor_prices.values())
-        
-        # 시장 평균 계산
-        market_average = statistics.mean(available_prices)
-        
-        # 우리 가격 포지션 결정
-        price_gap = ((our_price - market_average) / market_average) * 100
-        
-        if our_price == min(available_prices + [our_price]):
-            position = 'lowest'
-            recommendation = "최저가 유지 중. 마진 확인 필요"
-        elif our_price < market_average - market_average * 0.05:
-            position = 'below_average'
-            recommendation = "경쟁력 있는 가격. 현 수준 유지 권장"
-        elif abs(price_gap) <= 5:
-            position = 'average'
-            recommendation = "시장 평균 수준. 차별화 전략 검토"
-        elif our_price < max(available_prices):
-            position = 'above_average'
-            recommendation = "가격 인하 검토 또는 프리미엄 전략 강화"
-        else:
-            position = 'highest'
-            recommendation = "긴급 가격 조정 필요. 경쟁력 상실 위험"
-        
-        return PriceComparison(
-            product_id=product_id,
-            our_price=our_price,
-            competitor_prices=competitor_prices,
-            market_average=market_average,
-            our_position=position,
-            price_gap=price_gap,
-            recommendation=recommendation
-        )
+            rows = cursor.fetchall()
+        
+        positions = {}
+        for row in rows:
+            our_price = float(our_prices[row['product_id']] if our_prices is not None else row['our_price'])
+            market_average = float(row['market_average'])
+            position, price_gap, recommendation = classify_price_position(
+                our_price, market_average, float(row['min_price']), float(row['max_price'])
+            )
+            positions[row['product_id']] = PriceComparison(
+                product_id=row['product_id'],
+                our_price=our_price,
+                competitor_prices={name: float(price) for name, price in row['competitor_prices'].items()},
+                market_average=market_average,
+                our_position=position,
+                price_gap=price_gap,
+                recommendation=recommendation
+            )
+        
+        return positions
     
     def detect_price_alerts(self) -> List[Dict]:
         """가격 알림 감지"""
@@ -233,14 +412,13 @@ class CompetitorMonitor:
                     WHERE status = 'active'
                 ),
                 recent_competitor_prices AS (
-                    SELECT DISTINCT ON (product_id, competitor_name)
+                    SELECT 
                         product_id,
                         competitor_name,
                         competitor_price + shipping_fee as total_price,
                         availability
-                    FROM competitor_prices
+                    FROM competitor_latest_prices
                     WHERE collected_at > NOW() - INTERVAL '6 hours'
-                    ORDER BY product_id, competitor_name, collected_at DESC
                 )
                 SELECT 
                     op.id,
@@ -273,42 +451,42 @@ class CompetitorMonitor:
                 }
                 
                 alerts.append(alert)
-                self._save_alert(alert)
             
-            # 가격 전쟁 감지
+            self._save_alerts(alerts)
+            
+            # 가격 전쟁 감지 (경쟁사 최신가의 편차 기준)
             cursor.execute("""
-                SELECT 
-                    product_id,
-                    COUNT(DISTINCT competitor_name) as competitors_count,
-                    MIN(competitor_price + shipping_fee) as min_price,
-                    MAX(competitor_price + shipping_fee) as max_price,
-                    AVG(competitor_price + shipping_fee) as avg_price,
-                    STDDEV(competitor_price + shipping_fee) as price_stddev
-                FROM competitor_prices
-                WHERE collected_at > NOW() - INTERVAL '24 hours'
-                GROUP BY product_id
-                HAVING STDDEV(competitor_price + shipping_fee) / AVG(competitor_price + shipping_fee) > 0.2
+                WITH price_stats AS (
+                    SELECT 
+                        product_id,
+                        COUNT(*) as competitors_count,
+                        MIN(competitor_price + shipping_fee) as min_price,
+                        MAX(competitor_price + shipping_fee) as max_price,
+                        AVG(competitor_price + shipping_fee) as avg_price,
+                        STDDEV(competitor_price + shipping_fee) as price_stddev
+                    FROM competitor_latest_prices
+                    WHERE collected_at > NOW() - INTERVAL '24 hours'
+                    GROUP BY product_id
+                    HAVING STDDEV(competitor_price + shipping_fee) / AVG(competitor_price + shipping_fee) > 0.2
+                )
+                SELECT ps.*, sp.product_name as name, sp.price
+                FROM price_stats ps
+                JOIN supplier_products sp ON sp.id = ps.product_id
             """)
             
             price_wars = cursor.fetchall()
             
             for war in price_wars:
                 if war['price_stddev'] and float(war['price_stddev']) > 0:
-                    cursor.execute("""
-                        SELECT product_name as name, price FROM supplier_products WHERE id = %s
-                    """, (war['product_id'],))
-                    
-                    product = cursor.fetchone()
-                    if product:
-                        alerts.append({
-                            'product_id': war['product_id'],
-                            'product_name': product['name'],
-                            'alert_type': 'price_war',
-                            'our_price': float(product['price']),
-                            'competitor_price': float(war['min_price']),
-                            'price_difference': float(war['max_price']) - float(war['min_price']),
-                            'recommendation': '가격 전쟁 진행 중. 신중한 대응 필요'
-                        })
+                    alerts.append({
+                        'product_id': war['product_id'],
+                        'product_name': war['name'],
+                        'alert_type': 'price_war',
+                        'our_price': float(war['price']),
+                        'competitor_price': float(war['min_price']),
+                        'price_difference': float(war['max_price']) - float(war['min_price']),
+                        'recommendation': '가격 전쟁 진행 중. 신중한 대응 필요'
+                    })
         
         return alerts
     
@@ -409,10 +587,10 @@ class CompetitorMonitor:
                         sp.price as our_price,
                         AVG(cp.competitor_price + cp.shipping_fee) as market_avg,
                         MIN(cp.competitor_price + cp.shipping_fee) as market_min,
-                        COUNT(DISTINCT cp.competitor_name) as competitor_count,
+                        COUNT(*) as competitor_count,
                         pai.demand_score
                     FROM supplier_products sp
-                    JOIN competitor_prices cp ON sp.id = cp.product_id
+                    JOIN competitor_latest_prices cp ON sp.id = cp.product_id
                     LEFT JOIN product_ai_insights pai ON sp.id = pai.product_id
                     WHERE sp.status = 'active'
                     AND cp.collected_at > NOW() - INTERVAL '24 hours'
@@ -489,22 +667,31 @@ class CompetitorMonitor:
     
     def _save_alert(self, alert: Dict):
         """가격 알림 저장"""
+        self._save_alerts([alert])
+    
+    def _save_alerts(self, alerts: List[Dict]):
+        """가격 알림 일괄 저장"""
+        if not alerts:
+            return
         
         with self.conn.cursor() as cursor:
-            cursor.execute("""
+            execute_values(cursor, """
                 INSERT INTO price_alerts 
                 (product_id, alert_type, our_price, competitor_price, 
                  competitor_name, price_difference, recommendation)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """, (
-                alert['product_id'],
-                alert['alert_type'],
-                alert['our_price'],
-                alert['competitor_price'],
-                alert.get('competitor_name', ''),
-                alert['price_difference'],
-                alert['recommendation']
-            ))
+                VALUES %s
+            """, [
+                (
+                    alert['product_id'],
+                    alert['alert_type'],
+                    alert['our_price'],
+                    alert['competitor_price'],
+                    alert.get('competitor_name', ''),
+                    alert['price_difference'],
+                    alert['recommendation']
+                )
+                for alert in alerts
+            ], page_size=1000)
             self.conn.commit()
     
     def _save_market_analysis(self, category: str, analysis: Dict):
@@ -574,24 +761,23 @@ class CompetitorMonitor:
         return {'margin_change': 0, 'revenue_impact': 0}
 
 
-async def monitor_competitors():
+async def monitor_competitors(limit: Optional[int] = None, batch_size: int = 1000):
     """경쟁사 모니터링 실행"""
     monitor = CompetitorMonitor()
     
     # 활성 상품 조회
     with monitor.conn.cursor(cursor_factory=RealDictCursor) as cursor:
         cursor.execute("""
-            SELECT id, name, price, category
+            SELECT id, product_name as name, price, category
             FROM supplier_products
             WHERE status = 'active'
-            LIMIT 100
-        """)
+            ORDER BY id
+            LIMIT %s
+        """, (limit,))
         products = cursor.fetchall()
     
-    # 경쟁사 가격 수집
-    for product in products:
-        prices = await monitor.collect_competitor_prices(product)
-        monitor.save_competitor_prices(prices)
+    # 경쟁사 가격 수집 (동시 수집, 배치 단위 COPY 저장)
+    await monitor.collect_and_save(products, batch_size=batch_size)
     
     # 가격 알림 확인
     alerts = monitor.detect_price_alerts()
@@ -20,6 +20,8 @@ from sklearn.decomposition import PCA
 import warnings
 warnings.filterwarnings('ignore')
 
+from database.rollup_manager import CATALOG_ROLLUP, rollup_is_fresh
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -118,10 +120,24 @@ class MarketTrendAnalyzer:
     def _analyze_category_trends(self) -> List[Dict]:
         """카테고리별 트렌드 분석"""
         
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cursor:
-            # 카테고리별 성장률 계산
-            cursor.execute("""
-                WITH category_stats AS (
+        with self.conn.cursor() as cursor:
+            use_rollup = rollup_is_fresh(cursor, CATALOG_ROLLUP,
+                                         datetime.now() - timedelta(days=90))
+        
+        if use_rollup:
+            # 일 단위 카탈로그 롤업을 주 단위로 합산
+            category_stats_sql = """
+                    SELECT 
+                        NULLIF(category, '') as category,
+                        DATE_TRUNC('week', bucket_date) as week,
+                        SUM(product_count) as product_count,
+                        SUM(price_sum) / NULLIF(SUM(price_count), 0) as avg_price
+                    FROM catalog_rollup_daily
+                    WHERE bucket_date >= (NOW() - INTERVAL '90 days')::DATE
+                    GROUP BY category, DATE_TRUNC('week', bucket_date)
+            """
+        else:
+            category_stats_sql = """
                     SELECT 
                         category,
                         DATE_TRUNC('week', collected_at) as week,
@@ -130,7 +146,12 @@ class MarketTrendAnalyzer:
                     FROM supplier_products
                     WHERE collected_at > NOW() - INTERVAL '90 days'
                     GROUP BY category, DATE_TRUNC('week', collected_at)
-                ),
+            """
+        
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            # 카테고리별 성장률 계산
+            cursor.execute(f"""
+                WITH category_stats AS ({category_stats_sql}),
                 growth_calc AS (
                     SELECT 
                         category,
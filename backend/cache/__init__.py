@@ -4,10 +4,15 @@ Redis 캐싱 시스템
 from .redis_client import RedisClient
 from .cache_decorator import cache, cache_invalidate
 from .cache_manager import CacheManager
+from .memory_cache import TTLCache, make_key, get_memory_cache, get_all_memory_cache_stats
 
 __all__ = [
     'RedisClient',
     'cache',
     'cache_invalidate',
-    'CacheManager'
+    'CacheManager',
+    'TTLCache',
+    'make_key',
+    'get_memory_cache',
+    'get_all_memory_cache_stats'
 ]
\ No newline at end of file
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+프로세스 내 메모리 캐시
+- 항목 수 / 메모리 상한이 있는 TTL + LRU 캐시
+- 히트/미스/제거 통계
+- 동일 키 동시 요청 병합 (request coalescing)
+- 저장/조회 시 값 복사 (호출자가 결과를 수정해도 캐시 항목은 그대로)
+"""
+import copy
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MemoryCacheStats:
+    """메모리 캐시 통계"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    coalesced: int = 0
+    load_errors: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return (self.hits / total * 100) if total > 0 else 0
+
+
+class _InFlight:
+    """진행 중인 로드 (같은 키를 기다리는 호출자들이 공유)"""
+    __slots__ = ('event', 'value', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """
+    값의 대략적인 메모리 크기 (바이트)
+
+    DataFrame/ndarray 는 자체 메모리 정보를 사용하고, dict/list 는
+    3단계 깊이까지만 재귀한다. 정확한 값이 아니라 상한 관리용 추정치다.
+    """
+    if hasattr(value, 'memory_usage') and callable(value.memory_usage):
+        try:
+            usage = value.memory_usage(deep=True)
+            return int(usage.sum()) if hasattr(usage, 'sum') else int(usage)
+        except TypeError:
+            pass
+    if hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+
+    size = sys.getsizeof(value)
+    if _depth >= 3:
+        return size
+
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size(item, _depth + 1)
+    return size
+
+
+def make_key(operation: str, **kwargs) -> Tuple:
+    """
+    캐시 키 생성
+
+    문자열 조합 대신 (operation, 정렬된 인자 튜플) 형태의 해시 가능한 키를 만든다.
+    """
+    return (operation, tuple(sorted(kwargs.items())))
+
+
+class TTLCache:
+    """
+    상한이 있는 TTL/LRU 메모리 캐시
+
+    Args:
+        name: 캐시 이름 (통계 표시용)
+        max_entries: 최대 항목 수
+        max_bytes: 최대 메모리 (추정치, None 이면 제한 없음)
+        default_ttl: 기본 TTL (초)
+        sizeof: 값 크기 추정 함수
+        copy_values: 저장/조회 시 값을 deepcopy (False 면 같은 객체를 공유하므로
+            호출자는 반환값을 수정하면 안 된다)
+
+    Examples:
+        cache = TTLCache('analytics', max_entries=512, max_bytes=64 * 1024 * 1024)
+        summary = cache.get_or_load(make_key('business_summary'),
+                                    load_summary, ttl=300)
+    """
+
+    def __init__(self, name: str = 'default', max_entries: int = 1024,
+                 max_bytes: Optional[int] = None, default_ttl: float = 300,
+                 sizeof: Callable[[Any], int] = estimate_size,
+                 copy_values: bool = True):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.copy_values = copy_values
+        self._sizeof = sizeof
+
+        # key -> (value, expires_at, size)
+        self._data: 'OrderedDict[Hashable, Tuple[Any, float, int]]' = OrderedDict()
+        self._in_flight: Dict[Hashable, _InFlight] = {}
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+        self.stats = MemoryCacheStats()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and entry[1] > time.monotonic()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """캐시 조회 (만료 항목은 즉시 제거)"""
+        with self._lock:
+            value = self._get_locked(key, _MISSING)
+        return default if value is _MISSING else self._copy(value)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """캐시 설정"""
+        ttl = self.default_ttl if ttl is None else ttl
+        value = self._copy(value)
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+
+        with self._lock:
+            if self.max_bytes is not None and size > self.max_bytes:
+                # 단일 항목이 상한보다 크면 캐싱하지 않음
+                self._remove_locked(key)
+                return
+
+            self._remove_locked(key)
+            self._data[key] = (value, time.monotonic() + ttl, size)
+            self._total_bytes += size
+            self._evict_locked()
+
+    def delete(self, key: Hashable) -> bool:
+        """항목 삭제"""
+        with self._lock:
+            return self._remove_locked(key)
+
+    def clear(self):
+        """전체 삭제"""
+        with self._lock:
+            self._data.clear()
+            self._total_bytes = 0
+
+    def purge_expired(self) -> int:
+        """만료된 항목 일괄 제거"""
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, (_, expires_at, _) in self._data.items()
+                       if expires_at <= now]
+            for key in expired:
+                self._remove_locked(key)
+            self.stats.expirations += len(expired)
+        return len(expired)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any],
+                    ttl: Optional[float] = None,
+                    cache_if: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        캐시 조회 후 없으면 loader 실행
+
+        같은 키에 대한 동시 호출은 하나의 loader 실행 결과를 공유한다
+        (thundering herd 방지). loader 예외는 기다리던 호출자 모두에게 전달된다.
+
+        Args:
+            key: 캐시 키
+            loader: 데이터 로더 함수
+            ttl: 캐시 TTL (None 이면 default_ttl)
+            cache_if: 결과 캐싱 조건 함수 (기본: None 이 아니면 캐싱)
+        """
+        with self._lock:
+            value = self._get_locked(key, _MISSING)
+            if value is _MISSING:
+                pending = self._in_flight.get(key)
+                if pending is None:
+                    pending = _InFlight()
+                    self._in_flight[key] = pending
+                    owner = True
+                else:
+                    self.stats.coalesced += 1
+                    owner = False
+
+        if value is not _MISSING:
+            return self._copy(value)
+
+        if not owner:
+            pending.event.wait()
+            if pending.error is not None:
+                raise pending.error
+            return self._copy(pending.value)
+
+        try:
+            value = loader()
+            pending.value = value
+            should_cache = cache_if(value) if cache_if else value is not None
+            if should_cache:
+                self.set(key, value, ttl)
+            return value
+        except Exception as e:
+            pending.error = e
+            with self._lock:
+                self.stats.load_errors += 1
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            pending.event.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계 조회"""
+        with self._lock:
+            stats = asdict(self.stats)
+            stats.update({
+                'name': self.name,
+                'hit_rate': round(self.stats.hit_rate, 2),
+                'entries': len(self._data),
+                'max_entries': self.max_entries,
+                'memory_bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'in_flight': len(self._in_flight)
+            })
+        return stats
+
+    def _copy(self, value: Any) -> Any:
+        return copy.deepcopy(value) if self.copy_values else value
+
+    # 내부 메서드 (self._lock 보유 상태에서 호출)
+    def _get_locked(self, key: Hashable, default: Any) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return default
+
+        value, expires_at, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove_locked(key)
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def _remove_locked(self, key: Hashable) -> bool:
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return False
+        self._total_bytes -= entry[2]
+        return True
+
+    def _evict_locked(self):
+        while self._data and (
+            len(self._data) > self.max_entries or
+            (self.max_bytes is not None and self._total_bytes > self.max_bytes)
+        ):
+            _, (_, _, size) = self._data.popitem(last=False)
+            self._total_bytes -= size
+            self.stats.evictions += 1
+
+
+_MISSING = object()
+
+# 이름별 공유 캐시 레지스트리
+_caches: Dict[str, TTLCache] = {}
+_registry_lock = threading.Lock()
+
+
+def get_memory_cache(name: str, **kwargs) -> TTLCache:
+    """
+    이름별 공유 메모리 캐시 조회 (없으면 생성)
+
+    같은 프로세스의 여러 엔진 인스턴스가 하나의 캐시와 상한을 공유한다.
+    kwargs 는 최초 생성 시에만 적용된다.
+    """
+    with _registry_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = TTLCache(name, **kwargs)
+            _caches[name] = cache
+        return cache
+
+
+def get_all_memory_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """등록된 모든 메모리 캐시 통계"""
+    with _registry_lock:
+        caches = list(_caches.values())
+    return {cache.name: cache.get_stats() for cache in caches}
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+웹소켓 브로드캐스트 허브
+- 메시지는 토픽당 한 번만 직렬화하고, 토픽 → 구독자 인덱스로 대상만 골라 큐에 넣음
+- 연결마다 크기 제한 큐 + 전용 전송 태스크 → 느린 클라이언트가 다른 클라이언트를 지연시키지 않음
+- 큐가 가득 차면 가장 오래된 메시지를 버림, 스냅샷 토픽(메트릭)은 최신 값만 유지 (coalesce)
+- send_timeout 안에 전송되지 않는 연결은 끊긴 것으로 보고 정리
+- 전송 함수(send)만 받으므로 FastAPI WebSocket(send_text) / websockets(send) 모두 사용 가능
+"""
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+SendFunc = Callable[[str], Awaitable[Any]]
+
+
+def encode_message(message: Any) -> str:
+    """브로드캐스트 메시지 직렬화 (Decimal/datetime 은 문자열로)"""
+    return json.dumps(message, ensure_ascii=False, separators=(',', ':'), default=str)
+
+
+class Subscriber:
+    """연결 하나의 전송 큐"""
+
+    __slots__ = ('key', 'send', 'topics', 'max_queue', '_queue', '_latest',
+                 '_ready', '_task', 'sent', 'dropped', 'coalesced')
+
+    def __init__(self, key: Hashable, send: SendFunc, max_queue: int):
+        self.key = key
+        self.send = send
+        self.topics: Set[str] = set()
+        self.max_queue = max_queue
+        # (topic, payload) - coalesce 항목은 payload 대신 None, 실제 값은 _latest 에 보관
+        self._queue: deque = deque()
+        self._latest: Dict[str, str] = {}
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def offer(self, topic: Optional[str], payload: str, coalesce: bool = False):
+        """메시지 적재 (블로킹 없음)"""
+        if coalesce and topic is not None:
+            if topic in self._latest:
+                # 아직 전송 전인 스냅샷 → 값만 교체 (큐 위치 유지)
+                self._latest[topic] = payload
+                self.coalesced += 1
+                return
+            self._latest[topic] = payload
+            entry = (topic, None)
+        else:
+            entry = (topic, payload)
+
+        if len(self._queue) >= self.max_queue:
+            old_topic, old_payload = self._queue.popleft()
+            if old_payload is None:
+                self._latest.pop(old_topic, None)
+            self.dropped += 1
+
+        self._queue.append(entry)
+        self._ready.set()
+
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def _next_payload(self) -> str:
+        topic, payload = self._queue.popleft()
+        if payload is None:
+            payload = self._latest.pop(topic)
+        return payload
+
+
+class BroadcastHub:
+    """
+    토픽 기반 웹소켓 팬아웃
+
+    Examples:
+        hub = BroadcastHub(coalesce_topics={'system', 'api'})
+        hub.register(websocket, websocket.send_text)
+        hub.subscribe(websocket, {'system'})
+        hub.publish('system', {'type': 'metrics_update', 'data': {...}})
+    """
+
+    def __init__(self, max_queue: int = 100, send_timeout: float = 10.0,
+                 coalesce_topics: Optional[Iterable[str]] = None,
+                 on_disconnect: Optional[Callable[[Hashable], Any]] = None):
+        """
+        Args:
+            max_queue: 연결별 최대 대기 메시지 수
+            send_timeout: 메시지 1건 전송 제한 시간 (초과 시 연결 정리)
+            coalesce_topics: 최신 값만 의미 있는 스냅샷 토픽 (대기 중인 이전 값을 교체)
+            on_disconnect: 전송 실패로 연결을 정리할 때 호출할 콜백 (key 전달)
+        """
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self.coalesce_topics = set(coalesce_topics or ())
+        self.on_disconnect = on_disconnect
+        self._subscribers: Dict[Hashable, Subscriber] = {}
+        self._topic_index: Dict[str, Set[Subscriber]] = {}
+        self.stats = {'published': 0, 'delivered': 0, 'send_failures': 0}
+
+    # -- 연결 관리 --------------------------------------------------------
+
+    def register(self, key: Hashable, send: SendFunc,
+                 topics: Optional[Iterable[str]] = None) -> Subscriber:
+        """연결 등록 및 전송 태스크 시작 (이벤트 루프 안에서 호출)"""
+        self.unregister(key)
+        subscriber = Subscriber(key, send, self.max_queue)
+        self._subscribers[key] = subscriber
+        subscriber._task = asyncio.get_running_loop().create_task(self._drain(subscriber))
+        if topics:
+            self.subscribe(key, topics)
+        return subscriber
+
+    def unregister(self, key: Hashable) -> bool:
+        """연결 해제 (대기 중인 메시지는 버림)"""
+        subscriber = self._subscribers.pop(key, None)
+        if subscriber is None:
+            return False
+        for topic in subscriber.topics:
+            self._remove_from_index(topic, subscriber)
+        subscriber.topics = set()
+        if subscriber._task is not None and subscriber._task is not asyncio.current_task():
+            subscriber._task.cancel()
+        return True
+
+    def subscribe(self, key: Hashable, topics: Iterable[str]):
+        subscriber = self._subscribers.get(key)
+        if subscriber is None:
+            return
+        for topic in topics:
+            subscriber.topics.add(topic)
+            self._topic_index.setdefault(topic, set()).add(subscriber)
+
+    def unsubscribe(self, key: Hashable, topics: Iterable[str]):
+        subscriber = self._subscribers.get(key)
+        if subscriber is None:
+            return
+        for topic in topics:
+            if topic in subscriber.topics:
+                subscriber.topics.discard(topic)
+                self._remove_from_index(topic, subscriber)
+
+    def set_topics(self, key: Hashable, topics: Iterable[str]):
+        """구독 토픽 교체"""
+        subscriber = self._subscribers.get(key)
+        if subscriber is None:
+            return
+        topics = set(topics)
+        self.unsubscribe(key, subscriber.topics - topics)
+        self.subscribe(key, topics - subscriber.topics)
+
+    def _remove_from_index(self, topic: str, subscriber: Subscriber):
+        subscribers = self._topic_index.get(topic)
+        if subscribers is not None:
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._topic_index[topic]
+
+    # -- 전송 -------------------------------------------------------------
+
+    def publish(self, topic: Optional[str], message: Any,
+                coalesce: Optional[bool] = None) -> int:
+        """
+        토픽 구독자에게 메시지 발행 (topic 이 None 이면 전체 연결)
+
+        Returns:
+            큐에 넣은 연결 수
+        """
+        targets = self._subscribers.values() if topic is None else self._topic_index.get(topic, ())
+        if not targets:
+            return 0
+
+        payload = message if isinstance(message, str) else encode_message(message)
+        if coalesce is None:
+            coalesce = topic in self.coalesce_topics
+
+        count = 0
+        for subscriber in targets:
+            subscriber.offer(topic, payload, coalesce)
+            count += 1
+        self.stats['published'] += 1
+        return count
+
+    def send_to(self, key: Hashable, message: Any) -> bool:
+        """개별 연결에 메시지 전송 (브로드캐스트와 같은 큐를 사용해 순서 보장)"""
+        subscriber = self._subscribers.get(key)
+        if subscriber is None:
+            return False
+        payload = message if isinstance(message, str) else encode_message(message)
+        subscriber.offer(None, payload)
+        return True
+
+    async def _drain(self, subscriber: Subscriber):
+        """연결 전용 전송 루프"""
+        try:
+            while True:
+                await subscriber._ready.wait()
+                subscriber._ready.clear()
+                while subscriber._queue:
+                    payload = subscriber._next_payload()
+                    await asyncio.wait_for(subscriber.send(payload), self.send_timeout)
+                    subscriber.sent += 1
+                    self.stats['delivered'] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.stats['send_failures'] += 1
+            logger.warning(f"웹소켓 전송 실패, 연결 정리: {type(e).__name__}: {e}")
+            self.unregister(subscriber.key)
+            if self.on_disconnect is not None:
+                try:
+                    self.on_disconnect(subscriber.key)
+                except Exception as callback_error:
+                    logger.error(f"연결 정리 콜백 실패: {callback_error}")
+
+    # -- 조회 -------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._subscribers
+
+    def keys(self):
+        return self._subscribers.keys()
+
+    def subscriber_count(self, topic: Optional[str] = None) -> int:
+        if topic is None:
+            return len(self._subscribers)
+        return len(self._topic_index.get(topic, ()))
+
+    def get_topics(self, key: Hashable) -> Set[str]:
+        subscriber = self._subscribers.get(key)
+        return set(subscriber.topics) if subscriber else set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        subscribers = list(self._subscribers.values())
+        return {
+            **self.stats,
+            'connections': len(subscribers),
+            'topics': {topic: len(subs) for topic, subs in self._topic_index.items()},
+            'pending': sum(s.pending() for s in subscribers),
+            'dropped': sum(s.dropped for s in subscribers),
+            'coalesced': sum(s.coalesced for s in subscribers),
+        }
+
+    async def close(self):
+        """모든 전송 태스크 종료"""
+        tasks = [s._task for s in self._subscribers.values() if s._task is not None]
+        for key in list(self._subscribers):
+            self.unregister(key)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -11,6 +11,8 @@ import time
 import logging
 from datetime import datetime
 
+from .rate_control import CircuitBreaker as _BaseCircuitBreaker
+
 logger = logging.getLogger(__name__)
 
 
@@ -180,80 +182,23 @@ def retry_on_exception(
     return decorator
 
 
-class CircuitBreaker:
-    """서킷 브레이커 패턴 구현"""
+class CircuitBreaker(_BaseCircuitBreaker):
+    """서킷 브레이커 (core.rate_control 공용 구현 - 열림 상태에서 503 APIError 발생)"""
     def __init__(
         self,
         failure_threshold: int = 5,
         recovery_timeout: int = 60,
         expected_exception: Type[Exception] = Exception
     ):
-        self.failure_threshold = failure_threshold
-        self.recovery_timeout = recovery_timeout
-        self.expected_exception = expected_exception
-        self.failure_count = 0
-        self.last_failure_time = None
-        self.state = "closed"  # closed, open, half-open
-    
-    def __call__(self, func: Callable) -> Callable:
-        @functools.wraps(func)
-        async def async_wrapper(*args, **kwargs):
-            if self.state == "open":
-                if self._should_attempt_reset():
-                    self.state = "half-open"
-                else:
-                    raise APIError(
-                        "Service temporarily unavailable",
-                        status_code=503,
-                        error_code="CIRCUIT_BREAKER_OPEN"
-                    )
-            
-            try:
-                result = await func(*args, **kwargs)
-                self._on_success()
-                return result
-            except self.expected_exception as e:
-                self._on_failure()
-                raise
-        
-        @functools.wraps(func)
-        def sync_wrapper(*args, **kwargs):
-            if self.state == "open":
-                if self._should_attempt_reset():
-                    self.state = "half-open"
-                else:
-                    raise APIError(
-                        "Service temporarily unavailable",
-                        status_code=503,
-                        error_code="CIRCUIT_BREAKER_OPEN"
-                    )
-            
-            try:
-                result = func(*args, **kwargs)
-                self._on_success()
-                return result
-            except self.expected_exception as e:
-                self._on_failure()
-                raise
-        
-        if asyncio.iscoroutinefunction(func):
-            return async_wrapper
-        else:
-            return sync_wrapper
-    
-    def _should_attempt_reset(self) -> bool:
-        return (
-            self.last_failure_time and
-            time.time() - self.last_failure_time >= self.recovery_timeout
+        super().__init__(
+            failure_threshold=failure_threshold,
+            recovery_timeout=recovery_timeout,
+            expected_exception=expected_exception
         )
     
-    def _on_success(self):
-        self.failure_count = 0
-        self.state = "closed"
-    
-    def _on_failure(self):
-        self.failure_count += 1
-        self.last_failure_time = time.time()
-        if self.failure_count >= self.failure_threshold:
-            self.state = "open"
-            logger.warning(f"Circuit breaker opened after {self.failure_count} failures")
\ No newline at end of file
+    def _open_error(self) -> Exception:
+        return APIError(
+            "Service temporarily unavailable",
+            status_code=503,
+            error_code="CIRCUIT_BREAKER_OPEN"
+        )
\ No newline at end of file
@@ -5,13 +5,19 @@ import logging
 import logging.handlers
 import json
 import os
+import queue
 import sys
+import threading
+import time
 from datetime import datetime
 from typing import Dict, Any, Optional
 from pathlib import Path
 import traceback
 from functools import wraps
 
+# DatabaseLogHandler 기록 스레드 종료 신호
+_STOP = object()
+
 class JSONFormatter(logging.Formatter):
     """JSON 형식의 로그 포맷터"""
     
@@ -50,20 +56,68 @@ class JSONFormatter(logging.Formatter):
 
 
 class DatabaseLogHandler(logging.Handler):
-    """데이터베이스 로그 핸들러"""
+    """
+    데이터베이스 로그 핸들러 (큐 + 백그라운드 배치 기록)
+
+    emit() 은 레코드를 행 튜플로 변환해 제한된 크기의 큐에 넣기만 하고, 별도 스레드가
+    batch_size 건 또는 flush_interval 초마다 다중 행 INSERT 한 번으로 저장한다.
+    큐가 sample_threshold 비율 이상 차면 ERROR 미만 레코드는 sample_rate 비율로만 받고,
+    가득 차면 버린다 (ERROR 이상은 block_timeout 초까지 대기). 버린 건수는 다음 배치에
+    요약 행으로 기록한다. close() (logging.shutdown 포함) 시 남은 레코드를 모두 기록한다.
+    """
     
-    def __init__(self, db_config: Dict[str, Any]):
+    _RESERVED_ATTRS = {
+        'name', 'msg', 'args', 'created', 'filename', 'funcName', 'levelname', 'levelno',
+        'lineno', 'module', 'exc_info', 'exc_text', 'stack_info', 'pathname', 'process',
+        'processName', 'thread', 'threadName', 'getMessage'
+    }
+    _EXTRA_COLUMNS = ('user_id', 'market_code', 'request_id', 'execution_time')
+    
+    def __init__(self, db_config: Dict[str, Any],
+                 batch_size: int = 200,
+                 flush_interval: float = 1.0,
+                 max_queue_size: int = 10000,
+                 sample_threshold: float = 0.8,
+                 sample_rate: float = 0.1,
+                 block_timeout: float = 0.05):
+        """
+        Args:
+            db_config: psycopg2.connect 인자
+            batch_size: 한 번에 INSERT 할 최대 레코드 수
+            flush_interval: 배치가 차지 않아도 기록하는 주기 (초)
+            max_queue_size: 대기 레코드 최대 수 (메모리 상한)
+            sample_threshold: 샘플링을 시작하는 큐 사용률
+            sample_rate: 샘플링 중 ERROR 미만 레코드 수용 비율
+            block_timeout: 큐가 가득 찼을 때 ERROR 이상 레코드 대기 시간 (초)
+        """
         super().__init__()
         self.db_config = db_config
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sample_threshold = sample_threshold
+        self.sample_rate = sample_rate
+        self.block_timeout = block_timeout
+        
         self._connection = None
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._dropped = 0
+        self._sample_counter = 0
+        self._stats_lock = threading.Lock()
+        self._closed = False
+        self.stats = {'queued': 0, 'written': 0, 'dropped': 0, 'failed_batches': 0}
+        
         self._init_table()
+        self._writer = threading.Thread(target=self._writer_loop, name='db-log-writer', daemon=True)
+        self._writer.start()
+    
+    def _connect(self):
+        import psycopg2
+        return psycopg2.connect(**self.db_config)
     
     def _init_table(self):
         """로그 테이블 초기화"""
-        import psycopg2
-        
         try:
-            conn = psycopg2.connect(**self.db_config)
+            conn = self._connect()
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -99,67 +153,216 @@ class DatabaseLogHandler(logging.Handler):
         except Exception as e:
             print(f"로그 테이블 초기화 실패: {e}")
     
+    def _record_to_row(self, record: logging.LogRecord) -> tuple:
+        """레코드 → INSERT 행 (호출 스레드에서 메시지/예외를 확정)"""
+        # 메타데이터 수집
+        metadata = {
+            key: value for key, value in record.__dict__.items()
+            if key not in self._RESERVED_ATTRS
+        }
+        
+        # 예외 정보 처리
+        exception_type = None
+        exception_message = None
+        traceback_text = None
+        
+        if record.exc_info:
+            exception_type = record.exc_info[0].__name__
+            exception_message = str(record.exc_info[1])
+            traceback_text = ''.join(traceback.format_exception(*record.exc_info))
+        
+        return (
+            datetime.fromtimestamp(record.created),
+            record.levelname,
+            record.name,
+            record.getMessage(),
+            record.module,
+            record.funcName,
+            record.lineno,
+            *(getattr(record, column, None) for column in self._EXTRA_COLUMNS),
+            exception_type,
+            exception_message,
+            traceback_text,
+            json.dumps(metadata, ensure_ascii=False, default=str) if metadata else None
+        )
+    
+    def _count_drop(self):
+        with self._stats_lock:
+            self._dropped += 1
+            self.stats['dropped'] += 1
+    
     def emit(self, record: logging.LogRecord):
-        """로그 레코드를 데이터베이스에 저장"""
-        import psycopg2
-        from psycopg2.extras import Json
+        """로그 레코드를 기록 큐에 추가 (DB 왕복 없음)"""
+        if self._closed:
+            return
         
         try:
-            if not self._connection or self._connection.closed:
-                self._connection = psycopg2.connect(**self.db_config)
+            important = record.levelno >= logging.ERROR
             
-            cursor = self._connection.cursor()
+            # 과부하 시 ERROR 미만 레코드 샘플링
+            maxsize = self._queue.maxsize
+            if not important and maxsize and self._queue.qsize() >= maxsize * self.sample_threshold:
+                with self._stats_lock:
+                    self._sample_counter += 1
+                    keep = self._sample_counter * self.sample_rate >= 1
+                    if keep:
+                        self._sample_counter = 0
+                if not keep:
+                    self._count_drop()
+                    return
             
-            # 메타데이터 수집
-            metadata = {}
-            for key, value in record.__dict__.items():
-                if key not in ['name', 'msg', 'args', 'created', 'filename', 
-                               'funcName', 'levelname', 'levelno', 'lineno', 
-                               'module', 'exc_info', 'exc_text', 'stack_info',
-                               'pathname', 'process', 'processName', 'thread',
-                               'threadName', 'getMessage']:
-                    metadata[key] = value
+            row = self._record_to_row(record)
+            try:
+                if important:
+                    self._queue.put(row, timeout=self.block_timeout)
+                else:
+                    self._queue.put_nowait(row)
+                with self._stats_lock:
+                    self.stats['queued'] += 1
+            except queue.Full:
+                self._count_drop()
+                
+        except Exception:
+            self.handleError(record)
+    
+    def _drain_dropped_row(self) -> Optional[tuple]:
+        """버린 레코드 요약 행"""
+        with self._stats_lock:
+            dropped, self._dropped = self._dropped, 0
+        if not dropped:
+            return None
+        return (
+            datetime.now(), 'WARNING', __name__, f"로그 큐 과부하로 {dropped}건 버림",
+            'logger', '_writer_loop', 0, None, None, None, None, None, None, None,
+            json.dumps({'dropped': dropped})
+        )
+    
+    def _writer_loop(self):
+        """백그라운드 기록 스레드"""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        stopping = False
+        
+        while not stopping:
+            timeout = max(0.0, deadline - time.monotonic())
+            item = None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                pass
             
-            # 예외 정보 처리
-            exception_type = None
-            exception_message = None
-            traceback_text = None
+            flush_event = None
+            if item is _STOP:
+                stopping = True
+            elif isinstance(item, threading.Event):
+                flush_event = item
+            elif item is not None:
+                batch.append(item)
+                # 이미 쌓인 레코드는 대기 없이 배치로 가져옴
+                while len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    if isinstance(item, threading.Event):
+                        flush_event = item
+                        break
+                    batch.append(item)
             
-            if record.exc_info:
-                exception_type = record.exc_info[0].__name__
-                exception_message = str(record.exc_info[1])
-                traceback_text = ''.join(traceback.format_exception(*record.exc_info))
+            if stopping or flush_event or len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                dropped_row = self._drain_dropped_row()
+                if dropped_row:
+                    batch.append(dropped_row)
+                if batch:
+                    self._write_batch(batch)
+                    batch = []
+                deadline = time.monotonic() + self.flush_interval
             
-            cursor.execute("""
+            if flush_event:
+                flush_event.set()
+        
+        # 종료: 큐에 남은 레코드 기록
+        remaining = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is not _STOP:
+                remaining.append(item)
+        for start in range(0, len(remaining), self.batch_size):
+            self._write_batch(remaining[start:start + self.batch_size])
+        
+        if self._connection is not None and not self._connection.closed:
+            self._connection.close()
+    
+    def _write_batch(self, rows: list):
+        """배치 기록 (실패 시 재연결 후 1회 재시도, 그래도 실패하면 버림)"""
+        for attempt in range(2):
+            try:
+                if not self._connection or self._connection.closed:
+                    self._connection = self._connect()
+                self._write_rows(rows)
+                with self._stats_lock:
+                    self.stats['written'] += len(rows)
+                return
+            except Exception as e:
+                try:
+                    if self._connection is not None:
+                        self._connection.rollback()
+                except Exception:
+                    self._connection = None
+                if attempt == 1:
+                    with self._stats_lock:
+                        self.stats['failed_batches'] += 1
+                    # 로깅 재귀를 피하기 위해 stderr 로만 출력
+                    print(f"로그 배치 저장 실패 ({len(rows)}건): {e}", file=sys.stderr)
+    
+    def _write_rows(self, rows: list):
+        """다중 행 INSERT"""
+        from psycopg2.extras import execute_values
+        
+        with self._connection.cursor() as cursor:
+            execute_values(cursor, """
                 INSERT INTO system_logs (
                     timestamp, level, logger, message, module, function, line,
                     user_id, market_code, request_id, execution_time,
                     exception_type, exception_message, traceback, metadata
-                ) VALUES (
-                    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                )
-            """, (
-                datetime.fromtimestamp(record.created),
-                record.levelname,
-                record.name,
-                record.getMessage(),
-                record.module,
-                record.funcName,
-                record.lineno,
-                getattr(record, 'user_id', None),
-                getattr(record, 'market_code', None),
-                getattr(record, 'request_id', None),
-                getattr(record, 'execution_time', None),
-                exception_type,
-                exception_message,
-                traceback_text,
-                Json(metadata) if metadata else None
-            ))
-            
-            self._connection.commit()
-            
-        except Exception as e:
-            self.handleError(record)
+                ) VALUES %s
+            """, rows, template="(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s::jsonb)",
+                page_size=self.batch_size)
+        self._connection.commit()
+    
+    def flush(self, timeout: float = 5.0):
+        """큐에 쌓인 레코드를 모두 기록할 때까지 대기"""
+        if self._closed or not self._writer.is_alive():
+            return
+        event = threading.Event()
+        try:
+            self._queue.put(event, timeout=timeout)
+        except queue.Full:
+            return
+        event.wait(timeout)
+    
+    def close(self, timeout: float = 10.0):
+        """기록 스레드 종료 (남은 레코드 기록 후)"""
+        if not self._closed:
+            self._closed = True
+            if self._writer.is_alive():
+                while True:
+                    try:
+                        self._queue.put(_STOP, timeout=0.1)
+                        break
+                    except queue.Full:
+                        if not self._writer.is_alive():
+                            break
+                self._writer.join(timeout)
+        super().close()
 
 
 class LoggerManager:
@@ -241,9 +444,15 @@ class LoggerManager:
         
         return self._loggers[name]
     
-    def add_database_handler(self, db_config: Dict[str, Any]):
-        """데이터베이스 핸들러 추가"""
-        db_handler = DatabaseLogHandler(db_config)
+    def add_database_handler(self, db_config: Dict[str, Any], **handler_options):
+        """
+        데이터베이스 핸들러 추가
+        
+        Args:
+            db_config: psycopg2.connect 인자
+            **handler_options: DatabaseLogHandler 배치/큐 설정 (batch_size, max_queue_size 등)
+        """
+        db_handler = DatabaseLogHandler(db_config, **handler_options)
         db_handler.setLevel(logging.WARNING)  # WARNING 이상만 DB에 저장
         db_handler.setFormatter(JSONFormatter())
         
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+공급사 / 마켓 API 공용 율 제한기 및 서킷 브레이커
+- O(1) 토큰 버킷 (동기/비동기 공용, 동시 호출 안전)
+- AIMD 적응: 성공 시 율을 조금씩 올리고 429/5xx 응답 시 절반으로 낮춤
+- Redis 저장소 사용 시 여러 프로세스가 같은 버킷 상태(토큰/율)를 공유
+- 서킷 브레이커: closed → open → half-open (시험 호출 수 제한)
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+
+def is_throttle_status(status_code: Optional[int]) -> bool:
+    """율 제한/과부하 응답 여부 (429, 5xx)"""
+    return status_code is not None and (status_code == 429 or status_code >= 500)
+
+
+class _LocalBucketStore:
+    """프로세스 내 버킷 상태 (스레드/코루틴 공용 락)"""
+
+    def __init__(self, capacity: float, rate: float):
+        self._tokens = capacity
+        self._rate = rate
+        self._updated = time.monotonic()
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    def apply(self, op: str, amount: float, capacity: float, min_rate: float,
+              max_rate: float, cooldown: float) -> Tuple[float, float, float]:
+        """버킷 연산 실행 후 (결과, 현재 율, 현재 토큰) 반환"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+
+            result = 0.0
+            if op == 'reserve':
+                # 토큰이 모자라면 음수(대기 예약)로 두고 대기 시간을 돌려준다
+                self._tokens -= amount
+                if self._tokens < 0:
+                    result = -self._tokens / self._rate
+            elif op == 'try':
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    result = 1.0
+            elif op == 'increase':
+                self._rate = min(max_rate, self._rate + amount)
+            elif op == 'decrease':
+                if now - self._last_decrease >= cooldown:
+                    self._rate = max(min_rate, self._rate * amount)
+                    self._tokens = min(self._tokens, 0.0)
+                    self._last_decrease = now
+
+            return result, self._rate, self._tokens
+
+
+class RedisBucketStore:
+    """
+    Redis 공유 버킷 상태
+
+    Lua 스크립트로 보충/소비/율 조정을 원자적으로 처리하고 Redis 서버 시각을 사용하므로
+    여러 프로세스/서버가 같은 API 허용량을 나눠 쓴다. Redis 오류 시 로컬 상태로 대체한다.
+    """
+
+    _SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local op = ARGV[3]
+    local amount = tonumber(ARGV[4])
+    local min_rate = tonumber(ARGV[5])
+    local max_rate = tonumber(ARGV[6])
+    local cooldown = tonumber(ARGV[7])
+    local ttl = tonumber(ARGV[8])
+
+    local t = redis.call('TIME')
+    local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts', 'rate', 'last_decrease')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    local cur_rate = tonumber(state[3]) or rate
+    local last_decrease = tonumber(state[4]) or 0
+
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * cur_rate)
+
+    local result = 0
+    if op == 'reserve' then
+        tokens = tokens - amount
+        if tokens < 0 then result = -tokens / cur_rate end
+    elseif op == 'try' then
+        if tokens >= amount then
+            tokens = tokens - amount
+            result = 1
+        end
+    elseif op == 'increase' then
+        cur_rate = math.min(max_rate, cur_rate + amount)
+    elseif op == 'decrease' then
+        if now - last_decrease >= cooldown then
+            cur_rate = math.max(min_rate, cur_rate * amount)
+            if tokens > 0 then tokens = 0 end
+            last_decrease = now
+        end
+    end
+
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now, 'rate', cur_rate,
+               'last_decrease', last_decrease)
+    redis.call('EXPIRE', KEYS[1], ttl)
+    return {tostring(result), tostring(cur_rate), tostring(tokens)}
+    """
+
+    def __init__(self, client, key: str, capacity: float, rate: float, ttl: int = 3600):
+        self.client = client
+        self.key = key
+        self.ttl = ttl
+        self._script = client.register_script(self._SCRIPT)
+        self._fallback = _LocalBucketStore(capacity, rate)
+        self._initial_rate = rate
+
+    def apply(self, op: str, amount: float, capacity: float, min_rate: float,
+              max_rate: float, cooldown: float) -> Tuple[float, float, float]:
+        try:
+            result, rate, tokens = self._script(
+                keys=[self.key],
+                args=[capacity, self._initial_rate, op, amount, min_rate, max_rate,
+                      cooldown, self.ttl]
+            )
+            return float(result), float(rate), float(tokens)
+        except Exception as e:
+            logger.warning(f"Redis 율 제한 상태 사용 불가 ({self.key}), 로컬 상태로 대체: {e}")
+            return self._fallback.apply(op, amount, capacity, min_rate, max_rate, cooldown)
+
+
+class TokenBucket:
+    """
+    적응형 토큰 버킷 율 제한기
+
+    모든 연산이 O(1) 이고 락 구간에서 대기하지 않는다. acquire 는 토큰을 먼저 예약하고
+    (부족하면 빚으로 기록) 예약 시각까지 락 밖에서 잠들기 때문에, 동시 호출자들이 같은
+    슬롯을 나눠 갖지 않고 도착 순서대로 간격을 두고 통과한다.
+
+    Examples:
+        limiter = TokenBucket(rate=10, capacity=15)
+        await limiter.acquire_async()     # 코루틴
+        limiter.acquire()                 # 스레드
+        limiter.record(response.status)  # 429/5xx 면 율 감소, 2xx 면 점진 증가
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 min_rate: Optional[float] = None, max_rate: Optional[float] = None,
+                 increase_step: Optional[float] = None, decrease_factor: float = 0.5,
+                 decrease_cooldown: float = 1.0, redis_client=None,
+                 name: Optional[str] = None):
+        if rate <= 0:
+            raise ValueError("rate 는 0보다 커야 합니다")
+
+        self.name = name or 'default'
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.max_rate = float(max_rate or rate)
+        self.min_rate = float(min_rate or min(self.max_rate, max(0.1, rate * 0.1)))
+        self.increase_step = float(increase_step or max(0.01, self.max_rate / 100))
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+
+        if redis_client is not None:
+            self._store = RedisBucketStore(redis_client, f"ratelimit:{self.name}",
+                                           self.capacity, float(rate))
+        else:
+            self._store = _LocalBucketStore(self.capacity, float(rate))
+        self._rate = float(rate)
+
+    def _apply(self, op: str, amount: float) -> float:
+        result, self._rate, _ = self._store.apply(
+            op, amount, self.capacity, self.min_rate, self.max_rate, self.decrease_cooldown
+        )
+        return result
+
+    @property
+    def rate(self) -> float:
+        """현재 초당 허용 요청 수 (AIMD 조정 결과)"""
+        return self._rate
+
+    @property
+    def tokens(self) -> float:
+        """현재 사용 가능한 토큰 수"""
+        return self._store.apply('peek', 0, self.capacity, self.min_rate,
+                                 self.max_rate, self.decrease_cooldown)[2]
+
+    def reserve(self, tokens: float = 1) -> float:
+        """토큰 예약 후 대기해야 할 시간(초) 반환"""
+        return self._apply('reserve', tokens)
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """대기 없이 토큰 소비 시도"""
+        return self._apply('try', tokens) > 0
+
+    # 기존 TokenBucket 인터페이스 호환
+    consume = try_acquire
+
+    def time_until_available(self, tokens: float = 1) -> float:
+        """토큰이 사용 가능해질 때까지의 시간"""
+        missing = tokens - self.tokens
+        return max(0.0, missing / self._rate)
+
+    def acquire(self, tokens: float = 1):
+        """토큰 획득 (동기 - 필요 시 현재 스레드 대기)"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1):
+        """토큰 획득 (비동기 - 필요 시 코루틴 대기)"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    # 기존 RateLimiter 인터페이스 호환
+    wait_if_needed = acquire_async
+
+    def on_success(self):
+        """성공 응답 - 율 가산 증가"""
+        if self._rate != self.max_rate:
+            # 상한이 낮아진 경우에도 여기서 상한으로 맞춰진다
+            self._apply('increase', self.increase_step)
+
+    def on_throttle(self):
+        """429/5xx 응답 - 율 승산 감소 (쿨다운 내 중복 감소 방지)"""
+        before = self._rate
+        self._apply('decrease', self.decrease_factor)
+        if self._rate < before:
+            logger.warning(f"율 제한 감소 ({self.name}): {before:.2f} → {self._rate:.2f} req/s")
+
+    def record(self, status_code: Optional[int]):
+        """응답 상태 코드로 율 조정"""
+        if is_throttle_status(status_code):
+            self.on_throttle()
+        elif status_code is not None and status_code < 400:
+            self.on_success()
+
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 호출이 차단됨"""
+
+
+class CircuitBreaker:
+    """
+    서킷 브레이커 (동기/비동기 공용)
+
+    연속 실패가 임계값에 도달하면 open, recovery_timeout 후 half-open 에서
+    half_open_max_calls 개의 시험 호출만 허용하고 성공하면 closed 로 돌아간다.
+    호출 자체는 락 밖에서 실행하므로 동시 호출이 직렬화되지 않는다.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 60,
+                 expected_exception: Type[Exception] = Exception,
+                 half_open_max_calls: int = 1, name: Optional[str] = None):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.expected_exception = expected_exception
+        self.half_open_max_calls = half_open_max_calls
+        self.name = name or 'default'
+        self.failure_count = 0
+        self.last_failure_time: Optional[float] = None
+        self._state = self.CLOSED
+        self._half_open_calls = 0
+        self._half_open_since = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def allow_request(self) -> bool:
+        """호출 허용 여부 (open 상태에서 복구 시간이 지나면 half-open 으로 전환)"""
+        with self._lock:
+            now = time.time()
+            if self._state == self.CLOSED:
+                return True
+
+            if self._state == self.OPEN:
+                if self.last_failure_time and now - self.last_failure_time >= self.recovery_timeout:
+                    self._state = self.HALF_OPEN
+                    self._half_open_calls = 1
+                    self._half_open_since = now
+                    return True
+                return False
+
+            # half-open: 시험 호출 수 제한 (결과 없이 오래 지나면 다시 허용)
+            if now - self._half_open_since >= self.recovery_timeout:
+                self._half_open_calls = 0
+                self._half_open_since = now
+            if self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failure_count = 0
+            self._half_open_calls = 0
+            self._state = self.CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self.failure_count += 1
+            self.last_failure_time = time.time()
+            if self._state == self.HALF_OPEN or self.failure_count >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(f"Circuit breaker opened ({self.name}) after {self.failure_count} failures")
+                self._state = self.OPEN
+                self._half_open_calls = 0
+
+    def _open_error(self) -> Exception:
+        """open 상태 호출 시 발생시킬 예외 (하위 클래스에서 변경 가능)"""
+        return CircuitOpenError(f"Circuit breaker is OPEN ({self.name})")
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """서킷 브레이커를 통한 동기 호출"""
+        if not self.allow_request():
+            raise self._open_error()
+        try:
+            result = func(*args, **kwargs)
+        except self.expected_exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    async def call_async(self, func: Callable, *args, **kwargs) -> Any:
+        """서킷 브레이커를 통한 비동기 호출"""
+        if not self.allow_request():
+            raise self._open_error()
+        try:
+            result = await func(*args, **kwargs)
+        except self.expected_exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def __call__(self, func: Callable) -> Callable:
+        """데코레이터 사용 (동기/비동기 함수 모두 지원)"""
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await self.call_async(func, *args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            return self.call(func, *args, **kwargs)
+        return sync_wrapper
+
+
+# API 이름별 공유 인스턴스 (같은 API 를 쓰는 클라이언트가 허용량을 나눠 씀)
+_limiters: Dict[str, TokenBucket] = {}
+_breakers: Dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str, rate: float, **kwargs) -> TokenBucket:
+    """이름별 공유 율 제한기 조회 (없으면 생성)"""
+    with _registry_lock:
+        if name not in _limiters:
+            _limiters[name] = TokenBucket(rate, name=name, **kwargs)
+        return _limiters[name]
+
+
+def get_circuit_breaker(name: str, **kwargs) -> CircuitBreaker:
+    """이름별 공유 서킷 브레이커 조회 (없으면 생성)"""
+    with _registry_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name=name, **kwargs)
+        return _breakers[name]
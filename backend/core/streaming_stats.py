@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+스트리밍 통계 - 고정 메모리 / 관측당 O(1)
+- RunningStats: Welford 온라인 평균/분산
+- QuantileSketch: DDSketch 방식 상대오차 보장 분위수 스케치
+- Reservoir: 고정 크기 무작위 샘플 (Algorithm R)
+- WindowedHistogram: 고정 구간 롤링 윈도 히스토그램 (PSI / KS)
+"""
+import bisect
+import math
+import random
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence
+
+
+class RunningStats:
+    """Welford 온라인 평균/분산 (병합 가능)"""
+
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: 'RunningStats'):
+        """다른 RunningStats 병합 (Chan 병렬 알고리즘)"""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'std': self.std,
+            'min': self.min if self.count else 0.0,
+            'max': self.max if self.count else 0.0
+        }
+
+
+class QuantileSketch:
+    """
+    DDSketch 방식 분위수 스케치
+
+    값을 로그 간격 버킷에 세어 relative_accuracy 이내의 상대오차로 분위수를 추정한다.
+    버킷 수가 max_buckets 를 넘으면 가장 작은 버킷부터 합친다 (고정 메모리).
+    두 스케치는 버킷 카운트를 더하는 것만으로 병합된다.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.max_buckets = max_buckets
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value: float, count: int = 1):
+        if value > 1e-12:
+            key = self._key(value)
+            self.positive[key] = self.positive.get(key, 0) + count
+            if len(self.positive) > self.max_buckets:
+                self._collapse(self.positive)
+        elif value < -1e-12:
+            key = self._key(-value)
+            self.negative[key] = self.negative.get(key, 0) + count
+            if len(self.negative) > self.max_buckets:
+                self._collapse(self.negative)
+        else:
+            self.zero_count += count
+
+        self.count += count
+        self.sum += value * count
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def _collapse(self, store: Dict[int, int]):
+        """가장 작은 두 버킷을 합쳐 버킷 수 유지"""
+        keys = sorted(store)
+        lowest, second = keys[0], keys[1]
+        store[second] += store.pop(lowest)
+
+    def merge(self, other: 'QuantileSketch'):
+        for key, count in other.positive.items():
+            self.positive[key] = self.positive.get(key, 0) + count
+        for key, count in other.negative.items():
+            self.negative[key] = self.negative.get(key, 0) + count
+        while len(self.positive) > self.max_buckets:
+            self._collapse(self.positive)
+        while len(self.negative) > self.max_buckets:
+            self._collapse(self.negative)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def copy(self) -> 'QuantileSketch':
+        """독립 복사본 (버킷 dict 만 복사)"""
+        clone = QuantileSketch.__new__(QuantileSketch)
+        clone.__dict__.update(self.__dict__)
+        clone.positive = dict(self.positive)
+        clone.negative = dict(self.negative)
+        return clone
+
+    def iter_buckets(self):
+        """(버킷 대표값, 개수) 오름차순"""
+        for key in sorted(self.negative, reverse=True):
+            yield -self._value(key), self.negative[key]
+        if self.zero_count:
+            yield 0.0, self.zero_count
+        for key in sorted(self.positive):
+            yield self._value(key), self.positive[key]
+
+    def quantile(self, q: float) -> float:
+        """q (0~1) 분위수"""
+        if self.count == 0:
+            return 0.0
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+
+        rank = q * (self.count - 1)
+        cumulative = 0
+
+        # 음수 (절대값 큰 것부터)
+        for key in sorted(self.negative, reverse=True):
+            cumulative += self.negative[key]
+            if cumulative > rank:
+                return -self._value(key)
+
+        cumulative += self.zero_count
+        if cumulative > rank:
+            return 0.0
+
+        for key in sorted(self.positive):
+            cumulative += self.positive[key]
+            if cumulative > rank:
+                return self._value(key)
+
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def to_dict(self, quantiles: Sequence[float] = (0.5, 0.9, 0.95, 0.99)) -> Dict[str, float]:
+        result = {
+            'count': self.count,
+            'mean': self.mean,
+            'min': self.min if self.count else 0.0,
+            'max': self.max if self.count else 0.0
+        }
+        for q in quantiles:
+            result[f"p{q * 100:g}"] = self.quantile(q)
+        return result
+
+
+class Reservoir:
+    """고정 크기 무작위 샘플 (Algorithm R)"""
+
+    def __init__(self, size: int = 1000, seed: Optional[int] = None):
+        self.size = size
+        self.samples: List[Any] = []
+        self.seen = 0
+        self._random = random.Random(seed)
+
+    def add(self, item: Any):
+        self.seen += 1
+        if len(self.samples) < self.size:
+            self.samples.append(item)
+        else:
+            idx = self._random.randrange(self.seen)
+            if idx < self.size:
+                self.samples[idx] = item
+
+
+class WindowedHistogram:
+    """
+    고정 구간 롤링 윈도 히스토그램
+
+    edges 로 나눈 구간별 카운트를 window_size 관측 단위로 나눠 최근 num_windows 개만
+    유지한다. 참조 분포와 비교해 PSI / KS 통계량을 구간 카운트만으로 계산한다.
+    """
+
+    def __init__(self, edges: Sequence[float], window_size: int = 1000, num_windows: int = 10):
+        self.edges = list(edges)
+        self.window_size = window_size
+        self.num_windows = num_windows
+        self._bins = len(self.edges) + 1
+        self._windows: deque = deque(maxlen=num_windows)
+        self._current = [0] * self._bins
+        self._current_count = 0
+        self._totals = [0] * self._bins
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_reference(cls, values: Sequence[float], bins: int = 10, **kwargs) -> 'WindowedHistogram':
+        """참조 샘플 분위수로 구간 경계 생성"""
+        ordered = sorted(values)
+        if not ordered:
+            raise ValueError("참조 샘플이 비어 있습니다")
+        edges = []
+        for i in range(1, bins):
+            edge = ordered[min(len(ordered) - 1, int(len(ordered) * i / bins))]
+            if not edges or edge > edges[-1]:
+                edges.append(edge)
+        return cls(edges, **kwargs)
+
+    def bin_of(self, value: float) -> int:
+        return bisect.bisect_right(self.edges, value)
+
+    def add(self, value: float):
+        idx = bisect.bisect_right(self.edges, value)
+        with self._lock:
+            self._current[idx] += 1
+            self._totals[idx] += 1
+            self._current_count += 1
+            if self._current_count >= self.window_size:
+                self._rotate_locked()
+
+    def _rotate_locked(self):
+        if len(self._windows) == self.num_windows:
+            expired = self._windows[0]
+            for i, c in enumerate(expired):
+                self._totals[i] -= c
+        self._windows.append(self._current)
+        self._current = [0] * self._bins
+        self._current_count = 0
+
+    def counts(self) -> List[int]:
+        """현재 롤링 윈도 전체의 구간별 카운트"""
+        with self._lock:
+            return list(self._totals)
+
+    @staticmethod
+    def _proportions(counts: Sequence[int], eps: float = 1e-4) -> List[float]:
+        total = sum(counts)
+        if total == 0:
+            return [0.0] * len(counts)
+        return [max(c / total, eps) for c in counts]
+
+    def psi(self, reference_counts: Sequence[int]) -> float:
+        """Population Stability Index (0.1 미만 안정, 0.25 이상 큰 변화)"""
+        current = self.counts()
+        if sum(current) == 0 or sum(reference_counts) == 0:
+            return 0.0
+        expected = self._proportions(reference_counts)
+        actual = self._proportions(current)
+        return sum((a - e) * math.log(a / e) for a, e in zip(actual, expected))
+
+    def ks(self, reference_counts: Sequence[int]) -> float:
+        """구간 경계 기준 KS 통계량 (누적 분포 최대 차이)"""
+        current = self.counts()
+        ref_total, cur_total = sum(reference_counts), sum(current)
+        if ref_total == 0 or cur_total == 0:
+            return 0.0
+        ref_cum = cur_cum = 0
+        max_diff = 0.0
+        for ref_count, cur_count in zip(reference_counts, current):
+            ref_cum += ref_count
+            cur_cum += cur_count
+            max_diff = max(max_diff, abs(ref_cum / ref_total - cur_cum / cur_total))
+        return max_diff
@@ -13,6 +13,8 @@ import functools
 from collections import defaultdict
 import threading
 
+from .tracing import current_span, get_tracer
+
 class StructuredLogger:
     """구조화된 JSON 로거"""
     
@@ -43,6 +45,12 @@ class StructuredLogger:
                 "line": record.lineno
             }
             
+            # 트레이스 연결 (로그 ↔ 스팬)
+            span = current_span()
+            if span is not None:
+                log_data["trace_id"] = span.trace_id
+                log_data["span_id"] = span.span_id
+            
             # 추가 컨텍스트 정보
             if hasattr(record, 'extra_data'):
                 log_data.update(record.extra_data)
@@ -79,14 +87,21 @@ class StructuredLogger:
     
     @contextmanager
     def timer(self, operation: str, **context):
-        """작업 시간 측정 컨텍스트 매니저"""
-        start_time = time.time()
+        """작업 시간 측정 컨텍스트 매니저 (트레이싱 스팬도 함께 기록)"""
+        with get_tracer().span(operation) as span, self._timed(operation, **context):
+            if span is not None:
+                span.attributes.update(context)
+            yield
+    
+    @contextmanager
+    def _timed(self, operation: str, **context):
+        start_time = time.perf_counter()
         
         self.info(f"{operation} 시작", operation=operation, **context)
         
         try:
             yield
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             
             self.info(
                 f"{operation} 완료",
@@ -101,7 +116,7 @@ class StructuredLogger:
                 self.metrics[operation].append(duration)
                 
         except Exception as e:
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             
             self.error(
                 f"{operation} 실패",
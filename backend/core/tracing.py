@@ -0,0 +1,518 @@
+#!/usr/bin/env python3
+"""
+경량 분산 트레이싱
+- 트레이스/스팬 ID 는 contextvars 로 전파 (스레드·asyncio 태스크별로 분리)
+- 루트 스팬에서 샘플링 여부를 결정하고 자식 스팬은 그 결정을 상속
+- 샘플링되지 않은 스팬도 slow_threshold_ms 를 넘으면 기록 (느린 구간은 항상 남김)
+- 완료된 스팬은 메모리 링 버퍼에 쌓고 백그라운드 스레드가 배치로 내보냄
+  (버퍼가 가득 차면 가장 오래된 스팬부터 버림 → 요청 경로는 절대 블로킹되지 않음)
+- W3C traceparent 헤더로 서비스 간 전파, ASGI 미들웨어 / aiohttp TraceConfig 제공
+"""
+import asyncio
+import contextvars
+import functools
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_HEADER = 'traceparent'
+TRACE_ID_HEADER = 'x-trace-id'
+
+_current_span: contextvars.ContextVar[Optional['Span']] = contextvars.ContextVar(
+    'current_span', default=None
+)
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+class SpanContext:
+    """원격에서 전달받은 부모 스팬 정보 (traceparent)"""
+
+    __slots__ = ('trace_id', 'span_id', 'sampled')
+
+    def __init__(self, trace_id: str, span_id: str, sampled: bool):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.sampled = sampled
+
+
+class Span:
+    """트레이스 구간 (요청, 쿼리, 외부 API 호출 등)"""
+
+    __slots__ = ('trace_id', 'span_id', 'parent_id', 'name', 'kind', 'service',
+                 'start_time', 'duration_ms', 'attributes', 'status', 'error',
+                 'sampled', '_start_ns')
+
+    def __init__(self, name: str, kind: str, trace_id: str, parent_id: Optional[str],
+                 sampled: bool, service: str, attributes: Optional[Dict[str, Any]] = None):
+        self.trace_id = trace_id
+        self.span_id = _new_id(64)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.service = service
+        self.start_time = time.time()
+        self.duration_ms: Optional[float] = None
+        self.attributes = attributes or {}
+        self.status = 'ok'
+        self.error: Optional[str] = None
+        self.sampled = sampled
+        self._start_ns = time.perf_counter_ns()
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException):
+        self.status = 'error'
+        self.error = f"{type(error).__name__}: {error}"[:500]
+
+    def finish(self):
+        if self.duration_ms is None:
+            self.duration_ms = (time.perf_counter_ns() - self._start_ns) / 1e6
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'kind': self.kind,
+            'service': self.service,
+            'start_time': self.start_time,
+            'duration_ms': round(self.duration_ms, 3) if self.duration_ms is not None else None,
+            'status': self.status,
+            'error': self.error,
+            'attributes': self.attributes,
+        }
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[SpanContext]:
+    """W3C traceparent 헤더 파싱 (형식이 잘못되면 None)"""
+    if not value:
+        return None
+    parts = value.strip().split('-')
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        int(parts[1], 16), int(parts[2], 16)
+        flags = int(parts[3][:2], 16)
+    except ValueError:
+        return None
+    if parts[1] == '0' * 32 or parts[2] == '0' * 16:
+        return None
+    return SpanContext(parts[1], parts[2], bool(flags & 0x01))
+
+
+def current_span() -> Optional[Span]:
+    """현재 컨텍스트의 스팬"""
+    return _current_span.get()
+
+
+def current_trace_id() -> Optional[str]:
+    span = _current_span.get()
+    return span.trace_id if span else None
+
+
+def inject_headers(headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """현재 스팬의 traceparent 를 요청 헤더에 추가 (내부 서비스 호출용)"""
+    headers = headers if headers is not None else {}
+    span = _current_span.get()
+    if span is not None:
+        headers[TRACEPARENT_HEADER] = span.traceparent
+    return headers
+
+
+def extract_context(headers: Dict[str, str]) -> Optional[SpanContext]:
+    """수신 헤더에서 부모 스팬 정보 추출"""
+    value = headers.get(TRACEPARENT_HEADER) or headers.get(TRACEPARENT_HEADER.title())
+    return parse_traceparent(value)
+
+
+def wrap_context(func: Callable) -> Callable:
+    """
+    현재 컨텍스트(부모 스팬)를 유지한 채 실행되도록 감싸기
+
+    ThreadPoolExecutor 작업은 contextvars 를 상속하지 않으므로
+    executor.submit(wrap_context(fn), ...) 형태로 사용한다.
+    """
+    context = contextvars.copy_context()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return context.copy().run(func, *args, **kwargs)
+
+    return wrapper
+
+
+# ---------------------------------------------------------------------------
+# 익스포터
+# ---------------------------------------------------------------------------
+
+class LoggingSpanExporter:
+    """스팬을 JSON 한 줄씩 로거로 출력 (기본 익스포터)"""
+
+    def __init__(self, logger_name: str = 'tracing.spans'):
+        self.logger = logging.getLogger(logger_name)
+
+    def __call__(self, spans: List[Dict[str, Any]]):
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        for span in spans:
+            self.logger.info(json.dumps(span, ensure_ascii=False, default=str))
+
+
+class JsonlFileSpanExporter:
+    """스팬을 JSONL 파일에 추가 (배치당 write 1회)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def __call__(self, spans: List[Dict[str, Any]]):
+        lines = ''.join(json.dumps(span, ensure_ascii=False, default=str) + '\n' for span in spans)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+
+
+# ---------------------------------------------------------------------------
+# 트레이서
+# ---------------------------------------------------------------------------
+
+class Tracer:
+    """
+    스팬 생성/버퍼링/배치 내보내기
+
+    Examples:
+        tracer = get_tracer()
+        with tracer.span('db.query', kind='client', statement=sql) as span:
+            rows = cursor.fetchall()
+            span.set_attribute('rows', len(rows))
+    """
+
+    def __init__(self, service_name: str = 'yooni-backend',
+                 sample_rate: float = 1.0,
+                 slow_threshold_ms: Optional[float] = 1000.0,
+                 buffer_size: int = 10000,
+                 export_batch_size: int = 500,
+                 export_interval: float = 5.0,
+                 exporter: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+                 enabled: bool = True):
+        """
+        Args:
+            service_name: 스팬에 기록할 서비스 이름
+            sample_rate: 루트 스팬 샘플링 비율 (0.0 ~ 1.0)
+            slow_threshold_ms: 샘플링되지 않았어도 기록할 최소 소요 시간 (None 이면 사용 안 함)
+            buffer_size: 내보내기 전 보관할 최대 스팬 수 (초과 시 오래된 것부터 버림)
+            export_batch_size: 한 번에 내보낼 스팬 수
+            export_interval: 내보내기 주기 (초)
+            exporter: 스팬 dict 목록을 받는 호출 가능 객체 (기본: LoggingSpanExporter)
+            enabled: False 면 스팬을 만들지 않음
+        """
+        self.service_name = service_name
+        self.sample_rate = sample_rate
+        self.slow_threshold_ms = slow_threshold_ms
+        self.export_batch_size = export_batch_size
+        self.export_interval = export_interval
+        self.exporter = exporter or LoggingSpanExporter()
+        self.enabled = enabled
+
+        self._buffer: deque = deque(maxlen=buffer_size)
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._export_lock = threading.Lock()
+        self.stats = {'started': 0, 'recorded': 0, 'dropped': 0, 'exported': 0, 'export_errors': 0}
+
+    # -- 스팬 생성 --------------------------------------------------------
+
+    def start_span(self, name: str, kind: str = 'internal',
+                   parent: Optional[SpanContext] = None,
+                   attributes: Optional[Dict[str, Any]] = None) -> Span:
+        """스팬 시작 (parent 가 없으면 현재 컨텍스트의 스팬이 부모)"""
+        if parent is None:
+            parent = _current_span.get()
+
+        if parent is not None:
+            trace_id, parent_id, sampled = parent.trace_id, parent.span_id, parent.sampled
+        else:
+            trace_id, parent_id = _new_id(128), None
+            sampled = self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+        self.stats['started'] += 1
+        return Span(name, kind, trace_id, parent_id, sampled, self.service_name, attributes)
+
+    def end_span(self, span: Span):
+        """스팬 종료 및 버퍼 기록"""
+        span.finish()
+        if not span.sampled and (self.slow_threshold_ms is None
+                                 or span.duration_ms < self.slow_threshold_ms):
+            return
+
+        if len(self._buffer) == self._buffer.maxlen:
+            self.stats['dropped'] += 1
+        self._buffer.append(span)
+        self.stats['recorded'] += 1
+        if len(self._buffer) >= self.export_batch_size:
+            self._wakeup.set()
+
+    @contextmanager
+    def span(self, name: str, kind: str = 'internal',
+             parent: Optional[SpanContext] = None, **attributes):
+        """스팬 컨텍스트 매니저 (블록 안의 하위 호출은 자식 스팬이 됨)"""
+        if not self.enabled:
+            yield None
+            return
+
+        span = self.start_span(name, kind, parent, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end_span(span)
+
+    def trace(self, name: Optional[str] = None, kind: str = 'internal'):
+        """함수 실행을 스팬으로 기록하는 데코레이터 (sync/async 모두 지원)"""
+        def decorator(func):
+            span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+            if asyncio.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with self.span(span_name, kind):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name, kind):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    # -- 내보내기 ---------------------------------------------------------
+
+    def start(self):
+        """백그라운드 내보내기 스레드 시작"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._export_loop, name='span-exporter', daemon=True)
+            self._thread.start()
+
+    def shutdown(self, timeout: float = 5.0):
+        """내보내기 스레드 종료 (남은 스팬 모두 내보냄)"""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def _drain(self, limit: int) -> List[Span]:
+        batch = []
+        try:
+            while len(batch) < limit:
+                batch.append(self._buffer.popleft())
+        except IndexError:
+            pass
+        return batch
+
+    def flush(self) -> int:
+        """버퍼의 스팬을 배치 단위로 모두 내보냄"""
+        exported = 0
+        with self._export_lock:
+            while True:
+                batch = self._drain(self.export_batch_size)
+                if not batch:
+                    break
+                try:
+                    self.exporter([span.to_dict() for span in batch])
+                    exported += len(batch)
+                except Exception as e:
+                    self.stats['export_errors'] += 1
+                    logger.error(f"스팬 내보내기 실패 ({len(batch)}개 버림): {e}")
+        self.stats['exported'] += exported
+        return exported
+
+    def _export_loop(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(self.export_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def pending(self) -> int:
+        return len(self._buffer)
+
+
+# ---------------------------------------------------------------------------
+# 전역 트레이서
+# ---------------------------------------------------------------------------
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def _tracer_from_env() -> Tracer:
+    span_file = os.getenv('TRACING_SPAN_FILE')
+    slow_threshold = os.getenv('TRACING_SLOW_THRESHOLD_MS', '1000')
+    return Tracer(
+        service_name=os.getenv('TRACING_SERVICE_NAME', 'yooni-backend'),
+        sample_rate=float(os.getenv('TRACING_SAMPLE_RATE', '0.1')),
+        slow_threshold_ms=float(slow_threshold) if slow_threshold else None,
+        exporter=JsonlFileSpanExporter(span_file) if span_file else None,
+        enabled=os.getenv('TRACING_ENABLED', 'true').lower() != 'false'
+    )
+
+
+def get_tracer() -> Tracer:
+    """전역 트레이서 (최초 호출 시 환경 변수로 생성 후 내보내기 스레드 시작)"""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = _tracer_from_env()
+                if _tracer.enabled:
+                    _tracer.start()
+    return _tracer
+
+
+def configure_tracing(**tracer_options) -> Tracer:
+    """전역 트레이서 교체 (기존 트레이서는 남은 스팬을 내보낸 뒤 종료)"""
+    global _tracer
+    with _tracer_lock:
+        if _tracer is not None:
+            _tracer.shutdown()
+        _tracer = Tracer(**tracer_options)
+        if _tracer.enabled:
+            _tracer.start()
+    return _tracer
+
+
+def span(name: str, kind: str = 'internal', **attributes):
+    """전역 트레이서로 스팬 생성 (get_tracer().span 단축형)"""
+    return get_tracer().span(name, kind, **attributes)
+
+
+# ---------------------------------------------------------------------------
+# 자동 계측
+# ---------------------------------------------------------------------------
+
+class TracingMiddleware:
+    """
+    ASGI 트레이싱 미들웨어 (FastAPI: app.add_middleware(TracingMiddleware))
+
+    수신 traceparent 가 있으면 이어받고, 응답에 x-trace-id 헤더를 붙인다.
+    """
+
+    def __init__(self, app, tracer: Optional[Tracer] = None,
+                 excluded_paths: Sequence[str] = ('/metrics', '/health')):
+        self.app = app
+        self.tracer = tracer
+        self.excluded_paths = tuple(excluded_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope.get('path', '').startswith(self.excluded_paths):
+            await self.app(scope, receive, send)
+            return
+
+        tracer = self.tracer or get_tracer()
+        parent = None
+        for key, value in scope.get('headers', ()):
+            if key == b'traceparent':
+                parent = parse_traceparent(value.decode('latin-1'))
+                break
+
+        method = scope.get('method', '')
+        path = scope.get('path', '')
+        with tracer.span(f"{method} {path}", kind='server', parent=parent,
+                         **{'http.method': method, 'http.path': path}) as span:
+            if span is None:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_wrapper(message):
+                if message['type'] == 'http.response.start':
+                    span.set_attribute('http.status_code', message['status'])
+                    if message['status'] >= 500:
+                        span.status = 'error'
+                    headers = list(message.get('headers', []))
+                    headers.append((TRACE_ID_HEADER.encode(), span.trace_id.encode()))
+                    message = {**message, 'headers': headers}
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+            route = scope.get('route')
+            if route is not None and getattr(route, 'path', None):
+                span.name = f"{method} {route.path}"
+
+
+def aiohttp_trace_config(service: str, tracer: Optional[Tracer] = None):
+    """
+    aiohttp ClientSession 용 TraceConfig
+
+    Examples:
+        aiohttp.ClientSession(trace_configs=[aiohttp_trace_config('ownerclan')])
+    """
+    import aiohttp
+
+    trace_config = aiohttp.TraceConfig()
+
+    async def on_request_start(session, ctx, params):
+        active_tracer = tracer or get_tracer()
+        if not active_tracer.enabled:
+            ctx.span = None
+            return
+        ctx.span = active_tracer.start_span(
+            f"{service} {params.method} {params.url.path}", kind='client',
+            attributes={'http.method': params.method, 'http.host': params.url.host,
+                        'http.path': params.url.path, 'peer.service': service}
+        )
+
+    async def on_request_end(session, ctx, params):
+        if ctx.span is not None:
+            ctx.span.set_attribute('http.status_code', params.response.status)
+            if params.response.status >= 400:
+                ctx.span.status = 'error'
+            (tracer or get_tracer()).end_span(ctx.span)
+
+    async def on_request_exception(session, ctx, params):
+        if ctx.span is not None:
+            ctx.span.record_error(params.exception)
+            (tracer or get_tracer()).end_span(ctx.span)
+
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_request_exception.append(on_request_exception)
+    return trace_config
+
+
+def summarize_spans(spans: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """스팬 이름별 호출 수/총 소요 시간/최대 소요 시간 (느린 구간 파악용)"""
+    summary: Dict[str, Dict[str, float]] = {}
+    for span in spans:
+        entry = summary.setdefault(span['name'], {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+        duration = span.get('duration_ms') or 0.0
+        entry['count'] += 1
+        entry['total_ms'] += duration
+        entry['max_ms'] = max(entry['max_ms'], duration)
+    return dict(sorted(summary.items(), key=lambda item: item[1]['total_ms'], reverse=True))
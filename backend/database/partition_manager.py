@@ -21,21 +21,31 @@ from config.config_manager import ConfigManager
 class PartitionManager:
     """파티션 관리자"""
     
-    def __init__(self):
-        self.config = ConfigManager()
-        self.db_config = {
-            'host': self.config.get('database', 'host', 'localhost'),
-            'port': self.config.get('database', 'port', 5434),
-            'database': self.config.get('database', 'name', 'yoonni'),
-            'user': self.config.get('database', 'user', 'postgres'),
-            'password': self.config.get('database', 'password', '1234')
-        }
+    def __init__(self, db_config: Optional[Dict] = None):
+        """
+        Args:
+            db_config: 데이터베이스 연결 설정 (None 이면 ConfigManager 에서 읽음)
+        """
+        if db_config:
+            self.config = None
+            self.db_config = db_config
+        else:
+            self.config = ConfigManager()
+            self.db_config = {
+                'host': self.config.get('database', 'host', 'localhost'),
+                'port': self.config.get('database', 'port', 5434),
+                'database': self.config.get('database', 'name', 'yoonni'),
+                'user': self.config.get('database', 'user', 'postgres'),
+                'password': self.config.get('database', 'password', '1234')
+            }
         self.logger = self._setup_logger()
         
     def _setup_logger(self) -> logging.Logger:
         """로거 설정"""
         logger = logging.getLogger('partition_manager')
         logger.setLevel(logging.INFO)
+        if logger.handlers:
+            return logger
         
         # 콘솔 핸들러
         ch = logging.StreamHandler()
@@ -50,8 +60,9 @@ class PartitionManager:
         """데이터베이스 연결"""
         return psycopg2.connect(**self.db_config)
         
-    def create_monthly_partitions(self, table_name: str, months_ahead: int = 3):
-        """월별 파티션 생성"""
+    def create_monthly_partitions(self, table_name: str, months_ahead: int = 3,
+                                  months_behind: int = 1):
+        """월별 파티션 생성 (현재 월 기준 months_behind 개월 전 ~ months_ahead 개월 후)"""
         conn = self.get_connection()
         cur = conn.cursor()
         
@@ -59,7 +70,7 @@ class PartitionManager:
             # 현재 날짜 기준으로 파티션 생성
             current_date = datetime.now()
             
-            for i in range(-1, months_ahead):
+            for i in range(-months_behind, months_ahead):
                 partition_date = current_date + relativedelta(months=i)
                 start_date = partition_date.replace(day=1)
                 end_date = start_date + relativedelta(months=1)
@@ -0,0 +1,769 @@
+#!/usr/bin/env python3
+"""
+매출/카탈로그 롤업 관리자
+- 주문(orders/order_items/products)을 일 단위로 미리 집계해 월별 파티션 테이블에 보관
+  (전체/상품/카테고리/공급사/마켓 차원 + 고객별 일 집계)
+- 긴 기간 조회용 주간 롤업은 일 롤업에서 파생
+- 공급사 상품(supplier_products)의 카테고리별 일 집계 (트렌드 분석용, 최근 구간 전체 재집계)
+- 워터마크 이후 변경된 주문이 속한 날짜만 삭제 후 재집계 (증분 갱신, 재실행해도 결과 동일)
+  주문 항목 변경은 트리거로 주문 updated_at 에, 주문 삭제/날짜 이동은 rollup_dirty_days 에 기록
+- 리포트/BI 모듈은 롤업이 최신이면 롤업을, 아니면 원본 테이블을 조회
+"""
+from psycopg2.extras import RealDictCursor
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+import argparse
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from database.partition_manager import PartitionManager
+
+DateLike = Union[str, date, datetime]
+
+SALES_DIMENSIONS = ('total', 'product', 'category', 'supplier', 'market')
+
+# 롤업 상태 이름
+SALES_ROLLUP = 'sales'
+CATALOG_ROLLUP = 'catalog'
+
+SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS sales_rollup_daily_partitioned (
+        bucket_date DATE NOT NULL,
+        dimension VARCHAR(20) NOT NULL,
+        dim_key VARCHAR(255) NOT NULL,
+        order_count INTEGER NOT NULL DEFAULT 0,
+        quantity BIGINT,
+        revenue NUMERIC(15, 2) NOT NULL DEFAULT 0,
+        PRIMARY KEY (dimension, bucket_date, dim_key)
+    ) PARTITION BY RANGE (bucket_date);
+
+    CREATE TABLE IF NOT EXISTS customer_rollup_daily_partitioned (
+        bucket_date DATE NOT NULL,
+        customer_id VARCHAR(100) NOT NULL,
+        customer_name VARCHAR(255),
+        order_count INTEGER NOT NULL DEFAULT 0,
+        total_spent NUMERIC(15, 2) NOT NULL DEFAULT 0,
+        last_order_at TIMESTAMP,
+        PRIMARY KEY (bucket_date, customer_id)
+    ) PARTITION BY RANGE (bucket_date);
+
+    CREATE TABLE IF NOT EXISTS sales_rollup_weekly (
+        week_start DATE NOT NULL,
+        dimension VARCHAR(20) NOT NULL,
+        dim_key VARCHAR(255) NOT NULL,
+        order_count INTEGER NOT NULL DEFAULT 0,
+        quantity BIGINT,
+        revenue NUMERIC(15, 2) NOT NULL DEFAULT 0,
+        PRIMARY KEY (dimension, week_start, dim_key)
+    );
+
+    CREATE TABLE IF NOT EXISTS catalog_rollup_daily (
+        bucket_date DATE NOT NULL,
+        category VARCHAR(255) NOT NULL,
+        product_count INTEGER NOT NULL DEFAULT 0,
+        price_sum NUMERIC(18, 2) NOT NULL DEFAULT 0,
+        price_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (bucket_date, category)
+    );
+
+    CREATE TABLE IF NOT EXISTS rollup_state (
+        name VARCHAR(50) PRIMARY KEY,
+        watermark TIMESTAMP,
+        covered_from DATE,
+        refreshed_at TIMESTAMP
+    );
+
+    -- 타임스탬프로 찾을 수 없는 변경(주문 삭제, 주문일 변경)의 이전 날짜
+    CREATE TABLE IF NOT EXISTS rollup_dirty_days (
+        name VARCHAR(50) NOT NULL,
+        bucket_date DATE NOT NULL,
+        marked_at TIMESTAMP NOT NULL DEFAULT LOCALTIMESTAMP,
+        PRIMARY KEY (name, bucket_date)
+    );
+"""
+
+# 주문 변경 감지 트리거 (orders/order_items 가 있을 때만, 최초 1회 생성)
+TRIGGER_SQL = """
+    CREATE OR REPLACE FUNCTION rollup_touch_order() RETURNS TRIGGER AS $$
+    BEGIN
+        IF TG_TABLE_NAME = 'orders' THEN
+            NEW.updated_at := LOCALTIMESTAMP;
+            RETURN NEW;
+        END IF;
+        -- 주문 항목 추가/수정/삭제 → 주문 updated_at 갱신
+        IF TG_OP = 'DELETE' THEN
+            UPDATE orders SET updated_at = LOCALTIMESTAMP WHERE id = OLD.order_id;
+            RETURN NULL;
+        END IF;
+        UPDATE orders SET updated_at = LOCALTIMESTAMP WHERE id = NEW.order_id;
+        IF TG_OP = 'UPDATE' THEN
+            IF OLD.order_id IS DISTINCT FROM NEW.order_id THEN
+                UPDATE orders SET updated_at = LOCALTIMESTAMP WHERE id = OLD.order_id;
+            END IF;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE OR REPLACE FUNCTION rollup_mark_order_day() RETURNS TRIGGER AS $$
+    BEGIN
+        -- 삭제되거나 다른 날짜로 옮겨간 주문의 이전 날짜 기록
+        IF TG_OP = 'UPDATE' THEN
+            IF DATE(OLD.created_at) IS NOT DISTINCT FROM DATE(NEW.created_at) THEN
+                RETURN NULL;
+            END IF;
+        END IF;
+        INSERT INTO rollup_dirty_days (name, bucket_date)
+        VALUES ('sales', DATE(OLD.created_at))
+        ON CONFLICT (name, bucket_date) DO UPDATE SET marked_at = EXCLUDED.marked_at;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DO $$
+    BEGIN
+        IF to_regclass('orders') IS NULL OR to_regclass('order_items') IS NULL THEN
+            RETURN;
+        END IF;
+        IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'rollup_orders_touch') THEN
+            CREATE TRIGGER rollup_orders_touch BEFORE UPDATE ON orders
+                FOR EACH ROW EXECUTE FUNCTION rollup_touch_order();
+        END IF;
+        IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'rollup_order_items_touch') THEN
+            CREATE TRIGGER rollup_order_items_touch AFTER INSERT OR UPDATE OR DELETE ON order_items
+                FOR EACH ROW EXECUTE FUNCTION rollup_touch_order();
+        END IF;
+        IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'rollup_orders_mark_day') THEN
+            CREATE TRIGGER rollup_orders_mark_day AFTER DELETE OR UPDATE OF created_at ON orders
+                FOR EACH ROW EXECUTE FUNCTION rollup_mark_order_day();
+        END IF;
+    END $$;
+"""
+
+
+def to_date(value: DateLike) -> date:
+    """'YYYY-MM-DD' 문자열/datetime/date 를 date 로 변환"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+
+
+def week_start(day: date) -> date:
+    """해당 날짜가 속한 주의 월요일 (PostgreSQL DATE_TRUNC('week') 와 동일)"""
+    return day - timedelta(days=day.weekday())
+
+
+def day_ranges(days: Iterable[date]) -> List[Tuple[date, date]]:
+    """날짜 집합을 연속 구간 [start, end) 목록으로 묶음"""
+    ranges: List[Tuple[date, date]] = []
+    for day in sorted(set(days)):
+        if ranges and ranges[-1][1] == day:
+            ranges[-1] = (ranges[-1][0], day + timedelta(days=1))
+        else:
+            ranges.append((day, day + timedelta(days=1)))
+    return ranges
+
+
+def split_weeks(start: date, end: date) -> Tuple[Optional[Tuple[date, date]], List[Tuple[date, date]]]:
+    """
+    조회 구간 [start, end) 를 주간 롤업으로 읽을 완전한 주 구간과
+    일 롤업으로 읽을 앞뒤 자투리 구간으로 나눔
+
+    Returns:
+        (완전한 주 구간 [week_from, week_to) 또는 None, 일 단위 구간 목록)
+    """
+    first_full = week_start(start + timedelta(days=6))
+    last_full = week_start(end)
+    if first_full >= last_full:
+        return None, [(start, end)] if start < end else []
+
+    edges = []
+    if start < first_full:
+        edges.append((start, first_full))
+    if last_full < end:
+        edges.append((last_full, end))
+    return (first_full, last_full), edges
+
+
+def rollup_is_fresh(cursor, name: str, start: DateLike, end: Optional[DateLike] = None,
+                    max_lag: timedelta = timedelta(minutes=15)) -> bool:
+    """
+    롤업이 조회 구간을 모두 포함하는지 확인 (cursor 는 튜플을 돌려주는 기본 커서)
+
+    - covered_from 이 조회 시작일 이전이어야 함 (백필 완료)
+    - 워터마크(증분 갱신이 반영한 시점)가 조회 종료 시점 이후이거나,
+      진행 중인 구간이면 max_lag 이내여야 함
+    """
+    cursor.execute("SELECT to_regclass('rollup_state') IS NOT NULL")
+    if not cursor.fetchone()[0]:
+        return False
+
+    cursor.execute(
+        "SELECT covered_from, watermark, LOCALTIMESTAMP FROM rollup_state WHERE name = %s",
+        (name,)
+    )
+    row = cursor.fetchone()
+    if row is None:
+        return False
+    covered_from, watermark, now = row
+    if covered_from is None or watermark is None or covered_from > to_date(start):
+        return False
+
+    range_end = datetime.combine(to_date(end) + timedelta(days=1), datetime.min.time()) if end else now
+    return watermark >= min(range_end, now) - max_lag
+
+
+class SalesRollupManager(PartitionManager):
+    """매출/고객/카탈로그 롤업 관리자"""
+
+    # 일 롤업 파티션 테이블 (PartitionManager 규칙: {name}_partitioned 의 월별 파티션)
+    PARTITIONED_TABLES = ('sales_rollup_daily', 'customer_rollup_daily')
+
+    def __init__(self, db_config: Optional[Dict] = None, backfill_days: int = 400,
+                 catalog_window_days: int = 90,
+                 watermark_overlap: timedelta = timedelta(minutes=5),
+                 max_lag: timedelta = timedelta(minutes=15)):
+        """
+        Args:
+            db_config: 데이터베이스 연결 설정 (None 이면 ConfigManager 에서 읽음)
+            backfill_days: 최초 갱신 시 미리 집계할 기간 (일)
+            catalog_window_days: 카탈로그 롤업을 매번 재집계하는 최근 기간 (일)
+            watermark_overlap: 워터마크 조회 시 겹쳐 읽을 시간 (커밋 지연 대비)
+            max_lag: 진행 중인 구간을 롤업으로 조회할 때 허용하는 갱신 지연
+        """
+        super().__init__(db_config)
+        self.backfill_days = backfill_days
+        self.catalog_window_days = catalog_window_days
+        self.watermark_overlap = watermark_overlap
+        self.max_lag = max_lag
+        self._schema_ready = False
+
+    # -- 스키마/파티션 -----------------------------------------------------
+
+    def ensure_schema(self):
+        """롤업 테이블 생성 (최초 1회)"""
+        if self._schema_ready:
+            return
+        conn = self.get_connection()
+        try:
+            with conn, conn.cursor() as cur:
+                cur.execute(SCHEMA_SQL)
+                cur.execute(TRIGGER_SQL)
+        finally:
+            conn.close()
+        self._schema_ready = True
+
+    def ensure_partitions(self, start: date, months_ahead: int = 3):
+        """start 가 속한 월부터 months_ahead 개월 후까지 일 롤업 파티션 생성"""
+        today = date.today()
+        months_behind = max(1, (today.year - start.year) * 12 + today.month - start.month)
+        for table in self.PARTITIONED_TABLES:
+            self.create_monthly_partitions(table, months_ahead=months_ahead,
+                                           months_behind=months_behind)
+
+    # -- 갱신 -------------------------------------------------------------
+
+    def refresh(self) -> Dict[str, Any]:
+        """
+        증분 갱신
+
+        - 매출: 마지막 워터마크 이후 생성/변경된 주문과 삭제/이동된 주문이 속한 날짜만 재집계
+          (상태가 없으면 backfill_days 만큼 전체 집계)
+        - 카탈로그: 재수집 시 collected_at 이 바뀌어 상품이 다른 날짜로 옮겨가므로
+          최근 catalog_window_days 전체를 재집계하고 그 이전 날짜는 삭제
+        """
+        self.ensure_schema()
+        conn = self.get_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT LOCALTIMESTAMP")
+                now = cur.fetchone()[0]
+                states = self._load_states(cur)
+        finally:
+            conn.close()
+
+        result = {}
+        state = states.get(SALES_ROLLUP)
+        if state is None or state['watermark'] is None:
+            start = now.date() - timedelta(days=self.backfill_days)
+            days = [start + timedelta(days=i) for i in range(self.backfill_days + 1)]
+            result[SALES_ROLLUP] = self._recompute(SALES_ROLLUP, days, now,
+                                                   covered_from=start, watermark=now)
+        else:
+            conn = self.get_connection()
+            try:
+                with conn.cursor() as cur:
+                    days = self._affected_sales_days(cur, state['watermark'] - self.watermark_overlap)
+            finally:
+                conn.close()
+            result[SALES_ROLLUP] = self._recompute(SALES_ROLLUP, days, now, watermark=now)
+
+        start = now.date() - timedelta(days=self.catalog_window_days)
+        days = [start + timedelta(days=i) for i in range(self.catalog_window_days + 1)]
+        result[CATALOG_ROLLUP] = self._recompute(CATALOG_ROLLUP, days, now, covered_from=start,
+                                                 watermark=now, prune_before=start)
+        return result
+
+    def rebuild(self, start: DateLike, end: DateLike,
+                names: Iterable[str] = (SALES_ROLLUP, CATALOG_ROLLUP)) -> Dict[str, Any]:
+        """
+        지정 기간 [start, end] 전체 재집계 (백필/데이터 보정용)
+
+        워터마크는 옮기지 않는다 - 기간 밖에서 마지막 refresh() 이후 변경된 주문은
+        다음 refresh() 에서 그대로 재집계된다.
+        """
+        self.ensure_schema()
+        start, end = to_date(start), to_date(end)
+        conn = self.get_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT LOCALTIMESTAMP")
+                now = cur.fetchone()[0]
+        finally:
+            conn.close()
+
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        return {name: self._recompute(name, days, now, covered_from=start) for name in names}
+
+    def _recompute(self, name: str, days: List[date], now: datetime,
+                   covered_from: Optional[date] = None,
+                   watermark: Optional[datetime] = None,
+                   prune_before: Optional[date] = None) -> Dict[str, Any]:
+        """
+        날짜 구간별로 삭제 후 재집계하고 상태를 같은 트랜잭션에서 저장
+
+        prune_before 를 주면 (카탈로그) 그 이전 날짜의 롤업을 지우고 covered_from 을 그 날짜로 맞춘다.
+        """
+        ranges = day_ranges(days)
+        if ranges and name == SALES_ROLLUP:
+            self.ensure_partitions(ranges[0][0])
+
+        started = datetime.now()
+        conn = self.get_connection()
+        try:
+            with conn, conn.cursor() as cur:
+                for range_start, range_end in ranges:
+                    if name == SALES_ROLLUP:
+                        self._recompute_sales(cur, range_start, range_end)
+                    else:
+                        self._recompute_catalog(cur, range_start, range_end)
+                if ranges and name == SALES_ROLLUP:
+                    self._recompute_weeks(cur, ranges)
+                    # 처리한 삭제/이동 날짜 정리 (커밋 지연 대비 겹침 구간 안의 기록은 다음 갱신에서 다시 처리)
+                    cur.execute("""
+                        DELETE FROM rollup_dirty_days
+                        WHERE name = %s AND bucket_date = ANY(%s) AND marked_at < %s
+                    """, (name, sorted(set(days)), now - self.watermark_overlap))
+                if prune_before is not None:
+                    cur.execute("DELETE FROM catalog_rollup_daily WHERE bucket_date < %s",
+                                (prune_before,))
+                self._save_state(cur, name, now, covered_from, watermark,
+                                 replace_covered=prune_before is not None)
+        except Exception as e:
+            self.logger.error(f"{name} 롤업 갱신 오류: {str(e)}")
+            raise
+        finally:
+            conn.close()
+
+        elapsed = (datetime.now() - started).total_seconds()
+        if ranges:
+            self.logger.info(
+                f"{name} 롤업 갱신: {len(set(days))}일 ({ranges[0][0]} ~ {ranges[-1][1] - timedelta(days=1)}), "
+                f"{elapsed:.2f}초"
+            )
+        return {'days': len(set(days)), 'ranges': len(ranges), 'elapsed_seconds': elapsed}
+
+    def _affected_sales_days(self, cur, since: datetime) -> List[date]:
+        """
+        워터마크 이후 생성/변경된 주문이 속한 날짜 + 삭제/이동된 주문의 이전 날짜
+
+        주문 항목 추가/수정/삭제는 트리거가 주문 updated_at 을 갱신하므로 주문 조회로 함께 잡힌다.
+        """
+        cur.execute("""
+            SELECT DATE(created_at) FROM orders
+            WHERE created_at >= %(since)s OR updated_at >= %(since)s
+            UNION
+            SELECT bucket_date FROM rollup_dirty_days
+            WHERE name = %(name)s
+        """, {'since': since, 'name': SALES_ROLLUP})
+        return [row[0] for row in cur.fetchall()]
+
+    def _recompute_sales(self, cur, start: date, end: date):
+        """[start, end) 구간 매출/고객 일 롤업 재집계"""
+        params = {'start': start, 'end': end}
+        cur.execute("""
+            DELETE FROM sales_rollup_daily_partitioned
+            WHERE bucket_date >= %(start)s AND bucket_date < %(end)s
+        """, params)
+        cur.execute("""
+            DELETE FROM customer_rollup_daily_partitioned
+            WHERE bucket_date >= %(start)s AND bucket_date < %(end)s
+        """, params)
+
+        # 전체 매출 - 주문 금액 기준 (기존 리포트의 total_amount 합계와 동일)
+        cur.execute("""
+            INSERT INTO sales_rollup_daily_partitioned
+                (bucket_date, dimension, dim_key, order_count, quantity, revenue)
+            SELECT DATE(created_at), 'total', '', COUNT(*), NULL, COALESCE(SUM(total_amount), 0)
+            FROM orders
+            WHERE created_at >= %(start)s AND created_at < %(end)s
+            GROUP BY DATE(created_at)
+        """, params)
+
+        # 상품/카테고리/공급사/마켓 - 주문 항목 기준, 한 번의 스캔으로 모든 차원 집계
+        cur.execute("""
+            INSERT INTO sales_rollup_daily_partitioned
+                (bucket_date, dimension, dim_key, order_count, quantity, revenue)
+            SELECT
+                DATE(o.created_at),
+                CASE
+                    WHEN GROUPING(p.id) = 0 THEN 'product'
+                    WHEN GROUPING(p.category) = 0 THEN 'category'
+                    WHEN GROUPING(p.supplier) = 0 THEN 'supplier'
+                    ELSE 'market'
+                END,
+                CASE
+                    WHEN GROUPING(p.id) = 0 THEN p.id::TEXT
+                    WHEN GROUPING(p.category) = 0 THEN COALESCE(p.category, '')
+                    WHEN GROUPING(p.supplier) = 0 THEN COALESCE(p.supplier, '')
+                    ELSE COALESCE(p.marketplace, '')
+                END,
+                COUNT(DISTINCT o.id),
+                SUM(oi.quantity),
+                COALESCE(SUM(oi.quantity * oi.price), 0)
+            FROM orders o
+            JOIN order_items oi ON o.id = oi.order_id
+            JOIN products p ON oi.product_id = p.id
+            WHERE o.created_at >= %(start)s AND o.created_at < %(end)s
+            GROUP BY DATE(o.created_at),
+                GROUPING SETS ((p.id), (p.category), (p.supplier), (p.marketplace))
+        """, params)
+
+        cur.execute("""
+            INSERT INTO customer_rollup_daily_partitioned
+                (bucket_date, customer_id, customer_name, order_count, total_spent, last_order_at)
+            SELECT
+                DATE(created_at),
+                COALESCE(customer_id, ''),
+                MAX(customer_name),
+                COUNT(*),
+                COALESCE(SUM(total_amount), 0),
+                MAX(created_at)
+            FROM orders
+            WHERE created_at >= %(start)s AND created_at < %(end)s
+            GROUP BY DATE(created_at), COALESCE(customer_id, '')
+        """, params)
+
+    def _recompute_weeks(self, cur, ranges: List[Tuple[date, date]]):
+        """재집계한 날짜가 속한 주의 주간 롤업을 일 롤업에서 다시 계산"""
+        weeks = sorted({
+            week_start(range_start + timedelta(days=i))
+            for range_start, range_end in ranges
+            for i in range((range_end - range_start).days)
+        })
+        runs: List[Tuple[date, date]] = []
+        for week in weeks:
+            if runs and runs[-1][1] == week:
+                runs[-1] = (runs[-1][0], week + timedelta(days=7))
+            else:
+                runs.append((week, week + timedelta(days=7)))
+
+        for start, end in runs:
+            params = {'start': start, 'end': end}
+            cur.execute("""
+                DELETE FROM sales_rollup_weekly
+                WHERE week_start >= %(start)s AND week_start < %(end)s
+            """, params)
+            cur.execute("""
+                INSERT INTO sales_rollup_weekly
+                    (week_start, dimension, dim_key, order_count, quantity, revenue)
+                SELECT
+                    DATE_TRUNC('week', bucket_date)::DATE,
+                    dimension,
+                    dim_key,
+                    SUM(order_count),
+                    SUM(quantity),
+                    SUM(revenue)
+                FROM sales_rollup_daily_partitioned
+                WHERE bucket_date >= %(start)s AND bucket_date < %(end)s
+                GROUP BY 1, 2, 3
+            """, params)
+
+    def _recompute_catalog(self, cur, start: date, end: date):
+        """[start, end) 구간 공급사 상품 카테고리 일 롤업 재집계"""
+        params = {'start': start, 'end': end}
+        cur.execute("""
+            DELETE FROM catalog_rollup_daily
+            WHERE bucket_date >= %(start)s AND bucket_date < %(end)s
+        """, params)
+        cur.execute("""
+            INSERT INTO catalog_rollup_daily
+                (bucket_date, category, product_count, price_sum, price_count)
+            SELECT
+                DATE(collected_at),
+                COALESCE(category, ''),
+                COUNT(*),
+                COALESCE(SUM(price), 0),
+                COUNT(price)
+            FROM supplier_products
+            WHERE collected_at >= %(start)s AND collected_at < %(end)s
+            GROUP BY DATE(collected_at), COALESCE(category, '')
+        """, params)
+
+    def _load_states(self, cur) -> Dict[str, Dict]:
+        cur.execute("SELECT name, watermark, covered_from, refreshed_at FROM rollup_state")
+        return {
+            row[0]: {'watermark': row[1], 'covered_from': row[2], 'refreshed_at': row[3]}
+            for row in cur.fetchall()
+        }
+
+    def _save_state(self, cur, name: str, now: datetime, covered_from: Optional[date] = None,
+                    watermark: Optional[datetime] = None, replace_covered: bool = False):
+        """
+        상태 저장 - 워터마크는 refresh() 에서만 전달되며(None 이면 유지),
+        재집계 시작 전에 읽은 시각을 사용하므로 집계 도중 들어온 주문은 다음 갱신에서 다시 처리됨
+
+        covered_from 은 기본적으로 더 이른 날짜를 유지하고, replace_covered 이면 그대로 덮어쓴다.
+        """
+        cur.execute("""
+            INSERT INTO rollup_state (name, watermark, covered_from, refreshed_at)
+            VALUES (%(name)s, %(watermark)s, %(covered_from)s, %(now)s)
+            ON CONFLICT (name) DO UPDATE SET
+                watermark = COALESCE(EXCLUDED.watermark, rollup_state.watermark),
+                covered_from = CASE WHEN %(replace_covered)s THEN EXCLUDED.covered_from ELSE LEAST(
+                    COALESCE(EXCLUDED.covered_from, rollup_state.covered_from),
+                    COALESCE(rollup_state.covered_from, EXCLUDED.covered_from)
+                ) END,
+                refreshed_at = EXCLUDED.refreshed_at
+        """, {'name': name, 'watermark': watermark, 'covered_from': covered_from,
+              'now': now, 'replace_covered': replace_covered})
+
+    # -- 조회 -------------------------------------------------------------
+
+    def covers(self, start: DateLike, end: Optional[DateLike] = None,
+               name: str = SALES_ROLLUP) -> bool:
+        """롤업으로 [start, end] 구간을 조회할 수 있는지 확인"""
+        conn = self.get_connection()
+        try:
+            with conn.cursor() as cur:
+                return rollup_is_fresh(cur, name, start, end, self.max_lag)
+        finally:
+            conn.close()
+
+    def _query(self, sql: str, params: Any = None, one: bool = False):
+        conn = self.get_connection()
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(sql, params)
+                return cur.fetchone() if one else cur.fetchall()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _bounds(start: DateLike, end: DateLike) -> Dict[str, date]:
+        """[start, end] (종료일 포함) → 반열린 구간 파라미터"""
+        return {'start': to_date(start), 'end': to_date(end) + timedelta(days=1)}
+
+    def sales_summary(self, start: DateLike, end: DateLike) -> Dict:
+        """기간 매출 요약 (주문 수, 매출, 평균 주문 금액, 고객 수)"""
+        params = self._bounds(start, end)
+        return self._query("""
+            SELECT
+                totals.total_orders,
+                totals.total_revenue,
+                totals.total_revenue / NULLIF(totals.total_orders, 0) as avg_order_value,
+                customers.unique_customers
+            FROM (
+                SELECT
+                    COALESCE(SUM(order_count), 0) as total_orders,
+                    SUM(revenue) as total_revenue
+                FROM sales_rollup_daily_partitioned
+                WHERE dimension = 'total'
+                  AND bucket_date >= %(start)s AND bucket_date < %(end)s
+            ) totals,
+            (
+                SELECT COUNT(DISTINCT NULLIF(customer_id, '')) as unique_customers
+                FROM customer_rollup_daily_partitioned
+                WHERE bucket_date >= %(start)s AND bucket_date < %(end)s
+            ) customers
+        """, params, one=True)
+
+    def daily_sales(self, start: DateLike, end: DateLike) -> List[Dict]:
+        """일별 주문 수/매출"""
+        return self._query("""
+            SELECT bucket_date as date, order_count, revenue
+            FROM sales_rollup_daily_partitioned
+            WHERE dimension = 'total'
+              AND bucket_date >= %(start)s AND bucket_date < %(end)s
+            ORDER BY bucket_date
+        """, self._bounds(start, end))
+
+    def dimension_sales(self, dimension: str, start: DateLike, end: DateLike,
+                        limit: Optional[int] = None) -> List[Dict]:
+        """
+        차원별 매출 (매출 내림차순)
+
+        완전한 주는 주간 롤업에서, 앞뒤 자투리 날짜는 일 롤업에서 읽어 합산
+        """
+        if dimension not in SALES_DIMENSIONS:
+            raise ValueError(f"지원하지 않는 롤업 차원: {dimension}")
+
+        bounds = self._bounds(start, end)
+        weeks, edges = split_weeks(bounds['start'], bounds['end'])
+        parts, params = [], {'dimension': dimension, 'limit': limit}
+        if weeks:
+            parts.append("""
+                SELECT dim_key, order_count, quantity, revenue FROM sales_rollup_weekly
+                WHERE dimension = %(dimension)s
+                  AND week_start >= %(week_from)s AND week_start < %(week_to)s
+            """)
+            params.update(week_from=weeks[0], week_to=weeks[1])
+        for i, (edge_start, edge_end) in enumerate(edges):
+            parts.append(f"""
+                SELECT dim_key, order_count, quantity, revenue FROM sales_rollup_daily_partitioned
+                WHERE dimension = %(dimension)s
+                  AND bucket_date >= %(edge_start_{i})s AND bucket_date < %(edge_end_{i})s
+            """)
+            params.update({f'edge_start_{i}': edge_start, f'edge_end_{i}': edge_end})
+        if not parts:
+            return []
+
+        return self._query(f"""
+            SELECT
+                NULLIF(dim_key, '') as dim_key,
+                SUM(order_count) as order_count,
+                SUM(quantity) as quantity_sold,
+                SUM(revenue) as revenue
+            FROM ({' UNION ALL '.join(parts)}) rollup
+            GROUP BY dim_key
+            ORDER BY revenue DESC
+            {'LIMIT %(limit)s' if limit else ''}
+        """, params)
+
+    def category_sales(self, start: DateLike, end: DateLike) -> List[Dict]:
+        """카테고리별 매출 (기존 리포트 형식)"""
+        return [
+            {'category': row['dim_key'], 'order_count': row['order_count'],
+             'quantity_sold': row['quantity_sold'], 'revenue': row['revenue']}
+            for row in self.dimension_sales('category', start, end)
+        ]
+
+    def top_products(self, start: DateLike, end: DateLike, limit: int = 10) -> List[Dict]:
+        """매출 상위 상품 (상품명/카테고리는 현재 상품 정보로 보완)"""
+        rows = self.dimension_sales('product', start, end, limit=limit)
+        if not rows:
+            return []
+        names = {
+            str(row['id']): row
+            for row in self._query(
+                "SELECT id, name, category FROM products WHERE id = ANY(%s)",
+                ([int(row['dim_key']) for row in rows],)
+            )
+        }
+        return [
+            {
+                'id': int(row['dim_key']),
+                'name': names.get(row['dim_key'], {}).get('name'),
+                'category': names.get(row['dim_key'], {}).get('category'),
+                'quantity_sold': row['quantity_sold'],
+                'revenue': row['revenue'],
+            }
+            for row in rows
+        ]
+
+    def customer_summary(self, start: DateLike, end: DateLike) -> Dict:
+        """고객 통계 (전체/신규/재구매 고객 수, 고객당 평균 구매액)"""
+        return self._query("""
+            SELECT
+                COUNT(DISTINCT customer_id) as total_customers,
+                COUNT(DISTINCT CASE WHEN order_count = 1 THEN customer_id END) as new_customers,
+                COUNT(DISTINCT CASE WHEN order_count > 1 THEN customer_id END) as repeat_customers,
+                AVG(total_spent) as avg_customer_value
+            FROM (
+                SELECT
+                    NULLIF(customer_id, '') as customer_id,
+                    SUM(order_count) as order_count,
+                    SUM(total_spent) as total_spent
+                FROM customer_rollup_daily_partitioned
+                WHERE bucket_date >= %(start)s AND bucket_date < %(end)s
+                GROUP BY customer_id
+            ) customer_stats
+        """, self._bounds(start, end), one=True)
+
+    def top_customers(self, start: DateLike, end: DateLike, limit: int = 20) -> List[Dict]:
+        """구매액 상위 고객"""
+        params = self._bounds(start, end)
+        params['limit'] = limit
+        return self._query("""
+            SELECT
+                NULLIF(customer_id, '') as customer_id,
+                MAX(customer_name) as customer_name,
+                SUM(order_count) as order_count,
+                SUM(total_spent) as total_spent,
+                SUM(total_spent) / NULLIF(SUM(order_count), 0) as avg_order_value,
+                MAX(last_order_at) as last_order_date
+            FROM customer_rollup_daily_partitioned
+            WHERE bucket_date >= %(start)s AND bucket_date < %(end)s
+            GROUP BY customer_id
+            ORDER BY total_spent DESC
+            LIMIT %(limit)s
+        """, params)
+
+    def customer_segments(self, start: DateLike, end: DateLike) -> List[Dict]:
+        """최근 구매일 기준 고객 세그먼트 (활성/휴면/이탈)"""
+        return self._query("""
+            WITH customer_rfm AS (
+                SELECT
+                    customer_id,
+                    MAX(last_order_at) as last_order_date,
+                    SUM(order_count) as frequency,
+                    SUM(total_spent) as monetary
+                FROM customer_rollup_daily_partitioned
+                WHERE bucket_date >= %(start)s AND bucket_date < %(end)s
+                GROUP BY customer_id
+            )
+            SELECT
+                CASE
+                    WHEN last_order_date >= CURRENT_DATE - INTERVAL '30 days' THEN '활성'
+                    WHEN last_order_date >= CURRENT_DATE - INTERVAL '90 days' THEN '휴면'
+                    ELSE '이탈'
+                END as segment,
+                COUNT(*) as customer_count,
+                AVG(frequency) as avg_frequency,
+                AVG(monetary) as avg_monetary
+            FROM customer_rfm
+            GROUP BY segment
+        """, self._bounds(start, end))
+
+    def drop_old_rollups(self, retention_months: int = 24):
+        """보관 기간이 지난 일 롤업 파티션 삭제"""
+        for table in self.PARTITIONED_TABLES:
+            self.drop_old_partitions(table, retention_months)
+
+
+def main():
+    """CLI 실행 (cron 등에서 주기적으로 refresh 실행)"""
+    parser = argparse.ArgumentParser(description='매출/카탈로그 롤업 관리')
+    parser.add_argument('command', choices=['refresh', 'rebuild', 'cleanup'],
+                        help='refresh: 증분 갱신, rebuild: 기간 재집계, cleanup: 오래된 파티션 삭제')
+    parser.add_argument('--days', type=int, default=35, help='rebuild 기간 (오늘부터 과거 일수)')
+    parser.add_argument('--retention-months', type=int, default=24, help='cleanup 보관 개월 수')
+    args = parser.parse_args()
+
+    manager = SalesRollupManager()
+    if args.command == 'refresh':
+        print(manager.refresh())
+    elif args.command == 'rebuild':
+        today = date.today()
+        print(manager.rebuild(today - timedelta(days=args.days), today))
+    else:
+        manager.drop_old_rollups(args.retention_months)
+
+
+if __name__ == "__main__":
+    main()
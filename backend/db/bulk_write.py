@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+일괄 쓰기 유틸리티
+- execute_values 한 번으로 실행하고, 실패하면 세이브포인트 안에서 반씩 나눠 재실행
+- 잘못된 행만 걸러내고 나머지는 같은 트랜잭션에 반영 (커밋은 호출자)
+"""
+from typing import Any, List, Optional, Sequence, Tuple
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+
+def bulk_execute(cursor, query: str, rows: Sequence[tuple], keys: Sequence[Any],
+                 template: Optional[str] = None) -> Tuple[List[tuple], List[Tuple[Any, str]]]:
+    """
+    execute_values 일괄 실행 (행 단위 오류 격리)
+
+    전체를 한 문장으로 실행하고, 실패하면 세이브포인트로 되돌린 뒤 절반씩 나눠 다시
+    실행한다. 잘못된 행이 k 개면 약 k * log2(n) 번의 문장으로 실패 행만 골라낸다.
+
+    Args:
+        cursor: 커서 (트랜잭션 진행 중)
+        query: VALUES %s 와 RETURNING 을 포함한 INSERT 문
+        rows: 행 튜플 목록
+        keys: 행별 식별자 (오류 보고용)
+        template: execute_values 템플릿
+
+    Returns:
+        (RETURNING 결과 목록 - 성공한 행의 입력 순서, [(식별자, 오류 메시지)])
+    """
+    returned: List[tuple] = []
+    failures: List[Tuple[Any, str]] = []
+    if rows:
+        _execute_isolated(cursor, query, list(rows), list(keys), template, returned, failures)
+    return returned, failures
+
+
+def _execute_isolated(cursor, query: str, rows: List[tuple], keys: List[Any],
+                      template: Optional[str], returned: List[tuple],
+                      failures: List[Tuple[Any, str]]):
+    cursor.execute("SAVEPOINT bulk_execute")
+    try:
+        result = execute_values(cursor, query, rows, template=template,
+                                page_size=len(rows), fetch=True)
+    except psycopg2.Error as e:
+        cursor.execute("ROLLBACK TO SAVEPOINT bulk_execute")
+        cursor.execute("RELEASE SAVEPOINT bulk_execute")
+        if len(rows) == 1:
+            failures.append((keys[0], str(e).strip()))
+            return
+        mid = len(rows) // 2
+        _execute_isolated(cursor, query, rows[:mid], keys[:mid], template, returned, failures)
+        _execute_isolated(cursor, query, rows[mid:], keys[mid:], template, returned, failures)
+        return
+
+    cursor.execute("RELEASE SAVEPOINT bulk_execute")
+    returned.extend(result)
@@ -10,6 +10,8 @@ import logging
 from typing import Dict, Any, Optional
 import threading
 
+from core.tracing import get_tracer
+
 logger = logging.getLogger(__name__)
 
 
@@ -62,7 +64,8 @@ class DatabasePool:
         
         while attempt < retry_count:
             try:
-                connection = self._pool.getconn()
+                with get_tracer().span('db.connection.acquire', kind='client', attempt=attempt + 1):
+                    connection = self._pool.getconn()
                 yield connection
                 break
             except psycopg2.pool.PoolError as e:
@@ -98,15 +101,22 @@ class DatabasePool:
     def execute_query(self, query: str, params: Optional[tuple] = None, 
                      fetch_one: bool = False, fetch_all: bool = True):
         """쿼리 실행 헬퍼"""
-        with self.get_cursor() as cursor:
+        with get_tracer().span('db.query', kind='client',
+                               **{'db.statement': ' '.join(query[:300].split())}) as span, \
+                self.get_cursor() as cursor:
             cursor.execute(query, params)
             
             if cursor.description is None:  # INSERT, UPDATE, DELETE
+                if span is not None:
+                    span.set_attribute('db.rowcount', cursor.rowcount)
                 return cursor.rowcount
             elif fetch_one:
                 return cursor.fetchone()
             elif fetch_all:
-                return cursor.fetchall()
+                rows = cursor.fetchall()
+                if span is not None:
+                    span.set_attribute('db.rowcount', len(rows))
+                return rows
             else:
                 return cursor
     
@@ -26,6 +26,10 @@ logger = logging.getLogger(__name__)
 # AI 모듈 임포트
 from ai.advanced.chatbot_api import app as chatbot_app
 from ai.advanced.model_manager import ModelManager
+from ai.inference_server import InferenceServer
+from core.tracing import TracingMiddleware, get_tracer
+from api.monitoring_routes import router as monitoring_router, metrics_router
+from monitoring.prometheus_exporter import start_multiprocess_writer, stop_multiprocess_writer
 
 # 데이터베이스 설정
 DATABASE_URL = os.getenv(
@@ -35,16 +39,20 @@ DATABASE_URL = os.getenv(
 
 # 전역 객체
 model_manager = None
+inference_server = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """애플리케이션 생명주기 관리"""
-    global model_manager
+    global model_manager, inference_server
     
     # 시작 시
     logger.info("AI/ML 서버 시작...")
     
+    # 워커별 메트릭 상태 기록 (METRICS_MULTIPROC_DIR 설정 시 /metrics 에서 병합)
+    start_multiprocess_writer()
+    
     # 모델 매니저 초기화
     model_manager = ModelManager({
         'registry_path': './model_registry',
@@ -52,6 +60,18 @@ async def lifespan(app: FastAPI):
         'email_alerts': False
     })
     
+    # 추론 서버 초기화 (프로덕션 모델은 시작 시 (모델, 버전) 별로 한 번만 로드)
+    inference_server = InferenceServer(
+        model_manager.registry,
+        max_batch_size=int(os.getenv("INFERENCE_MAX_BATCH_SIZE", "64")),
+        max_wait_ms=float(os.getenv("INFERENCE_MAX_WAIT_MS", "5")),
+        max_workers=int(os.getenv("INFERENCE_WORKERS", "2")),
+        monitor=model_manager.monitor
+    )
+    await inference_server.start()
+    loaded = await inference_server.load_production_models()
+    logger.info(f"추론 모델 로드 완료: {loaded}")
+    
     # 챗봇 데이터베이스 초기화
     try:
         from ai.advanced.nlp_chatbot import chatbot
@@ -64,6 +84,9 @@ async def lifespan(app: FastAPI):
     
     # 종료 시
     logger.info("AI/ML 서버 종료...")
+    await inference_server.shutdown()
+    stop_multiprocess_writer()
+    get_tracer().shutdown()
 
 
 # FastAPI 앱 생성
@@ -83,9 +106,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 요청 트레이싱 (TRACING_SAMPLE_RATE 비율 + 느린 요청은 항상 기록)
+app.add_middleware(TracingMiddleware)
+
 # 챗봇 라우터 마운트
 app.mount("/chatbot", chatbot_app)
 
+# 모니터링 API 및 Prometheus 스크레이프 경로 (/metrics)
+app.include_router(monitoring_router)
+app.include_router(metrics_router)
+
 
 # 루트 엔드포인트
 @app.get("/")
@@ -99,6 +129,7 @@ async def root():
             "models": "/api/models",
             "predictions": "/api/predict",
             "monitoring": "/api/monitoring",
+            "metrics": "/metrics",
             "health": "/health"
         }
     }
@@ -188,6 +219,12 @@ async def deploy_model(request: Dict[str, Any]):
             config=config
         )
         
+        # 배포된 버전을 추론 서버의 기본 버전으로 로드
+        if inference_server:
+            deployment['inference_version'] = await inference_server.load_model(
+                model_id, deployment['version']
+            )
+        
         return deployment
     except Exception as e:
         logger.error(f"Model deployment failed: {e}")
@@ -198,27 +235,79 @@ async def deploy_model(request: Dict[str, Any]):
 @app.post("/api/predict/{model_id}")
 async def predict(model_id: str, request: Dict[str, Any]):
     """모델 예측"""
-    if not model_manager:
+    if not model_manager or not inference_server:
         raise HTTPException(status_code=503, detail="Model manager not initialized")
     
+    instances = request.get("instances")
+    if not instances:
+        raise HTTPException(status_code=400, detail="instances가 필요합니다")
+    
+    version = request.get("version") or inference_server.loaded_version(model_id)
+    if not inference_server.is_registered(model_id, version):
+        raise HTTPException(
+            status_code=404,
+            detail=f"로드되지 않은 모델입니다: {model_id}" + (f" v{version}" if version else "")
+        )
+    
     try:
-        # 모델 로드
-        model_version = model_manager.registry.get_model(model_id)
+        # 동시 요청과 함께 (모델, 버전) 별 마이크로 배치로 예측
+        outputs = await inference_server.predict(model_id, instances, version)
         
-        # 예측 수행 (시뮬레이션)
-        prediction = {
+        return {
             "model_id": model_id,
-            "version": model_version.version,
-            "prediction": "시뮬레이션 예측 결과",
-            "confidence": 0.95
+            "version": version,
+            "predictions": outputs.tolist() if hasattr(outputs, "tolist") else outputs
         }
-        
-        return prediction
     except Exception as e:
         logger.error(f"Prediction failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/inference/stats")
+async def get_inference_stats():
+    """추론 서버 통계 (모델별 지연시간 / 배치 크기 히스토그램)"""
+    if not inference_server:
+        raise HTTPException(status_code=503, detail="Inference server not initialized")
+    
+    return inference_server.get_stats()
+
+
+@app.post("/api/inference/models/{model_id}/load")
+async def load_inference_model(model_id: str, request: Dict[str, Any] = None):
+    """추론 서버에 모델 버전 로드 (관리용)"""
+    if not inference_server:
+        raise HTTPException(status_code=503, detail="Inference server not initialized")
+    
+    request = request or {}
+    try:
+        version = await inference_server.load_model(
+            model_id,
+            request.get("version"),
+            make_default=request.get("default", True)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    return {
+        "model_id": model_id,
+        "version": version,
+        "default_version": inference_server.loaded_version(model_id)
+    }
+
+
+@app.delete("/api/inference/models/{model_id}")
+async def unload_inference_model(model_id: str, version: str):
+    """추론 서버에서 모델 버전 해제 (관리용)"""
+    if not inference_server:
+        raise HTTPException(status_code=503, detail="Inference server not initialized")
+    
+    if not inference_server.is_registered(model_id, version):
+        raise HTTPException(status_code=404, detail=f"로드되지 않은 모델입니다: {model_id} v{version}")
+    
+    inference_server.unregister(model_id, version)
+    return {"model_id": model_id, "version": version, "status": "unloaded"}
+
+
 # 모니터링 API
 @app.get("/api/monitoring/{model_id}")
 async def get_monitoring_data(model_id: str, hours: int = 24):
@@ -3,15 +3,23 @@
 """
 
 from .category_client import CoupangCategoryClient
+from .metadata_cache import CategoryMetadataCache
 from .option_validator import CoupangOptionValidator
 from .category_recommendation_client import CoupangCategoryRecommendationClient
 from .category_manager import CoupangCategoryManager
 from .excel_category_parser import CoupangExcelCategoryParser
+from .category_search_index import CategorySearchIndex
+from .category_artifact import CompiledCategoryStore, load_category_artifact, save_category_artifact
 
 __all__ = [
     'CoupangCategoryClient', 
+    'CategoryMetadataCache',
     'CoupangOptionValidator', 
     'CoupangCategoryRecommendationClient',
     'CoupangCategoryManager',
-    'CoupangExcelCategoryParser'
+    'CoupangExcelCategoryParser',
+    'CategorySearchIndex',
+    'CompiledCategoryStore',
+    'load_category_artifact',
+    'save_category_artifact'
 ]
\ No newline at end of file
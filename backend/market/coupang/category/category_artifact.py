@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+쿠팡 카테고리 컴파일 아티팩트
+- JSON/Excel 원본을 미리 변환한 단일 바이너리 파일 (coupang_categories_data.catbin)
+- 헤더: 포맷 버전, 원본 스탬프(크기/수정 시각/해시), 카테고리 ID 오프셋 표, 미리 구축한 검색 인덱스
+- 본문: 카테고리별 JSON 레코드를 이어 붙인 영역 → mmap 후 조회 시점에 해당 레코드만 디코딩
+- 임시 파일에 쓴 뒤 os.replace 로 교체 (로드 중인 다른 프로세스는 이전 파일 유지)
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+
+ARTIFACT_MAGIC = b'CPCATBIN'
+ARTIFACT_FORMAT_VERSION = 1
+ARTIFACT_SUFFIX = '.catbin'
+
+# magic(8) + 포맷 버전(uint16) + 헤더 길이(uint64)
+_PREAMBLE = struct.Struct('<8sHQ')
+
+
+class ArtifactFormatError(Exception):
+    """아티팩트 포맷/버전 불일치"""
+    pass
+
+
+def artifact_path_for(source_path: str) -> str:
+    """원본 JSON 경로 → 컴파일 아티팩트 경로"""
+    return os.path.splitext(source_path)[0] + ARTIFACT_SUFFIX
+
+
+def source_stamp(source_path: str, with_hash: bool = True) -> Dict[str, Any]:
+    """원본 파일 스탬프 (크기, 수정 시각, SHA-256)"""
+    stat = os.stat(source_path)
+    stamp = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    if with_hash:
+        digest = hashlib.sha256()
+        with open(source_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        stamp['sha256'] = digest.hexdigest()
+    return stamp
+
+
+def save_category_artifact(path: str,
+                           categories: Mapping[str, Dict[str, Any]],
+                           indexes: Optional[Dict[str, Any]] = None,
+                           source: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    카테고리 아티팩트 저장
+
+    Args:
+        path: 저장 경로
+        categories: 카테고리 ID → 카테고리 정보
+        indexes: 미리 구축한 인덱스 (pickle 가능한 구조)
+        source: 원본 스탬프 (source_stamp 결과)
+
+    Returns:
+        아티팩트 메타데이터
+    """
+    ids = []
+    offsets = array('Q', [0])
+    body = bytearray()
+    for category_id, category in categories.items():
+        ids.append(category_id)
+        body += json.dumps(category, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        offsets.append(len(body))
+
+    metadata = {
+        'format_version': ARTIFACT_FORMAT_VERSION,
+        'total_categories': len(ids),
+        'content_hash': hashlib.sha256(body).hexdigest(),
+        'source': source or {},
+        'created_at': datetime.now().isoformat(),
+    }
+    header = pickle.dumps({
+        'metadata': metadata,
+        'ids': ids,
+        'offsets': offsets.tobytes(),
+        'indexes': indexes or {},
+    }, protocol=pickle.HIGHEST_PROTOCOL)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(_PREAMBLE.pack(ARTIFACT_MAGIC, ARTIFACT_FORMAT_VERSION, len(header)))
+        f.write(header)
+        f.write(body)
+    os.replace(tmp_path, path)
+
+    return metadata
+
+
+def is_artifact_fresh(metadata: Optional[Dict[str, Any]], source_path: str) -> bool:
+    """
+    아티팩트가 원본과 일치하는지 확인
+
+    크기/수정 시각이 같으면 해시 계산 없이 최신으로 보고,
+    수정 시각만 바뀐 경우(복사/체크아웃)는 해시로 다시 비교한다.
+    """
+    if metadata is None or metadata.get('format_version') != ARTIFACT_FORMAT_VERSION:
+        return False
+    if not os.path.exists(source_path):
+        return True  # 원본 없이 아티팩트만 배포된 경우
+
+    recorded = metadata.get('source') or {}
+    current = source_stamp(source_path, with_hash=False)
+    if recorded.get('size') != current['size']:
+        return False
+    if recorded.get('mtime_ns') == current['mtime_ns']:
+        return True
+    return recorded.get('sha256') == source_stamp(source_path)['sha256']
+
+
+class CompiledCategoryStore(Mapping):
+    """
+    mmap 기반 읽기 전용 카테고리 저장소 (dict 와 같은 인터페이스)
+
+    레코드는 조회 시점에 디코딩하고 결과를 보관한다. 여러 워커 프로세스가
+    같은 파일을 열면 본문 페이지는 OS 페이지 캐시를 공유한다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            preamble = self._file.read(_PREAMBLE.size)
+            if len(preamble) < _PREAMBLE.size:
+                raise ArtifactFormatError(f"아티팩트 헤더 손상: {path}")
+            magic, version, header_size = _PREAMBLE.unpack(preamble)
+            if magic != ARTIFACT_MAGIC or version != ARTIFACT_FORMAT_VERSION:
+                raise ArtifactFormatError(f"지원하지 않는 아티팩트 포맷: {path} (version {version})")
+
+            header = pickle.loads(self._file.read(header_size))
+            self._body_start = _PREAMBLE.size + header_size
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+        self.metadata: Dict[str, Any] = header['metadata']
+        self.indexes: Dict[str, Any] = header['indexes']
+        self._ids = header['ids']
+        self._positions = {category_id: position for position, category_id in enumerate(self._ids)}
+        self._offsets = array('Q')
+        self._offsets.frombytes(header['offsets'])
+        self._decoded: Dict[str, Dict[str, Any]] = {}
+
+    def __getitem__(self, category_id: str) -> Dict[str, Any]:
+        category = self._decoded.get(category_id)
+        if category is not None:
+            return category
+
+        position = self._positions[category_id]
+        start = self._body_start + self._offsets[position]
+        end = self._body_start + self._offsets[position + 1]
+        category = json.loads(self._mmap[start:end])
+        self._decoded[category_id] = category
+        return category
+
+    def __contains__(self, category_id: object) -> bool:
+        return category_id in self._positions
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def close(self):
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> 'CompiledCategoryStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_category_artifact(path: str, verify: bool = False) -> Tuple[CompiledCategoryStore, Dict[str, Any]]:
+    """
+    카테고리 아티팩트 로드
+
+    Args:
+        path: 아티팩트 경로
+        verify: 본문 해시를 다시 계산해 메타데이터와 비교
+
+    Returns:
+        (카테고리 저장소, 미리 구축한 인덱스)
+    """
+    store = CompiledCategoryStore(path)
+    if verify:
+        body = store._mmap[store._body_start:]
+        if hashlib.sha256(body).hexdigest() != store.metadata.get('content_hash'):
+            store.close()
+            raise ArtifactFormatError(f"콘텐츠 해시 불일치: {path}")
+    return store, store.indexes
+
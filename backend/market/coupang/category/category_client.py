@@ -9,7 +9,8 @@ import ssl
 import json
 import urllib.request
 import urllib.parse
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Any
 
 # 상위 디렉토리 import를 위한 경로 추가
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -17,6 +18,7 @@ parent_dir = os.path.dirname(current_dir)
 sys.path.insert(0, parent_dir)
 
 from auth import CoupangAuth
+from .metadata_cache import CategoryMetadataCache, DEFAULT_CACHE_DIR, DEFAULT_TTL_SECONDS
 
 
 class CoupangCategoryClient:
@@ -28,7 +30,12 @@ class CoupangCategoryClient:
     CATEGORY_STATUS_API_PATH = "/v2/providers/seller_api/apis/api/v1/marketplace/meta/display-categories"
     
     def __init__(self, access_key: Optional[str] = None, secret_key: Optional[str] = None, 
-                 vendor_id: Optional[str] = None):
+                 vendor_id: Optional[str] = None,
+                 cache: Optional[CategoryMetadataCache] = None,
+                 use_cache: bool = True,
+                 cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                 cache_ttl: float = DEFAULT_TTL_SECONDS,
+                 max_workers: int = 8):
         """
         카테고리 클라이언트 초기화
         
@@ -36,6 +43,11 @@ class CoupangCategoryClient:
             access_key: 쿠팡 액세스 키
             secret_key: 쿠팡 시크릿 키  
             vendor_id: 쿠팡 벤더 ID
+            cache: 공유할 메타정보 캐시 (없으면 cache_dir / cache_ttl 로 생성)
+            use_cache: 메타정보 / 노출 카테고리 응답 캐시 사용 여부
+            cache_dir: 디스크 캐시 디렉토리 (None 이면 메모리만 사용)
+            cache_ttl: 캐시 유효 시간 (초, 만료 후 ETag 로 재검증)
+            max_workers: 동시 프리페치 스레드 수
         """
         self.auth = CoupangAuth(access_key, secret_key, vendor_id)
         
@@ -43,6 +55,78 @@ class CoupangCategoryClient:
         self.ssl_context = ssl.create_default_context()
         self.ssl_context.check_hostname = False
         self.ssl_context.verify_mode = ssl.CERT_NONE
+        
+        # 응답 캐시 / 동시 조회 설정
+        if cache is None and use_cache:
+            cache = CategoryMetadataCache(cache_dir, cache_ttl)
+        self.cache = cache
+        self.max_workers = max_workers
+    
+    def _open(self, api_path: str, cached: Optional[Dict[str, Any]] = None):
+        """
+        인증 헤더를 붙여 GET 요청 실행
+        
+        만료된 캐시 항목이 있으면 If-None-Match / If-Modified-Since 를 보내
+        변경이 없을 때 304 (HTTPError) 를 받는다.
+        """
+        headers = self.auth.generate_authorization_header("GET", api_path)
+        req = urllib.request.Request(f"{self.BASE_URL}{api_path}")
+        for key, value in headers.items():
+            req.add_header(key, value)
+        
+        if cached:
+            if cached.get('etag'):
+                req.add_header('If-None-Match', cached['etag'])
+            if cached.get('last_modified'):
+                req.add_header('If-Modified-Since', cached['last_modified'])
+        
+        return urllib.request.urlopen(req, context=self.ssl_context)
+    
+    def _cache_get(self, kind: str, code: int) -> Optional[Dict[str, Any]]:
+        return self.cache.get(kind, code) if self.cache else None
+    
+    def _cache_put(self, kind: str, code: int, result: Dict[str, Any], response) -> None:
+        if self.cache:
+            self.cache.put(kind, code, result,
+                           etag=response.headers.get('ETag'),
+                           last_modified=response.headers.get('Last-Modified'))
+    
+    def _fetch_many(self, fetch: Callable[[int], Any], codes: List[int]) -> Dict[int, Any]:
+        """
+        여러 코드 동시 조회 (중복 코드는 1회)
+        
+        Returns:
+            Dict[int, Any]: 코드 → 결과 (실패 시 예외 객체)
+        """
+        unique_codes = list(dict.fromkeys(codes))
+        
+        def _safe_fetch(code):
+            try:
+                return fetch(code)
+            except Exception as e:
+                return e
+        
+        if len(unique_codes) <= 1 or self.max_workers <= 1:
+            return {code: _safe_fetch(code) for code in unique_codes}
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(unique_codes))) as executor:
+            return dict(zip(unique_codes, executor.map(_safe_fetch, unique_codes)))
+    
+    def prefetch_metadata(self, display_category_codes: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        여러 카테고리 메타정보를 동시에 조회해 캐시에 적재
+        
+        Args:
+            display_category_codes: 노출카테고리코드 리스트
+            
+        Returns:
+            Dict[int, Dict[str, Any]]: 코드 → 메타정보 (조회 실패한 코드는 제외)
+        """
+        results = self._fetch_many(self.get_category_metadata, display_category_codes)
+        for code, result in results.items():
+            if isinstance(result, Exception):
+                print(f"⚠️ 카테고리 {code} 메타정보 조회 실패: {result}")
+        return {code: result for code, result in results.items() if not isinstance(result, Exception)}
     
     def get_category_metadata(self, display_category_code: int) -> Dict[str, Any]:
         """
@@ -61,34 +145,17 @@ class CoupangCategoryClient:
         if not isinstance(display_category_code, int) or display_category_code <= 0:
             raise ValueError("노출카테고리코드는 양수여야 합니다")
         
+        # 캐시 확인 (유효하면 API 호출 없음)
+        cached = self._cache_get('metadata', display_category_code)
+        if cached and cached['fresh']:
+            return cached['payload']
+        
         # API 경로 생성 (vendor_id 없이 직접 사용)
         path = f"{self.CATEGORY_API_PATH}/{display_category_code}"
         
-        # 인증 헤더 생성
-        headers = self.auth.generate_authorization_header("GET", path)
-        
-        # URL 생성
-        url = f"{self.BASE_URL}{path}"
-        
         try:
-            import ssl
-            import json
-            import urllib.request
-            
-            # SSL 컨텍스트 설정
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            
-            # 요청 객체 생성
-            req = urllib.request.Request(url)
-            
-            # 헤더 추가
-            for key, value in headers.items():
-                req.add_header(key, value)
-            
             # 요청 실행
-            response = urllib.request.urlopen(req, context=ssl_context)
+            response = self._open(path, cached)
             
             # 응답 읽기
             charset = response.headers.get_content_charset() or 'utf-8'
@@ -98,11 +165,15 @@ class CoupangCategoryClient:
             result = json.loads(response_data)
             
             if result.get('code') == 'SUCCESS':
+                self._cache_put('metadata', display_category_code, result, response)
                 return result
             else:
                 raise Exception(f"API 오류: {result.get('message', '알 수 없는 오류')}")
                 
         except urllib.request.HTTPError as e:
+            if e.code == 304 and cached:
+                return self.cache.touch('metadata', display_category_code)
+            
             error_body = e.read().decode('utf-8') if e.fp else str(e)
             
             if e.code == 400:
@@ -113,6 +184,10 @@ class CoupangCategoryClient:
             
             raise Exception(f"HTTP 오류 {e.code}: {error_body}")
         except urllib.request.URLError as e:
+            if cached:
+                # 네트워크 장애 시 만료된 캐시라도 사용
+                print(f"⚠️ 네트워크 오류 - 만료된 메타정보 캐시 사용 ({display_category_code}): {e.reason}")
+                return cached['payload']
             raise Exception(f"URL 오류: {e.reason}")
         except json.JSONDecodeError as e:
             raise Exception(f"JSON 파싱 오류: {e}")
@@ -238,25 +313,17 @@ class CoupangCategoryClient:
         if not isinstance(display_category_code, int) or display_category_code < 0:
             raise ValueError("노출카테고리코드는 0 이상의 숫자여야 합니다")
         
+        # 캐시 확인 (유효하면 API 호출 없음)
+        cached = self._cache_get('display', display_category_code)
+        if cached and cached['fresh']:
+            return cached['payload']
+        
         # API 경로 생성
         api_path = f"{self.DISPLAY_CATEGORY_API_PATH}/{display_category_code}"
         
         try:
-            # 인증 헤더 생성 (GET 요청)
-            headers = self.auth.generate_authorization_header("GET", api_path)
-            
-            # URL 생성
-            url = f"{self.BASE_URL}{api_path}"
-            
-            # 요청 객체 생성
-            req = urllib.request.Request(url)
-            
-            # 헤더 추가
-            for key, value in headers.items():
-                req.add_header(key, value)
-            
             # 요청 실행
-            response = urllib.request.urlopen(req, context=self.ssl_context)
+            response = self._open(api_path, cached)
             
             # 응답 읽기
             charset = response.headers.get_content_charset() or 'utf-8'
@@ -267,11 +334,15 @@ class CoupangCategoryClient:
             
             # 응답 검증
             if result.get('code') == 'SUCCESS':
+                self._cache_put('display', display_category_code, result, response)
                 return result
             else:
                 raise Exception(f"API 오류 (코드: {result.get('code')}): {result.get('message', '알 수 없는 오류')}")
                 
         except urllib.request.HTTPError as e:
+            if e.code == 304 and cached:
+                return self.cache.touch('display', display_category_code)
+            
             error_body = e.read().decode('utf-8') if e.fp else str(e)
             
             # 구체적인 오류 메시지 처리
@@ -286,6 +357,9 @@ class CoupangCategoryClient:
                 raise Exception(f"HTTP 오류 {e.code}: {error_body}")
                 
         except urllib.request.URLError as e:
+            if cached:
+                print(f"⚠️ 네트워크 오류 - 만료된 카테고리 캐시 사용 ({display_category_code}): {e.reason}")
+                return cached['payload']
             raise Exception(f"네트워크 오류: {e.reason}")
         except json.JSONDecodeError as e:
             raise Exception(f"응답 파싱 오류: {e}")
@@ -309,7 +383,9 @@ class CoupangCategoryClient:
     
     def get_category_hierarchy(self, display_category_code: int, max_depth: int = 3) -> Dict[str, Any]:
         """
-        카테고리 계층 구조 조회 (재귀적으로 하위 카테고리까지)
+        카테고리 계층 구조 조회 (하위 카테고리까지)
+        
+        깊이 단위로 같은 깊이의 노드를 동시에 조회한다 (노드당 순차 요청 대신 깊이당 1회 대기).
         
         Args:
             display_category_code: 시작 노출카테고리코드
@@ -318,40 +394,54 @@ class CoupangCategoryClient:
         Returns:
             Dict[str, Any]: 카테고리 계층 구조
         """
-        def _get_hierarchy_recursive(code: int, current_depth: int = 0) -> Dict[str, Any]:
-            """재귀적으로 카테고리 계층 구조 조회"""
-            if current_depth >= max_depth:
+        if max_depth <= 0:
+            return None
+        
+        responses: Dict[int, Any] = {}
+        level = [display_category_code]
+        for depth in range(max_depth):
+            fetched = self._fetch_many(self.get_display_categories, level)
+            responses.update(fetched)
+            
+            if depth >= max_depth - 1:
+                break
+            level = [
+                child.get('displayItemCategoryCode')
+                for result in fetched.values() if not isinstance(result, Exception)
+                for child in result.get('data', {}).get('child', [])
+                if child.get('displayItemCategoryCode')
+            ]
+            if not level:
+                break
+        
+        def _build(code: int, current_depth: int) -> Optional[Dict[str, Any]]:
+            response = responses.get(code)
+            if response is None:
                 return None
-            
-            try:
-                response = self.get_display_categories(code)
-                data = response.get('data', {})
-                
-                category_info = {
-                    "displayCategoryCode": data.get('displayItemCategoryCode'),
-                    "name": data.get('name'),
-                    "status": data.get('status'),
-                    "depth": current_depth,
-                    "children": []
-                }
-                
-                # 하위 카테고리가 있으면 재귀 호출
-                children = data.get('child', [])
-                if children and current_depth < max_depth - 1:
-                    for child in children:
-                        child_code = child.get('displayItemCategoryCode')
-                        if child_code:
-                            child_hierarchy = _get_hierarchy_recursive(child_code, current_depth + 1)
-                            if child_hierarchy:
-                                category_info["children"].append(child_hierarchy)
-                
-                return category_info
-                
-            except Exception as e:
-                print(f"⚠️ 카테고리 {code} 조회 실패: {e}")
+            if isinstance(response, Exception):
+                print(f"⚠️ 카테고리 {code} 조회 실패: {response}")
                 return None
+            
+            data = response.get('data', {})
+            category_info = {
+                "displayCategoryCode": data.get('displayItemCategoryCode'),
+                "name": data.get('name'),
+                "status": data.get('status'),
+                "depth": current_depth,
+                "children": []
+            }
+            
+            if current_depth < max_depth - 1:
+                for child in data.get('child', []):
+                    child_code = child.get('displayItemCategoryCode')
+                    if child_code:
+                        child_hierarchy = _build(child_code, current_depth + 1)
+                        if child_hierarchy:
+                            category_info["children"].append(child_hierarchy)
+            
+            return category_info
         
-        return _get_hierarchy_recursive(display_category_code)
+        return _build(display_category_code, 0)
     
     def search_categories_by_name(self, search_name: str) -> List[Dict[str, Any]]:
         """
@@ -368,27 +458,29 @@ class CoupangCategoryClient:
         # 1 Depth 카테고리들을 가져와서 검색
         first_depth_categories = self.get_all_first_depth_categories()
         
+        # 하위 카테고리 (2 Depth) 동시 조회
+        child_responses = self._fetch_many(
+            self.get_display_categories,
+            [category.get('displayItemCategoryCode', 0) for category in first_depth_categories]
+        )
+        
         for category in first_depth_categories:
             if search_name.lower() in category.get('name', '').lower():
                 results.append(category)
                 
             # 하위 카테고리도 검색 (2 Depth까지)
-            try:
-                child_response = self.get_display_categories(category.get('displayItemCategoryCode', 0))
-                child_data = child_response.get('data', {})
-                child_categories = child_data.get('child', [])
-                
-                for child in child_categories:
-                    if search_name.lower() in child.get('name', '').lower():
-                        # 상위 카테고리 정보도 포함
-                        child_with_parent = child.copy()
-                        child_with_parent['parentName'] = category.get('name')
-                        child_with_parent['parentCode'] = category.get('displayItemCategoryCode')
-                        results.append(child_with_parent)
-                        
-            except Exception as e:
+            child_response = child_responses.get(category.get('displayItemCategoryCode', 0))
+            if isinstance(child_response, Exception) or child_response is None:
                 # 개별 카테고리 조회 실패는 무시하고 계속 진행
                 continue
+            
+            for child in child_response.get('data', {}).get('child', []):
+                if search_name.lower() in child.get('name', '').lower():
+                    # 상위 카테고리 정보도 포함
+                    child_with_parent = child.copy()
+                    child_with_parent['parentName'] = category.get('name')
+                    child_with_parent['parentCode'] = category.get('displayItemCategoryCode')
+                    results.append(child_with_parent)
         
         return results
     
@@ -415,20 +507,20 @@ class CoupangCategoryClient:
                 if category.get('displayItemCategoryCode') == display_category_code:
                     return current_name
             
-            # 2 Depth 이상인 경우 상위 카테고리 찾기
+            # 2 Depth 이상인 경우 상위 카테고리 찾기 (하위 목록 동시 조회)
+            parent_responses = self._fetch_many(
+                self.get_display_categories,
+                [parent.get('displayItemCategoryCode', 0) for parent in first_depth_categories]
+            )
             for parent_category in first_depth_categories:
-                try:
-                    parent_response = self.get_display_categories(parent_category.get('displayItemCategoryCode', 0))
-                    parent_data = parent_response.get('data', {})
-                    children = parent_data.get('child', [])
-                    
-                    for child in children:
-                        if child.get('displayItemCategoryCode') == display_category_code:
-                            parent_name = parent_category.get('name', '알 수 없음')
-                            return f"{parent_name} > {current_name}"
-                            
-                except Exception:
+                parent_response = parent_responses.get(parent_category.get('displayItemCategoryCode', 0))
+                if isinstance(parent_response, Exception) or parent_response is None:
                     continue
+                
+                for child in parent_response.get('data', {}).get('child', []):
+                    if child.get('displayItemCategoryCode') == display_category_code:
+                        parent_name = parent_category.get('name', '알 수 없음')
+                        return f"{parent_name} > {current_name}"
             
             return current_name
             
@@ -567,11 +659,16 @@ class CoupangCategoryClient:
         
         print(f"📊 {len(category_codes)}개 카테고리 일괄 유효성 검사 시작...")
         
+        # 중복 제거 후 동시 조회, 결과는 입력 순서대로 정리
+        status_results = self._fetch_many(self.check_category_status, category_codes)
+        
         for i, code in enumerate(category_codes, 1):
-            print(f"   📦 {i}/{len(category_codes)} - 카테고리 {code} 검사 중...")
+            print(f"   📦 {i}/{len(category_codes)} - 카테고리 {code} 검사 결과 정리...")
             
             try:
-                status_result = self.check_category_status(code)
+                status_result = status_results[code]
+                if isinstance(status_result, Exception):
+                    raise status_result
                 
                 detail = {
                     "categoryCode": code,
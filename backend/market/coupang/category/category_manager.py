@@ -18,6 +18,11 @@ sys.path.insert(0, project_root)
 
 from market.coupang.category.category_client import CoupangCategoryClient
 from market.coupang.category.category_recommendation_client import CoupangCategoryRecommendationClient
+from market.coupang.category.category_search_index import CategorySearchIndex, build_category_indexes
+from market.coupang.category.category_artifact import (
+    ARTIFACT_SUFFIX, artifact_path_for, is_artifact_fresh, load_category_artifact,
+    save_category_artifact, source_stamp
+)
 
 
 class CoupangCategoryManager:
@@ -27,7 +32,8 @@ class CoupangCategoryManager:
                  access_key: Optional[str] = None, 
                  secret_key: Optional[str] = None, 
                  vendor_id: Optional[str] = None,
-                 categories_data_path: Optional[str] = None):
+                 categories_data_path: Optional[str] = None,
+                 use_compiled: bool = True):
         """
         카테고리 매니저 초기화
         
@@ -35,7 +41,8 @@ class CoupangCategoryManager:
             access_key: 쿠팡 액세스 키
             secret_key: 쿠팡 시크릿 키
             vendor_id: 쿠팡 벤더 ID
-            categories_data_path: 카테고리 데이터 JSON 파일 경로
+            categories_data_path: 카테고리 데이터 JSON 파일 경로 (또는 .catbin 아티팩트)
+            use_compiled: 컴파일 아티팩트 사용 여부 (없거나 오래되면 JSON 로드 후 생성)
         """
         # API 클라이언트들 초기화
         self.api_client = CoupangCategoryClient(access_key, secret_key, vendor_id) if access_key else None
@@ -44,20 +51,45 @@ class CoupangCategoryManager:
         # 오프라인 카테고리 데이터 로드
         self.categories_data = {}
         self.categories_index = {}  # 빠른 검색을 위한 인덱스
+        self.name_index = CategorySearchIndex()  # 카테고리명 검색 (n-gram / 자모)
+        self.path_index = CategorySearchIndex()  # 전체 경로 검색
+        self.use_compiled = use_compiled
+        self.artifact_metadata: Optional[Dict[str, Any]] = None
         
         if not categories_data_path:
             categories_data_path = os.path.join(current_dir, "coupang_categories_data.json")
         
-        self.load_offline_data(categories_data_path)
-        self._build_search_index()
+        if not self.load_offline_data(categories_data_path):
+            self._build_search_index()
+            if use_compiled and self.categories_data:
+                self.compile_offline_data(categories_data_path)
     
-    def load_offline_data(self, data_path: str) -> None:
+    def load_offline_data(self, data_path: str) -> bool:
         """
         오프라인 카테고리 데이터 로드
         
+        최신 컴파일 아티팩트가 있으면 레코드를 mmap 으로 열고 미리 구축한
+        인덱스를 그대로 사용한다. 없거나 원본보다 오래되면 JSON 을 읽는다.
+        
         Args:
-            data_path: JSON 데이터 파일 경로
+            data_path: JSON 데이터 파일 경로 (또는 .catbin 아티팩트)
+            
+        Returns:
+            bool: 검색 인덱스까지 아티팩트에서 로드했으면 True
         """
+        if data_path.endswith(ARTIFACT_SUFFIX):
+            artifact_path, source_path = data_path, None
+        else:
+            artifact_path, source_path = artifact_path_for(data_path), data_path
+        
+        if (self.use_compiled or source_path is None) and os.path.exists(artifact_path):
+            if self._load_artifact(artifact_path, source_path):
+                return True
+        
+        if source_path is None:
+            print(f"⚠️ 카테고리 아티팩트 로드 실패: {artifact_path}")
+            return False
+        
         try:
             if os.path.exists(data_path):
                 with open(data_path, 'r', encoding='utf-8') as f:
@@ -72,49 +104,60 @@ class CoupangCategoryManager:
         except Exception as e:
             print(f"❌ 카테고리 데이터 로드 오류: {e}")
             self.categories_data = {}
+        return False
+    
+    def _load_artifact(self, artifact_path: str, source_path: Optional[str]) -> bool:
+        """컴파일 아티팩트 로드 (포맷/원본 스탬프 불일치 시 False)"""
+        try:
+            store, indexes = load_category_artifact(artifact_path)
+        except Exception as e:
+            print(f"⚠️ 카테고리 아티팩트 로드 오류: {e}")
+            return False
+        
+        if (source_path and not is_artifact_fresh(store.metadata, source_path)) or 'categories_index' not in indexes:
+            store.close()
+            print(f"⚠️ 카테고리 아티팩트가 원본과 다름 - JSON 에서 다시 생성: {artifact_path}")
+            return False
+        
+        self.categories_data = store
+        self.categories_index = indexes['categories_index']
+        self.name_index = CategorySearchIndex.from_state(indexes['name_index'])
+        self.path_index = CategorySearchIndex.from_state(indexes['path_index'])
+        self.artifact_metadata = store.metadata
+        print(f"✅ 카테고리 아티팩트 로드 완료: {len(store)}개 카테고리")
+        return True
     
     def _build_search_index(self) -> None:
         """검색 인덱스 구축"""
-        self.categories_index = {
-            "by_name": {},      # 카테고리명으로 검색
-            "by_path": {},      # 경로로 검색  
-            "by_level": {},     # 레벨별 분류
-            "by_file": {},      # 파일 카테고리별 분류
-            "by_commission": {} # 수수료율별 분류
-        }
+        self.categories_index, self.name_index, self.path_index = build_category_indexes(self.categories_data)
+    
+    def compile_offline_data(self, source_path: str, output_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        현재 카테고리 데이터와 검색 인덱스를 아티팩트로 저장 (다음 시작부터 재구축 생략)
         
-        for category_id, category in self.categories_data.items():
-            # 이름으로 인덱싱
-            if category.get('path'):
-                path_parts = category['path'].split('>')
-                for part in path_parts:
-                    part = part.strip()
-                    if part not in self.categories_index["by_name"]:
-                        self.categories_index["by_name"][part] = []
-                    self.categories_index["by_name"][part].append(category_id)
-            
-            # 경로로 인덱싱
-            if category.get('path'):
-                self.categories_index["by_path"][category['path']] = category_id
-            
-            # 레벨별 인덱싱
-            level = category.get('level', 0)
-            if level not in self.categories_index["by_level"]:
-                self.categories_index["by_level"][level] = []
-            self.categories_index["by_level"][level].append(category_id)
-            
-            # 파일별 인덱싱
-            file_cat = category.get('file_category', 'unknown')
-            if file_cat not in self.categories_index["by_file"]:
-                self.categories_index["by_file"][file_cat] = []
-            self.categories_index["by_file"][file_cat].append(category_id)
+        Args:
+            source_path: 원본 JSON 경로 (스탬프 기록용)
+            output_path: 저장 경로 (기본: 원본 경로의 .catbin)
             
-            # 수수료율별 인덱싱
-            commission = category.get('commission_rate')
-            if commission:
-                if commission not in self.categories_index["by_commission"]:
-                    self.categories_index["by_commission"][commission] = []
-                self.categories_index["by_commission"][commission].append(category_id)
+        Returns:
+            Optional[Dict[str, Any]]: 아티팩트 메타데이터 (실패 시 None)
+        """
+        try:
+            metadata = save_category_artifact(
+                output_path or artifact_path_for(source_path),
+                self.categories_data,
+                indexes={
+                    'categories_index': self.categories_index,
+                    'name_index': self.name_index.to_state(),
+                    'path_index': self.path_index.to_state(),
+                },
+                source=source_stamp(source_path) if os.path.exists(source_path) else None,
+            )
+            print(f"💾 카테고리 아티팩트 저장: {metadata['total_categories']}개 카테고리")
+            return metadata
+        except Exception as e:
+            print(f"⚠️ 카테고리 아티팩트 저장 실패: {e}")
+            return None
     
     def get_category_info(self, category_id: str, use_api: bool = False) -> Dict[str, Any]:
         """
@@ -173,25 +216,28 @@ class CoupangCategoryManager:
         results = []
         
         if search_type == "name":
-            # 카테고리명으로 검색 (부분 일치)
-            for name, category_ids in self.categories_index["by_name"].items():
-                if query.lower() in name.lower():
-                    for cat_id in category_ids[:limit]:
-                        if cat_id in self.categories_data:
-                            results.append({
-                                "category_id": cat_id,
-                                "matched_name": name,
-                                "category_info": self.categories_data[cat_id]
-                            })
+            # 카테고리명으로 검색 (부분 일치, 정확/접두어 일치 우선)
+            for name, score, category_ids in self.name_index.search(query, limit):
+                for cat_id in category_ids[:limit]:
+                    if cat_id in self.categories_data:
+                        results.append({
+                            "category_id": cat_id,
+                            "matched_name": name,
+                            "score": score,
+                            "category_info": self.categories_data[cat_id]
+                        })
+                if len(results) >= limit:
+                    break
         
         elif search_type == "path":
             # 경로로 검색 (부분 일치)
-            for path, category_id in self.categories_index["by_path"].items():
-                if query.lower() in path.lower():
+            for path, score, category_ids in self.path_index.search(query, limit):
+                for category_id in category_ids:
                     if category_id in self.categories_data:
                         results.append({
                             "category_id": category_id,
                             "matched_path": path,
+                            "score": score,
                             "category_info": self.categories_data[category_id]
                         })
         
@@ -206,6 +252,22 @@ class CoupangCategoryManager:
         
         return results[:limit]
     
+    def autocomplete_categories(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        카테고리명 자동완성 (입력 중인 한글 자모 포함)
+        
+        Args:
+            prefix: 입력 중인 검색어
+            limit: 결과 제한 수
+            
+        Returns:
+            List[Dict[str, Any]]: [{"name": 카테고리명, "category_ids": [...]}]
+        """
+        return [
+            {"name": name, "category_ids": self.name_index.lookup(name)}
+            for name in self.name_index.autocomplete(prefix, limit)
+        ]
+    
     def get_categories_by_level(self, level: int) -> List[Dict[str, Any]]:
         """
         레벨별 카테고리 조회
@@ -258,10 +320,7 @@ class CoupangCategoryManager:
             Dict[str, Any]: 추천 결과
         """
         if not self.recommendation_client:
-            return {
-                "success": False,
-                "error": "카테고리 추천 클라이언트가 초기화되지 않았습니다"
-            }
+            return self._recommend_category_offline(product_name)
         
         try:
             # API 추천 실행
@@ -284,6 +343,38 @@ class CoupangCategoryManager:
                 "error": f"카테고리 추천 오류: {str(e)}"
             }
     
+    def _recommend_category_offline(self, product_name: str) -> Dict[str, Any]:
+        """
+        API 클라이언트가 없을 때 상품명 단어로 카테고리 인덱스를 조회해 추천
+        
+        단어별 일치 카테고리에 점수를 누적하고, 더 깊은(구체적인) 카테고리를 우선한다.
+        """
+        scores: Dict[str, float] = {}
+        for word in re.split(r'\s+', product_name or ''):
+            if len(word) < 2:
+                continue
+            for name, score, category_ids in self.name_index.search(word, 10):
+                for cat_id in category_ids:
+                    scores[cat_id] = scores.get(cat_id, 0.0) + score
+        
+        if not scores:
+            return {
+                "success": False,
+                "error": "카테고리 추천 클라이언트가 초기화되지 않았습니다"
+            }
+        
+        category_id = max(
+            scores,
+            key=lambda cat_id: (scores[cat_id], self.categories_data.get(cat_id, {}).get('level', 0))
+        )
+        return {
+            "success": True,
+            "source": "offline",
+            "categoryId": category_id,
+            "score": scores[category_id],
+            "categoryDetail": self.categories_data.get(category_id)
+        }
+    
     def _enhance_category_info(self, category_info: Dict[str, Any]) -> Dict[str, Any]:
         """
         카테고리 정보 보강
@@ -314,15 +405,16 @@ class CoupangCategoryManager:
         
         # 유사 카테고리 찾기 (같은 상위 경로)
         if category_info.get('parent_path'):
-            similar_cats = self.search_categories(category_info['parent_path'], 'path', 5)
+            sibling_ids = self.categories_index.get("by_parent", {}).get(category_info['parent_path'], [])
             enhanced["similar_categories"] = [
                 {
-                    "id": cat["category_id"],
-                    "name": cat["category_info"]["path"].split(">")[-1] if cat["category_info"].get("path") else "Unknown"
+                    "id": cat_id,
+                    "name": self.categories_data[cat_id]["path"].split(">")[-1].strip()
+                    if self.categories_data[cat_id].get("path") else "Unknown"
                 }
-                for cat in similar_cats
-                if cat["category_id"] != category_info.get("id")
-            ]
+                for cat_id in sibling_ids[:6]
+                if cat_id != category_info.get("id") and cat_id in self.categories_data
+            ][:5]
         
         return enhanced
     
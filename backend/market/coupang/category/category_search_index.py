@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+쿠팡 카테고리 검색 인덱스
+- 소문자/공백 제거 정규화 형태를 로드 시 한 번만 계산
+- 글자 bigram 역색인으로 부분 일치 후보를 바로 찾고 점수순 정렬
+- 한글 자모 분해 정렬 목록으로 접두어 자동완성 (입력 중인 글자 '티ㅅ' → '티셔츠')
+"""
+
+import re
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+_HANGUL_BASE = 0xAC00
+_HANGUL_LAST = 0xD7A3
+_CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+_JUNGSEONG = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ'
+_JONGSEONG = ' ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ'
+
+_NORMALIZE_RE = re.compile(r'[\s\-_/·,.()\[\]]+')
+
+
+def normalize(text: str) -> str:
+    """검색용 정규화 (소문자, 공백/구분 기호 제거)"""
+    return _NORMALIZE_RE.sub('', text or '').lower()
+
+
+def decompose_jamo(text: str) -> str:
+    """한글 음절을 자모로 분해 ('티셔츠' → 'ㅌㅣㅅㅕㅊㅡ'), 그 외 문자는 그대로"""
+    result = []
+    for char in text:
+        code = ord(char)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            offset = code - _HANGUL_BASE
+            result.append(_CHOSEONG[offset // 588])
+            result.append(_JUNGSEONG[(offset % 588) // 28])
+            jong = _JONGSEONG[offset % 28]
+            if jong != ' ':
+                result.append(jong)
+        else:
+            result.append(char)
+    return ''.join(result)
+
+
+def _grams(text: str) -> Set[str]:
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class CategorySearchIndex:
+    """
+    검색어 → 카테고리 ID 역색인
+
+    같은 검색 대상 문자열(카테고리명/경로)은 한 항목으로 합치고 카테고리 ID 목록을 붙인다.
+
+    Examples:
+        index = CategorySearchIndex()
+        index.add('티셔츠', '1001')
+        index.add('반팔 티셔츠', '1002')
+        index.build()
+        index.search('티셔')        # [('티셔츠', 3.0, ['1001']), ('반팔 티셔츠', ...)]
+        index.autocomplete('티ㅅ')  # ['티셔츠']
+    """
+
+    def __init__(self):
+        self.terms: List[str] = []            # 원본 문자열
+        self.normalized: List[str] = []       # 정규화 형태 (미리 계산)
+        self.postings: List[List[str]] = []   # 항목별 카테고리 ID
+        self._term_ids: Dict[str, int] = {}
+        self._grams: Dict[str, List[int]] = {}
+        self._units: Dict[str, List[int]] = {}
+        self._jamo_sorted: List[Tuple[str, int]] = []
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def add(self, term: str, category_id: str):
+        """검색 대상 문자열 등록"""
+        term = (term or '').strip()
+        if not term:
+            return
+        term_id = self._term_ids.get(term)
+        if term_id is None:
+            term_id = len(self.terms)
+            self._term_ids[term] = term_id
+            self.terms.append(term)
+            self.normalized.append(normalize(term))
+            self.postings.append([])
+        if category_id not in self.postings[term_id]:
+            self.postings[term_id].append(category_id)
+
+    def build(self):
+        """bigram 역색인 / 자모 정렬 목록 생성 (등록 완료 후 1회)"""
+        grams: Dict[str, List[int]] = {}
+        units: Dict[str, List[int]] = {}
+        for term_id, norm in enumerate(self.normalized):
+            for gram in _grams(norm):
+                grams.setdefault(gram, []).append(term_id)
+            for char in set(norm):
+                units.setdefault(char, []).append(term_id)
+        self._grams = grams
+        self._units = units
+        self._jamo_sorted = sorted(
+            (decompose_jamo(norm), term_id) for term_id, norm in enumerate(self.normalized)
+        )
+
+    def to_state(self) -> Dict[str, object]:
+        """컴파일 아티팩트 저장용 상태 (build() 이후)"""
+        return {
+            'terms': self.terms,
+            'normalized': self.normalized,
+            'postings': self.postings,
+            'grams': self._grams,
+            'units': self._units,
+            'jamo_sorted': self._jamo_sorted,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, object]) -> 'CategorySearchIndex':
+        """to_state() 결과로 인덱스 복원 (재구축 없음)"""
+        index = cls()
+        index.terms = state['terms']
+        index.normalized = state['normalized']
+        index.postings = state['postings']
+        index._grams = state['grams']
+        index._units = state['units']
+        index._jamo_sorted = state['jamo_sorted']
+        index._term_ids = {term: term_id for term_id, term in enumerate(index.terms)}
+        return index
+
+    def lookup(self, term: str) -> List[str]:
+        """정확히 일치하는 문자열의 카테고리 ID"""
+        term_id = self._term_ids.get((term or '').strip())
+        return list(self.postings[term_id]) if term_id is not None else []
+
+    def _candidates(self, query: str) -> Iterable[int]:
+        if len(query) == 1:
+            return self._units.get(query, [])
+
+        # 가장 드문 bigram 부터 교집합
+        postings = sorted((self._grams.get(gram, []) for gram in _grams(query)), key=len)
+        if not postings or not postings[0]:
+            return []
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                break
+        return candidates
+
+    @staticmethod
+    def _score(query: str, norm: str) -> float:
+        if norm == query:
+            return 3.0
+        coverage = len(query) / len(norm)
+        if norm.startswith(query):
+            return 2.0 + coverage
+        return 1.0 + coverage
+
+    def search(self, query: str, limit: Optional[int] = 20) -> List[Tuple[str, float, List[str]]]:
+        """
+        부분 일치 검색 (정확 일치 > 접두어 일치 > 부분 일치, 같은 등급은 짧은 문자열 우선)
+
+        Returns:
+            [(일치 문자열, 점수, 카테고리 ID 목록)]
+        """
+        query = normalize(query)
+        if not query:
+            return []
+
+        matches = [
+            (self._score(query, self.normalized[term_id]), term_id)
+            for term_id in self._candidates(query)
+            if query in self.normalized[term_id]
+        ]
+        matches.sort(key=lambda item: (-item[0], self.terms[item[1]]))
+        if limit is not None:
+            matches = matches[:limit]
+        return [(self.terms[term_id], score, self.postings[term_id]) for score, term_id in matches]
+
+    def autocomplete(self, prefix: str, limit: int = 10) -> List[str]:
+        """접두어 자동완성 (자모 단위 - 입력 중인 마지막 글자도 일치)"""
+        key = decompose_jamo(normalize(prefix))
+        if not key:
+            return []
+
+        results = []
+        position = bisect_left(self._jamo_sorted, (key, -1))
+        while position < len(self._jamo_sorted) and len(results) < limit:
+            jamo, term_id = self._jamo_sorted[position]
+            if not jamo.startswith(key):
+                break
+            results.append(self.terms[term_id])
+            position += 1
+        return results
+
+
+def build_category_indexes(categories: Dict[str, Dict]) -> Tuple[Dict[str, Dict], 'CategorySearchIndex', 'CategorySearchIndex']:
+    """
+    카테고리 데이터 → (분류 인덱스, 카테고리명 검색 인덱스, 경로 검색 인덱스)
+
+    매니저 로드 시와 컴파일 아티팩트 생성 시 같은 결과를 쓰도록 한 곳에서 구축한다.
+    """
+    categories_index = {
+        "by_name": {},      # 카테고리명으로 검색
+        "by_path": {},      # 경로로 검색
+        "by_level": {},     # 레벨별 분류
+        "by_file": {},      # 파일 카테고리별 분류
+        "by_commission": {}, # 수수료율별 분류
+        "by_parent": {}     # 상위 경로별 분류
+    }
+    name_index = CategorySearchIndex()
+    path_index = CategorySearchIndex()
+
+    for category_id, category in categories.items():
+        path = category.get('path')
+        if path:
+            # 이름으로 인덱싱
+            for part in path.split('>'):
+                part = part.strip()
+                categories_index["by_name"].setdefault(part, []).append(category_id)
+                name_index.add(part, category_id)
+
+            # 경로로 인덱싱
+            categories_index["by_path"][path] = category_id
+            path_index.add(path, category_id)
+
+        # 상위 경로별 인덱싱 (유사 카테고리 조회용)
+        if category.get('parent_path'):
+            categories_index["by_parent"].setdefault(category['parent_path'], []).append(category_id)
+
+        # 레벨별 / 파일별 인덱싱
+        categories_index["by_level"].setdefault(category.get('level', 0), []).append(category_id)
+        categories_index["by_file"].setdefault(category.get('file_category', 'unknown'), []).append(category_id)
+
+        # 수수료율별 인덱싱
+        commission = category.get('commission_rate')
+        if commission:
+            categories_index["by_commission"].setdefault(commission, []).append(category_id)
+
+    name_index.build()
+    path_index.build()
+    return categories_index, name_index, path_index
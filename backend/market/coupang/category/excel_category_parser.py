@@ -5,12 +5,34 @@ Excel 파일에서 카테고리 데이터를 추출하여 구조화된 데이터
 """
 
 import os
+import sys
 import re
 import json
+import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 
+# 프로젝트 루트를 Python 경로에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..', '..', '..'))
+
+from market.coupang.category.category_artifact import artifact_path_for, save_category_artifact, source_stamp
+from market.coupang.category.category_search_index import build_category_indexes
+
+_CATEGORY_CELL_RE = re.compile(r'^\[(\d+)\]\s*(.+)')
+_NUMBER_RE = re.compile(r'(\d+\.?\d*)')
+_OPTION_SPLIT_RE = re.compile(r'[/,]')
+
+
+def _parse_file_worker(file_path: Path) -> Tuple[Dict[str, Dict[str, Any]], Optional[str]]:
+    """프로세스 풀 작업 함수: (카테고리 데이터, 오류 메시지)"""
+    try:
+        return CoupangExcelCategoryParser(str(file_path.parent)).parse_excel_file(file_path), None
+    except Exception as e:
+        return {}, str(e)
+
 
 class CoupangExcelCategoryParser:
     """쿠팡 카테고리 Excel 파일 파서"""
@@ -31,36 +53,31 @@ class CoupangExcelCategoryParser:
             "errors": []
         }
     
-    def parse_all_excel_files(self) -> Dict[str, Any]:
+    def parse_all_excel_files(self, max_workers: Optional[int] = None) -> Dict[str, Any]:
         """
         모든 Excel 파일을 파싱하여 카테고리 데이터 추출
         
+        Excel 읽기(openpyxl)는 CPU 작업이므로 파일 단위로 프로세스 풀에서 병렬 처리한다.
+        
+        Args:
+            max_workers: 프로세스 수 (기본: CPU 수, 1 이면 순차 처리)
+            
         Returns:
             Dict[str, Any]: 전체 카테고리 데이터
         """
         print("🚀 쿠팡 카테고리 Excel 파일 파싱 시작")
         
-        excel_files = list(self.excel_folder.glob("*.xlsx"))
+        excel_files = sorted(self.excel_folder.glob("*.xlsx"))
         self.stats["total_files"] = len(excel_files)
         
         print(f"📁 발견된 Excel 파일: {len(excel_files)}개")
         
-        for excel_file in excel_files:
-            try:
-                print(f"\n📄 처리 중: {excel_file.name}")
-                file_data = self.parse_excel_file(excel_file)
-                
-                if file_data:
-                    self.categories_data.update(file_data)
-                    self.stats["files_processed"].append(excel_file.name)
-                    print(f"   ✅ {len(file_data)}개 카테고리 추출 완료")
-                else:
-                    print(f"   ⚠️ 데이터 없음")
-                    
-            except Exception as e:
-                error_msg = f"{excel_file.name}: {str(e)}"
-                self.stats["errors"].append(error_msg)
-                print(f"   ❌ 오류: {e}")
+        if max_workers == 1 or len(excel_files) <= 1:
+            results = map(_parse_file_worker, excel_files)
+            self._collect_results(excel_files, results)
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                self._collect_results(excel_files, executor.map(_parse_file_worker, excel_files))
         
         self.stats["total_categories"] = len(self.categories_data)
         
@@ -71,6 +88,20 @@ class CoupangExcelCategoryParser:
         
         return self.categories_data
     
+    def _collect_results(self, excel_files: List[Path], results) -> None:
+        """파일별 파싱 결과 병합 (파일 순서 유지)"""
+        for excel_file, (file_data, error) in zip(excel_files, results):
+            print(f"\n📄 처리 중: {excel_file.name}")
+            if error:
+                self.stats["errors"].append(f"{excel_file.name}: {error}")
+                print(f"   ❌ 오류: {error}")
+            elif file_data:
+                self.categories_data.update(file_data)
+                self.stats["files_processed"].append(excel_file.name)
+                print(f"   ✅ {len(file_data)}개 카테고리 추출 완료")
+            else:
+                print(f"   ⚠️ 데이터 없음")
+    
     def parse_excel_file(self, file_path: Path) -> Dict[str, Dict[str, Any]]:
         """
         개별 Excel 파일 파싱
@@ -89,240 +120,141 @@ class CoupangExcelCategoryParser:
             if df.empty or df.columns[0] is None:
                 return {}
             
-            # 카테고리 데이터 추출
-            categories = {}
-            
-            for idx, row in df.iterrows():
-                try:
-                    category_info = self._parse_category_row(row, file_path.stem)
-                    if category_info and category_info.get('id'):
-                        categories[category_info['id']] = category_info
-                except Exception as e:
-                    # 개별 행 파싱 오류는 로그만 남기고 계속 진행
-                    continue
-            
-            return categories
+            return self.parse_frame(df, file_path.stem)
             
         except Exception as e:
             print(f"   Excel 파일 읽기 오류: {e}")
             return {}
     
-    def _parse_category_row(self, row: pd.Series, file_category: str) -> Optional[Dict[str, Any]]:
+    def parse_frame(self, df: pd.DataFrame, file_category: str) -> Dict[str, Dict[str, Any]]:
         """
-        Excel 행에서 카테고리 정보 추출
+        DataFrame → 카테고리 데이터 (열 단위 처리)
+        
+        행마다 Series 를 만드는 iterrows 대신 셀을 문자열 배열로 한 번 변환하고,
+        카테고리 셀/수수료율은 str 벡터 연산, 옵션은 열 쌍 단위 마스크로 추출한다.
         
         Args:
-            row: 파싱할 DataFrame 행
+            df: Excel 시트 DataFrame
             file_category: 파일 카테고리명
             
         Returns:
-            Optional[Dict[str, Any]]: 카테고리 정보 또는 None
+            Dict[str, Dict[str, Any]]: 카테고리 데이터 딕셔너리
         """
-        try:
-            # 첫 번째 컬럼에서 카테고리 정보 추출
-            category_cell = str(row.iloc[0]) if len(row) > 0 else ""
-            
-            if pd.isna(category_cell) or category_cell.strip() == "" or category_cell == "nan":
-                return None
-            
-            # 카테고리 ID와 경로 파싱
-            category_id, category_path = self._extract_category_info(category_cell)
-            
-            if not category_id:
-                return None
-            
-            # 수수료율 추출
-            commission_rate = self._extract_commission_rate(row)
-            
-            # 구매 옵션 추출 (컬럼 2-9)
-            purchase_options = self._extract_purchase_options(row)
-            
-            # 검색 옵션 추출 (컬럼 10-149)
-            search_options = self._extract_search_options(row)
-            
-            # 고시정보 추출 (컬럼 150+)
-            notice_info = self._extract_notice_info(row)
-            
-            # 카테고리 정보 구성
-            category_info = {
+        # NaN / 'nan' → 빈 문자열
+        cells = df.astype(object).where(df.notna(), '').astype(str).to_numpy()
+        cells[cells == 'nan'] = ''
+        
+        # 카테고리 ID와 경로 파싱 ([카테고리ID] 경로 형식)
+        extracted = pd.Series(cells[:, 0]).str.strip().str.extract(_CATEGORY_CELL_RE)
+        valid = extracted[0].notna().to_numpy()
+        if not valid.any():
+            return {}
+        
+        cells = cells[valid]
+        category_ids = extracted[0][valid].tolist()
+        category_paths = extracted[1][valid].str.strip().tolist()
+        
+        commission_rates = self._extract_commission_rates(cells)
+        purchase_options = self._extract_option_columns(cells, start_col=2, max_options=4, is_required=True)
+        search_options = self._extract_option_columns(cells, start_col=10, max_options=70, is_required=False)
+        notice_infos = self._extract_notice_infos(cells)
+        
+        categories = {}
+        for row, (category_id, category_path) in enumerate(zip(category_ids, category_paths)):
+            path_parts = category_path.split(">")
+            categories[category_id] = {
                 "id": category_id,
                 "path": category_path,
                 "file_category": file_category,
-                "commission_rate": commission_rate,
-                "purchase_options": purchase_options,
-                "search_options": search_options,
-                "notice_info": notice_info,
-                "level": len(category_path.split(">")) if category_path else 0,
-                "parent_path": ">".join(category_path.split(">")[:-1]) if category_path and ">" in category_path else ""
+                "commission_rate": commission_rates[row],
+                "purchase_options": purchase_options[row],
+                "search_options": search_options[row],
+                "notice_info": notice_infos[row],
+                "level": len(path_parts) if category_path else 0,
+                "parent_path": ">".join(path_parts[:-1]) if ">" in category_path else ""
             }
-            
-            return category_info
-            
-        except Exception as e:
-            return None
-    
-    def _extract_category_info(self, category_cell: str) -> Tuple[Optional[str], Optional[str]]:
-        """
-        카테고리 셀에서 ID와 경로 추출
         
-        Args:
-            category_cell: 카테고리 셀 내용
-            
-        Returns:
-            Tuple[Optional[str], Optional[str]]: (카테고리 ID, 카테고리 경로)
-        """
-        try:
-            # [카테고리ID] 경로 형식 파싱
-            pattern = r'\[(\d+)\]\s*(.+)'
-            match = re.match(pattern, category_cell.strip())
-            
-            if match:
-                category_id = match.group(1)
-                category_path = match.group(2).strip()
-                return category_id, category_path
-            
-            return None, None
-            
-        except Exception:
-            return None, None
+        return categories
     
-    def _extract_commission_rate(self, row: pd.Series) -> Optional[float]:
+    @staticmethod
+    def _extract_commission_rates(cells: np.ndarray) -> List[Optional[float]]:
         """
-        수수료율 추출
+        수수료율 추출 (컬럼 1, 첫 번째 숫자)
         
         Args:
-            row: DataFrame 행
+            cells: 문자열 셀 배열
             
         Returns:
-            Optional[float]: 수수료율 (%)
+            List[Optional[float]]: 행별 수수료율 (%)
         """
-        try:
-            if len(row) > 1:
-                commission_cell = str(row.iloc[1])
-                if commission_cell and commission_cell != "nan":
-                    # 숫자 추출
-                    numbers = re.findall(r'\d+\.?\d*', commission_cell)
-                    if numbers:
-                        return float(numbers[0])
-            return None
-            
-        except Exception:
-            return None
-    
-    def _extract_purchase_options(self, row: pd.Series) -> List[Dict[str, Any]]:
-        """
-        구매 옵션 추출 (컬럼 2-9)
-        
-        Args:
-            row: DataFrame 행
-            
-        Returns:
-            List[Dict[str, Any]]: 구매 옵션 리스트
-        """
-        purchase_options = []
-        
-        try:
-            # 구매 옵션은 컬럼 2-9 (옵션유형1-4, 옵션값1-4)
-            for i in range(4):  # 4개의 옵션 유형
-                type_col = 2 + i * 2      # 옵션유형 컬럼
-                value_col = 2 + i * 2 + 1 # 옵션값 컬럼
-                
-                if len(row) > value_col:
-                    option_type = str(row.iloc[type_col]) if pd.notna(row.iloc[type_col]) else ""
-                    option_values = str(row.iloc[value_col]) if pd.notna(row.iloc[value_col]) else ""
-                    
-                    if option_type and option_type != "nan" and option_values and option_values != "nan":
-                        # 옵션값들을 파싱 (/ 또는 , 구분자)
-                        values_list = [v.strip() for v in re.split(r'[/,]', option_values) if v.strip()]
-                        
-                        purchase_options.append({
-                            "type": option_type.strip(),
-                            "values": values_list,
-                            "is_required": True  # 구매 옵션은 기본적으로 필수
-                        })
+        if cells.shape[1] <= 1:
+            return [None] * len(cells)
         
-        except Exception:
-            pass
-        
-        return purchase_options
+        numbers = pd.to_numeric(pd.Series(cells[:, 1]).str.extract(_NUMBER_RE)[0], errors='coerce')
+        return [None if pd.isna(value) else float(value) for value in numbers]
     
-    def _extract_search_options(self, row: pd.Series) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _extract_option_columns(cells: np.ndarray, start_col: int, max_options: int,
+                                is_required: bool) -> List[List[Dict[str, Any]]]:
         """
-        검색 옵션 추출 (컬럼 10-149)
+        옵션 유형/값 열 쌍 추출
+        
+        구매 옵션은 컬럼 2-9 (옵션유형1-4, 옵션값1-4), 검색 옵션은 컬럼 10-149
+        (옵션유형1-70, 옵션값1-70). 열 쌍마다 값이 있는 행만 골라 처리한다.
         
         Args:
-            row: DataFrame 행
+            cells: 문자열 셀 배열
+            start_col: 첫 옵션유형 컬럼
+            max_options: 옵션 쌍 개수
+            is_required: 필수 옵션 여부 (구매 옵션 True, 검색 옵션 False)
             
         Returns:
-            List[Dict[str, Any]]: 검색 옵션 리스트
+            List[List[Dict[str, Any]]]: 행별 옵션 리스트
         """
-        search_options = []
+        options: List[List[Dict[str, Any]]] = [[] for _ in range(len(cells))]
         
-        try:
-            # 검색 옵션은 컬럼 10부터 (옵션유형1-70, 옵션값1-70)
-            start_col = 10
-            max_options = 70
+        for i in range(max_options):
+            type_col = start_col + i * 2
+            value_col = type_col + 1
+            if cells.shape[1] <= value_col:
+                break
             
-            for i in range(max_options):
-                type_col = start_col + i * 2     # 옵션유형 컬럼
-                value_col = start_col + i * 2 + 1 # 옵션값 컬럼
-                
-                if len(row) > value_col:
-                    option_type = str(row.iloc[type_col]) if pd.notna(row.iloc[type_col]) else ""
-                    option_values = str(row.iloc[value_col]) if pd.notna(row.iloc[value_col]) else ""
-                    
-                    if option_type and option_type != "nan" and option_values and option_values != "nan":
-                        # 옵션값들을 파싱
-                        values_list = [v.strip() for v in re.split(r'[/,]', option_values) if v.strip()]
-                        
-                        search_options.append({
-                            "type": option_type.strip(),
-                            "values": values_list,
-                            "is_required": False  # 검색 옵션은 선택적
-                        })
+            types = cells[:, type_col]
+            values = cells[:, value_col]
+            for row in np.flatnonzero((types != '') & (values != '')):
+                # 옵션값들을 파싱 (/ 또는 , 구분자)
+                options[row].append({
+                    "type": types[row].strip(),
+                    "values": [v.strip() for v in _OPTION_SPLIT_RE.split(values[row]) if v.strip()],
+                    "is_required": is_required
+                })
         
-        except Exception:
-            pass
-        
-        return search_options
+        return options
     
-    def _extract_notice_info(self, row: pd.Series) -> Dict[str, Any]:
+    @staticmethod
+    def _extract_notice_infos(cells: np.ndarray, start_col: int = 150) -> List[Dict[str, Any]]:
         """
-        고시정보 추출 (컬럼 150+)
+        고시정보 추출 (컬럼 150: 고시정보 분류, 151-164: 고시정보값1-14)
         
         Args:
-            row: DataFrame 행
+            cells: 문자열 셀 배열
+            start_col: 고시정보 분류 컬럼
             
         Returns:
-            Dict[str, Any]: 고시정보
+            List[Dict[str, Any]]: 행별 고시정보
         """
-        notice_info = {}
+        notice_infos: List[Dict[str, Any]] = [{} for _ in range(len(cells))]
+        if cells.shape[1] <= start_col:
+            return notice_infos
         
-        try:
-            # 고시정보는 보통 컬럼 150 이후
-            start_col = 150
-            
-            if len(row) > start_col:
-                notice_category = str(row.iloc[start_col]) if pd.notna(row.iloc[start_col]) else ""
-                
-                if notice_category and notice_category != "nan":
-                    notice_info["category"] = notice_category.strip()
-                    
-                    # 고시정보값들 추출
-                    notice_values = []
-                    for i in range(1, 15):  # 고시정보값1-14
-                        val_col = start_col + i
-                        if len(row) > val_col:
-                            value = str(row.iloc[val_col]) if pd.notna(row.iloc[val_col]) else ""
-                            if value and value != "nan":
-                                notice_values.append(value.strip())
-                    
-                    notice_info["required_fields"] = notice_values
-        
-        except Exception:
-            pass
+        value_cols = cells[:, start_col + 1:start_col + 15]
+        for row in np.flatnonzero(cells[:, start_col] != ''):
+            notice_infos[row] = {
+                "category": cells[row, start_col].strip(),
+                "required_fields": [value.strip() for value in value_cols[row] if value]
+            }
         
-        return notice_info
+        return notice_infos
     
     def save_to_json(self, output_path: str) -> None:
         """
@@ -351,6 +283,32 @@ class CoupangExcelCategoryParser:
         except Exception as e:
             print(f"❌ 데이터 저장 오류: {e}")
     
+    def save_to_artifact(self, json_path: str, output_path: Optional[str] = None) -> None:
+        """
+        카테고리 데이터와 검색 인덱스를 컴파일 아티팩트로 저장 (매니저 시작 시 JSON 파싱/인덱스 구축 생략)
+        
+        Args:
+            json_path: save_to_json 으로 저장한 원본 JSON 경로 (스탬프 기록용)
+            output_path: 저장 경로 (기본: 원본 경로의 .catbin)
+        """
+        try:
+            categories_index, name_index, path_index = build_category_indexes(self.categories_data)
+            metadata = save_category_artifact(
+                output_path or artifact_path_for(json_path),
+                self.categories_data,
+                indexes={
+                    'categories_index': categories_index,
+                    'name_index': name_index.to_state(),
+                    'path_index': path_index.to_state(),
+                },
+                source=source_stamp(json_path),
+            )
+            print(f"💾 아티팩트 저장 완료: {output_path or artifact_path_for(json_path)}")
+            print(f"   🔖 포맷 v{metadata['format_version']}, 해시 {metadata['content_hash'][:12]}")
+            
+        except Exception as e:
+            print(f"❌ 아티팩트 저장 오류: {e}")
+    
     def get_statistics(self) -> Dict[str, Any]:
         """
         파싱 통계 정보 반환
@@ -388,8 +346,9 @@ def main():
     parser = CoupangExcelCategoryParser(excel_folder)
     categories_data = parser.parse_all_excel_files()
     
-    # JSON 파일로 저장
+    # JSON 파일 및 컴파일 아티팩트로 저장
     parser.save_to_json(output_file)
+    parser.save_to_artifact(output_file)
     
     # 통계 출력
     stats = parser.get_statistics()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+쿠팡 카테고리 메타정보 캐시
+- 메모리 + 디스크(JSON 파일) 2단 캐시, 항목별 TTL
+- 응답의 ETag / Last-Modified 를 함께 저장해 만료 후 조건부 요청(304)으로 재검증
+- 여러 스레드(계층 프리페치)에서 동시에 사용 가능
+- 저장/조회 시 응답을 복사하므로 호출자가 결과를 수정해도 캐시는 바뀌지 않음
+"""
+
+import copy
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_DIR = os.getenv(
+    'COUPANG_CATEGORY_CACHE_DIR',
+    os.path.join(tempfile.gettempdir(), 'coupang_category_cache')
+)
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+
+class CategoryMetadataCache:
+    """
+    카테고리 API 응답 캐시
+
+    Examples:
+        cache = CategoryMetadataCache(ttl_seconds=3600)
+        entry = cache.get('metadata', 78780)
+        if entry and entry['fresh']:
+            return entry['payload']
+        cache.put('metadata', 78780, result, etag='"abc"')
+    """
+
+    def __init__(self, cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        """
+        Args:
+            cache_dir: 디스크 캐시 디렉토리 (None 이면 메모리만 사용)
+            ttl_seconds: 항목 유효 시간 (초)
+        """
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self._memory: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "stale": 0, "misses": 0, "revalidated": 0}
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def _key(kind: str, code: int) -> str:
+        return f"{kind}_{code}"
+
+    def _file_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._file_path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            return None
+
+    def _write_disk(self, key: str, entry: Dict[str, Any]):
+        # 임시 파일에 쓴 뒤 교체 (다른 프로세스가 절반만 쓰인 파일을 읽지 않도록)
+        path = self._file_path(key)
+        tmp_path = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ 카테고리 캐시 저장 실패 ({key}): {e}")
+
+    def get(self, kind: str, code: int) -> Optional[Dict[str, Any]]:
+        """
+        캐시 항목 조회
+
+        Returns:
+            {'payload', 'etag', 'last_modified', 'fetched_at', 'fresh'} 또는 None
+        """
+        key = self._key(kind, code)
+        with self._lock:
+            entry = self._memory.get(key)
+        if entry is None and self.cache_dir:
+            entry = self._read_disk(key)
+            if entry is not None:
+                with self._lock:
+                    self._memory[key] = entry
+
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+
+        fresh = time.time() - entry.get('fetched_at', 0) < self.ttl_seconds
+        self.stats["hits" if fresh else "stale"] += 1
+        return {**entry, 'payload': copy.deepcopy(entry['payload']), 'fresh': fresh}
+
+    def put(self, kind: str, code: int, payload: Any,
+            etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """API 응답 저장"""
+        key = self._key(kind, code)
+        entry = {
+            'payload': copy.deepcopy(payload),
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': time.time(),
+        }
+        with self._lock:
+            self._memory[key] = entry
+        if self.cache_dir:
+            self._write_disk(key, entry)
+
+    def touch(self, kind: str, code: int) -> Optional[Any]:
+        """304 재검증 성공: 유효 시간만 연장하고 저장된 응답 반환"""
+        key = self._key(kind, code)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            entry = {**entry, 'fetched_at': time.time()}
+            self._memory[key] = entry
+        if self.cache_dir:
+            self._write_disk(key, entry)
+        self.stats["revalidated"] += 1
+        return copy.deepcopy(entry['payload'])
+
+    def invalidate(self, kind: Optional[str] = None, code: Optional[int] = None):
+        """캐시 삭제 (인자 없으면 전체)"""
+        if kind and code is not None:
+            matches = lambda key: key == self._key(kind, code)
+        else:
+            matches = lambda key: key.startswith(f"{kind}_" if kind else '')
+
+        with self._lock:
+            for key in [k for k in self._memory if matches(k)]:
+                del self._memory[key]
+        if self.cache_dir:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.json') and matches(name[:-len('.json')]):
+                    try:
+                        os.remove(os.path.join(self.cache_dir, name))
+                    except OSError:
+                        pass
@@ -11,7 +11,8 @@ class CoupangOptionValidator:
     """쿠팡 구매 옵션 검증 및 가이드 클래스"""
     
     def __init__(self, access_key: Optional[str] = None, secret_key: Optional[str] = None, 
-                 vendor_id: Optional[str] = None):
+                 vendor_id: Optional[str] = None,
+                 category_client: Optional[CoupangCategoryClient] = None):
         """
         옵션 검증기 초기화
         
@@ -19,8 +20,9 @@ class CoupangOptionValidator:
             access_key: 쿠팡 액세스 키
             secret_key: 쿠팡 시크릿 키  
             vendor_id: 쿠팡 벤더 ID
+            category_client: 공유할 카테고리 클라이언트 (메타정보 캐시 공유)
         """
-        self.category_client = CoupangCategoryClient(access_key, secret_key, vendor_id)
+        self.category_client = category_client or CoupangCategoryClient(access_key, secret_key, vendor_id)
     
     def validate_required_options(self, display_category_code: int, 
                                 product_options: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -36,111 +38,163 @@ class CoupangOptionValidator:
             Dict[str, Any]: 검증 결과
         """
         try:
-            # 카테고리 메타정보 조회
+            # 카테고리 메타정보 조회 (클라이언트 캐시 사용)
             category_attrs = self.category_client.get_category_attributes(display_category_code)
+            return self._validate_options(category_attrs, product_options)
             
-            # 필수 구매 옵션 필터링 (MANDATORY + EXPOSED)
-            required_purchase_options = [
-                attr for attr in category_attrs 
-                if attr.get('required') == 'MANDATORY' and attr.get('exposed') == 'EXPOSED'
-            ]
-            
-            validation_result = {
-                "isValid": True,
-                "errors": [],
-                "warnings": [],
-                "groupWarnings": [],
-                "requiredOptions": required_purchase_options,
-                "providedOptions": product_options,
-                "missingOptions": [],
-                "invalidOptions": [],
-                "groupValidation": {}
-            }
-            
-            # 카테고리 속성을 이름으로 매핑
-            attr_map = {attr['attributeTypeName']: attr for attr in category_attrs}
+        except Exception as e:
+            return self._error_result(f"검증 중 오류 발생: {str(e)}", str(e), product_options)
+    
+    def validate_products_batch(self, products: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        여러 상품의 필수 구매 옵션 일괄 검증
+        
+        상품 묶음에 포함된 카테고리 메타정보를 카테고리당 1회만 (동시에) 조회한 뒤
+        각 상품을 검증한다.
+        
+        Args:
+            products: 검증할 상품 리스트
+                예시: [{"displayCategoryCode": 78780, "options": [{"attributeTypeName": "수량", ...}]}]
             
-            # 제공된 옵션을 이름으로 매핑
-            provided_options_map = {opt.get('attributeTypeName'): opt for opt in product_options}
-            provided_option_names = set(provided_options_map.keys())
+        Returns:
+            Dict[str, Any]: 일괄 검증 결과 (results 는 입력 순서)
+        """
+        category_codes = [product.get('displayCategoryCode') for product in products]
+        metadata_by_code = self.category_client.prefetch_metadata(
+            [code for code in category_codes if isinstance(code, int)]
+        )
+        
+        results = []
+        for product, code in zip(products, category_codes):
+            product_options = product.get('options', [])
+            metadata = metadata_by_code.get(code)
+            if metadata is None:
+                message = f"카테고리 {code} 메타정보를 조회할 수 없습니다."
+                result = self._error_result(f"검증 중 오류 발생: {message}", message, product_options)
+            else:
+                try:
+                    category_attrs = metadata.get('data', {}).get('attributes', [])
+                    result = self._validate_options(category_attrs, product_options)
+                except Exception as e:
+                    result = self._error_result(f"검증 중 오류 발생: {str(e)}", str(e), product_options)
+            results.append({"displayCategoryCode": code, **result})
+        
+        valid_count = sum(1 for result in results if result["isValid"])
+        return {
+            "totalCount": len(products),
+            "validCount": valid_count,
+            "invalidCount": len(products) - valid_count,
+            "categoryCount": len(set(category_codes)),
+            "results": results
+        }
+    
+    def _validate_options(self, category_attrs: List[Dict[str, Any]],
+                          product_options: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """카테고리 속성 목록 기준 옵션 검증 (API 호출 없음)"""
+        # 필수 구매 옵션 필터링 (MANDATORY + EXPOSED)
+        required_purchase_options = [
+            attr for attr in category_attrs 
+            if attr.get('required') == 'MANDATORY' and attr.get('exposed') == 'EXPOSED'
+        ]
+        
+        validation_result = {
+            "isValid": True,
+            "errors": [],
+            "warnings": [],
+            "groupWarnings": [],
+            "requiredOptions": required_purchase_options,
+            "providedOptions": product_options,
+            "missingOptions": [],
+            "invalidOptions": [],
+            "groupValidation": {}
+        }
+        
+        # 카테고리 속성을 이름으로 매핑
+        attr_map = {attr['attributeTypeName']: attr for attr in category_attrs}
+        
+        # 제공된 옵션을 이름으로 매핑
+        provided_options_map = {opt.get('attributeTypeName'): opt for opt in product_options}
+        provided_option_names = set(provided_options_map.keys())
+        
+        # 1. 필수 옵션 누락 검증
+        for required_opt in required_purchase_options:
+            opt_name = required_opt.get('attributeTypeName')
             
-            # 1. 필수 옵션 누락 검증
-            for required_opt in required_purchase_options:
-                opt_name = required_opt.get('attributeTypeName')
+            if opt_name not in provided_option_names:
+                validation_result["errors"].append(
+                    f"필수 구매 옵션 '{opt_name}' (타입: {required_opt.get('dataType')})이 누락되었습니다."
+                )
+                validation_result["missingOptions"].append(required_opt)
+                validation_result["isValid"] = False
+        
+        # 2. 그룹 옵션 검증 (PDF 예시 반영)
+        group_validation = self._validate_group_options(category_attrs, provided_option_names)
+        validation_result["groupValidation"] = group_validation
+        
+        if group_validation.get("hasErrors"):
+            validation_result["errors"].extend(group_validation["errors"])
+            validation_result["isValid"] = False
+        
+        if group_validation.get("hasWarnings"):
+            validation_result["groupWarnings"].extend(group_validation["warnings"])
+        
+        # 3. 제공된 옵션의 세부 검증
+        for provided_opt in product_options:
+            opt_name = provided_opt.get('attributeTypeName')
+            opt_value = provided_opt.get('attributeValue')
+            opt_unit = provided_opt.get('attributeUnit')
+            
+            if opt_name in attr_map:
+                attr_info = attr_map[opt_name]
                 
-                if opt_name not in provided_option_names:
+                # 3-1. 데이터 타입 검증
+                expected_type = attr_info.get('dataType')
+                if not self._validate_data_type(opt_value, expected_type):
                     validation_result["errors"].append(
-                        f"필수 구매 옵션 '{opt_name}' (타입: {required_opt.get('dataType')})이 누락되었습니다."
+                        f"옵션 '{opt_name}'의 값 '{opt_value}'가 예상 타입 '{expected_type}'과 맞지 않습니다. "
+                        f"(예: {self._get_type_example(expected_type)})"
                     )
-                    validation_result["missingOptions"].append(required_opt)
+                    validation_result["invalidOptions"].append(provided_opt)
                     validation_result["isValid"] = False
-            
-            # 2. 그룹 옵션 검증 (PDF 예시 반영)
-            group_validation = self._validate_group_options(category_attrs, provided_option_names)
-            validation_result["groupValidation"] = group_validation
-            
-            if group_validation.get("hasErrors"):
-                validation_result["errors"].extend(group_validation["errors"])
-                validation_result["isValid"] = False
-            
-            if group_validation.get("hasWarnings"):
-                validation_result["groupWarnings"].extend(group_validation["warnings"])
-            
-            # 3. 제공된 옵션의 세부 검증
-            for provided_opt in product_options:
-                opt_name = provided_opt.get('attributeTypeName')
-                opt_value = provided_opt.get('attributeValue')
-                opt_unit = provided_opt.get('attributeUnit')
                 
-                if opt_name in attr_map:
-                    attr_info = attr_map[opt_name]
-                    
-                    # 3-1. 데이터 타입 검증
-                    expected_type = attr_info.get('dataType')
-                    if not self._validate_data_type(opt_value, expected_type):
-                        validation_result["errors"].append(
-                            f"옵션 '{opt_name}'의 값 '{opt_value}'가 예상 타입 '{expected_type}'과 맞지 않습니다. "
-                            f"(예: {self._get_type_example(expected_type)})"
-                        )
-                        validation_result["invalidOptions"].append(provided_opt)
+                # 3-2. 단위 검증 (PDF 예시 기반)
+                if opt_unit:
+                    unit_validation = self._validate_unit(opt_name, opt_unit, attr_info)
+                    if not unit_validation["isValid"]:
+                        validation_result["errors"].append(unit_validation["message"])
                         validation_result["isValid"] = False
-                    
-                    # 3-2. 단위 검증 (PDF 예시 기반)
-                    if opt_unit:
-                        unit_validation = self._validate_unit(opt_name, opt_unit, attr_info)
-                        if not unit_validation["isValid"]:
-                            validation_result["errors"].append(unit_validation["message"])
-                            validation_result["isValid"] = False
-                        elif unit_validation.get("warning"):
-                            validation_result["warnings"].append(unit_validation["warning"])
-                    elif attr_info.get('usableUnits') and len(attr_info['usableUnits']) > 0:
-                        # 단위가 필요한 옵션인데 단위가 없는 경우
-                        basic_unit = attr_info.get('basicUnit', '없음')
-                        if basic_unit != '없음':
-                            validation_result["warnings"].append(
-                                f"옵션 '{opt_name}'에 단위를 지정하는 것이 권장됩니다. "
-                                f"기본 단위: {basic_unit}, 허용 단위: {', '.join(attr_info['usableUnits'][:5])}"
-                            )
-                else:
-                    validation_result["warnings"].append(
-                        f"카테고리에 정의되지 않은 옵션 '{opt_name}'입니다."
-                    )
-            
-            return validation_result
-            
-        except Exception as e:
-            return {
-                "isValid": False,
-                "error": f"검증 중 오류 발생: {str(e)}",
-                "errors": [str(e)],
-                "warnings": [],
-                "groupWarnings": [],
-                "requiredOptions": [],
-                "providedOptions": product_options,
-                "missingOptions": [],
-                "invalidOptions": [],
-                "groupValidation": {}
-            }
+                    elif unit_validation.get("warning"):
+                        validation_result["warnings"].append(unit_validation["warning"])
+                elif attr_info.get('usableUnits') and len(attr_info['usableUnits']) > 0:
+                    # 단위가 필요한 옵션인데 단위가 없는 경우
+                    basic_unit = attr_info.get('basicUnit', '없음')
+                    if basic_unit != '없음':
+                        validation_result["warnings"].append(
+                            f"옵션 '{opt_name}'에 단위를 지정하는 것이 권장됩니다. "
+                            f"기본 단위: {basic_unit}, 허용 단위: {', '.join(attr_info['usableUnits'][:5])}"
+                        )
+            else:
+                validation_result["warnings"].append(
+                    f"카테고리에 정의되지 않은 옵션 '{opt_name}'입니다."
+                )
+        
+        return validation_result
+    
+    @staticmethod
+    def _error_result(error: str, detail: str, product_options: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """검증 실패 결과"""
+        return {
+            "isValid": False,
+            "error": error,
+            "errors": [detail],
+            "warnings": [],
+            "groupWarnings": [],
+            "requiredOptions": [],
+            "providedOptions": product_options,
+            "missingOptions": [],
+            "invalidOptions": [],
+            "groupValidation": {}
+        }
     
     def _validate_data_type(self, value: Any, expected_type: str) -> bool:
         """
@@ -14,6 +14,7 @@ from abc import ABC, abstractmethod
 from .config import config
 from .errors import error_handler, CoupangAPIError, CoupangAuthError, CoupangNetworkError
 from market.coupang.auth.coupang_auth import CoupangAuth
+from core.tracing import current_span, get_tracer
 
 
 class BaseCoupangClient(ABC):
@@ -69,6 +70,15 @@ class BaseCoupangClient(ABC):
         Raises:
             CoupangAPIError: API 호출 실패시
         """
+        path_without_query = api_path.split('?')[0]
+        with get_tracer().span(f"coupang {method} {path_without_query}", kind='client',
+                               **{'http.method': method, 'http.path': path_without_query,
+                                  'peer.service': 'coupang'}):
+            return self._send_api_request(method, api_path, data, timeout)
+    
+    def _send_api_request(self, method: str, api_path: str,
+                          data: Optional[Dict[str, Any]], timeout: int) -> Dict[str, Any]:
+        """API 요청 전송 (execute_api_request 의 스팬 안에서 실행)"""
         start_time = time.time()
         
         try:
@@ -113,6 +123,9 @@ class BaseCoupangClient(ABC):
                 
         except urllib.error.HTTPError as e:
             # HTTP 오류 처리
+            span = current_span()
+            if span is not None:
+                span.set_attribute('http.status_code', e.code)
             try:
                 error_data = e.read().decode('utf-8')
                 error_response = json.loads(error_data)
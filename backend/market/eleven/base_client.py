@@ -1,31 +1,190 @@
 """
 11번가 Open API 기본 클라이언트
 """
-import urllib.request
+import codecs
+import io
+import re
 import urllib.parse
-import urllib.error
 import xml.etree.ElementTree as ET
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, Iterator, IO
+import threading
 import time
 import logging
 import json
 
+import requests
+from requests.adapters import HTTPAdapter
+
 logger = logging.getLogger(__name__)
 
+# 프로세스 공유 keep-alive 세션 (상품/주문 클라이언트가 같은 연결 풀 사용)
+_shared_session: Optional[requests.Session] = None
+_shared_session_lock = threading.Lock()
+
+
+def get_shared_session(pool_maxsize: int = 10) -> requests.Session:
+    """11번가 API 공유 세션 조회 (없으면 생성)"""
+    global _shared_session
+    if _shared_session is None:
+        with _shared_session_lock:
+            if _shared_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({'User-Agent': 'Mozilla/5.0'})
+                _shared_session = session
+    return _shared_session
+
+
+def _local_name(tag: str) -> str:
+    """네임스페이스 제거 ('{uri}product' -> 'product')"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def element_to_flat_dict(element: ET.Element) -> Dict[str, Any]:
+    """
+    상품/주문 엘리먼트를 평탄한 딕셔너리로 변환
+
+    리프 자식은 {태그: 텍스트}, 같은 태그가 반복되면 리스트, 속성은 '@이름' 키로 저장한다.
+    하위 구조나 속성이 있는 자식은 다시 딕셔너리가 되고, 속성이 있는 리프의 텍스트는
+    '#text' 키로 저장한다 (<selPrc unit="KRW">10000</selPrc> -> {'@unit': 'KRW', '#text': '10000'}).
+    태그의 네임스페이스는 제거한다.
+    """
+    result: Dict[str, Any] = {}
+    for name, value in element.attrib.items():
+        result[f'@{_local_name(name)}'] = value
+
+    if not len(element):
+        text = element.text
+        if text and text.strip():
+            result['#text'] = text.strip()
+
+    for child in element:
+        tag = _local_name(child.tag)
+        if len(child) or child.attrib:
+            value = element_to_flat_dict(child)
+        else:
+            text = child.text
+            value = text.strip() if text and text.strip() else None
+
+        if tag not in result:
+            result[tag] = value
+        elif isinstance(result[tag], list):
+            result[tag].append(value)
+        else:
+            result[tag] = [result[tag], value]
+
+    return result
+
+
+_XML_ENCODING_RE = re.compile(rb'^(<\?xml[^>]*encoding=["\'])([A-Za-z0-9._-]+)(["\'])')
+
+
+class _Utf8TranscodingReader:
+    """
+    EUC-KR 등 expat 이 지원하지 않는 멀티바이트 인코딩 스트림을 UTF-8 로 변환해 읽는 래퍼
+
+    XML 선언의 encoding 도 UTF-8 로 바꿔 iterparse 에 넘긴다.
+    """
+
+    def __init__(self, raw: IO[bytes], head: bytes, encoding: str):
+        self._raw = raw
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        self._pending = _XML_ENCODING_RE.sub(rb'\1UTF-8\3', self._transcode(head))
+        self._eof = False
+
+    def _transcode(self, data: bytes, final: bool = False) -> bytes:
+        return self._decoder.decode(data, final).encode('utf-8')
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._eof and (size < 0 or len(self._pending) < size):
+            chunk = self._raw.read(64 * 1024)
+            if not chunk:
+                self._pending += self._transcode(b'', final=True)
+                self._eof = True
+            else:
+                self._pending += self._transcode(chunk)
+        if size < 0:
+            data, self._pending = self._pending, b''
+        else:
+            data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+
+class _PrefixedReader:
+    """이미 읽은 선두 바이트를 다시 붙여 읽는 래퍼"""
+
+    def __init__(self, raw: IO[bytes], head: bytes):
+        self._raw = raw
+        self._head = head
+
+    def read(self, size: int = -1) -> bytes:
+        if self._head:
+            data, self._head = self._head, b''
+            return data
+        return self._raw.read(size)
+
+
+def _utf8_source(source: IO[bytes]) -> IO[bytes]:
+    """XML 선언 인코딩 확인 후 필요하면 UTF-8 변환 래퍼 적용"""
+    head = source.read(256)
+    match = _XML_ENCODING_RE.match(head.lstrip())
+    if match:
+        encoding = match.group(2).decode('ascii').lower()
+        if encoding not in ('utf-8', 'utf8', 'us-ascii', 'ascii', 'iso-8859-1', 'latin-1'):
+            return _Utf8TranscodingReader(source, head, encoding)
+    return _PrefixedReader(source, head)
+
+
+def iter_xml_elements(source: Union[IO[bytes], bytes], item_tag: str) -> Iterator[Dict[str, Any]]:
+    """
+    XML 스트림에서 item_tag 엘리먼트를 하나씩 평탄한 딕셔너리로 반환
+
+    iterparse 로 읽으며 반환한 엘리먼트는 부모에서 바로 떼어내므로 문서 전체를
+    메모리에 올리지 않는다. 인코딩은 XML 선언(EUC-KR 등)을 따른다.
+    """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+
+    stack: List[ET.Element] = []
+    item_depth = 0
+    for event, element in ET.iterparse(_utf8_source(source), events=('start', 'end')):
+        is_item = _local_name(element.tag) == item_tag
+        if event == 'start':
+            stack.append(element)
+            if is_item:
+                item_depth += 1
+            continue
+
+        stack.pop()
+        if not is_item:
+            continue
+        item_depth -= 1
+        if item_depth == 0:
+            yield element_to_flat_dict(element)
+            # 처리 완료된 엘리먼트를 부모에서 분리
+            if stack:
+                stack[-1].remove(element)
+            element.clear()
+
+
 class ElevenBaseClient:
     """11번가 API 기본 클라이언트"""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, session: Optional[requests.Session] = None,
+                 timeout: int = 30):
         self.api_key = api_key
         self.base_url = "https://api.11st.co.kr/rest"
         self.retry_count = 3
         self.retry_delay = 1  # seconds
+        self.timeout = timeout
+        self.session = session or get_shared_session()
     
-    def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Union[Dict, str]:
-        """API 요청 실행 (11번가는 GET 요청만 지원)"""
+    def _open_stream(self, endpoint: str, params: Optional[Dict] = None) -> requests.Response:
+        """API 요청 실행 후 스트리밍 응답 반환 (11번가는 GET 요청만 지원)"""
         # 기본 파라미터에 API 키 추가
-        if params is None:
-            params = {}
+        params = dict(params or {})
         params['key'] = self.api_key
         
         # URL 생성
@@ -35,35 +194,66 @@ class ElevenBaseClient:
         # 재시도 로직
         for attempt in range(self.retry_count):
             try:
-                # 요청 실행
-                req = urllib.request.Request(url)
-                req.add_header('User-Agent', 'Mozilla/5.0')
+                response = self.session.get(url, stream=True, timeout=self.timeout)
                 
-                with urllib.request.urlopen(req) as response:
-                    content = response.read().decode('utf-8')
+                if response.status_code >= 400:
+                    error_body = response.text
+                    response.close()
+                    logger.error(f"HTTP Error {response.status_code}: {error_body}")
                     
-                    # XML 파싱
-                    return self._parse_xml_response(content)
+                    # 429 Too Many Requests - 재시도
+                    if response.status_code == 429 and attempt < self.retry_count - 1:
+                        time.sleep(self.retry_delay * (attempt + 1))
+                        continue
             
-            except urllib.error.HTTPError as e:
-                error_body = e.read().decode('utf-8')
-                logger.error(f"HTTP Error {e.code}: {error_body}")
+                    raise Exception(f"API request failed: {response.status_code} - {error_body}")
                 
-                # 429 Too Many Requests - 재시도
-                if e.code == 429 and attempt < self.retry_count - 1:
-                    time.sleep(self.retry_delay * (attempt + 1))
-                    continue
+                # gzip 등 전송 인코딩 해제 후 읽도록 설정
+                response.raw.decode_content = True
+                return response
                 
-                raise Exception(f"API request failed: {e.code} - {error_body}")
-            
-            except Exception as e:
+            except requests.RequestException as e:
                 logger.error(f"Request error: {str(e)}")
                 if attempt < self.retry_count - 1:
                     time.sleep(self.retry_delay)
                     continue
                 raise
     
-    def _parse_xml_response(self, xml_content: str) -> Dict:
+    def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Union[Dict, str]:
+        """API 요청 실행 (단건/소형 응답용 - 전체 문서를 딕셔너리로 변환)"""
+        response = self._open_stream(endpoint, params)
+        try:
+            content = response.content
+        finally:
+            response.close()
+
+        # XML 파싱
+        return self._parse_xml_response(content)
+
+    def iter_elements(self, endpoint: str, item_tag: str,
+                      params: Optional[Dict] = None) -> Iterator[Dict[str, Any]]:
+        """
+        목록 응답의 item_tag 엘리먼트를 하나씩 반환 (스트리밍)
+
+        Args:
+            endpoint: API 엔드포인트
+            item_tag: 반복 엘리먼트 태그 (Product, Order 등)
+            params: 요청 파라미터
+
+        Yields:
+            엘리먼트별 평탄한 딕셔너리
+        """
+        response = self._open_stream(endpoint, params)
+        try:
+            yield from iter_xml_elements(response.raw, item_tag)
+        except ET.ParseError as e:
+            logger.error(f"XML parsing error: {e}")
+            raise
+        finally:
+            # 연결을 풀로 반환
+            response.close()
+
+    def _parse_xml_response(self, xml_content: Union[bytes, str]) -> Dict:
         """XML 응답을 딕셔너리로 변환"""
         try:
             root = ET.fromstring(xml_content)
@@ -71,6 +261,8 @@ class ElevenBaseClient:
         except ET.ParseError as e:
             logger.error(f"XML parsing error: {e}")
             # XML이 아닌 경우 원본 반환
+            if isinstance(xml_content, bytes):
+                xml_content = xml_content.decode('utf-8', errors='replace')
             return {'raw_response': xml_content}
     
     def _xml_to_dict(self, element: ET.Element) -> Union[Dict, List, str]:
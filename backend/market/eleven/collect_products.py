@@ -7,7 +7,7 @@ import sys
 import json
 import logging
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Iterable, Iterator, Optional
 
 # 상위 디렉토리 모듈 import를 위한 경로 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -54,17 +54,14 @@ class ElevenProductCollector:
                 logger.info(f"페이지 {page} 수집 중...")
                 
                 try:
-                    # 상품 조회
-                    response = self.client.products.get_products(page=page)
-                    
-                    # 상품 추출
-                    products = []
-                    if 'Products' in response and 'Product' in response['Products']:
-                        products = response['Products']['Product']
-                        if not isinstance(products, list):
-                            products = [products]
+                    # 상품을 한 건씩 스트리밍으로 읽어 변환 후 바로 동기화
+                    products = self.client.products.iter_products(page=page)
+                    sync_result = self.sync_manager.sync_eleven_products(
+                        self.account_name, 
+                        self._iter_converted_products(products)
+                    )
                     
-                    if not products:
+                    if sync_result['total'] == 0:
                         empty_page_count += 1
                         if empty_page_count >= 3:  # 연속 3페이지 비어있으면 종료
                             logger.info("더 이상 상품이 없습니다.")
@@ -74,13 +71,6 @@ class ElevenProductCollector:
                     
                     empty_page_count = 0
                     
-                    # 상품 변환 및 저장
-                    converted_products = self._convert_products(products)
-                    sync_result = self.sync_manager.sync_eleven_products(
-                        self.account_name, 
-                        converted_products
-                    )
-                    
                     # 결과 집계
                     result['total_products'] += sync_result['total']
                     result['updated_products'] += sync_result['updated']
@@ -124,8 +114,10 @@ class ElevenProductCollector:
     
     def _convert_products(self, products: List[Dict]) -> List[Dict]:
         """11번가 상품 데이터를 공통 형식으로 변환"""
-        converted = []
-        
+        return list(self._iter_converted_products(products))
+    
+    def _iter_converted_products(self, products: Iterable[Dict]) -> Iterator[Dict]:
+        """11번가 상품 데이터를 공통 형식으로 하나씩 변환"""
         for product in products:
             try:
                 # 가격 정보 추출
@@ -161,13 +153,11 @@ class ElevenProductCollector:
                     'original_data': product
                 }
                 
-                converted.append(converted_product)
+                yield converted_product
                 
             except Exception as e:
                 logger.error(f"상품 변환 오류: {e}")
                 logger.error(f"원본 데이터: {json.dumps(product, ensure_ascii=False)[:200]}")
-        
-        return converted
     
     def _extract_number(self, value: str) -> float:
         """문자열에서 숫자 추출"""
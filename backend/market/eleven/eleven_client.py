@@ -13,10 +13,11 @@ load_dotenv()
 class ElevenClient:
     """11번가 통합 클라이언트"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, session=None):
         """
         Args:
             api_key: 11번가 Open API 키
+            session: 공유할 requests 세션 (없으면 모듈 공유 keep-alive 세션)
         """
         self.api_key = api_key or os.getenv('ELEVEN_API_KEY')
         
@@ -24,8 +25,8 @@ class ElevenClient:
             raise ValueError("11번가 API key is required")
         
         # 서브 클라이언트 초기화
-        self.products = ElevenProductClient(self.api_key)
-        self.orders = ElevenOrderClient(self.api_key)
+        self.products = ElevenProductClient(self.api_key, session=session)
+        self.orders = ElevenOrderClient(self.api_key, session=session)
     
     def test_connection(self) -> bool:
         """연결 테스트"""
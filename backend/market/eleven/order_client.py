@@ -1,7 +1,7 @@
 """
 11번가 주문 관리 API
 """
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Iterator
 from datetime import datetime, date
 from .base_client import ElevenBaseClient
 
@@ -40,6 +40,29 @@ class ElevenOrderClient(ElevenBaseClient):
         
         return result
     
+    def iter_orders(self, start_date: str, end_date: Optional[str] = None,
+                    status: Optional[str] = None) -> Iterator[Dict]:
+        """주문 목록 스트리밍 조회
+        
+        Args:
+            start_date: 조회 시작일 (YYYY-MM-DD)
+            end_date: 조회 종료일
+            status: 주문 상태
+        
+        Yields:
+            주문 정보 (Order 엘리먼트별 평탄한 딕셔너리)
+        """
+        params = {
+            'dateType': '01',  # 01: 주문일 기준
+            'startDate': start_date.replace('-', ''),
+            'endDate': (end_date or start_date).replace('-', '')
+        }
+        
+        if status:
+            params['ordStat'] = status
+        
+        yield from self.iter_elements('orderservices/order', 'Order', params)
+    
     def get_order_detail(self, order_no: str) -> Dict:
         """주문 상세 조회
         
@@ -1,7 +1,7 @@
 """
 11번가 상품 관리 API
 """
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Iterator
 from .base_client import ElevenBaseClient
 
 class ElevenProductClient(ElevenBaseClient):
@@ -33,6 +33,46 @@ class ElevenProductClient(ElevenBaseClient):
         
         return result
     
+    def iter_products(self, page: int = 1, rows: int = 100) -> Iterator[Dict]:
+        """판매중인 상품 목록 스트리밍 조회
+        
+        응답 전체를 딕셔너리로 만들지 않고 Product 엘리먼트를 하나씩 평탄한 딕셔너리로 반환
+        
+        Args:
+            page: 페이지 번호 (1부터 시작)
+            rows: 페이지당 상품 수 (최대 100)
+        
+        Yields:
+            상품 정보
+        """
+        params = {
+            'page': page,
+            'rows': rows
+        }
+        
+        yield from self.iter_elements('prodmarketservice/prodmarket/seller', 'Product', params)
+    
+    def iter_all_products(self, start_page: int = 1, max_pages: int = 1000,
+                          rows: int = 100) -> Iterator[Dict]:
+        """전체 상품 스트리밍 조회 (빈 페이지가 나오면 종료)
+        
+        Args:
+            start_page: 시작 페이지
+            max_pages: 최대 페이지 수 (안전장치)
+            rows: 페이지당 상품 수
+        
+        Yields:
+            상품 정보
+        """
+        for page in range(start_page, start_page + max_pages):
+            count = 0
+            for product in self.iter_products(page=page, rows=rows):
+                count += 1
+                yield product
+            
+            if count == 0:
+                break
+    
     def get_product_detail(self, product_no: str) -> Dict:
         """상품 상세 조회
         
@@ -24,12 +24,17 @@ import queue
 import sys
 import os
 
-# 기존 마켓플레이스 클라이언트 임포트
+# 기존 마켓플레이스 클라이언트 임포트 (클라이언트가 core 를 쓰므로 backend 경로를 먼저 추가)
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from coupang.coupang_client import CoupangClient
 from naver.naver_client import NaverClient  
 from eleven.eleven_client import ElevenClient
 
+from core.rate_control import (
+    TokenBucket, CircuitBreaker as UnifiedCircuitBreaker, is_throttle_status
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -65,81 +70,21 @@ class RequestMetrics:
     last_request_time: Optional[datetime] = None
 
 
-class TokenBucket:
-    """토큰 버킷 알고리즘 구현"""
+class CircuitBreaker(UnifiedCircuitBreaker):
+    """마켓플레이스 회로 차단기 (core.rate_control 공용 구현, 기존 timeout 인자 / 대문자 상태 유지)"""
     
-    def __init__(self, rate: float, capacity: int):
-        self.rate = rate  # 초당 토큰 추가율
-        self.capacity = capacity  # 최대 토큰 수
-        self.tokens = capacity
-        self.last_refill = time.time()
-        self.lock = threading.Lock()
+    def __init__(self, failure_threshold: int = 5, timeout: int = 60, name: Optional[str] = None):
+        super().__init__(failure_threshold=failure_threshold, recovery_timeout=timeout, name=name)
     
-    def consume(self, tokens: int = 1) -> bool:
-        """토큰 소비 시도"""
-        with self.lock:
-            now = time.time()
-            # 토큰 추가
-            elapsed = now - self.last_refill
-            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
-            self.last_refill = now
-            
-            # 토큰 소비 가능 여부 확인
-            if self.tokens >= tokens:
-                self.tokens -= tokens
-                return True
-            return False
-    
-    def time_until_available(self, tokens: int = 1) -> float:
-        """토큰이 사용 가능해질 때까지의 시간"""
-        with self.lock:
-            if self.tokens >= tokens:
-                return 0.0
-            needed_tokens = tokens - self.tokens
-            return needed_tokens / self.rate
-
-
-class CircuitBreaker:
-    """회로 차단기 패턴 구현"""
-    
-    def __init__(self, failure_threshold: int = 5, timeout: int = 60):
-        self.failure_threshold = failure_threshold
-        self.timeout = timeout
-        self.failure_count = 0
-        self.last_failure_time = None
-        self.state = 'CLOSED'  # CLOSED, OPEN, HALF_OPEN
-        self.lock = threading.Lock()
-    
-    def call(self, func, *args, **kwargs):
-        """회로 차단기를 통한 함수 호출"""
-        with self.lock:
-            if self.state == 'OPEN':
-                if time.time() - self.last_failure_time > self.timeout:
-                    self.state = 'HALF_OPEN'
-                else:
-                    raise Exception("Circuit breaker is OPEN")
-            
-            try:
-                result = func(*args, **kwargs)
-                if self.state == 'HALF_OPEN':
-                    self.state = 'CLOSED'
-                    self.failure_count = 0
-                return result
-                
-            except Exception as e:
-                self.failure_count += 1
-                self.last_failure_time = time.time()
-                
-                if self.failure_count >= self.failure_threshold:
-                    self.state = 'OPEN'
-                
-                raise e
+    @property
+    def state(self) -> str:
+        return self._state.upper().replace('-', '_')
 
 
 class EnhancedMarketplaceManager:
     """향상된 마켓플레이스 통합 관리자"""
     
-    def __init__(self, db_config: Dict[str, Any]):
+    def __init__(self, db_config: Dict[str, Any], redis_client=None):
         self.db_config = db_config
         
         # 율 제한 설정
@@ -164,18 +109,22 @@ class EnhancedMarketplaceManager:
             )
         }
         
-        # 토큰 버킷 초기화
+        # 토큰 버킷 초기화 (429/5xx 응답에 따라 AIMD 로 율 자동 조정, redis_client 지정 시 프로세스 간 공유)
+        self.redis_client = redis_client
         self.token_buckets = {
             marketplace: TokenBucket(
                 rate=config.max_requests_per_second,
-                capacity=config.burst_allowance
+                capacity=config.burst_allowance,
+                min_rate=1.0,
+                redis_client=redis_client,
+                name=f"marketplace:{marketplace}"
             )
             for marketplace, config in self.rate_limits.items()
         }
         
         # 회로 차단기 초기화
         self.circuit_breakers = {
-            marketplace: CircuitBreaker(failure_threshold=5, timeout=60)
+            marketplace: CircuitBreaker(failure_threshold=5, timeout=60, name=marketplace)
             for marketplace in self.rate_limits.keys()
         }
         
@@ -255,10 +204,8 @@ class EnhancedMarketplaceManager:
                 # 우선순위 큐에서 요청 가져오기
                 priority, request_data = request_queue.get(timeout=1)
                 
-                # 토큰 버킷에서 토큰 소비 대기
-                while not token_bucket.consume():
-                    wait_time = token_bucket.time_until_available()
-                    time.sleep(min(wait_time, 0.1))
+                # 토큰 버킷에서 토큰 예약 후 대기
+                token_bucket.acquire()
                 
                 # 요청 처리
                 self._execute_request(marketplace, request_data)
@@ -273,6 +220,7 @@ class EnhancedMarketplaceManager:
         start_time = time.time()
         metrics = self.metrics[marketplace]
         circuit_breaker = self.circuit_breakers[marketplace]
+        token_bucket = self.token_buckets[marketplace]
         
         try:
             # 회로 차단기를 통한 요청 실행
@@ -282,6 +230,9 @@ class EnhancedMarketplaceManager:
                 request_data
             )
             
+            # 성공 응답 - 율 점진 증가
+            token_bucket.on_success()
+            
             # 성공 메트릭 업데이트
             response_time = time.time() - start_time
             metrics.successful_requests += 1
@@ -298,9 +249,14 @@ class EnhancedMarketplaceManager:
             # 실패 메트릭 업데이트
             metrics.failed_requests += 1
             
-            if '429' in str(e) or 'rate limit' in str(e).lower():
+            status_code = self._status_from_error(e)
+            if status_code == 429 or 'rate limit' in str(e).lower():
                 metrics.rate_limited_requests += 1
             
+            # 429/5xx - 율 감소
+            if is_throttle_status(status_code) or 'rate limit' in str(e).lower():
+                token_bucket.on_throttle()
+            
             # 오류 콜백 호출
             if 'callback' in request_data:
                 request_data['callback'](None, e)
@@ -311,6 +267,17 @@ class EnhancedMarketplaceManager:
             metrics.total_requests += 1
             metrics.last_request_time = datetime.now()
     
+    @staticmethod
+    def _status_from_error(error: Exception) -> Optional[int]:
+        """예외에서 HTTP 상태 코드 추출 (requests 응답 또는 메시지의 상태 코드)"""
+        response = getattr(error, 'response', None)
+        if response is not None and getattr(response, 'status_code', None):
+            return response.status_code
+        for code in (429, 500, 502, 503, 504):
+            if str(code) in str(error):
+                return code
+        return None
+    
     def _make_api_request(self, marketplace: str, request_data: Dict[str, Any]) -> Any:
         """실제 API 요청 수행"""
         client = self.clients[marketplace]
@@ -514,10 +481,8 @@ class EnhancedMarketplaceManager:
         """단일 요청 처리"""
         token_bucket = self.token_buckets[marketplace]
         
-        # 토큰 소비 대기
-        while not token_bucket.consume():
-            wait_time = token_bucket.time_until_available()
-            time.sleep(min(wait_time, 0.1))
+        # 토큰 예약 후 대기
+        token_bucket.acquire()
         
         # 요청 실행
         return self._make_api_request(marketplace, request)
@@ -539,6 +504,7 @@ class EnhancedMarketplaceManager:
             status[marketplace] = {
                 'circuit_breaker_state': circuit_breaker.state,
                 'available_tokens': int(token_bucket.tokens),
+                'current_rate': round(token_bucket.rate, 2),
                 'success_rate': f"{success_rate:.1f}%",
                 'total_requests': metrics.total_requests,
                 'avg_response_time': f"{metrics.avg_response_time:.3f}s",
@@ -601,11 +567,9 @@ class EnhancedMarketplaceManager:
                 new_rate = rate_limit_config.max_requests_per_second * 0.8
                 rate_limit_config.max_requests_per_second = max(1.0, new_rate)
                 
-                # 토큰 버킷 업데이트
-                self.token_buckets[marketplace] = TokenBucket(
-                    rate=new_rate,
-                    capacity=rate_limit_config.burst_allowance
-                )
+                # 토큰 버킷 상한 조정 (AIMD 증가가 새 상한을 넘지 않도록)
+                token_bucket = self.token_buckets[marketplace]
+                token_bucket.max_rate = max(token_bucket.min_rate, new_rate)
                 
                 logger.info(f"{marketplace} 율 제한 최적화: {new_rate:.1f} req/sec")
     
@@ -10,6 +10,7 @@ from datetime import datetime
 import time
 import logging
 from .auth import NaverAuth
+from core.tracing import current_span, get_tracer
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +26,15 @@ class NaverBaseClient:
     def _make_request(self, method: str, endpoint: str, 
                      params: Optional[Dict] = None, 
                      data: Optional[Dict] = None) -> Dict:
-        """API 요청 실행"""
+        """API 요청 실행 (재시도 포함 전체 구간을 스팬 하나로 기록)"""
+        with get_tracer().span(f"naver {method} {endpoint}", kind='client',
+                               **{'http.method': method, 'http.path': endpoint,
+                                  'peer.service': 'naver'}):
+            return self._send_request(method, endpoint, params, data)
+    
+    def _send_request(self, method: str, endpoint: str,
+                      params: Optional[Dict], data: Optional[Dict]) -> Dict:
+        """API 요청 전송 (재시도 로직)"""
         url = f"{self.base_url}{endpoint}"
         
         # URL 파라미터 추가
@@ -60,6 +69,10 @@ class NaverBaseClient:
             
             except urllib.error.HTTPError as e:
                 error_body = e.read().decode('utf-8')
+                span = current_span()
+                if span is not None:
+                    span.set_attribute('http.status_code', e.code)
+                    span.set_attribute('retry.attempt', attempt + 1)
                 logger.error(f"HTTP Error {e.code}: {error_body}")
                 
                 # 429 Too Many Requests - 재시도
@@ -1,13 +1,14 @@
 import psycopg2
 from psycopg2.extras import RealDictCursor, Json
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Sequence, Tuple
 import os
 import sys
 from dotenv import load_dotenv
 
 # 상위 디렉토리를 경로에 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from db.bulk_write import bulk_execute
 
 try:
     from config import DatabaseConfig, get_config
@@ -93,6 +94,16 @@ class MarketBase:
             self.connection.commit()
             return cursor.fetchone()[0]
     
+    def _bulk_execute(self, cursor, query: str, rows: Sequence[tuple], keys: Sequence[Any],
+                      template: Optional[str] = None) -> Tuple[List[tuple], List[Tuple[Any, str]]]:
+        """
+        execute_values 일괄 실행 (행 단위 오류 격리, db.bulk_write.bulk_execute 참고)
+        
+        Returns:
+            (RETURNING 결과 목록, [(식별자, 오류 메시지)])
+        """
+        return bulk_execute(cursor, query, rows, keys, template)
+    
     def close(self):
         """연결 종료"""
         if self.connection:
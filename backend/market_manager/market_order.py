@@ -1,5 +1,6 @@
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
+import psycopg2
 from psycopg2.extras import RealDictCursor, Json, execute_values
 from .market_base import MarketBase
 
@@ -81,26 +82,30 @@ class MarketOrder(MarketBase):
             self.connection.commit()
             return order_id
     
+    def _order_item_row(self, order_id: int, item: Dict) -> tuple:
+        """주문 상품 INSERT 행 변환"""
+        return (
+            order_id,
+            item.get('market_product_id'),
+            item.get('product_name'),
+            item.get('option_name'),
+            item.get('quantity', 1),
+            item.get('unit_price'),
+            item.get('total_price'),
+            item.get('item_status', 'pending'),
+            item.get('tracking_company'),
+            item.get('tracking_number'),
+            item.get('shipped_date'),
+            item.get('delivered_date'),
+            Json(item.get('item_data', {}))
+        )
+    
     def _save_order_items(self, cursor, order_id: int, items: List[Dict]):
         """주문 상품 저장"""
-        values = []
-        for item in items:
-            values.append((
-                order_id,
-                item.get('market_product_id'),
-                item.get('product_name'),
-                item.get('option_name'),
-                item.get('quantity', 1),
-                item.get('unit_price'),
-                item.get('total_price'),
-                item.get('item_status', 'pending'),
-                item.get('tracking_company'),
-                item.get('tracking_number'),
-                item.get('shipped_date'),
-                item.get('delivered_date'),
-                Json(item.get('item_data', {}))
-            ))
-        
+        self._save_order_rows(cursor, [self._order_item_row(order_id, item) for item in items])
+    
+    def _save_order_rows(self, cursor, values: List[tuple]):
+        """주문 상품 INSERT (행은 _order_item_row 형식)"""
         execute_values(
             cursor,
             """
@@ -112,9 +117,165 @@ class MarketOrder(MarketBase):
                 shipped_date, delivered_date, item_data
             ) VALUES %s
             """,
-            values
+            values,
+            page_size=len(values)
         )
     
+    def _replace_order_items(self, cursor, entries: List[Tuple[Any, int, List[Dict]]]) -> List[Tuple[Any, str]]:
+        """
+        주문 상품 교체 (기존 상품 삭제 후 insert)
+        
+        전체를 세이브포인트 하나로 먼저 실행하고, 실패하면 주문마다 세이브포인트를 두고
+        다시 실행한다. 상품 저장에 실패한 주문은 삭제도 되돌려 기존 상품을 그대로 둔다.
+        
+        Args:
+            entries: [(market_order_id, 주문 ID, 상품 목록)]
+        
+        Returns:
+            [(market_order_id, 오류 메시지)]
+        """
+        cursor.execute("SAVEPOINT order_items")
+        try:
+            cursor.execute(
+                "DELETE FROM market_order_items WHERE market_order_id = ANY(%s)",
+                ([order_id for _, order_id, _ in entries],)
+            )
+            values = [self._order_item_row(order_id, item)
+                      for _, order_id, items in entries for item in items]
+            if values:
+                self._save_order_rows(cursor, values)
+        except psycopg2.Error as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT order_items")
+            cursor.execute("RELEASE SAVEPOINT order_items")
+            if len(entries) == 1:
+                return [(entries[0][0], str(e).strip())]
+            failures = []
+            for entry in entries:
+                failures.extend(self._replace_order_items(cursor, [entry]))
+            return failures
+        
+        cursor.execute("RELEASE SAVEPOINT order_items")
+        return []
+    
+    def save_orders_batch(self, market_code: str, account_name: str, orders: List[Dict]) -> Dict:
+        """
+        마켓 주문 일괄 저장
+        
+        주문은 upsert 한 번, 주문 상품은 해당 주문들의 기존 상품 삭제 후 insert 로
+        교체한다 (마켓 데이터 기준 - 재동기화 시 상품 중복 방지). 주문 upsert 실패는
+        행 단위로, 상품 교체 실패는 주문 단위 세이브포인트로 격리한다.
+        
+        입력 주문은 정확히 하나의 결과로 집계된다. 같은 청크 안에 중복된 주문은
+        마지막 값만 저장하고 나머지는 skipped, 상품 교체에 실패한 주문은 (주문 정보는
+        갱신되었더라도) 기존 상품을 유지한 채 failed 로 센다.
+        
+        Returns:
+            {'created': 신규 수, 'updated': 갱신 수, 'failed': 실패 수,
+             'skipped': 청크 내 중복 수, 'errors': [...]}
+        """
+        account = self.get_market_account(market_code, account_name)
+        if not account:
+            raise ValueError(f"Account not found: {market_code}/{account_name}")
+        
+        # 청크 내 중복 제거
+        latest = {}
+        for order in orders:
+            latest[order['market_order_id']] = order
+        
+        values = []
+        for order_data in latest.values():
+            values.append((
+                account['market_id'],
+                account['id'],
+                order_data['market_order_id'],
+                order_data['order_date'],
+                order_data.get('payment_date'),
+                order_data.get('buyer_name'),
+                order_data.get('buyer_email'),
+                order_data.get('buyer_phone'),
+                order_data.get('receiver_name'),
+                order_data.get('receiver_phone'),
+                order_data.get('receiver_address'),
+                order_data.get('receiver_zipcode'),
+                order_data.get('delivery_message'),
+                order_data.get('order_status', 'pending'),
+                order_data.get('payment_method'),
+                order_data.get('total_price'),
+                order_data.get('product_price'),
+                order_data.get('discount_amount'),
+                order_data.get('shipping_fee'),
+                Json(order_data.get('market_data', {}))
+            ))
+        
+        with self.connection.cursor() as cursor:
+            # 1. 주문 upsert
+            returned, failures = self._bulk_execute(
+                cursor,
+                """
+                INSERT INTO market_orders (
+                    market_id, market_account_id, market_order_id,
+                    order_date, payment_date,
+                    buyer_name, buyer_email, buyer_phone,
+                    receiver_name, receiver_phone, receiver_address, 
+                    receiver_zipcode, delivery_message,
+                    order_status, payment_method,
+                    total_price, product_price, discount_amount, shipping_fee,
+                    market_data, last_synced_at
+                ) VALUES %s
+                ON CONFLICT (market_account_id, market_order_id)
+                DO UPDATE SET
+                    order_date = EXCLUDED.order_date,
+                    payment_date = EXCLUDED.payment_date,
+                    buyer_name = EXCLUDED.buyer_name,
+                    buyer_email = EXCLUDED.buyer_email,
+                    buyer_phone = EXCLUDED.buyer_phone,
+                    receiver_name = EXCLUDED.receiver_name,
+                    receiver_phone = EXCLUDED.receiver_phone,
+                    receiver_address = EXCLUDED.receiver_address,
+                    receiver_zipcode = EXCLUDED.receiver_zipcode,
+                    delivery_message = EXCLUDED.delivery_message,
+                    order_status = EXCLUDED.order_status,
+                    payment_method = EXCLUDED.payment_method,
+                    total_price = EXCLUDED.total_price,
+                    product_price = EXCLUDED.product_price,
+                    discount_amount = EXCLUDED.discount_amount,
+                    shipping_fee = EXCLUDED.shipping_fee,
+                    market_data = EXCLUDED.market_data,
+                    last_synced_at = CURRENT_TIMESTAMP,
+                    updated_at = CURRENT_TIMESTAMP
+                RETURNING id, market_order_id, (xmax = 0) AS inserted
+                """,
+                values,
+                keys=list(latest.keys()),
+                template="(" + ", ".join(["%s"] * 20) + ", CURRENT_TIMESTAMP)"
+            )
+            
+            # 2. 주문 상품 교체 (상품 정보가 있는 주문만)
+            order_ids = {market_order_id: order_id for order_id, market_order_id, _ in returned}
+            replace = [
+                (market_order_id, order_ids[market_order_id], order_data.get('items') or [])
+                for market_order_id, order_data in latest.items()
+                if market_order_id in order_ids and 'items' in order_data
+            ]
+            item_failures = self._replace_order_items(cursor, replace) if replace else []
+            
+            self.connection.commit()
+        
+        failed_items = {key for key, _ in item_failures}
+        saved = [row for row in returned if row[1] not in failed_items]
+        created = sum(1 for row in saved if row[2])
+        
+        errors = [f"Order {key}: {error}" for key, error in failures]
+        errors.extend(f"Order {key} items: {error}" for key, error in item_failures)
+        
+        return {
+            'created': created,
+            'updated': len(saved) - created,
+            'failed': len(failures) + len(failed_items),
+            'skipped': len(orders) - len(latest),
+            'errors': errors
+        }
+    
     def update_order_status(self, market_code: str, account_name: str,
                           market_order_id: str, status: str):
         """주문 상태 업데이트"""
@@ -1,6 +1,6 @@
 from typing import Dict, List, Optional, Any
 from datetime import datetime
-from psycopg2.extras import RealDictCursor, Json, execute_values
+from psycopg2.extras import RealDictCursor, Json
 from .market_base import MarketBase
 
 class MarketProduct(MarketBase):
@@ -69,15 +69,27 @@ class MarketProduct(MarketBase):
             self.connection.commit()
             return cursor.fetchone()[0]
     
-    def save_products_batch(self, market_code: str, account_name: str, products: List[Dict]):
-        """마켓 상품 일괄 저장"""
+    def save_products_batch(self, market_code: str, account_name: str, products: List[Dict]) -> Dict:
+        """
+        마켓 상품 일괄 저장 (단일 upsert 문, 행 단위 오류 격리)
+        
+        같은 청크 안에 중복된 market_product_id 는 마지막 값만 저장하고 나머지는 skipped 로 센다.
+        
+        Returns:
+            {'created': 신규 수, 'updated': 갱신 수, 'failed': 실패 수,
+             'skipped': 청크 내 중복 수, 'errors': [...]}
+        """
         account = self.get_market_account(market_code, account_name)
         if not account:
             raise ValueError(f"Account not found: {market_code}/{account_name}")
         
-        # 데이터 준비
-        values = []
+        # 데이터 준비 (청크 내 중복 제거 - ON CONFLICT 는 한 문장에서 같은 행을 두 번 갱신할 수 없음)
+        latest = {}
         for product in products:
+            latest[product['market_product_id']] = product
+        
+        values = []
+        for product in latest.values():
             values.append((
                 account['market_id'],
                 account['id'],
@@ -100,7 +112,7 @@ class MarketProduct(MarketBase):
             ))
         
         with self.connection.cursor() as cursor:
-            execute_values(
+            returned, failures = self._bulk_execute(
                 cursor,
                 """
                 INSERT INTO market_products (
@@ -109,7 +121,7 @@ class MarketProduct(MarketBase):
                     original_price, sale_price, discount_rate,
                     status, stock_quantity,
                     category_code, category_name, category_path,
-                    shipping_type, shipping_fee, market_data
+                    shipping_type, shipping_fee, market_data, last_synced_at
                 ) VALUES %s
                 ON CONFLICT (market_account_id, market_product_id)
                 DO UPDATE SET
@@ -130,10 +142,22 @@ class MarketProduct(MarketBase):
                     market_data = EXCLUDED.market_data,
                     last_synced_at = CURRENT_TIMESTAMP,
                     updated_at = CURRENT_TIMESTAMP
+                RETURNING (xmax = 0) AS inserted
                 """,
-                values
+                values,
+                keys=list(latest.keys()),
+                template="(" + ", ".join(["%s"] * 18) + ", CURRENT_TIMESTAMP)"
             )
             self.connection.commit()
+        
+        created = sum(1 for row in returned if row[0])
+        return {
+            'created': created,
+            'updated': len(returned) - created,
+            'failed': len(failures),
+            'skipped': len(products) - len(latest),
+            'errors': [f"Product {key}: {error}" for key, error in failures]
+        }
     
     def get_products(self, market_code: str, account_name: Optional[str] = None, 
                     status: Optional[str] = None, limit: int = 100) -> List[Dict]:
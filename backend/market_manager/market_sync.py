@@ -1,5 +1,6 @@
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterable, Callable
 from datetime import datetime, timedelta
+from itertools import islice
 import json
 from psycopg2.extras import RealDictCursor, Json
 from .market_base import MarketBase
@@ -9,188 +10,211 @@ from .market_order import MarketOrder
 class MarketSync(MarketBase):
     """마켓 데이터 동기화 관리"""
     
-    def __init__(self):
+    def __init__(self, chunk_size: int = 500):
         super().__init__()
         self.product_manager = MarketProduct()
         self.order_manager = MarketOrder()
+        # 청크당 상품 upsert 1회, 주문/주문상품 upsert 각 1회
+        self.chunk_size = chunk_size
     
-    def sync_coupang_products(self, account_name: str, products: List[Dict]) -> Dict:
-        """쿠팡 상품 동기화"""
+    def _sync_in_chunks(self, market_code: str, account_name: str, records: Iterable[Dict],
+                        converter: Callable[[Dict], Dict], key_getter: Callable[[Dict], Any],
+                        saver: Callable[[str, str, List[Dict]], Dict], label: str) -> Dict:
+        """
+        청크 단위 동기화 파이프라인
+        
+        청크마다 변환 → 일괄 저장 순으로 처리한다. 변환 실패 행은 저장 전에 걸러지고,
+        저장 실패 행은 saver 가 행 단위로 격리해 돌려준다. records 는 리스트나
+        스트리밍 이터레이터 모두 가능하다.
+        
+        모든 입력은 created/updated/failed/skipped(청크 내 중복) 중 하나로 집계되어
+        합계가 total 과 같다.
+        """
         results = {
             'total': 0,
             'created': 0,
             'updated': 0,
             'failed': 0,
+            'skipped': 0,
             'errors': []
         }
         
-        for product in products:
+        iterator = iter(records)
+        while True:
+            chunk = list(islice(iterator, self.chunk_size))
+            if not chunk:
+                break
+            results['total'] += len(chunk)
+            
+            # 변환
+            converted = []
+            for record in chunk:
+                try:
+                    converted.append(converter(record))
+                except Exception as e:
+                    results['failed'] += 1
+                    results['errors'].append(f"{label} {key_getter(record)}: {str(e)}")
+            
+            if not converted:
+                continue
+            
+            # 일괄 저장
             try:
-                # 쿠팡 데이터를 공통 형식으로 변환
-                common_product = {
-                    'market_product_id': str(product.get('sellerProductId', '')),
-                    'product_name': product.get('sellerProductName', ''),
-                    'brand': product.get('brand', ''),
-                    'manufacturer': product.get('manufacture', ''),
-                    'model_name': product.get('modelName', ''),
-                    'original_price': product.get('originalPrice'),
-                    'sale_price': product.get('salePrice'),
-                    'discount_rate': self._calculate_discount_rate(
-                        product.get('originalPrice'), 
-                        product.get('salePrice')
-                    ),
-                    'status': self._convert_coupang_status(product.get('statusName')),
-                    'stock_quantity': product.get('productStock', 0),
-                    'category_code': product.get('displayCategoryCode'),
-                    'category_name': product.get('displayCategoryName'),
-                    'shipping_type': 'free' if product.get('freeShipment') else 'paid',
-                    'market_data': product
-                }
-                
-                self.product_manager.save_product('coupang', account_name, common_product)
-                results['updated'] += 1
-                
+                saved = saver(market_code, account_name, converted)
             except Exception as e:
-                results['failed'] += 1
-                results['errors'].append(f"Product {product.get('sellerProductId')}: {str(e)}")
+                self._rollback(saver)
+                results['failed'] += len(converted)
+                results['errors'].append(f"{label} chunk ({len(converted)}건): {str(e)}")
+                continue
             
-            results['total'] += 1
+            results['created'] += saved['created']
+            results['updated'] += saved['updated']
+            results['failed'] += saved['failed']
+            results['skipped'] += saved['skipped']
+            results['errors'].extend(saved['errors'])
         
         return results
     
-    def sync_coupang_orders(self, account_name: str, orders: List[Dict]) -> Dict:
+    def _rollback(self, saver: Callable):
+        """저장 실패 후 해당 매니저 연결 트랜잭션 정리"""
+        manager = getattr(saver, '__self__', None)
+        if manager is not None and manager.connection and not manager.connection.closed:
+            manager.connection.rollback()
+    
+    def sync_coupang_products(self, account_name: str, products: Iterable[Dict]) -> Dict:
+        """쿠팡 상품 동기화"""
+        return self._sync_in_chunks(
+            'coupang', account_name, products,
+            self._convert_coupang_product,
+            lambda product: product.get('sellerProductId'),
+            self.product_manager.save_products_batch,
+            'Product'
+        )
+    
+    def _convert_coupang_product(self, product: Dict) -> Dict:
+        """쿠팡 데이터를 공통 형식으로 변환"""
+        return self._require_id({
+            'market_product_id': str(product.get('sellerProductId', '')),
+            'product_name': product.get('sellerProductName', ''),
+            'brand': product.get('brand', ''),
+            'manufacturer': product.get('manufacture', ''),
+            'model_name': product.get('modelName', ''),
+            'original_price': product.get('originalPrice'),
+            'sale_price': product.get('salePrice'),
+            'discount_rate': self._calculate_discount_rate(
+                product.get('originalPrice'), 
+                product.get('salePrice')
+            ),
+            'status': self._convert_coupang_status(product.get('statusName')),
+            'stock_quantity': product.get('productStock', 0),
+            'category_code': product.get('displayCategoryCode'),
+            'category_name': product.get('displayCategoryName'),
+            'shipping_type': 'free' if product.get('freeShipment') else 'paid',
+            'market_data': product
+        }, 'market_product_id')
+    
+    def sync_coupang_orders(self, account_name: str, orders: Iterable[Dict]) -> Dict:
         """쿠팡 주문 동기화"""
-        results = {
-            'total': 0,
-            'created': 0,
-            'updated': 0,
-            'failed': 0,
-            'errors': []
-        }
+        return self._sync_in_chunks(
+            'coupang', account_name, orders,
+            self._convert_coupang_order,
+            lambda order: order.get('orderId'),
+            self.order_manager.save_orders_batch,
+            'Order'
+        )
+    
+    def _convert_coupang_order(self, order: Dict) -> Dict:
+        """쿠팡 주문 데이터를 공통 형식으로 변환"""
+        common_order = self._require_id({
+            'market_order_id': str(order.get('orderId', '')),
+            'order_date': self._parse_date(order.get('orderedAt')),
+            'payment_date': self._parse_date(order.get('paidAt')),
+            'buyer_name': order.get('ordererName'),
+            'buyer_email': order.get('ordererEmail'),
+            'buyer_phone': order.get('ordererPhoneNumber'),
+            'receiver_name': order.get('receiverName'),
+            'receiver_phone': order.get('receiverPhoneNumber'),
+            'receiver_address': order.get('receiverAddr1', '') + ' ' + order.get('receiverAddr2', ''),
+            'receiver_zipcode': order.get('receiverPostCode'),
+            'delivery_message': order.get('parcelPrintMessage'),
+            'order_status': self._convert_coupang_order_status(order.get('status')),
+            'payment_method': order.get('paymentMethod'),
+            'total_price': order.get('totalPrice'),
+            'product_price': order.get('orderPrice'),
+            'discount_amount': order.get('discountPrice', 0),
+            'shipping_fee': order.get('shippingPrice', 0),
+            'market_data': order,
+            'items': self._convert_coupang_order_items(order.get('orderItems', []))
+        }, 'market_order_id')
         
-        for order in orders:
-            try:
-                # 쿠팡 주문 데이터를 공통 형식으로 변환
-                common_order = {
-                    'market_order_id': str(order.get('orderId', '')),
-                    'order_date': self._parse_date(order.get('orderedAt')),
-                    'payment_date': self._parse_date(order.get('paidAt')),
-                    'buyer_name': order.get('ordererName'),
-                    'buyer_email': order.get('ordererEmail'),
-                    'buyer_phone': order.get('ordererPhoneNumber'),
-                    'receiver_name': order.get('receiverName'),
-                    'receiver_phone': order.get('receiverPhoneNumber'),
-                    'receiver_address': order.get('receiverAddr1', '') + ' ' + order.get('receiverAddr2', ''),
-                    'receiver_zipcode': order.get('receiverPostCode'),
-                    'delivery_message': order.get('parcelPrintMessage'),
-                    'order_status': self._convert_coupang_order_status(order.get('status')),
-                    'payment_method': order.get('paymentMethod'),
-                    'total_price': order.get('totalPrice'),
-                    'product_price': order.get('orderPrice'),
-                    'discount_amount': order.get('discountPrice', 0),
-                    'shipping_fee': order.get('shippingPrice', 0),
-                    'market_data': order,
-                    'items': self._convert_coupang_order_items(order.get('orderItems', []))
-                }
-                
-                self.order_manager.save_order('coupang', account_name, common_order)
-                results['updated'] += 1
-                
-            except Exception as e:
-                results['failed'] += 1
-                results['errors'].append(f"Order {order.get('orderId')}: {str(e)}")
-            
-            results['total'] += 1
+        if common_order['order_date'] is None:
+            raise ValueError("주문일(orderedAt)이 없습니다")
         
-        return results
+        return common_order
     
-    def sync_ownerclan_products(self, account_name: str, products: List[Dict]) -> Dict:
+    def sync_ownerclan_products(self, account_name: str, products: Iterable[Dict]) -> Dict:
         """오너클랜 상품 동기화"""
-        results = {
-            'total': 0,
-            'created': 0,
-            'updated': 0,
-            'failed': 0,
-            'errors': []
-        }
-        
-        for product in products:
-            try:
-                # 오너클랜 데이터를 공통 형식으로 변환
-                common_product = {
-                    'market_product_id': str(product.get('id', '')),
-                    'product_name': product.get('name', ''),
-                    'brand': product.get('brand'),
-                    'manufacturer': product.get('manufacturer'),
-                    'model_name': product.get('modelName'),
-                    'original_price': product.get('originalPrice'),
-                    'sale_price': product.get('price'),
-                    'discount_rate': self._calculate_discount_rate(
-                        product.get('originalPrice'), 
-                        product.get('price')
-                    ),
-                    'status': 'active' if product.get('status') == 'ACTIVE' else 'inactive',
-                    'stock_quantity': product.get('stockQuantity', 0),
-                    'category_code': product.get('category', {}).get('id'),
-                    'category_name': product.get('category', {}).get('name'),
-                    'shipping_type': 'free',  # 오너클랜은 기본 무료배송
-                    'market_data': product
-                }
-                
-                self.product_manager.save_product('ownerclan', account_name, common_product)
-                results['updated'] += 1
-                
-            except Exception as e:
-                results['failed'] += 1
-                results['errors'].append(f"Product {product.get('id')}: {str(e)}")
-            
-            results['total'] += 1
-        
-        return results
+        return self._sync_in_chunks(
+            'ownerclan', account_name, products,
+            self._convert_ownerclan_product,
+            lambda product: product.get('id'),
+            self.product_manager.save_products_batch,
+            'Product'
+        )
     
-    def sync_naver_products(self, account_name: str, products: List[Dict]) -> Dict:
+    def _convert_ownerclan_product(self, product: Dict) -> Dict:
+        """오너클랜 데이터를 공통 형식으로 변환"""
+        return self._require_id({
+            'market_product_id': str(product.get('id', '')),
+            'product_name': product.get('name', ''),
+            'brand': product.get('brand'),
+            'manufacturer': product.get('manufacturer'),
+            'model_name': product.get('modelName'),
+            'original_price': product.get('originalPrice'),
+            'sale_price': product.get('price'),
+            'discount_rate': self._calculate_discount_rate(
+                product.get('originalPrice'), 
+                product.get('price')
+            ),
+            'status': 'active' if product.get('status') == 'ACTIVE' else 'inactive',
+            'stock_quantity': product.get('stockQuantity', 0),
+            'category_code': product.get('category', {}).get('id'),
+            'category_name': product.get('category', {}).get('name'),
+            'shipping_type': 'free',  # 오너클랜은 기본 무료배송
+            'market_data': product
+        }, 'market_product_id')
+    
+    def sync_naver_products(self, account_name: str, products: Iterable[Dict]) -> Dict:
         """네이버 스마트스토어 상품 동기화"""
-        results = {
-            'total': 0,
-            'created': 0,
-            'updated': 0,
-            'failed': 0,
-            'errors': []
-        }
-        
-        for product in products:
-            try:
-                # 네이버 데이터를 공통 형식으로 변환
-                common_product = {
-                    'market_product_id': str(product.get('id', '')),
-                    'product_name': product.get('name', ''),
-                    'brand': product.get('brand'),
-                    'manufacturer': product.get('manufacturer'),
-                    'model_name': product.get('modelName'),
-                    'original_price': product.get('originalPrice'),
-                    'sale_price': product.get('price'),
-                    'discount_rate': self._calculate_discount_rate(
-                        product.get('originalPrice'), 
-                        product.get('price')
-                    ),
-                    'status': self._convert_naver_status(product.get('status')),
-                    'stock_quantity': product.get('stockQuantity', 0),
-                    'category_code': product.get('category', {}).get('id'),
-                    'category_name': product.get('category', {}).get('name'),
-                    'shipping_type': 'free',  # 네이버는 기본 무료배송
-                    'market_data': product.get('original_data', product)
-                }
-                
-                self.product_manager.save_product('naver', account_name, common_product)
-                results['updated'] += 1
-                
-            except Exception as e:
-                results['failed'] += 1
-                results['errors'].append(f"Product {product.get('id')}: {str(e)}")
-            
-            results['total'] += 1
-        
-        return results
+        return self._sync_in_chunks(
+            'naver', account_name, products,
+            self._convert_naver_product,
+            lambda product: product.get('id'),
+            self.product_manager.save_products_batch,
+            'Product'
+        )
+    
+    def _convert_naver_product(self, product: Dict) -> Dict:
+        """네이버 데이터를 공통 형식으로 변환"""
+        return self._require_id({
+            'market_product_id': str(product.get('id', '')),
+            'product_name': product.get('name', ''),
+            'brand': product.get('brand'),
+            'manufacturer': product.get('manufacturer'),
+            'model_name': product.get('modelName'),
+            'original_price': product.get('originalPrice'),
+            'sale_price': product.get('price'),
+            'discount_rate': self._calculate_discount_rate(
+                product.get('originalPrice'), 
+                product.get('price')
+            ),
+            'status': self._convert_naver_status(product.get('status')),
+            'stock_quantity': product.get('stockQuantity', 0),
+            'category_code': product.get('category', {}).get('id'),
+            'category_name': product.get('category', {}).get('name'),
+            'shipping_type': 'free',  # 네이버는 기본 무료배송
+            'market_data': product.get('original_data', product)
+        }, 'market_product_id')
     
     def _convert_naver_status(self, status: Optional[str]) -> str:
         """네이버 상품 상태 변환"""
@@ -209,49 +233,37 @@ class MarketSync(MarketBase):
         
         return status_map.get(status.upper(), 'inactive')
     
-    def sync_eleven_products(self, account_name: str, products: List[Dict]) -> Dict:
-        """11번가 상품 동기화"""
-        results = {
-            'total': 0,
-            'created': 0,
-            'updated': 0,
-            'failed': 0,
-            'errors': []
-        }
-        
-        for product in products:
-            try:
-                # 11번가 데이터를 공통 형식으로 변환
-                common_product = {
-                    'market_product_id': str(product.get('id', '')),
-                    'product_name': product.get('name', ''),
-                    'brand': product.get('brand'),
-                    'manufacturer': product.get('manufacturer'),
-                    'model_name': product.get('modelName'),
-                    'original_price': product.get('originalPrice'),
-                    'sale_price': product.get('price'),
-                    'discount_rate': self._calculate_discount_rate(
-                        product.get('originalPrice'), 
-                        product.get('price')
-                    ),
-                    'status': self._convert_eleven_status(product.get('status')),
-                    'stock_quantity': product.get('stockQuantity', 0),
-                    'category_code': product.get('category', {}).get('id'),
-                    'category_name': product.get('category', {}).get('name'),
-                    'shipping_type': 'paid',  # 11번가는 기본 유료배송
-                    'market_data': product.get('original_data', product)
-                }
-                
-                self.product_manager.save_product('11st', account_name, common_product)
-                results['updated'] += 1
-                
-            except Exception as e:
-                results['failed'] += 1
-                results['errors'].append(f"Product {product.get('id')}: {str(e)}")
-            
-            results['total'] += 1
-        
-        return results
+    def sync_eleven_products(self, account_name: str, products: Iterable[Dict]) -> Dict:
+        """11번가 상품 동기화 (리스트 또는 스트리밍 이터레이터)"""
+        return self._sync_in_chunks(
+            '11st', account_name, products,
+            self._convert_eleven_product,
+            lambda product: product.get('id'),
+            self.product_manager.save_products_batch,
+            'Product'
+        )
+    
+    def _convert_eleven_product(self, product: Dict) -> Dict:
+        """11번가 데이터를 공통 형식으로 변환"""
+        return self._require_id({
+            'market_product_id': str(product.get('id', '')),
+            'product_name': product.get('name', ''),
+            'brand': product.get('brand'),
+            'manufacturer': product.get('manufacturer'),
+            'model_name': product.get('modelName'),
+            'original_price': product.get('originalPrice'),
+            'sale_price': product.get('price'),
+            'discount_rate': self._calculate_discount_rate(
+                product.get('originalPrice'), 
+                product.get('price')
+            ),
+            'status': self._convert_eleven_status(product.get('status')),
+            'stock_quantity': product.get('stockQuantity', 0),
+            'category_code': product.get('category', {}).get('id'),
+            'category_name': product.get('category', {}).get('name'),
+            'shipping_type': 'paid',  # 11번가는 기본 유료배송
+            'market_data': product.get('original_data', product)
+        }, 'market_product_id')
     
     def _convert_eleven_status(self, status: Optional[str]) -> str:
         """11번가 상품 상태 변환"""
@@ -266,6 +278,12 @@ class MarketSync(MarketBase):
         
         return status_map.get(status.upper(), 'inactive')
     
+    def _require_id(self, record: Dict, key: str) -> Dict:
+        """식별자 누락 행은 저장 전에 실패 처리"""
+        if not record[key]:
+            raise ValueError(f"{key}가 없습니다")
+        return record
+    
     def _calculate_discount_rate(self, original_price: Optional[float], 
                                 sale_price: Optional[float]) -> Optional[float]:
         """할인율 계산"""
@@ -1,22 +1,30 @@
 """
 메트릭 수집기
 시스템, 비즈니스, 성능 메트릭을 수집하고 저장합니다.
+
+- 히스토그램은 고정 메모리 DDSketch (QuantileSketch) 로 기록하고 분위수는 조회/플러시 시점에만 계산
+- 타임시리즈는 시리즈당 고정 길이 링 버퍼, 시리즈 수도 max_series 로 제한
 """
 import asyncio
+import bisect
 import psutil
 import time
 import json
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, List, Any, Optional
 from collections import defaultdict, deque
 import threading
 from contextlib import contextmanager
 
-from ..db.connection_pool import get_database_pool
-from ..core.structured_logger import get_logger
+from db.connection_pool import get_database_pool
+from core.streaming_stats import QuantileSketch
+from core import get_logger
 
 logger = get_logger(__name__)
 
+HISTOGRAM_QUANTILES = (0.5, 0.9, 0.99)
+OVERFLOW_TAGS = {'_overflow': 'true'}
+
 
 class MetricsCollector:
     """메트릭 수집 및 관리 클래스"""
@@ -37,10 +45,19 @@ class MetricsCollector:
             return
             
         self._initialized = True
-        self.metrics_buffer = defaultdict(lambda: deque(maxlen=1000))
+        self.timeseries_points = 1000   # 시리즈당 보관 데이터포인트 수
+        self.max_series = 10000         # 메트릭 종류별 최대 시리즈 (태그 조합) 수
+        self.max_timeseries = 50000     # 타임시리즈 버퍼 최대 시리즈 수
+        self.histogram_accuracy = 0.01  # 히스토그램 분위수 상대오차
+        self.histogram_max_buckets = 512
+        
+        # 타임시리즈: 키 → (epoch 초, 값, 타입) 링 버퍼
+        self.metrics_buffer: Dict[str, deque] = {}
         self.counters = defaultdict(int)
         self.gauges = defaultdict(float)
-        self.histograms = defaultdict(list)
+        self.histograms: Dict[str, QuantileSketch] = {}
+        self.overflowed_series = 0
+        self._metrics_lock = threading.Lock()
         self._collection_task = None
         self._db_pool = None
         
@@ -100,6 +117,9 @@ class MetricsCollector:
                 self.record_gauge('process.memory.rss', process.memory_info().rss / (1024 * 1024))  # MB
                 self.record_gauge('process.threads', process.num_threads())
                 
+                # 히스토그램 통계 타임시리즈 (주기당 1회)
+                self.flush_histogram_timeseries()
+                
                 await asyncio.sleep(self.system_metrics_interval)
                 
             except asyncio.CancelledError:
@@ -108,57 +128,100 @@ class MetricsCollector:
                 logger.error(f"시스템 메트릭 수집 오류: {e}")
                 await asyncio.sleep(self.system_metrics_interval)
     
+    def _series_key(self, name: str, tags: Optional[Dict[str, str]], store: Dict) -> str:
+        """시리즈 키 (시리즈 수 초과 시 새 태그 조합은 overflow 시리즈로 합침)"""
+        key = self._make_key(name, tags)
+        if key in store or len(store) < self.max_series:
+            return key
+        self.overflowed_series += 1
+        return self._make_key(name, OVERFLOW_TAGS)
+    
     def record_counter(self, name: str, value: int = 1, tags: Optional[Dict[str, str]] = None):
         """카운터 메트릭 기록 (누적값)"""
-        key = self._make_key(name, tags)
-        self.counters[key] += value
-        
-        # 타임시리즈 데이터 저장
-        self._record_timeseries(name, self.counters[key], 'counter', tags)
+        with self._metrics_lock:
+            key = self._series_key(name, tags, self.counters)
+            self.counters[key] += value
+            total = self.counters[key]
+            
+            # 타임시리즈 데이터 저장
+            self._append_timeseries(key, total, 'counter')
     
     def record_gauge(self, name: str, value: float, tags: Optional[Dict[str, str]] = None):
         """게이지 메트릭 기록 (현재값)"""
-        key = self._make_key(name, tags)
-        self.gauges[key] = value
-        
-        # 타임시리즈 데이터 저장
-        self._record_timeseries(name, value, 'gauge', tags)
+        with self._metrics_lock:
+            key = self._series_key(name, tags, self.gauges)
+            self.gauges[key] = value
+            
+            # 타임시리즈 데이터 저장
+            self._append_timeseries(key, value, 'gauge')
     
     def record_histogram(self, name: str, value: float, tags: Optional[Dict[str, str]] = None):
-        """히스토그램 메트릭 기록 (분포)"""
-        key = self._make_key(name, tags)
+        """
+        히스토그램 메트릭 기록 (분포)
         
-        # 최근 1000개 값만 유지
-        if len(self.histograms[key]) >= 1000:
-            self.histograms[key].pop(0)
-        
-        self.histograms[key].append(value)
+        버킷 카운트 1개만 증가시킨다 (정렬/통계 계산 없음). 통계는
+        get_histogram_stats / flush_histogram_timeseries 호출 시 계산한다.
+        """
+        with self._metrics_lock:
+            key = self._series_key(name, tags, self.histograms)
+            sketch = self.histograms.get(key)
+            if sketch is None:
+                sketch = QuantileSketch(self.histogram_accuracy, self.histogram_max_buckets)
+                self.histograms[key] = sketch
+            sketch.add(value)
+    
+    def get_histogram_stats(self, key: str) -> Optional[Dict[str, float]]:
+        """히스토그램 통계 (count, min, max, avg, p50, p90, p99)"""
+        with self._metrics_lock:
+            sketch = self.histograms.get(key)
+            if sketch is None or sketch.count == 0:
+                return None
+            return self._sketch_stats(sketch)
+    
+    @staticmethod
+    def _sketch_stats(sketch: QuantileSketch) -> Dict[str, float]:
+        stats = {
+            'count': sketch.count,
+            'min': sketch.min,
+            'max': sketch.max,
+            'avg': sketch.mean,
+        }
+        for q in HISTOGRAM_QUANTILES:
+            stats[f"p{q * 100:g}"] = sketch.quantile(q)
+        return stats
+    
+    def export_state(self) -> Dict[str, Any]:
+        """
+        사전 집계 상태 스냅샷 (익스포터 / 멀티 프로세스 집계용)
         
-        # 통계 계산
-        values = self.histograms[key]
-        if values:
-            stats = {
-                'count': len(values),
-                'min': min(values),
-                'max': max(values),
-                'avg': sum(values) / len(values),
-                'p50': self._percentile(values, 50),
-                'p90': self._percentile(values, 90),
-                'p99': self._percentile(values, 99)
+        Returns:
+            {'counters': {키: 값}, 'gauges': {키: 값}, 'histograms': {키: QuantileSketch 복사본}}
+        """
+        with self._metrics_lock:
+            return {
+                'counters': dict(self.counters),
+                'gauges': dict(self.gauges),
+                'histograms': {key: sketch.copy() for key, sketch in self.histograms.items()},
             }
-            
-            # 각 통계를 개별 메트릭으로 저장
-            for stat_name, stat_value in stats.items():
-                self._record_timeseries(f"{name}.{stat_name}", stat_value, 'histogram', tags)
+    
+    def flush_histogram_timeseries(self):
+        """히스토그램 통계를 타임시리즈에 1회 기록 (수집 주기마다 호출)"""
+        with self._metrics_lock:
+            for key, sketch in self.histograms.items():
+                if sketch.count == 0:
+                    continue
+                name, tags = self._parse_key(key)
+                for stat_name, stat_value in self._sketch_stats(sketch).items():
+                    self._append_timeseries(self._make_key(f"{name}.{stat_name}", tags), stat_value, 'histogram')
     
     @contextmanager
     def timer(self, name: str, tags: Optional[Dict[str, str]] = None):
         """실행 시간 측정 컨텍스트 매니저"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             yield
         finally:
-            duration = (time.time() - start_time) * 1000  # ms
+            duration = (time.perf_counter() - start_time) * 1000  # ms
             self.record_histogram(f"{name}.duration", duration, tags)
     
     async def atimer(self, name: str, tags: Optional[Dict[str, str]] = None):
@@ -171,11 +234,11 @@ class MetricsCollector:
                 self.start_time = None
             
             async def __aenter__(self):
-                self.start_time = time.time()
+                self.start_time = time.perf_counter()
                 return self
             
             async def __aexit__(self, exc_type, exc_val, exc_tb):
-                duration = (time.time() - self.start_time) * 1000  # ms
+                duration = (time.perf_counter() - self.start_time) * 1000  # ms
                 self.collector.record_histogram(f"{self.name}.duration", duration, self.tags)
         
         return AsyncTimer(self, name, tags)
@@ -219,7 +282,7 @@ class MetricsCollector:
     
     def get_metrics_summary(self, time_range_minutes: int = 60) -> Dict[str, Any]:
         """메트릭 요약 조회"""
-        cutoff_time = datetime.now() - timedelta(minutes=time_range_minutes)
+        cutoff = time.time() - time_range_minutes * 60
         summary = {
             'counters': {},
             'gauges': {},
@@ -227,80 +290,80 @@ class MetricsCollector:
             'timeseries': {}
         }
         
+        with self._metrics_lock:
+            counters = list(self.counters.items())
+            gauges = list(self.gauges.items())
+            histograms = [
+                (key, self._sketch_stats(sketch))
+                for key, sketch in self.histograms.items() if sketch.count
+            ]
+            buffers = [(key, list(points)) for key, points in self.metrics_buffer.items()]
+        
         # 카운터 요약
-        for key, value in self.counters.items():
+        for key, value in counters:
             name, tags = self._parse_key(key)
-            if name not in summary['counters']:
-                summary['counters'][name] = []
-            summary['counters'][name].append({
+            summary['counters'].setdefault(name, []).append({
                 'value': value,
                 'tags': tags
             })
         
         # 게이지 요약
-        for key, value in self.gauges.items():
+        for key, value in gauges:
             name, tags = self._parse_key(key)
-            if name not in summary['gauges']:
-                summary['gauges'][name] = []
-            summary['gauges'][name].append({
+            summary['gauges'].setdefault(name, []).append({
                 'value': value,
                 'tags': tags
             })
         
         # 히스토그램 요약
-        for key, values in self.histograms.items():
-            if values:
-                name, tags = self._parse_key(key)
-                if name not in summary['histograms']:
-                    summary['histograms'][name] = []
-                
-                summary['histograms'][name].append({
-                    'count': len(values),
-                    'min': min(values),
-                    'max': max(values),
-                    'avg': sum(values) / len(values),
-                    'p50': self._percentile(values, 50),
-                    'p90': self._percentile(values, 90),
-                    'p99': self._percentile(values, 99),
-                    'tags': tags
-                })
+        for key, stats in histograms:
+            name, tags = self._parse_key(key)
+            summary['histograms'].setdefault(name, []).append({**stats, 'tags': tags})
         
         # 타임시리즈 데이터
-        for metric_name, datapoints in self.metrics_buffer.items():
-            recent_points = [
-                point for point in datapoints
-                if datetime.fromisoformat(point['timestamp']) > cutoff_time
-            ]
+        for key, points in buffers:
+            recent_points = self._points_since(key, points, cutoff)
             if recent_points:
-                summary['timeseries'][metric_name] = recent_points
+                summary['timeseries'][key] = recent_points
         
         return summary
     
     def get_metric_timeseries(self, metric_name: str, 
                             time_range_minutes: int = 60) -> List[Dict[str, Any]]:
         """특정 메트릭의 시계열 데이터 조회"""
-        cutoff_time = datetime.now() - timedelta(minutes=time_range_minutes)
+        cutoff = time.time() - time_range_minutes * 60
         
-        datapoints = self.metrics_buffer.get(metric_name, [])
-        return [
-            point for point in datapoints
-            if datetime.fromisoformat(point['timestamp']) > cutoff_time
-        ]
+        with self._metrics_lock:
+            points = list(self.metrics_buffer.get(metric_name, ()))
+        return self._points_since(metric_name, points, cutoff)
     
-    def _record_timeseries(self, name: str, value: float, metric_type: str, 
-                          tags: Optional[Dict[str, str]] = None):
-        """타임시리즈 데이터 저장"""
-        datapoint = {
-            'timestamp': datetime.now().isoformat(),
-            'value': value,
-            'type': metric_type
-        }
+    def _points_since(self, key: str, points: List[tuple], cutoff: float) -> List[Dict[str, Any]]:
+        """링 버퍼 데이터포인트 → 응답 형식 (시간순이므로 이진 탐색으로 시작 위치 결정)"""
+        start = bisect.bisect_right(points, cutoff, key=lambda point: point[0])
+        if start >= len(points):
+            return []
         
-        if tags:
-            datapoint['tags'] = tags
-        
-        key = self._make_key(name, tags)
-        self.metrics_buffer[key].append(datapoint)
+        _, tags = self._parse_key(key)
+        result = []
+        for timestamp, value, metric_type in points[start:]:
+            datapoint = {
+                'timestamp': datetime.fromtimestamp(timestamp).isoformat(),
+                'value': value,
+                'type': metric_type
+            }
+            if tags:
+                datapoint['tags'] = tags
+            result.append(datapoint)
+        return result
+    
+    def _append_timeseries(self, key: str, value: float, metric_type: str):
+        """타임시리즈 데이터 저장 (_metrics_lock 보유 상태에서 호출)"""
+        points = self.metrics_buffer.get(key)
+        if points is None:
+            if len(self.metrics_buffer) >= self.max_timeseries:
+                return  # 시리즈 수 상한: 새 시리즈 타임시리즈는 보관하지 않음
+            points = self.metrics_buffer[key] = deque(maxlen=self.timeseries_points)
+        points.append((time.time(), value, metric_type))
     
     def _make_key(self, name: str, tags: Optional[Dict[str, str]] = None) -> str:
         """메트릭 키 생성"""
@@ -310,7 +373,8 @@ class MetricsCollector:
         tag_str = ','.join(f"{k}={v}" for k, v in sorted(tags.items()))
         return f"{name},{tag_str}"
     
-    def _parse_key(self, key: str) -> tuple:
+    @staticmethod
+    def _parse_key(key: str) -> tuple:
         """메트릭 키 파싱"""
         parts = key.split(',', 1)
         name = parts[0]
@@ -323,21 +387,6 @@ class MetricsCollector:
         
         return name, tags
     
-    def _percentile(self, values: List[float], percentile: float) -> float:
-        """백분위수 계산"""
-        if not values:
-            return 0
-        
-        sorted_values = sorted(values)
-        index = (len(sorted_values) - 1) * (percentile / 100)
-        lower = int(index)
-        upper = lower + 1
-        
-        if upper >= len(sorted_values):
-            return sorted_values[lower]
-        
-        return sorted_values[lower] * (upper - index) + sorted_values[upper] * (index - lower)
-    
     async def persist_metrics(self):
         """메트릭을 데이터베이스에 저장"""
         if not self._db_pool:
@@ -345,6 +394,7 @@ class MetricsCollector:
         
         try:
             # 메트릭 요약 생성
+            self.flush_histogram_timeseries()
             summary = self.get_metrics_summary(time_range_minutes=5)
             
             # JSON으로 직렬화
@@ -13,6 +13,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 import psycopg2
+import psycopg2.errors
 from psycopg2.extras import RealDictCursor
 import json
 import statistics
@@ -41,10 +42,107 @@ class PerformanceMetrics:
     collection_rate: float  # 상품/초
     error_rate: float
 
+class CollectorTier:
+    """
+    주기별 수집 단계
+
+    실행마다 소요 시간(wall/CPU)을 스스로 측정하고, 예산(budget_ms)을 넘기면
+    주기를 두 배씩(최대 max_backoff 배) 늘렸다가 예산 안으로 돌아오면 원래 주기로 복귀한다.
+    """
+    
+    def __init__(self, name: str, func, interval: float, budget_ms: float,
+                 max_backoff: int = 8):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.budget_ms = budget_ms
+        self.max_backoff = max_backoff
+        self.backoff = 1
+        self.next_run = 0.0
+        self.enabled = True
+        
+        self.runs = 0
+        self.errors = 0
+        self.over_budget = 0
+        self.last_ms = 0.0
+        self.avg_ms = 0.0
+        self.max_ms = 0.0
+        self.total_wall = 0.0
+        self.total_cpu = 0.0
+    
+    @property
+    def effective_interval(self) -> float:
+        return self.interval * self.backoff
+    
+    def run(self, now: float):
+        """단계 실행 및 오버헤드 측정"""
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            self.func()
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"{self.name} 수집 실패: {e}")
+        wall = time.perf_counter() - wall_start
+        
+        self.total_wall += wall
+        self.total_cpu += time.thread_time() - cpu_start
+        self.runs += 1
+        self.last_ms = wall * 1000
+        self.max_ms = max(self.max_ms, self.last_ms)
+        self.avg_ms = self.last_ms if self.runs == 1 else self.avg_ms * 0.9 + self.last_ms * 0.1
+        
+        if self.last_ms > self.budget_ms:
+            self.over_budget += 1
+            if self.backoff < self.max_backoff:
+                self.backoff *= 2
+                logger.warning(
+                    f"⚠️ {self.name} 수집이 예산 초과 ({self.last_ms:.1f}ms > {self.budget_ms}ms), "
+                    f"주기 {self.effective_interval:.0f}초로 완화"
+                )
+        elif self.backoff > 1 and self.avg_ms <= self.budget_ms / 2:
+            self.backoff = 1
+        
+        self.next_run = now + self.effective_interval
+    
+    def get_stats(self, elapsed: float) -> Dict[str, Any]:
+        return {
+            'enabled': self.enabled,
+            'interval_s': self.effective_interval,
+            'budget_ms': self.budget_ms,
+            'runs': self.runs,
+            'errors': self.errors,
+            'over_budget': self.over_budget,
+            'last_ms': round(self.last_ms, 2),
+            'avg_ms': round(self.avg_ms, 2),
+            'max_ms': round(self.max_ms, 2),
+            # 모니터가 차지한 시간 비율 (%)
+            'wall_percent': round(self.total_wall / elapsed * 100, 4) if elapsed > 0 else 0,
+            'cpu_percent': round(self.total_cpu / elapsed * 100, 4) if elapsed > 0 else 0
+        }
+
+
 class PerformanceMonitor:
-    """성능 모니터링 클래스"""
+    """
+    성능 모니터링 클래스
+
+    수집은 비용별로 나눈 단계(tier)로 실행된다.
+    - system: 프로세스 내 psutil 게이지 (1초, 블로킹 없음)
+    - database: 활성 연결/수집 속도/오류율 (30초)
+    - statements: pg_stat_statements 스냅샷 간 차이 (60초, 쿼리 텍스트 미조회)
+    - analysis: 성능 분석/저장 (10초)
+    """
+    
+    DEFAULT_INTERVALS = {'system': 1.0, 'database': 30.0, 'statements': 60.0, 'analysis': 10.0}
+    DEFAULT_BUDGETS_MS = {'system': 5.0, 'database': 100.0, 'statements': 250.0, 'analysis': 20.0}
     
-    def __init__(self):
+    def __init__(self, intervals: Optional[Dict[str, float]] = None,
+                 budgets_ms: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            intervals: 단계별 수집 주기 (초)
+            budgets_ms: 단계별 1회 실행 예산 (ms)
+        """
         self.conn = psycopg2.connect(
             host='localhost',
             port=5434,
@@ -52,6 +150,8 @@ class PerformanceMonitor:
             user='postgres',
             password='postgres'
         )
+        # 조회 전용 연결이 idle in transaction 으로 남지 않도록
+        self.conn.autocommit = True
         
         # 메트릭 저장용 큐 (최근 5분 데이터)
         self.metrics_queue = deque(maxlen=300)  # 1초마다 수집, 5분 = 300개
@@ -59,14 +159,43 @@ class PerformanceMonitor:
         # 이전 측정값 (델타 계산용)
         self.prev_disk_io = psutil.disk_io_counters()
         self.prev_net_io = psutil.net_io_counters()
-        self.prev_query_count = 0
+        self.prev_io_time = time.monotonic()
+        self.prev_statements: Optional[Dict[tuple, tuple]] = None
+        psutil.cpu_percent(interval=None)  # 첫 호출은 기준점 설정용
+        
+        # 느린 단계의 최신 결과 (시스템 샘플마다 합쳐서 기록)
+        self.db_metrics = {
+            'active_connections': 0,
+            'collection_rate': 0.0,
+            'error_rate': 0.0
+        }
+        self.statement_metrics = {
+            'query_count': 0,
+            'avg_query_time_ms': 0.0,
+            'slow_queries': 0
+        }
+        self.last_analysis: Dict[str, Any] = {"status": "insufficient_data"}
+        
+        intervals = {**self.DEFAULT_INTERVALS, **(intervals or {})}
+        budgets_ms = {**self.DEFAULT_BUDGETS_MS, **(budgets_ms or {})}
+        self.tiers = [
+            CollectorTier(name, func, intervals[name], budgets_ms[name])
+            for name, func in (
+                ('system', self._collect_system_tier),
+                ('database', self._collect_database_tier),
+                ('statements', self._collect_statements_tier),
+                ('analysis', self._analysis_tier),
+            )
+        ]
         
         # 모니터링 플래그
         self.monitoring = False
         self.monitor_thread = None
+        self._stop_event = threading.Event()
+        self._started_at = time.monotonic()
         
     def get_database_metrics(self) -> Dict[str, Any]:
-        """데이터베이스 성능 메트릭 수집"""
+        """데이터베이스 활동 메트릭 수집 (pg_stat_statements 제외)"""
         try:
             with self.conn.cursor(cursor_factory=RealDictCursor) as cursor:
                 # 활성 연결 수
@@ -77,17 +206,6 @@ class PerformanceMonitor:
                 """)
                 active_conn = cursor.fetchone()['active_connections']
                 
-                # 쿼리 통계
-                cursor.execute("""
-                    SELECT 
-                        COUNT(*) as query_count,
-                        AVG(mean_exec_time) as avg_query_time,
-                        COUNT(CASE WHEN mean_exec_time > 1000 THEN 1 END) as slow_queries
-                    FROM pg_stat_statements
-                    WHERE query NOT LIKE '%pg_stat%'
-                """)
-                query_stats = cursor.fetchone()
-                
                 # 최근 수집 속도
                 cursor.execute("""
                     SELECT 
@@ -110,9 +228,6 @@ class PerformanceMonitor:
                 
                 return {
                     'active_connections': active_conn,
-                    'query_count': query_stats['query_count'] or 0,
-                    'avg_query_time_ms': float(query_stats['avg_query_time'] or 0),
-                    'slow_queries': query_stats['slow_queries'] or 0,
                     'collection_rate': float(collection_rate),
                     'error_rate': float(error_rate)
                 }
@@ -121,46 +236,140 @@ class PerformanceMonitor:
             logger.error(f"데이터베이스 메트릭 수집 실패: {e}")
             return {
                 'active_connections': 0,
-                'query_count': 0,
-                'avg_query_time_ms': 0,
-                'slow_queries': 0,
                 'collection_rate': 0,
                 'error_rate': 0
             }
     
-    def collect_metrics(self) -> PerformanceMetrics:
-        """시스템 및 애플리케이션 메트릭 수집"""
-        # CPU 및 메모리
-        cpu_percent = psutil.cpu_percent(interval=0.1)
+    def get_statement_metrics(self) -> Dict[str, Any]:
+        """
+        pg_stat_statements 스냅샷 차이로 최근 구간의 쿼리 통계 계산
+        
+        pg_stat_statements(false) 는 쿼리 텍스트 파일을 읽지 않으므로
+        전체 뷰를 LIKE 로 거르는 것보다 훨씬 가볍다. 누적값의 차이만 보므로
+        평균 실행 시간도 '서버 시작 이후'가 아니라 직전 스냅샷 이후 값이다.
+        """
+        with self.conn.cursor() as cursor:
+            cursor.execute("""
+                SELECT userid, dbid, queryid, calls, total_exec_time
+                FROM pg_stat_statements(false)
+                WHERE calls > 0
+            """)
+            current = {(row[0], row[1], row[2]): (row[3], row[4]) for row in cursor.fetchall()}
+        
+        previous = self.prev_statements
+        self.prev_statements = current
+        if previous is None:
+            return dict(self.statement_metrics)
+        
+        active_statements = 0
+        total_calls = 0
+        total_time = 0.0
+        slow_queries = 0
+        for key, (calls, exec_time) in current.items():
+            prev_calls, prev_time = previous.get(key, (0, 0.0))
+            if calls < prev_calls:  # pg_stat_statements_reset 또는 항목 축출
+                prev_calls, prev_time = 0, 0.0
+            delta_calls = calls - prev_calls
+            if delta_calls <= 0:
+                continue
+            delta_time = exec_time - prev_time
+            active_statements += 1
+            total_calls += delta_calls
+            total_time += delta_time
+            if delta_time / delta_calls > 1000:
+                slow_queries += 1
+        
+        return {
+            'query_count': active_statements,
+            'avg_query_time_ms': total_time / total_calls if total_calls else 0.0,
+            'slow_queries': slow_queries
+        }
+    
+    def collect_system_metrics(self) -> Dict[str, Any]:
+        """프로세스 내 시스템 게이지 (블로킹 없음)"""
+        # CPU 는 직전 호출 이후 사용률 (interval=None → 대기 없음)
+        cpu_percent = psutil.cpu_percent(interval=None)
         memory = psutil.virtual_memory()
         
-        # 디스크 I/O (델타)
+        now = time.monotonic()
+        elapsed = max(now - self.prev_io_time, 1e-6)
+        self.prev_io_time = now
+        
+        # 디스크 I/O (초당 델타)
         current_disk = psutil.disk_io_counters()
-        disk_read_mb = (current_disk.read_bytes - self.prev_disk_io.read_bytes) / 1024 / 1024
-        disk_write_mb = (current_disk.write_bytes - self.prev_disk_io.write_bytes) / 1024 / 1024
+        disk_read_mb = (current_disk.read_bytes - self.prev_disk_io.read_bytes) / 1024 / 1024 / elapsed
+        disk_write_mb = (current_disk.write_bytes - self.prev_disk_io.write_bytes) / 1024 / 1024 / elapsed
         self.prev_disk_io = current_disk
         
-        # 네트워크 I/O (델타)
+        # 네트워크 I/O (초당 델타)
         current_net = psutil.net_io_counters()
-        net_sent_mb = (current_net.bytes_sent - self.prev_net_io.bytes_sent) / 1024 / 1024
-        net_recv_mb = (current_net.bytes_recv - self.prev_net_io.bytes_recv) / 1024 / 1024
+        net_sent_mb = (current_net.bytes_sent - self.prev_net_io.bytes_sent) / 1024 / 1024 / elapsed
+        net_recv_mb = (current_net.bytes_recv - self.prev_net_io.bytes_recv) / 1024 / 1024 / elapsed
         self.prev_net_io = current_net
         
-        # 데이터베이스 메트릭
-        db_metrics = self.get_database_metrics()
-        
+        return {
+            'cpu_percent': cpu_percent,
+            'memory_percent': memory.percent,
+            'memory_mb': memory.used / 1024 / 1024,
+            'disk_io_read_mb': max(0, disk_read_mb),
+            'disk_io_write_mb': max(0, disk_write_mb),
+            'network_sent_mb': max(0, net_sent_mb),
+            'network_recv_mb': max(0, net_recv_mb)
+        }
+    
+    def collect_metrics(self) -> PerformanceMetrics:
+        """시스템 게이지 수집 + 느린 단계의 최신 DB 메트릭 결합"""
         return PerformanceMetrics(
             timestamp=datetime.now(),
-            cpu_percent=cpu_percent,
-            memory_percent=memory.percent,
-            memory_mb=memory.used / 1024 / 1024,
-            disk_io_read_mb=max(0, disk_read_mb),
-            disk_io_write_mb=max(0, disk_write_mb),
-            network_sent_mb=max(0, net_sent_mb),
-            network_recv_mb=max(0, net_recv_mb),
-            **db_metrics
+            **self.collect_system_metrics(),
+            **self.db_metrics,
+            **self.statement_metrics
         )
     
+    # -- 단계별 작업 -------------------------------------------------------
+    
+    def _collect_system_tier(self):
+        self.metrics_queue.append(self.collect_metrics())
+    
+    def _collect_database_tier(self):
+        self.db_metrics = self.get_database_metrics()
+    
+    def _collect_statements_tier(self):
+        try:
+            self.statement_metrics = self.get_statement_metrics()
+        except (psycopg2.errors.UndefinedFunction, psycopg2.errors.UndefinedTable,
+                psycopg2.errors.ObjectNotInPrerequisiteState) as e:
+            # 확장 미설치/미로드 → 이 단계만 끄고 나머지는 계속
+            self._tier('statements').enabled = False
+            logger.warning(f"pg_stat_statements 수집 비활성화: {e}")
+    
+    def _analysis_tier(self):
+        analysis = self.analyze_performance()
+        self.last_analysis = analysis
+        if analysis.get('status') != 'analyzed':
+            return
+        
+        if self.metrics_queue:
+            self.save_metrics_to_db(self.metrics_queue[-1], analysis['performance_score'])
+        
+        # 성능 저하 감지
+        if analysis['performance_score'] < 70:
+            logger.warning(f"⚠️ 성능 저하 감지: {analysis['performance_score']}점")
+            logger.warning(f"   병목: {', '.join(analysis['bottlenecks'])}")
+    
+    def _tier(self, name: str) -> CollectorTier:
+        return next(tier for tier in self.tiers if tier.name == name)
+    
+    def get_overhead_stats(self) -> Dict[str, Any]:
+        """단계별 자체 오버헤드 (실행 시간, 예산 초과 횟수, 점유율)"""
+        elapsed = time.monotonic() - self._started_at
+        tiers = {tier.name: tier.get_stats(elapsed) for tier in self.tiers}
+        return {
+            'tiers': tiers,
+            'total_wall_percent': round(sum(t['wall_percent'] for t in tiers.values()), 4),
+            'total_cpu_percent': round(sum(t['cpu_percent'] for t in tiers.values()), 4)
+        }
+    
     def analyze_performance(self) -> Dict[str, Any]:
         """성능 분석 및 병목 지점 감지"""
         if len(self.metrics_queue) < 10:
@@ -219,8 +428,11 @@ class PerformanceMonitor:
             "analyzed_at": datetime.now().isoformat()
         }
     
-    def save_metrics_to_db(self, metrics: PerformanceMetrics):
+    def save_metrics_to_db(self, metrics: PerformanceMetrics,
+                           performance_score: Optional[float] = None):
         """메트릭을 데이터베이스에 저장"""
+        if performance_score is None:
+            performance_score = self.analyze_performance().get('performance_score', 0)
         try:
             with self.conn.cursor() as cursor:
                 cursor.execute("""
@@ -230,43 +442,43 @@ class PerformanceMonitor:
                 """, (
                     metrics.timestamp,
                     json.dumps(asdict(metrics), default=str),
-                    self.analyze_performance().get('performance_score', 0)
+                    performance_score
                 ))
-            self.conn.commit()
         except Exception as e:
             logger.error(f"메트릭 저장 실패: {e}")
-            self.conn.rollback()
+    
+    def run_due_tiers(self, now: Optional[float] = None) -> float:
+        """
+        실행 시각이 된 단계 실행
+        
+        Returns:
+            다음 단계 실행까지 남은 시간 (초)
+        """
+        now = time.monotonic() if now is None else now
+        for tier in self.tiers:
+            if tier.enabled and now >= tier.next_run:
+                tier.run(now)
+        
+        next_run = min((tier.next_run for tier in self.tiers if tier.enabled), default=now + 1)
+        return max(0.0, next_run - time.monotonic())
     
     def monitor_loop(self):
-        """모니터링 루프"""
+        """모니터링 루프 (단계별 주기로 실행)"""
         logger.info("🚀 성능 모니터링 시작")
         
         while self.monitoring:
             try:
-                # 메트릭 수집
-                metrics = self.collect_metrics()
-                self.metrics_queue.append(metrics)
-                
-                # 10초마다 DB 저장
-                if len(self.metrics_queue) % 10 == 0:
-                    self.save_metrics_to_db(metrics)
-                
-                # 성능 저하 감지
-                analysis = self.analyze_performance()
-                if analysis.get('performance_score', 100) < 70:
-                    logger.warning(f"⚠️ 성능 저하 감지: {analysis['performance_score']}점")
-                    logger.warning(f"   병목: {', '.join(analysis['bottlenecks'])}")
-                
-                time.sleep(1)  # 1초 대기
-                
+                self._stop_event.wait(self.run_due_tiers())
             except Exception as e:
                 logger.error(f"모니터링 오류: {e}")
-                time.sleep(5)
+                self._stop_event.wait(5)
     
     def start(self):
         """모니터링 시작"""
         if not self.monitoring:
             self.monitoring = True
+            self._stop_event.clear()
+            self._started_at = time.monotonic()
             self.monitor_thread = threading.Thread(target=self.monitor_loop)
             self.monitor_thread.daemon = True
             self.monitor_thread.start()
@@ -276,6 +488,7 @@ class PerformanceMonitor:
         """모니터링 중지"""
         if self.monitoring:
             self.monitoring = False
+            self._stop_event.set()
             if self.monitor_thread:
                 self.monitor_thread.join()
             logger.info("🛑 성능 모니터링 중지됨")
@@ -307,7 +520,8 @@ class PerformanceMonitor:
             "application": {
                 "collection_rate": round(latest.collection_rate, 1),
                 "error_rate": round(latest.error_rate, 1)
-            }
+            },
+            "monitor_overhead": self.get_overhead_stats()
         }
 
 def main():
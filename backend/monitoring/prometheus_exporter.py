@@ -0,0 +1,300 @@
+"""
+Prometheus / OpenMetrics 익스포터
+MetricsCollector 의 사전 집계 상태(카운터, 게이지, DDSketch 히스토그램)를 그대로 노출합니다.
+
+- 타임시리즈 버퍼나 DB 를 읽지 않음 → 스크레이프 비용은 시리즈 수에만 비례
+- 태그는 레이블, 히스토그램은 스케치 버킷을 고정 le 경계로 누적해 classic histogram 으로 노출
+  (prometheus_client 텍스트 포맷은 native histogram 을 지원하지 않음)
+- 멀티 프로세스 (uvicorn 워커): 각 워커가 METRICS_MULTIPROC_DIR 에 상태 파일을 주기적으로
+  기록하고, /metrics 를 받은 워커가 모든 파일을 병합 (카운터/히스토그램 합산, 게이지 최신값)
+"""
+import glob
+import os
+import pickle
+import re
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from prometheus_client import CollectorRegistry, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, HistogramMetricFamily
+from prometheus_client.openmetrics import exposition as openmetrics_exposition
+
+from core.streaming_stats import QuantileSketch
+from core import get_logger
+from monitoring.metrics_collector import MetricsCollector, get_metrics_collector
+
+logger = get_logger(__name__)
+
+MULTIPROC_DIR_ENV = 'METRICS_MULTIPROC_DIR'
+
+# 히스토그램 le 경계 (응답 시간 ms 기준)
+DEFAULT_BUCKETS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+# 워커별로 값이 다른 게이지 → pid 레이블로 구분 (나머지 게이지는 최신값 1개)
+PER_PROCESS_GAUGE_PREFIXES = ('process.',)
+
+_NAME_RE = re.compile(r'[^a-zA-Z0-9_:]')
+_LABEL_RE = re.compile(r'[^a-zA-Z0-9_]')
+
+
+def sanitize_metric_name(name: str) -> str:
+    """'api.response_time' → 'api_response_time'"""
+    name = _NAME_RE.sub('_', name)
+    return f"_{name}" if name[:1].isdigit() else name
+
+
+def sanitize_label_name(name: str) -> str:
+    name = _LABEL_RE.sub('_', name)
+    return f"_{name}" if name[:1].isdigit() else name
+
+
+def sketch_to_buckets(sketch: QuantileSketch,
+                      bounds: Sequence[float] = DEFAULT_BUCKETS) -> List[Tuple[str, float]]:
+    """스케치 버킷 → 누적 (le, count) 목록 (+Inf 포함)"""
+    buckets = []
+    cumulative = 0
+    bound_index = 0
+    for value, count in sketch.iter_buckets():
+        while bound_index < len(bounds) and value > bounds[bound_index]:
+            buckets.append((f"{bounds[bound_index]:g}", cumulative))
+            bound_index += 1
+        cumulative += count
+    for bound in bounds[bound_index:]:
+        buckets.append((f"{bound:g}", cumulative))
+    buckets.append(('+Inf', sketch.count))
+    return buckets
+
+
+# ---------------------------------------------------------------------------
+# 멀티 프로세스 상태 공유
+# ---------------------------------------------------------------------------
+
+def _state_path(directory: str, pid: int) -> str:
+    return os.path.join(directory, f"metrics_{pid}.pkl")
+
+
+def write_process_state(directory: str, collector: Optional[MetricsCollector] = None):
+    """현재 워커의 집계 상태를 파일로 기록 (임시 파일 → os.replace)"""
+    collector = collector or get_metrics_collector()
+    state = collector.export_state()
+    state['pid'] = os.getpid()
+    state['written_at'] = time.time()
+
+    os.makedirs(directory, exist_ok=True)
+    path = _state_path(directory, os.getpid())
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def merge_states(states: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    워커 상태 병합
+
+    카운터/히스토그램은 합산(종료된 워커 누적분 포함), 공용 게이지는 가장 최근 기록값,
+    process.* 게이지는 pid 태그를 붙여 워커별로 유지한다.
+    """
+    merged = {'counters': {}, 'gauges': {}, 'histograms': {}}
+    gauge_written_at: Dict[str, float] = {}
+
+    for state in states:
+        for key, value in state.get('counters', {}).items():
+            merged['counters'][key] = merged['counters'].get(key, 0) + value
+
+        for key, sketch in state.get('histograms', {}).items():
+            if key in merged['histograms']:
+                merged['histograms'][key].merge(sketch)
+            else:
+                merged['histograms'][key] = sketch.copy()
+
+        written_at = state.get('written_at', 0)
+        for key, value in state.get('gauges', {}).items():
+            if key.startswith(PER_PROCESS_GAUGE_PREFIXES):
+                key = f"{key},pid={state.get('pid')}"
+                merged['gauges'][key] = value
+            elif written_at >= gauge_written_at.get(key, -1):
+                gauge_written_at[key] = written_at
+                merged['gauges'][key] = value
+
+    return merged
+
+
+def read_multiprocess_state(directory: str, gauge_ttl: float = 300.0) -> Dict[str, Any]:
+    """
+    모든 워커 상태 파일 병합
+
+    Args:
+        directory: 상태 파일 디렉토리
+        gauge_ttl: 이 시간(초) 이상 갱신되지 않은 (종료된) 워커의 게이지는 제외
+    """
+    states = []
+    now = time.time()
+    for path in glob.glob(os.path.join(directory, 'metrics_*.pkl')):
+        try:
+            with open(path, 'rb') as f:
+                state = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError) as e:
+            logger.warning(f"메트릭 상태 파일 읽기 실패 ({path}): {e}")
+            continue
+        if now - state.get('written_at', 0) > gauge_ttl:
+            state['gauges'] = {}
+        states.append(state)
+    return merge_states(states)
+
+
+class MultiprocessStateWriter:
+    """워커 상태 주기적 기록 스레드"""
+
+    def __init__(self, directory: str, interval: float = 5.0,
+                 collector: Optional[MetricsCollector] = None):
+        self.directory = directory
+        self.interval = interval
+        self.collector = collector
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='metrics-state-writer', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(self.interval)
+        # 종료 직전 상태 기록 (누적 카운터 유지)
+        self._write()
+
+    def _write(self):
+        try:
+            write_process_state(self.directory, self.collector)
+        except Exception as e:
+            logger.error(f"메트릭 상태 기록 실패: {e}")
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._write()
+            self._stop.wait(self.interval)
+
+
+# ---------------------------------------------------------------------------
+# 노출
+# ---------------------------------------------------------------------------
+
+class MetricsCollectorExporter:
+    """
+    prometheus_client 커스텀 컬렉터
+
+    단일 프로세스면 MetricsCollector.export_state(), multiproc_dir 이 있으면
+    워커 상태 파일 병합 결과를 메트릭 패밀리로 변환한다.
+    """
+
+    def __init__(self, collector: Optional[MetricsCollector] = None,
+                 multiproc_dir: Optional[str] = None,
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.collector = collector
+        self.multiproc_dir = multiproc_dir
+        self.buckets = tuple(buckets)
+
+    def _state(self) -> Dict[str, Any]:
+        if self.multiproc_dir:
+            return read_multiprocess_state(self.multiproc_dir)
+        return (self.collector or get_metrics_collector()).export_state()
+
+    @staticmethod
+    def _group(values: Dict[str, Any]) -> Dict[str, List[Tuple[Dict[str, str], Any]]]:
+        """키 → 메트릭 이름별 (태그, 값) 묶음"""
+        grouped: Dict[str, List[Tuple[Dict[str, str], Any]]] = {}
+        for key, value in values.items():
+            name, tags = MetricsCollector._parse_key(key)
+            grouped.setdefault(sanitize_metric_name(name), []).append(
+                ({sanitize_label_name(k): str(v) for k, v in tags.items()}, value)
+            )
+        return grouped
+
+    @staticmethod
+    def _label_names(series: List[Tuple[Dict[str, str], Any]]) -> List[str]:
+        return sorted({label for labels, _ in series for label in labels})
+
+    def collect(self):
+        state = self._state()
+
+        for name, series in self._group(state['counters']).items():
+            label_names = self._label_names(series)
+            family = CounterMetricFamily(name, name, labels=label_names)
+            for labels, value in series:
+                family.add_metric([labels.get(label, '') for label in label_names], value)
+            yield family
+
+        for name, series in self._group(state['gauges']).items():
+            label_names = self._label_names(series)
+            family = GaugeMetricFamily(name, name, labels=label_names)
+            for labels, value in series:
+                family.add_metric([labels.get(label, '') for label in label_names], value)
+            yield family
+
+        for name, series in self._group(state['histograms']).items():
+            label_names = self._label_names(series)
+            family = HistogramMetricFamily(name, name, labels=label_names)
+            for labels, sketch in series:
+                if sketch.count == 0:
+                    continue
+                family.add_metric(
+                    [labels.get(label, '') for label in label_names],
+                    buckets=sketch_to_buckets(sketch, self.buckets),
+                    sum_value=sketch.sum
+                )
+            yield family
+
+
+def render_metrics(accept_header: str = '',
+                   collector: Optional[MetricsCollector] = None,
+                   multiproc_dir: Optional[str] = None) -> Tuple[bytes, str]:
+    """
+    /metrics 응답 본문 생성
+
+    Args:
+        accept_header: 요청 Accept 헤더 (openmetrics 요청 시 OpenMetrics 포맷)
+        collector: 메트릭 수집기 (기본: 싱글톤)
+        multiproc_dir: 멀티 프로세스 상태 디렉토리 (기본: METRICS_MULTIPROC_DIR 환경 변수)
+
+    Returns:
+        (본문, Content-Type)
+    """
+    multiproc_dir = multiproc_dir or os.getenv(MULTIPROC_DIR_ENV)
+    if multiproc_dir:
+        # 스크레이프를 받은 워커는 최신 상태를 먼저 기록
+        write_process_state(multiproc_dir, collector)
+
+    registry = CollectorRegistry(auto_describe=False)
+    registry.register(MetricsCollectorExporter(collector, multiproc_dir))
+
+    if 'application/openmetrics-text' in (accept_header or ''):
+        return openmetrics_exposition.generate_latest(registry), openmetrics_exposition.CONTENT_TYPE_LATEST
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+_state_writer: Optional[MultiprocessStateWriter] = None
+
+
+def start_multiprocess_writer(interval: float = 5.0) -> Optional[MultiprocessStateWriter]:
+    """METRICS_MULTIPROC_DIR 이 설정된 경우 워커 상태 기록 시작 (워커 시작 시 1회 호출)"""
+    global _state_writer
+    directory = os.getenv(MULTIPROC_DIR_ENV)
+    if not directory:
+        return None
+    if _state_writer is None:
+        _state_writer = MultiprocessStateWriter(directory, interval)
+        _state_writer.start()
+        logger.info(f"멀티 프로세스 메트릭 상태 기록 시작: {directory}")
+    return _state_writer
+
+
+def stop_multiprocess_writer():
+    global _state_writer
+    if _state_writer is not None:
+        _state_writer.stop()
+        _state_writer = None
@@ -8,67 +8,82 @@ from fastapi import WebSocket, WebSocketDisconnect
 from datetime import datetime
 
 from .metrics_collector import get_metrics_collector
-from ..core.structured_logger import get_logger
+from core.broadcast_hub import BroadcastHub
+from core import get_logger
 
 logger = get_logger(__name__)
 
 
 class ConnectionManager:
-    """웹소켓 연결 관리자"""
+    """
+    웹소켓 연결 관리자
+
+    실제 전송은 BroadcastHub 가 연결별 큐/전송 태스크로 처리하므로
+    broadcast 는 느린 클라이언트를 기다리지 않는다.
+    """
+    
+    # 최신 값만 의미 있는 메트릭 스냅샷 토픽
+    SNAPSHOT_TOPICS = {"system", "api", "database"}
+    
+    def __init__(self, max_queue: int = 100, send_timeout: float = 10.0):
+        self.hub = BroadcastHub(
+            max_queue=max_queue,
+            send_timeout=send_timeout,
+            coalesce_topics=self.SNAPSHOT_TOPICS,
+            on_disconnect=self._on_hub_disconnect
+        )
+    
+    @property
+    def active_connections(self) -> Set[WebSocket]:
+        return set(self.hub.keys())
     
-    def __init__(self):
-        self.active_connections: Set[WebSocket] = set()
-        self.subscriber_topics: Dict[WebSocket, Set[str]] = {}
+    @property
+    def subscriber_topics(self) -> Dict[WebSocket, Set[str]]:
+        return {websocket: self.hub.get_topics(websocket) for websocket in self.hub.keys()}
     
     async def connect(self, websocket: WebSocket):
         """새 웹소켓 연결"""
         await websocket.accept()
-        self.active_connections.add(websocket)
-        self.subscriber_topics[websocket] = set()
-        logger.info(f"웹소켓 연결 수락: {len(self.active_connections)}개 활성 연결")
+        self.hub.register(websocket, websocket.send_text)
+        logger.info(f"웹소켓 연결 수락: {len(self.hub)}개 활성 연결")
     
     def disconnect(self, websocket: WebSocket):
         """웹소켓 연결 해제"""
-        self.active_connections.discard(websocket)
-        self.subscriber_topics.pop(websocket, None)
-        logger.info(f"웹소켓 연결 해제: {len(self.active_connections)}개 활성 연결")
+        if self.hub.unregister(websocket):
+            logger.info(f"웹소켓 연결 해제: {len(self.hub)}개 활성 연결")
+    
+    def _on_hub_disconnect(self, websocket: WebSocket):
+        """전송 실패/타임아웃으로 허브가 정리한 연결 닫기"""
+        logger.info(f"느린/끊긴 웹소켓 정리: {len(self.hub)}개 활성 연결")
+        asyncio.ensure_future(self._close_quietly(websocket))
+    
+    @staticmethod
+    async def _close_quietly(websocket: WebSocket):
+        try:
+            await websocket.close()
+        except Exception:
+            pass
     
     async def subscribe(self, websocket: WebSocket, topics: Set[str]):
         """토픽 구독"""
-        self.subscriber_topics[websocket] = topics
+        self.hub.set_topics(websocket, topics)
         logger.info(f"웹소켓 토픽 구독: {topics}")
     
     async def unsubscribe(self, websocket: WebSocket, topics: Set[str]):
         """토픽 구독 해제"""
-        if websocket in self.subscriber_topics:
-            self.subscriber_topics[websocket] -= topics
+        self.hub.unsubscribe(websocket, topics)
     
     async def send_personal_message(self, message: dict, websocket: WebSocket):
-        """개별 메시지 전송"""
-        try:
-            await websocket.send_json(message)
-        except Exception as e:
-            logger.error(f"메시지 전송 실패: {e}")
-            self.disconnect(websocket)
+        """개별 메시지 전송 (브로드캐스트와 같은 큐 → 순서 보장)"""
+        if not self.hub.send_to(websocket, message):
+            logger.error("메시지 전송 실패: 등록되지 않은 연결")
     
-    async def broadcast(self, message: dict, topic: str = None):
-        """브로드캐스트 메시지"""
-        disconnected = set()
-        
-        for websocket in self.active_connections:
-            # 토픽 필터링
-            if topic and topic not in self.subscriber_topics.get(websocket, set()):
-                continue
-            
-            try:
-                await websocket.send_json(message)
-            except Exception as e:
-                logger.error(f"브로드캐스트 실패: {e}")
-                disconnected.add(websocket)
-        
-        # 실패한 연결 정리
-        for websocket in disconnected:
-            self.disconnect(websocket)
+    async def broadcast(self, message: dict, topic: str = None) -> int:
+        """브로드캐스트 메시지 (한 번 직렬화 후 구독자 큐에 적재)"""
+        return self.hub.publish(topic, message)
+    
+    def has_subscribers(self, topic: str) -> bool:
+        return self.hub.subscriber_count(topic) > 0
 
 
 # 전역 연결 관리자
@@ -140,69 +155,63 @@ async def websocket_endpoint(websocket: WebSocket):
         manager.disconnect(websocket)
 
 
-async def broadcast_metrics_updates():
+def _api_totals(counters: Dict[str, Any]) -> Dict[str, float]:
+    """api.requests / api.errors 카운터 합계 (태그별 시리즈 포함)"""
+    total_count = 0
+    error_count = 0
+    for key, value in counters.items():
+        if key.startswith("api.requests"):
+            total_count += value
+        elif key.startswith("api.errors"):
+            error_count += value
+    return {
+        "requestCount": total_count,
+        "errorCount": error_count,
+        "errorRate": (error_count / total_count * 100) if total_count > 0 else 0
+    }
+
+
+def build_metrics_snapshot(collector, topics: Set[str]) -> Dict[str, Dict[str, Any]]:
+    """구독자가 있는 토픽의 메트릭만 계산 (틱당 1회, 모든 연결이 공유)"""
+    snapshot = {}
+    if "system" in topics:
+        snapshot["system"] = {
+            "cpu": collector.gauges.get("system.cpu.usage", 0),
+            "memory": collector.gauges.get("system.memory.usage", 0),
+            "disk": collector.gauges.get("system.disk.usage", 0)
+        }
+    if "api" in topics:
+        snapshot["api"] = _api_totals(dict(collector.counters))
+    if "database" in topics:
+        snapshot["database"] = {
+            "activeConnections": collector.gauges.get("database.pool.active", 0),
+            "availableConnections": collector.gauges.get("database.pool.available", 0)
+        }
+    return snapshot
+
+
+async def broadcast_metrics_updates(interval: float = 5.0):
     """주기적으로 메트릭 업데이트 브로드캐스트"""
     collector = get_metrics_collector()
     
     while True:
         try:
-            # 시스템 메트릭 브로드캐스트
-            system_metrics = {
-                "type": "metrics_update",
-                "topic": "system",
-                "data": {
-                    "cpu": collector.gauges.get("system.cpu.usage", 0),
-                    "memory": collector.gauges.get("system.memory.usage", 0),
-                    "disk": collector.gauges.get("system.disk.usage", 0)
-                },
-                "timestamp": datetime.now().isoformat()
-            }
-            
-            await manager.broadcast(system_metrics, "system")
-            
-            # API 메트릭 브로드캐스트
-            api_metrics_summary = {}
-            error_count = 0
-            total_count = 0
+            topics = {topic for topic in ConnectionManager.SNAPSHOT_TOPICS
+                      if manager.has_subscribers(topic)}
+            timestamp = datetime.now().isoformat()
             
-            for key, value in collector.counters.items():
-                if key.startswith("api.requests"):
-                    total_count += value
-                elif key.startswith("api.errors"):
-                    error_count += value
-            
-            api_metrics = {
-                "type": "metrics_update",
-                "topic": "api",
-                "data": {
-                    "requestCount": total_count,
-                    "errorCount": error_count,
-                    "errorRate": (error_count / total_count * 100) if total_count > 0 else 0
-                },
-                "timestamp": datetime.now().isoformat()
-            }
-            
-            await manager.broadcast(api_metrics, "api")
-            
-            # 데이터베이스 메트릭 브로드캐스트
-            db_metrics = {
-                "type": "metrics_update",
-                "topic": "database",
-                "data": {
-                    "activeConnections": collector.gauges.get("database.pool.active", 0),
-                    "availableConnections": collector.gauges.get("database.pool.available", 0)
-                },
-                "timestamp": datetime.now().isoformat()
-            }
-            
-            await manager.broadcast(db_metrics, "database")
-            
-            # 5초 대기
-            await asyncio.sleep(5)
+            for topic, data in build_metrics_snapshot(collector, topics).items():
+                await manager.broadcast({
+                    "type": "metrics_update",
+                    "topic": topic,
+                    "data": data,
+                    "timestamp": timestamp
+                }, topic)
             
         except Exception as e:
             logger.error(f"메트릭 브로드캐스트 에러: {e}")
-            await asyncio.sleep(5)
+        
+        await asyncio.sleep(interval)
 
 
 # 브로드캐스트 태스크를 시작하는 함수
@@ -4,9 +4,11 @@
 from .report_generator import ReportGenerator
 from .report_scheduler import ReportScheduler
 from .report_templates import ReportTemplate
+from .render_pipeline import ReportRenderPipeline
 
 __all__ = [
     'ReportGenerator',
     'ReportScheduler',
-    'ReportTemplate'
+    'ReportTemplate',
+    'ReportRenderPipeline'
 ]
\ No newline at end of file
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+리포트 렌더링 파이프라인
+- 리포트 생성을 프로세스 풀에서 실행 (호출 스레드는 제출만 하고 바로 반환)
+- 같은 (리포트 타입, 기간, 차트 여부) 요청은 하나의 작업으로 묶어
+  한 번의 데이터 조회로 요청된 모든 형식(PDF/Excel/HTML)을 생성
+- 이미 실행 중인 동일 작업은 새로 제출하지 않고 결과를 공유
+"""
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+
+from .report_generator import ReportGenerator
+
+logger = logging.getLogger(__name__)
+
+# 워커 프로세스별 리포트 생성기 (데이터/차트 캐시를 작업 간 재사용)
+_worker_generator: Optional[ReportGenerator] = None
+
+
+def _init_worker(db_config: Dict[str, Any]):
+    global _worker_generator
+    _worker_generator = ReportGenerator(db_config)
+
+
+def _render_job(report_type: str, start_date: Optional[str], end_date: Optional[str],
+                formats: Tuple[str, ...], include_charts: bool) -> Dict[str, str]:
+    """워커 프로세스에서 실행되는 리포트 생성 작업"""
+    return _worker_generator.generate_report(
+        report_type, start_date, end_date, formats, include_charts
+    )
+
+
+def job_key(report_type: str, start_date: Optional[str] = None,
+            end_date: Optional[str] = None, include_charts: bool = True) -> Tuple:
+    """데이터 조회를 공유할 수 있는 작업 키 (재고 리포트는 기간과 무관)"""
+    if report_type == 'inventory':
+        return (report_type, None, None, False)
+    return (report_type, start_date, end_date, include_charts and report_type == 'sales')
+
+
+class ReportRenderPipeline:
+    """
+    프로세스 풀 기반 리포트 생성기
+
+    Examples:
+        pipeline = ReportRenderPipeline(db_config, max_workers=4)
+        futures = pipeline.submit_many([
+            {'report_type': 'sales', 'start_date': '2024-11-01', 'end_date': '2024-11-30', 'format': 'pdf'},
+            {'report_type': 'sales', 'start_date': '2024-11-01', 'end_date': '2024-11-30', 'format': 'excel'},
+        ])
+        paths = [future.result() for future in futures]
+    """
+
+    def __init__(self, db_config: Dict[str, Any], max_workers: Optional[int] = None):
+        """
+        Args:
+            db_config: 데이터베이스 연결 설정
+            max_workers: 워커 프로세스 수 (기본: CPU 수, 최대 4)
+        """
+        self.db_config = db_config
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._inflight: Dict[Tuple, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'jobs': 0, 'shared': 0, 'failed': 0}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # 스케줄러 스레드에서 fork 하면 잠금 상태가 복제될 수 있으므로 spawn 사용
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self.db_config,)
+            )
+            logger.info(f"리포트 렌더링 프로세스 풀 시작 (워커 {self.max_workers}개)")
+        return self._executor
+
+    def submit(self, report_type: str, start_date: Optional[str] = None,
+               end_date: Optional[str] = None, format: str = 'pdf',
+               include_charts: bool = True) -> 'Future[str]':
+        """리포트 1건 생성 요청 (결과는 파일 경로)"""
+        return self.submit_many([{
+            'report_type': report_type,
+            'start_date': start_date,
+            'end_date': end_date,
+            'format': format,
+            'include_charts': include_charts
+        }])[0]
+
+    def submit_many(self, requests: List[Dict[str, Any]]) -> List['Future[str]']:
+        """
+        여러 리포트 요청을 데이터 키별로 묶어 제출
+
+        Args:
+            requests: report_type, start_date, end_date, format, include_charts 를 가진 요청 목록
+
+        Returns:
+            요청 순서대로 파일 경로를 돌려주는 Future 목록
+        """
+        groups: Dict[Tuple, List[str]] = {}
+        keyed = []
+        for request in requests:
+            key = job_key(request['report_type'], request.get('start_date'),
+                          request.get('end_date'), request.get('include_charts', True))
+            fmt = request.get('format', 'pdf')
+            formats = groups.setdefault(key, [])
+            if fmt not in formats:
+                formats.append(fmt)
+            keyed.append((key, fmt))
+
+        jobs = {key: self._submit_job(key, tuple(formats)) for key, formats in groups.items()}
+        self.stats['requests'] += len(requests)
+
+        results = []
+        for key, fmt in keyed:
+            result: Future = Future()
+            jobs[key].add_done_callback(
+                lambda job, result=result, fmt=fmt: self._resolve(job, result, fmt)
+            )
+            results.append(result)
+        return results
+
+    def _submit_job(self, key: Tuple, formats: Tuple[str, ...]) -> Future:
+        """작업 제출 (같은 키/형식의 작업이 실행 중이면 공유)"""
+        inflight_key = key + (formats,)
+        with self._lock:
+            job = self._inflight.get(inflight_key)
+            if job is not None:
+                self.stats['shared'] += 1
+                return job
+
+            report_type, start_date, end_date, include_charts = key
+            try:
+                job = self._get_executor().submit(
+                    _render_job, report_type, start_date, end_date, formats, include_charts
+                )
+            except BrokenProcessPool:
+                # 워커가 비정상 종료된 풀은 다시 생성
+                logger.warning("리포트 렌더링 프로세스 풀 재시작")
+                self._executor = None
+                job = self._get_executor().submit(
+                    _render_job, report_type, start_date, end_date, formats, include_charts
+                )
+            self._inflight[inflight_key] = job
+            self.stats['jobs'] += 1
+
+        job.add_done_callback(lambda _: self._forget(inflight_key, job))
+        return job
+
+    def _forget(self, inflight_key: Tuple, job: Future):
+        with self._lock:
+            if self._inflight.get(inflight_key) is job:
+                del self._inflight[inflight_key]
+
+    def _resolve(self, job: Future, result: Future, fmt: str):
+        if job.cancelled():
+            result.cancel()
+            return
+        error = job.exception()
+        if error is not None:
+            self.stats['failed'] += 1
+            result.set_exception(error)
+        else:
+            result.set_result(job.result()[fmt])
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._inflight)
+
+    def shutdown(self, wait: bool = True):
+        """프로세스 풀 종료 (다음 제출 시 다시 생성)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+            logger.info("리포트 렌더링 프로세스 풀 종료")
@@ -1,17 +1,26 @@
 #!/usr/bin/env python3
 """
 리포트 생성기
+- 데이터 조회와 렌더링 분리: 같은 (리포트 타입, 기간) 데이터는 캐시해 여러 형식이 공유
+- 차트 PNG 는 데이터 내용 기준으로 캐시 (프로세스 간 파일 공유)
+- Excel 은 openpyxl write-only 모드로 행 단위 기록
 """
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional
 import psycopg2
 from psycopg2.extras import RealDictCursor
+import hashlib
 import json
 import os
-from jinja2 import Environment, FileSystemLoader
+import threading
+import time
+import uuid
+from jinja2 import Environment
 from reportlab.lib.pagesizes import A4
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -22,6 +31,7 @@ from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 import io
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment
 from openpyxl.chart import BarChart, LineChart, PieChart, Reference
 import smtplib
@@ -31,8 +41,17 @@ from email.mime.text import MIMEText
 from email import encoders
 import logging
 
+from database.rollup_manager import SalesRollupManager, to_date
+
 logger = logging.getLogger(__name__)
 
+# 리포트 타입별 지원 형식
+REPORT_FORMATS = {
+    'sales': ('pdf', 'excel', 'html'),
+    'inventory': ('pdf', 'excel'),
+    'customer': ('pdf', 'excel')
+}
+
 # 한글 폰트 등록 (ReportLab)
 try:
     pdfmetrics.registerFont(TTFont('NanumGothic', '/usr/share/fonts/truetype/nanum/NanumGothic.ttf'))
@@ -45,10 +64,25 @@ class ReportGenerator:
     다양한 형식의 리포트를 생성하는 클래스
     """
     
-    def __init__(self, db_config: Dict[str, Any]):
+    def __init__(self, db_config: Dict[str, Any], use_rollups: bool = True,
+                 dataset_ttl: int = 300, chart_dpi: int = 150):
+        """
+        Args:
+            db_config: 데이터베이스 연결 설정
+            use_rollups: 일/주간 롤업이 최신이면 원본 테이블 대신 롤업 조회
+            dataset_ttl: 리포트 데이터 캐시 유지 시간 (초)
+            chart_dpi: 차트 PNG 해상도 (PDF 에 6x4 인치로 배치되므로 150 이면 충분)
+        """
         self.db_config = db_config
+        self.use_rollups = use_rollups
+        self._rollups: Optional[SalesRollupManager] = None
+        self.dataset_ttl = dataset_ttl
+        self.chart_dpi = chart_dpi
+        self._dataset_cache: Dict[tuple, tuple] = {}
+        self._dataset_lock = threading.Lock()
         self.output_dir = "reports/output"
-        os.makedirs(self.output_dir, exist_ok=True)
+        self.chart_dir = os.path.join(self.output_dir, 'charts')
+        os.makedirs(self.chart_dir, exist_ok=True)
         
         # 스타일 설정
         self.styles = getSampleStyleSheet()
@@ -66,99 +100,115 @@ class ReportGenerator:
     
     def generate_sales_report(self, start_date: str, end_date: str, 
                             format: str = 'pdf', include_charts: bool = True) -> str:
-        """매출 리포트 생성"""
-        conn = psycopg2.connect(**self.db_config)
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # 1. 전체 매출 통계
-        cursor.execute("""
-            SELECT 
-                COUNT(DISTINCT id) as total_orders,
-                SUM(total_amount) as total_revenue,
-                AVG(total_amount) as avg_order_value,
-                COUNT(DISTINCT customer_id) as unique_customers
-            FROM orders
-            WHERE created_at BETWEEN %s AND %s
-        """, (start_date, end_date))
-        summary = cursor.fetchone()
-        
-        # 2. 일별 매출
-        cursor.execute("""
-            SELECT 
-                DATE(created_at) as date,
-                COUNT(*) as order_count,
-                SUM(total_amount) as revenue
-            FROM orders
-            WHERE created_at BETWEEN %s AND %s
-            GROUP BY DATE(created_at)
-            ORDER BY date
-        """, (start_date, end_date))
-        daily_sales = cursor.fetchall()
-        
-        # 3. 카테고리별 매출
-        cursor.execute("""
-            SELECT 
-                p.category,
-                COUNT(DISTINCT o.id) as order_count,
-                SUM(oi.quantity) as quantity_sold,
-                SUM(oi.quantity * oi.price) as revenue
-            FROM orders o
-            JOIN order_items oi ON o.id = oi.order_id
-            JOIN products p ON oi.product_id = p.id
-            WHERE o.created_at BETWEEN %s AND %s
-            GROUP BY p.category
-            ORDER BY revenue DESC
-        """, (start_date, end_date))
-        category_sales = cursor.fetchall()
+        """
+        매출 리포트 생성
+
+        기간은 종료일 하루 전체를 포함하며, 롤업이 기간을 포함하면 롤업에서 조회
+        """
+        return self.generate_report('sales', start_date, end_date, [format], include_charts)[format]
+    
+    def generate_inventory_report(self, format: str = 'pdf') -> str:
+        """재고 리포트 생성"""
+        return self.generate_report('inventory', formats=[format])[format]
+    
+    def generate_customer_report(self, start_date: str, end_date: str, format: str = 'pdf') -> str:
+        """
+        고객 분석 리포트 생성
+
+        기간은 종료일 하루 전체를 포함하며, 롤업이 기간을 포함하면 롤업에서 조회
+        """
+        return self.generate_report('customer', start_date, end_date, [format])[format]
+    
+    def generate_report(self, report_type: str, start_date: Optional[str] = None,
+                        end_date: Optional[str] = None, formats: Iterable[str] = ('pdf',),
+                        include_charts: bool = True) -> Dict[str, str]:
+        """
+        한 번의 데이터 조회로 여러 형식의 리포트 생성 (차트도 한 번만 생성)
         
-        # 4. 베스트셀러 상품
-        cursor.execute("""
-            SELECT 
-                p.id,
-                p.name,
-                p.category,
-                SUM(oi.quantity) as quantity_sold,
-                SUM(oi.quantity * oi.price) as revenue
-            FROM orders o
-            JOIN order_items oi ON o.id = oi.order_id
-            JOIN products p ON oi.product_id = p.id
-            WHERE o.created_at BETWEEN %s AND %s
-            GROUP BY p.id, p.name, p.category
-            ORDER BY revenue DESC
-            LIMIT 10
-        """, (start_date, end_date))
-        best_sellers = cursor.fetchall()
+        Returns:
+            {형식: 파일 경로}
+        """
+        supported = REPORT_FORMATS.get(report_type)
+        if supported is None:
+            raise ValueError(f"지원되지 않는 리포트 타입: {report_type}")
+        formats = list(dict.fromkeys(formats))
+        for fmt in formats:
+            if fmt not in supported:
+                raise ValueError(f"지원하지 않는 형식: {fmt}")
+        
+        report_data = self.get_report_data(report_type, start_date, end_date)
+        if include_charts and report_type == 'sales':
+            report_data = {
+                **report_data,
+                'charts': self._create_sales_charts(report_data['daily_sales'],
+                                                    report_data['category_sales'])
+            }
+        
+        renderers = {
+            'pdf': self._generate_pdf_report,
+            'excel': self._generate_excel_report,
+            'html': self._generate_html_report
+        }
+        return {fmt: renderers[fmt](report_data) for fmt in formats}
+    
+    def get_report_data(self, report_type: str, start_date: Optional[str] = None,
+                        end_date: Optional[str] = None) -> Dict[str, Any]:
+        """
+        리포트 데이터 조회
         
-        cursor.close()
-        conn.close()
+        같은 (리포트 타입, 기간) 은 dataset_ttl 동안 캐시를 재사용하므로
+        같은 리포트의 PDF/Excel/HTML 생성이 한 번의 조회를 공유함
+        """
+        if report_type == 'inventory':
+            key = (report_type, datetime.now().strftime('%Y-%m-%d'))
+        else:
+            key = (report_type, str(start_date), str(end_date))
+        
+        now = time.monotonic()
+        with self._dataset_lock:
+            cached = self._dataset_cache.get(key)
+            if cached and cached[0] > now:
+                return cached[1]
+        
+        if report_type == 'sales':
+            report_data = self._load_sales_data(start_date, end_date)
+        elif report_type == 'inventory':
+            report_data = self._load_inventory_data()
+        elif report_type == 'customer':
+            report_data = self._load_customer_data(start_date, end_date)
+        else:
+            raise ValueError(f"지원되지 않는 리포트 타입: {report_type}")
         
-        # 차트 생성
-        charts = []
-        if include_charts:
-            charts = self._create_sales_charts(daily_sales, category_sales)
+        with self._dataset_lock:
+            for expired in [k for k, (expires, _) in self._dataset_cache.items() if expires <= now]:
+                del self._dataset_cache[expired]
+            self._dataset_cache[key] = (now + self.dataset_ttl, report_data)
+        return report_data
+    
+    def _load_sales_data(self, start_date: str, end_date: str) -> Dict[str, Any]:
+        """매출 리포트 데이터"""
+        rollups = self._rollups_for(start_date, end_date)
+        if rollups is not None:
+            summary = rollups.sales_summary(start_date, end_date)
+            daily_sales = rollups.daily_sales(start_date, end_date)
+            category_sales = rollups.category_sales(start_date, end_date)
+            best_sellers = rollups.top_products(start_date, end_date, limit=10)
+        else:
+            summary, daily_sales, category_sales, best_sellers = \
+                self._query_sales_raw(start_date, end_date)
         
-        # 리포트 생성
-        report_data = {
+        return {
             'title': '매출 분석 리포트',
             'period': f"{start_date} ~ {end_date}",
             'summary': summary,
             'daily_sales': daily_sales,
             'category_sales': category_sales,
             'best_sellers': best_sellers,
-            'charts': charts
+            'charts': []
         }
-        
-        if format == 'pdf':
-            return self._generate_pdf_report(report_data)
-        elif format == 'excel':
-            return self._generate_excel_report(report_data)
-        elif format == 'html':
-            return self._generate_html_report(report_data)
-        else:
-            raise ValueError(f"지원하지 않는 형식: {format}")
     
-    def generate_inventory_report(self, format: str = 'pdf') -> str:
-        """재고 리포트 생성"""
+    def _load_inventory_data(self) -> Dict[str, Any]:
+        """재고 리포트 데이터"""
         conn = psycopg2.connect(**self.db_config)
         cursor = conn.cursor(cursor_factory=RealDictCursor)
         
@@ -220,23 +270,124 @@ class ReportGenerator:
         cursor.close()
         conn.close()
         
-        report_data = {
+        return {
             'title': '재고 현황 리포트',
             'period': datetime.now().strftime('%Y-%m-%d'),
             'inventory_summary': inventory_summary,
             'low_stock_items': low_stock_items,
             'turnover_rates': turnover_rates
         }
-        
-        if format == 'pdf':
-            return self._generate_pdf_report(report_data)
-        elif format == 'excel':
-            return self._generate_excel_report(report_data)
+    
+    def _load_customer_data(self, start_date: str, end_date: str) -> Dict[str, Any]:
+        """고객 분석 리포트 데이터"""
+        rollups = self._rollups_for(start_date, end_date)
+        if rollups is not None:
+            customer_summary = rollups.customer_summary(start_date, end_date)
+            vip_customers = rollups.top_customers(start_date, end_date, limit=20)
+            customer_segments = rollups.customer_segments(start_date, end_date)
         else:
-            raise ValueError(f"지원하지 않는 형식: {format}")
+            customer_summary, vip_customers, customer_segments = \
+                self._query_customers_raw(start_date, end_date)
+        
+        return {
+            'title': '고객 분석 리포트',
+            'period': f"{start_date} ~ {end_date}",
+            'customer_summary': customer_summary,
+            'vip_customers': vip_customers,
+            'customer_segments': customer_segments
+        }
     
-    def generate_customer_report(self, start_date: str, end_date: str, format: str = 'pdf') -> str:
-        """고객 분석 리포트 생성"""
+    def _rollups_for(self, start_date: str, end_date: str) -> Optional[SalesRollupManager]:
+        """조회 기간을 포함하는 최신 롤업이 있으면 롤업 관리자 반환"""
+        if not self.use_rollups:
+            return None
+        try:
+            if self._rollups is None:
+                self._rollups = SalesRollupManager(self.db_config)
+            if self._rollups.covers(start_date, end_date):
+                return self._rollups
+        except Exception as e:
+            logger.warning(f"롤업 확인 실패, 원본 테이블에서 조회합니다: {e}")
+        return None
+    
+    @staticmethod
+    def _date_bounds(start_date: str, end_date: str):
+        """[시작일, 종료일] → 반열린 구간 [시작일, 종료일 다음날)"""
+        return to_date(start_date), to_date(end_date) + timedelta(days=1)
+    
+    def _query_sales_raw(self, start_date: str, end_date: str):
+        """원본 주문 테이블에서 매출 집계 (롤업을 쓸 수 없을 때)"""
+        start, end = self._date_bounds(start_date, end_date)
+        conn = psycopg2.connect(**self.db_config)
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        
+        # 1. 전체 매출 통계
+        cursor.execute("""
+            SELECT 
+                COUNT(DISTINCT id) as total_orders,
+                SUM(total_amount) as total_revenue,
+                AVG(total_amount) as avg_order_value,
+                COUNT(DISTINCT customer_id) as unique_customers
+            FROM orders
+            WHERE created_at >= %s AND created_at < %s
+        """, (start, end))
+        summary = cursor.fetchone()
+        
+        # 2. 일별 매출
+        cursor.execute("""
+            SELECT 
+                DATE(created_at) as date,
+                COUNT(*) as order_count,
+                SUM(total_amount) as revenue
+            FROM orders
+            WHERE created_at >= %s AND created_at < %s
+            GROUP BY DATE(created_at)
+            ORDER BY date
+        """, (start, end))
+        daily_sales = cursor.fetchall()
+        
+        # 3. 카테고리별 매출
+        cursor.execute("""
+            SELECT 
+                p.category,
+                COUNT(DISTINCT o.id) as order_count,
+                SUM(oi.quantity) as quantity_sold,
+                SUM(oi.quantity * oi.price) as revenue
+            FROM orders o
+            JOIN order_items oi ON o.id = oi.order_id
+            JOIN products p ON oi.product_id = p.id
+            WHERE o.created_at >= %s AND o.created_at < %s
+            GROUP BY p.category
+            ORDER BY revenue DESC
+        """, (start, end))
+        category_sales = cursor.fetchall()
+        
+        # 4. 베스트셀러 상품
+        cursor.execute("""
+            SELECT 
+                p.id,
+                p.name,
+                p.category,
+                SUM(oi.quantity) as quantity_sold,
+                SUM(oi.quantity * oi.price) as revenue
+            FROM orders o
+            JOIN order_items oi ON o.id = oi.order_id
+            JOIN products p ON oi.product_id = p.id
+            WHERE o.created_at >= %s AND o.created_at < %s
+            GROUP BY p.id, p.name, p.category
+            ORDER BY revenue DESC
+            LIMIT 10
+        """, (start, end))
+        best_sellers = cursor.fetchall()
+        
+        cursor.close()
+        conn.close()
+        
+        return summary, daily_sales, category_sales, best_sellers
+    
+    def _query_customers_raw(self, start_date: str, end_date: str):
+        """원본 주문 테이블에서 고객 집계 (롤업을 쓸 수 없을 때)"""
+        start, end = self._date_bounds(start_date, end_date)
         conn = psycopg2.connect(**self.db_config)
         cursor = conn.cursor(cursor_factory=RealDictCursor)
         
@@ -253,10 +404,10 @@ class ReportGenerator:
                     COUNT(*) as order_count,
                     SUM(total_amount) as total_spent
                 FROM orders
-                WHERE created_at BETWEEN %s AND %s
+                WHERE created_at >= %s AND created_at < %s
                 GROUP BY customer_id
             ) customer_stats
-        """, (start_date, end_date))
+        """, (start, end))
         customer_summary = cursor.fetchone()
         
         # 2. VIP 고객 (상위 10%)
@@ -269,11 +420,11 @@ class ReportGenerator:
                 AVG(total_amount) as avg_order_value,
                 MAX(created_at) as last_order_date
             FROM orders
-            WHERE created_at BETWEEN %s AND %s
+            WHERE created_at >= %s AND created_at < %s
             GROUP BY customer_id, customer_name
             ORDER BY total_spent DESC
             LIMIT 20
-        """, (start_date, end_date))
+        """, (start, end))
         vip_customers = cursor.fetchall()
         
         # 3. 고객 세그먼트 분석
@@ -285,7 +436,7 @@ class ReportGenerator:
                     COUNT(*) as frequency,
                     SUM(total_amount) as monetary
                 FROM orders
-                WHERE created_at BETWEEN %s AND %s
+                WHERE created_at >= %s AND created_at < %s
                 GROUP BY customer_id
             )
             SELECT 
@@ -299,69 +450,83 @@ class ReportGenerator:
                 AVG(monetary) as avg_monetary
             FROM customer_rfm
             GROUP BY segment
-        """, (start_date, end_date))
+        """, (start, end))
         customer_segments = cursor.fetchall()
         
         cursor.close()
         conn.close()
         
-        report_data = {
-            'title': '고객 분석 리포트',
-            'period': f"{start_date} ~ {end_date}",
-            'customer_summary': customer_summary,
-            'vip_customers': vip_customers,
-            'customer_segments': customer_segments
-        }
-        
-        if format == 'pdf':
-            return self._generate_pdf_report(report_data)
-        elif format == 'excel':
-            return self._generate_excel_report(report_data)
-        else:
-            raise ValueError(f"지원하지 않는 형식: {format}")
+        return customer_summary, vip_customers, customer_segments
     
     def _create_sales_charts(self, daily_sales: List[Dict], category_sales: List[Dict]) -> List[str]:
-        """매출 차트 생성"""
+        """
+        매출 차트 생성
+        
+        차트 파일명은 그리는 데이터의 해시이므로, 같은 데이터의 차트는 다시 그리지 않고 재사용
+        """
+        top_categories = category_sales[:5]  # 상위 5개
+        digest = hashlib.sha1(
+            json.dumps([daily_sales, top_categories, self.chart_dpi], default=str, sort_keys=True).encode()
+        ).hexdigest()[:16]
+        
         charts = []
         
         # 1. 일별 매출 추이 차트
-        plt.figure(figsize=(10, 6))
-        dates = [row['date'] for row in daily_sales]
-        revenues = [row['revenue'] for row in daily_sales]
-        
-        plt.plot(dates, revenues, marker='o', linewidth=2, markersize=6)
-        plt.title('일별 매출 추이', fontsize=16, fontweight='bold')
-        plt.xlabel('날짜')
-        plt.ylabel('매출액 (원)')
-        plt.xticks(rotation=45)
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        
-        chart_path = os.path.join(self.output_dir, f'daily_sales_{datetime.now().strftime("%Y%m%d%H%M%S")}.png')
-        plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        chart_path = os.path.join(self.chart_dir, f'daily_sales_{digest}.png')
+        if not os.path.exists(chart_path):
+            fig = plt.figure(figsize=(10, 6))
+            dates = [row['date'] for row in daily_sales]
+            revenues = [row['revenue'] for row in daily_sales]
+            
+            plt.plot(dates, revenues, marker='o', linewidth=2, markersize=6)
+            plt.title('일별 매출 추이', fontsize=16, fontweight='bold')
+            plt.xlabel('날짜')
+            plt.ylabel('매출액 (원)')
+            plt.xticks(rotation=45)
+            plt.grid(True, alpha=0.3)
+            plt.tight_layout()
+            
+            self._save_chart(fig, chart_path)
         charts.append(chart_path)
         
         # 2. 카테고리별 매출 파이 차트
-        plt.figure(figsize=(8, 8))
-        categories = [row['category'] for row in category_sales[:5]]  # 상위 5개
-        revenues = [row['revenue'] for row in category_sales[:5]]
-        
-        plt.pie(revenues, labels=categories, autopct='%1.1f%%', startangle=90)
-        plt.title('카테고리별 매출 비중', fontsize=16, fontweight='bold')
-        plt.axis('equal')
-        
-        chart_path = os.path.join(self.output_dir, f'category_sales_{datetime.now().strftime("%Y%m%d%H%M%S")}.png')
-        plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        chart_path = os.path.join(self.chart_dir, f'category_sales_{digest}.png')
+        if not os.path.exists(chart_path):
+            fig = plt.figure(figsize=(8, 8))
+            categories = [row['category'] for row in top_categories]
+            revenues = [row['revenue'] for row in top_categories]
+            
+            plt.pie(revenues, labels=categories, autopct='%1.1f%%', startangle=90)
+            plt.title('카테고리별 매출 비중', fontsize=16, fontweight='bold')
+            plt.axis('equal')
+            
+            self._save_chart(fig, chart_path)
         charts.append(chart_path)
         
         return charts
     
+    def _save_chart(self, fig, chart_path: str):
+        """임시 파일에 저장 후 교체 (여러 프로세스가 같은 차트를 동시에 만들어도 안전)"""
+        tmp_path = f"{chart_path}.{os.getpid()}.tmp"
+        try:
+            fig.savefig(tmp_path, dpi=self.chart_dpi, bbox_inches='tight', format='png')
+            os.replace(tmp_path, chart_path)
+        finally:
+            plt.close(fig)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    def _output_path(self, report_data: Dict[str, Any], extension: str) -> str:
+        """리포트 파일 경로 (병렬 생성 시 이름이 겹치지 않도록 임의 접미사 추가)"""
+        filename = (
+            f"{report_data['title'].replace(' ', '_')}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+            f"_{uuid.uuid4().hex[:6]}.{extension}"
+        )
+        return os.path.join(self.output_dir, filename)
+    
     def _generate_pdf_report(self, report_data: Dict[str, Any]) -> str:
         """PDF 리포트 생성"""
-        filename = f"{report_data['title'].replace(' ', '_')}_{datetime.now().strftime('%Y%m%d%H%M%S')}.pdf"
-        filepath = os.path.join(self.output_dir, filename)
+        filepath = self._output_path(report_data, 'pdf')
         
         doc = SimpleDocTemplate(filepath, pagesize=A4)
         story = []
@@ -458,52 +623,47 @@ class ReportGenerator:
         return filepath
     
     def _generate_excel_report(self, report_data: Dict[str, Any]) -> str:
-        """Excel 리포트 생성"""
-        filename = f"{report_data['title'].replace(' ', '_')}_{datetime.now().strftime('%Y%m%d%H%M%S')}.xlsx"
-        filepath = os.path.join(self.output_dir, filename)
+        """Excel 리포트 생성 (write-only 모드 - 셀 객체를 메모리에 유지하지 않고 행 단위 기록)"""
+        filepath = self._output_path(report_data, 'xlsx')
         
-        wb = Workbook()
+        wb = Workbook(write_only=True)
+        bold = Font(bold=True)
         
         # 요약 시트
-        ws_summary = wb.active
-        ws_summary.title = "요약"
+        ws_summary = wb.create_sheet("요약")
         
         # 제목
-        ws_summary['A1'] = report_data['title']
-        ws_summary['A1'].font = Font(size=20, bold=True)
-        ws_summary['A2'] = f"기간: {report_data['period']}"
-        ws_summary['A2'].font = Font(size=12)
+        ws_summary.append([self._cell(ws_summary, report_data['title'], font=Font(size=20, bold=True))])
+        ws_summary.append([self._cell(ws_summary, f"기간: {report_data['period']}", font=Font(size=12))])
         
         # 요약 정보
         if 'summary' in report_data and report_data['summary']:
             summary = report_data['summary']
-            ws_summary['A4'] = '항목'
-            ws_summary['B4'] = '값'
-            ws_summary['A5'] = '총 주문 수'
-            ws_summary['B5'] = summary.get('total_orders', 0)
-            ws_summary['A6'] = '총 매출'
-            ws_summary['B6'] = summary.get('total_revenue', 0)
-            ws_summary['A7'] = '평균 주문액'
-            ws_summary['B7'] = summary.get('avg_order_value', 0)
-            ws_summary['A8'] = '고유 고객 수'
-            ws_summary['B8'] = summary.get('unique_customers', 0)
-            
-            # 스타일 적용
-            for row in range(4, 9):
-                ws_summary[f'A{row}'].font = Font(bold=True)
-                ws_summary[f'B{row}'].number_format = '#,##0'
+            ws_summary.append([])
+            rows = [
+                ('항목', '값'),
+                ('총 주문 수', summary.get('total_orders', 0)),
+                ('총 매출', summary.get('total_revenue', 0)),
+                ('평균 주문액', summary.get('avg_order_value', 0)),
+                ('고유 고객 수', summary.get('unique_customers', 0))
+            ]
+            for label, value in rows:
+                ws_summary.append([
+                    self._cell(ws_summary, label, font=bold),
+                    self._cell(ws_summary, value, number_format='#,##0')
+                ])
         
         # 일별 매출 시트
         if 'daily_sales' in report_data and report_data['daily_sales']:
             ws_daily = wb.create_sheet("일별 매출")
-            headers = ['날짜', '주문 수', '매출']
-            for col, header in enumerate(headers, 1):
-                ws_daily.cell(row=1, column=col, value=header).font = Font(bold=True)
+            ws_daily.append([self._cell(ws_daily, header, font=bold) for header in ['날짜', '주문 수', '매출']])
             
-            for row, data in enumerate(report_data['daily_sales'], 2):
-                ws_daily.cell(row=row, column=1, value=data['date'])
-                ws_daily.cell(row=row, column=2, value=data['order_count'])
-                ws_daily.cell(row=row, column=3, value=data['revenue']).number_format = '#,##0'
+            for data in report_data['daily_sales']:
+                ws_daily.append([
+                    data['date'],
+                    data['order_count'],
+                    self._cell(ws_daily, data['revenue'], number_format='#,##0')
+                ])
             
             # 차트 추가
             chart = LineChart()
@@ -521,16 +681,17 @@ class ReportGenerator:
         if 'best_sellers' in report_data and report_data['best_sellers']:
             ws_best = wb.create_sheet("베스트셀러")
             headers = ['순위', '상품 ID', '상품명', '카테고리', '판매량', '매출']
-            for col, header in enumerate(headers, 1):
-                ws_best.cell(row=1, column=col, value=header).font = Font(bold=True)
+            ws_best.append([self._cell(ws_best, header, font=bold) for header in headers])
             
-            for row, item in enumerate(report_data['best_sellers'], 2):
-                ws_best.cell(row=row, column=1, value=row-1)
-                ws_best.cell(row=row, column=2, value=item['id'])
-                ws_best.cell(row=row, column=3, value=item['name'])
-                ws_best.cell(row=row, column=4, value=item['category'])
-                ws_best.cell(row=row, column=5, value=item['quantity_sold'])
-                ws_best.cell(row=row, column=6, value=item['revenue']).number_format = '#,##0'
+            for rank, item in enumerate(report_data['best_sellers'], 1):
+                ws_best.append([
+                    rank,
+                    item['id'],
+                    item['name'],
+                    item['category'],
+                    item['quantity_sold'],
+                    self._cell(ws_best, item['revenue'], number_format='#,##0')
+                ])
         
         # 파일 저장
         wb.save(filepath)
@@ -538,11 +699,19 @@ class ReportGenerator:
         logger.info(f"Excel 리포트 생성 완료: {filepath}")
         return filepath
     
+    @staticmethod
+    def _cell(ws, value: Any, font: Optional[Font] = None,
+              number_format: Optional[str] = None) -> WriteOnlyCell:
+        """write-only 시트용 서식 셀"""
+        cell = WriteOnlyCell(ws, value=value)
+        if font is not None:
+            cell.font = font
+        if number_format is not None:
+            cell.number_format = number_format
+        return cell
+    
     def _generate_html_report(self, report_data: Dict[str, Any]) -> str:
         """HTML 리포트 생성"""
-        template_dir = os.path.join(os.path.dirname(__file__), 'templates')
-        os.makedirs(template_dir, exist_ok=True)
-        
         # HTML 템플릿 생성
         html_template = """
 <!DOCTYPE html>
@@ -692,20 +861,14 @@ class ReportGenerator:
 </html>
         """
         
-        # 템플릿 파일 저장
-        with open(os.path.join(template_dir, 'report.html'), 'w', encoding='utf-8') as f:
-            f.write(html_template)
-        
-        # Jinja2 환경 설정
-        env = Environment(loader=FileSystemLoader(template_dir))
-        template = env.get_template('report.html')
+        # Jinja2 템플릿 (파일로 쓰지 않고 문자열에서 컴파일 - 병렬 생성 시 파일 경합 방지)
+        template = Environment().from_string(html_template)
         
         # HTML 렌더링
         html_content = template.render(**report_data)
         
         # 파일 저장
-        filename = f"{report_data['title'].replace(' ', '_')}_{datetime.now().strftime('%Y%m%d%H%M%S')}.html"
-        filepath = os.path.join(self.output_dir, filename)
+        filepath = self._output_path(report_data, 'html')
         
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(html_content)
@@ -5,8 +5,9 @@
 import schedule
 import time
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Tuple
 import json
 import os
 import psycopg2
@@ -18,6 +19,7 @@ from email.mime.text import MIMEText
 from email import encoders
 import logging
 from .report_generator import ReportGenerator
+from .render_pipeline import ReportRenderPipeline
 
 logger = logging.getLogger(__name__)
 
@@ -25,16 +27,26 @@ logger = logging.getLogger(__name__)
 class ReportScheduler:
     """
     예약된 리포트 생성 및 전송을 관리하는 클래스
+    
+    스케줄러 스레드는 실행할 리포트를 모아 렌더링 파이프라인(프로세스 풀)에 제출만 하고,
+    생성이 끝난 리포트의 이메일 전송/실행 기록은 전송 스레드에서 처리
     """
     
-    def __init__(self, db_config: Dict[str, Any], smtp_config: Optional[Dict[str, Any]] = None):
+    def __init__(self, db_config: Dict[str, Any], smtp_config: Optional[Dict[str, Any]] = None,
+                 max_workers: Optional[int] = None):
         self.db_config = db_config
         self.smtp_config = smtp_config
         self.report_generator = ReportGenerator(db_config)
+        self.pipeline = ReportRenderPipeline(db_config, max_workers=max_workers)
         self.schedules = []
         self.running = False
         self.thread = None
         
+        # 제출 대기 중인 스케줄 (같은 틱에 실행되는 리포트를 묶어서 제출)
+        self._pending: List[Dict[str, Any]] = []
+        self._lock = threading.RLock()
+        self._delivery = ThreadPoolExecutor(max_workers=4, thread_name_prefix='report-delivery')
+        
         # 스케줄 저장 경로
         self.schedule_file = "reports/schedules.json"
         self.load_schedules()
@@ -108,13 +120,23 @@ class ReportScheduler:
                 return schedule
         return None
     
-    def run_schedule_now(self, schedule_id: str) -> bool:
-        """스케줄 즉시 실행"""
+    def run_schedule_now(self, schedule_id: str) -> Optional[Future]:
+        """
+        스케줄 즉시 실행
+        
+        리포트를 파이프라인에 제출만 하고 바로 반환한다. 반환된 Future 는 리포트 생성과
+        이메일 전송/실행 기록까지 끝나면 리포트 경로로 완료된다 (실패 시 예외).
+        
+        Returns:
+            완료 Future (스케줄이 없으면 None)
+        """
         schedule = self.get_schedule(schedule_id)
         if schedule:
             self._run_report(schedule)
-            return True
-        return False
+            for sched, completion in self._flush_pending():
+                if sched is schedule:
+                    return completion
+        return None
     
     def start(self):
         """스케줄러 시작"""
@@ -127,16 +149,24 @@ class ReportScheduler:
             logger.info("리포트 스케줄러 시작")
     
     def stop(self):
-        """스케줄러 중지"""
+        """
+        스케줄러 중지
+        
+        렌더링 중인 리포트가 끝날 때까지 기다린 뒤 (완료 콜백이 전송 작업을 제출),
+        전송 스레드의 이메일 전송/실행 기록까지 마치고 반환한다.
+        """
         self.running = False
         if self.thread:
             self.thread.join()
+        self.pipeline.shutdown(wait=True)
+        self._delivery.shutdown(wait=True)
         logger.info("리포트 스케줄러 중지")
     
     def _run_scheduler(self):
         """스케줄러 실행 루프"""
         while self.running:
             schedule.run_pending()
+            self._flush_pending()
             time.sleep(60)  # 1분마다 체크
     
     def _setup_all_schedules(self):
@@ -172,44 +202,80 @@ class ReportScheduler:
             self._setup_all_schedules()
     
     def _run_report(self, schedule: Dict[str, Any]):
-        """리포트 실행"""
+        """리포트 실행 예약 (실제 생성은 _flush_pending 에서 묶어서 제출)"""
+        with self._lock:
+            self._pending.append(schedule)
+    
+    def _build_report_params(self, schedule: Dict[str, Any]) -> Dict[str, Any]:
+        """스케줄 파라미터 준비 (기간 파라미터 자동 계산)"""
+        params = schedule['params'].copy()
+        
+        if 'start_date' not in params or 'end_date' not in params:
+            if schedule['frequency'] == 'daily':
+                params['start_date'] = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+                params['end_date'] = params['start_date']
+            elif schedule['frequency'] == 'weekly':
+                params['end_date'] = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+                params['start_date'] = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
+            elif schedule['frequency'] == 'monthly':
+                params['end_date'] = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+                params['start_date'] = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
+        
+        return params
+    
+    def _flush_pending(self) -> List[Tuple[Dict[str, Any], Future]]:
+        """
+        대기 중인 리포트를 렌더링 파이프라인에 한 번에 제출
+        
+        Returns:
+            [(스케줄, 전송/기록까지 끝나면 완료되는 Future)]
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return []
+        
+        requests = []
+        for sched in pending:
+            logger.info(f"리포트 실행 시작: {sched['name']}")
+            params = self._build_report_params(sched)
+            requests.append({
+                'report_type': sched['report_type'],
+                'start_date': params.get('start_date'),
+                'end_date': params.get('end_date'),
+                'format': params.get('format', 'pdf'),
+                'include_charts': params.get('include_charts', True)
+            })
+        
+        completions = [Future() for _ in pending]
         try:
-            logger.info(f"리포트 실행 시작: {schedule['name']}")
-            
-            # 파라미터 준비
-            params = schedule['params'].copy()
-            
-            # 기간 파라미터 자동 계산
-            if 'start_date' not in params or 'end_date' not in params:
-                if schedule['frequency'] == 'daily':
-                    params['start_date'] = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
-                    params['end_date'] = params['start_date']
-                elif schedule['frequency'] == 'weekly':
-                    params['end_date'] = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
-                    params['start_date'] = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
-                elif schedule['frequency'] == 'monthly':
-                    params['end_date'] = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
-                    params['start_date'] = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
-            
-            # 리포트 생성
-            report_path = None
-            if schedule['report_type'] == 'sales':
-                report_path = self.report_generator.generate_sales_report(
-                    start_date=params['start_date'],
-                    end_date=params['end_date'],
-                    format=params.get('format', 'pdf'),
-                    include_charts=params.get('include_charts', True)
-                )
-            elif schedule['report_type'] == 'inventory':
-                report_path = self.report_generator.generate_inventory_report(
-                    format=params.get('format', 'pdf')
-                )
-            elif schedule['report_type'] == 'customer':
-                report_path = self.report_generator.generate_customer_report(
-                    start_date=params['start_date'],
-                    end_date=params['end_date'],
-                    format=params.get('format', 'pdf')
-                )
+            futures = self.pipeline.submit_many(requests)
+        except Exception as e:
+            for sched, completion in zip(pending, completions):
+                logger.error(f"리포트 실행 실패: {sched['name']} - {str(e)}")
+                completion.set_exception(e)
+                self._save_execution_log(sched['id'], 'failed', error=str(e))
+            return list(zip(pending, completions))
+        
+        for sched, future, completion in zip(pending, futures, completions):
+            future.add_done_callback(
+                lambda f, sched=sched, completion=completion: self._deliver(sched, f, completion)
+            )
+        logger.info(f"리포트 {len(requests)}건 제출")
+        return list(zip(pending, completions))
+    
+    def _deliver(self, schedule: Dict[str, Any], future: Future, completion: Future):
+        """렌더링 완료 콜백 - 전송 스레드에 넘김 (stop() 이후면 현재 스레드에서 처리)"""
+        try:
+            self._delivery.submit(self._complete_report, schedule, future, completion)
+        except RuntimeError:
+            self._complete_report(schedule, future, completion)
+    
+    def _complete_report(self, schedule: Dict[str, Any], future: Future,
+                         completion: Optional[Future] = None):
+        """생성된 리포트 전송 및 실행 기록 (전송 스레드에서 실행, 끝나면 completion 완료)"""
+        try:
+            report_path = future.result()
             
             if report_path and os.path.exists(report_path):
                 # 이메일 전송
@@ -221,26 +287,33 @@ class ReportScheduler:
                     )
                 
                 # 실행 기록 업데이트
-                for i, s in enumerate(self.schedules):
-                    if s['id'] == schedule['id']:
-                        self.schedules[i]['last_run'] = datetime.now().isoformat()
-                        self.schedules[i]['next_run'] = self._calculate_next_run(
-                            s['schedule_time'], s['frequency']
-                        )
-                        break
-                
-                self.save_schedules()
+                with self._lock:
+                    for i, s in enumerate(self.schedules):
+                        if s['id'] == schedule['id']:
+                            self.schedules[i]['last_run'] = datetime.now().isoformat()
+                            self.schedules[i]['next_run'] = self._calculate_next_run(
+                                s['schedule_time'], s['frequency']
+                            )
+                            break
+                    
+                    self.save_schedules()
                 
                 # 실행 기록 DB 저장
                 self._save_execution_log(schedule['id'], 'success', report_path)
                 
                 logger.info(f"리포트 실행 완료: {schedule['name']}")
+                if completion is not None:
+                    completion.set_result(report_path)
             else:
                 raise Exception("리포트 생성 실패")
                 
         except Exception as e:
             logger.error(f"리포트 실행 실패: {schedule['name']} - {str(e)}")
-            self._save_execution_log(schedule['id'], 'failed', error=str(e))
+            try:
+                self._save_execution_log(schedule['id'], 'failed', error=str(e))
+            finally:
+                if completion is not None and not completion.done():
+                    completion.set_exception(e)
     
     def _send_report_email(self, report_path: str, recipients: List[str], schedule_name: str):
         """리포트 이메일 전송"""
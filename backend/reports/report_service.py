@@ -4,7 +4,7 @@
 """
 from fastapi import FastAPI, HTTPException, BackgroundTasks, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import Dict, List, Any, Optional
 from datetime import datetime
@@ -15,6 +15,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from reports.report_generator import ReportGenerator
 from reports.report_scheduler import ReportScheduler
 from reports.report_templates import ReportTemplate
+from services.export_engine import ExportEngine
 from core import get_logger
 
 logger = get_logger(__name__)
@@ -54,6 +55,7 @@ SMTP_CONFIG = {
 report_generator = ReportGenerator(DB_CONFIG)
 report_scheduler = ReportScheduler(DB_CONFIG, SMTP_CONFIG if SMTP_CONFIG['sender_email'] else None)
 report_templates = ReportTemplate(DB_CONFIG)
+export_engine = ExportEngine(DB_CONFIG)
 
 # Request/Response 모델
 class GenerateReportRequest(BaseModel):
@@ -189,6 +191,37 @@ async def download_report(filename: str):
     )
 
 
+# 대용량 내보내기 엔드포인트
+@app.get("/exports/{dataset}")
+def export_dataset(dataset: str, format: str = 'csv', gzip: bool = True,
+                   start_date: Optional[str] = None, end_date: Optional[str] = None,
+                   status: Optional[str] = None, supplier: Optional[str] = None,
+                   supplier_id: Optional[int] = None, category: Optional[str] = None):
+    """
+    주문/상품 데이터 스트리밍 내보내기 (csv, xlsx, parquet)
+    
+    서버 사이드 커서에서 청크 단위로 읽어 바로 전송하므로 데이터 양과 무관하게 메모리 사용량 일정
+    """
+    filters = {
+        'start_date': start_date,
+        'end_date': end_date,
+        'status': status,
+        'supplier': supplier,
+        'supplier_id': supplier_id,
+        'category': category
+    }
+    try:
+        body, media_type, filename = export_engine.stream(dataset, format, filters, gzip_output=gzip)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+
 # 스케줄 관리 엔드포인트
 @app.get("/schedules")
 async def list_schedules():
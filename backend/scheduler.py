@@ -15,6 +15,8 @@ import json
 import os
 import aiohttp
 
+from database.rollup_manager import SalesRollupManager
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -31,6 +33,7 @@ class Scheduler:
     def __init__(self):
         self.db_conn = None
         self.redis_client = None
+        self.rollup_manager = SalesRollupManager({'dsn': DATABASE_URL})
         self.setup_connections()
         
     def setup_connections(self):
@@ -207,6 +210,14 @@ class Scheduler:
             logger.error(f"데이터 정리 실패: {str(e)}")
             self.db_conn.rollback()
             
+    def refresh_rollups_job(self):
+        """매출/카탈로그 롤업 증분 갱신 (리포트/트렌드 분석의 롤업 최대 지연 이내로 유지)"""
+        try:
+            result = self.rollup_manager.refresh()
+            logger.info(f"롤업 갱신 완료: {result}")
+        except Exception as e:
+            logger.error(f"롤업 갱신 실패: {str(e)}")
+
     def monitor_system_health(self):
         """시스템 헬스 모니터링"""
         try:
@@ -312,6 +323,7 @@ class Scheduler:
         schedule.every().day.at("06:00").do(self.generate_reports_job)
         schedule.every().sunday.at("03:00").do(self.cleanup_old_data_job)
         schedule.every(5).minutes.do(self.monitor_system_health)
+        schedule.every(5).minutes.do(self.refresh_rollups_job)
         
         logger.info("스케줄러 시작")
         
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+대용량 데이터 내보내기 엔진
+- 서버 사이드 커서(이름 있는 커서)로 chunk_size 행씩 읽어 바로 기록 → 결과 크기와 무관하게 일정한 메모리
+- CSV (gzip 선택) 는 청크 단위 바이트로 바로 스트리밍
+- XLSX (openpyxl write-only) / Parquet (pyarrow, 청크별 row group) 은 임시 파일에 기록 후 스트리밍
+  (두 형식 모두 파일 끝에 목차/푸터가 있어 완성 전에는 전송할 수 없음)
+- FastAPI StreamingResponse 용 바이트 이터레이터와 파일 저장 모두 지원
+"""
+import csv
+import io
+import json
+import logging
+import os
+import tempfile
+import time
+import uuid
+import zlib
+from datetime import datetime
+from typing import Any, Callable, Dict, Generator, Iterable, Iterator, List, Optional, Tuple
+
+import psycopg2
+
+try:
+    from openpyxl import Workbook
+except ImportError:
+    Workbook = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+logger = logging.getLogger(__name__)
+
+# 내보내기 데이터셋 - 기본 쿼리, 허용 필터(파라미터 → 조건), 정렬 기준
+EXPORT_DATASETS: Dict[str, Dict[str, Any]] = {
+    'orders': {
+        'query': """
+            SELECT id, order_number, customer_id, customer_name, status,
+                   total_amount, created_at, updated_at
+            FROM orders
+        """,
+        'filters': {
+            'start_date': "created_at >= %(start_date)s",
+            'end_date': "created_at < %(end_date)s::date + 1",
+            'status': "status = %(status)s",
+        },
+        'order_by': 'id',
+    },
+    'order_items': {
+        'query': """
+            SELECT oi.order_id, o.order_number, o.created_at as order_created_at,
+                   oi.product_id, p.name as product_name, p.sku, p.category,
+                   oi.quantity, oi.price, oi.quantity * oi.price as amount
+            FROM order_items oi
+            JOIN orders o ON o.id = oi.order_id
+            LEFT JOIN products p ON p.id = oi.product_id
+        """,
+        'filters': {
+            'start_date': "o.created_at >= %(start_date)s",
+            'end_date': "o.created_at < %(end_date)s::date + 1",
+            'status': "o.status = %(status)s",
+        },
+        'order_by': 'oi.order_id, oi.product_id',
+    },
+    'products': {
+        'query': """
+            SELECT id, name, sku, price, stock, supplier, category, marketplace
+            FROM products
+        """,
+        'filters': {
+            'supplier': "supplier = %(supplier)s",
+            'category': "category = %(category)s",
+        },
+        'order_by': 'id',
+    },
+    'supplier_products': {
+        'query': """
+            SELECT id, supplier_id, supplier_product_id, product_name, product_code,
+                   barcode, brand, manufacturer, origin, category, price, cost_price,
+                   stock_quantity, status, image_url, collected_at, updated_at
+            FROM supplier_products
+        """,
+        'filters': {
+            'supplier_id': "supplier_id = %(supplier_id)s",
+            'category': "category = %(category)s",
+            'status': "status = %(status)s",
+        },
+        'order_by': 'id',
+    },
+}
+
+EXPORT_FORMATS = {
+    # 형식: (미디어 타입, 확장자)
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+# 엑셀 시트당 최대 행 수 (헤더 포함 1,048,576)
+XLSX_MAX_ROWS = 1048575
+
+Chunks = Iterable[Tuple[List[str], List[tuple]]]
+
+
+def build_query(dataset: str, filters: Optional[Dict[str, Any]] = None) -> Tuple[str, Dict[str, Any]]:
+    """데이터셋 쿼리와 파라미터 생성 (정의되지 않은 필터는 오류)"""
+    spec = EXPORT_DATASETS.get(dataset)
+    if spec is None:
+        raise ValueError(f"지원하지 않는 내보내기 데이터셋: {dataset}")
+
+    params = {key: value for key, value in (filters or {}).items() if value is not None}
+    unknown = set(params) - set(spec['filters'])
+    if unknown:
+        raise ValueError(f"{dataset} 에서 지원하지 않는 필터: {', '.join(sorted(unknown))}")
+
+    query = spec['query'].strip()
+    conditions = [spec['filters'][key] for key in spec['filters'] if key in params]
+    if conditions:
+        query += "\nWHERE " + " AND ".join(conditions)
+    query += f"\nORDER BY {spec['order_by']}"
+    return query, params
+
+
+def iter_chunks(conn, query: str, params: Optional[Dict[str, Any]] = None,
+                chunk_size: int = 5000) -> Iterator[Tuple[List[str], List[tuple]]]:
+    """
+    서버 사이드 커서로 (컬럼 목록, 행 목록) 청크 생성
+
+    결과가 비어 있어도 컬럼 정보를 위해 빈 청크를 한 번 생성
+    """
+    # 이름 있는 커서 = PostgreSQL 서버 사이드 커서
+    with conn.cursor(name=f"export_{uuid.uuid4().hex[:12]}") as cursor:
+        cursor.itersize = chunk_size
+        cursor.execute(query, params)
+
+        rows = cursor.fetchmany(chunk_size)
+        columns = [column[0] for column in cursor.description]
+        yield columns, rows
+
+        while rows:
+            rows = cursor.fetchmany(chunk_size)
+            if rows:
+                yield columns, rows
+
+
+def _plain_value(value: Any) -> Any:
+    """JSON 컬럼(dict/list)은 문자열로"""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return value
+
+
+def iter_csv(chunks: Chunks, gzip_output: bool = False) -> Generator[bytes, None, int]:
+    """
+    청크를 CSV 바이트로 변환 (UTF-8 BOM 포함 - 엑셀에서 한글이 깨지지 않도록)
+
+    gzip_output 이면 청크마다 압축된 바이트를 바로 내보냄 (전체를 버퍼링하지 않음).
+    기록한 행 수는 제너레이터 반환값 (StopIteration.value) 으로 돌려줌
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip_output else None
+    header_written = False
+    total = 0
+
+    for columns, rows in chunks:
+        if not header_written:
+            buffer.write('\ufeff')
+            writer.writerow(columns)
+            header_written = True
+        for row in rows:
+            writer.writerow([_plain_value(value) for value in row])
+        total += len(rows)
+
+        data = buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+        if compressor is not None:
+            data = compressor.compress(data)
+        if data:
+            yield data
+
+    if compressor is not None:
+        yield compressor.flush()
+    return total
+
+
+def write_csv(chunks: Chunks, path: str, gzip_output: bool = False) -> int:
+    """iter_csv 결과를 파일로 기록하고 행 수 반환"""
+    blocks = iter_csv(chunks, gzip_output)
+    with open(path, 'wb') as f:
+        while True:
+            try:
+                f.write(next(blocks))
+            except StopIteration as stop:
+                return stop.value
+
+
+def write_xlsx(chunks: Chunks, path: str, sheet_title: str = 'data') -> int:
+    """write-only 모드로 XLSX 기록 (시트 최대 행 수를 넘으면 다음 시트로 이어서 기록)"""
+    if Workbook is None:
+        raise RuntimeError("XLSX 내보내기에는 openpyxl 이 필요합니다")
+
+    wb = Workbook(write_only=True)
+    ws, sheet_rows, total, sheet_no = None, 0, 0, 0
+    columns: List[str] = []
+
+    def new_sheet():
+        nonlocal ws, sheet_rows, sheet_no
+        sheet_no += 1
+        ws = wb.create_sheet(sheet_title if sheet_no == 1 else f"{sheet_title}_{sheet_no}")
+        ws.append(columns)
+        sheet_rows = 0
+
+    for columns, rows in chunks:
+        if ws is None:
+            new_sheet()
+        for row in rows:
+            if sheet_rows >= XLSX_MAX_ROWS:
+                new_sheet()
+            ws.append([
+                value.replace(tzinfo=None) if isinstance(value, datetime) and value.tzinfo else _plain_value(value)
+                for value in row
+            ])
+            sheet_rows += 1
+        total += len(rows)
+
+    if ws is None:
+        wb.create_sheet(sheet_title)
+    wb.save(path)
+    return total
+
+
+def _arrow_column(type_code: int, precision: Optional[int], scale: Optional[int]) -> Tuple[Any, Callable]:
+    """PostgreSQL 타입 OID → (Arrow 타입, 값 변환 함수)"""
+    identity = lambda value: value
+    if type_code in (20, 21, 23):        # int8, int2, int4
+        return pa.int64(), identity
+    if type_code in (700, 701):          # float4, float8
+        return pa.float64(), identity
+    if type_code == 1700:                # numeric
+        if precision and 0 < precision <= 38:
+            return pa.decimal128(precision, scale or 0), identity
+        return pa.float64(), lambda value: None if value is None else float(value)
+    if type_code == 16:                  # bool
+        return pa.bool_(), identity
+    if type_code == 1082:                # date
+        return pa.date32(), identity
+    if type_code == 1114:                # timestamp
+        return pa.timestamp('us'), identity
+    if type_code == 1184:                # timestamptz
+        return pa.timestamp('us', tz='UTC'), identity
+    return pa.string(), lambda value: None if value is None else str(_plain_value(value))
+
+
+def write_parquet(conn, query: str, params: Optional[Dict[str, Any]], path: str,
+                  chunk_size: int = 5000, compression: str = 'snappy') -> int:
+    """청크마다 row group 하나씩 Parquet 기록 (스키마는 커서의 컬럼 타입에서 결정)"""
+    if pa is None:
+        raise RuntimeError("Parquet 내보내기에는 pyarrow 가 필요합니다")
+
+    writer, schema, converters, total = None, None, None, 0
+    with conn.cursor(name=f"export_{uuid.uuid4().hex[:12]}") as cursor:
+        cursor.itersize = chunk_size
+        cursor.execute(query, params)
+        try:
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if writer is None:
+                    fields, converters = [], []
+                    for column in cursor.description:
+                        arrow_type, converter = _arrow_column(column.type_code, column.precision, column.scale)
+                        fields.append(pa.field(column.name, arrow_type))
+                        converters.append(converter)
+                    schema = pa.schema(fields)
+                    writer = pq.ParquetWriter(path, schema, compression=compression)
+                if not rows:
+                    break
+                arrays = [
+                    pa.array([convert(row[i]) for row in rows], type=field.type)
+                    for i, (field, convert) in enumerate(zip(schema, converters))
+                ]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                total += len(rows)
+        finally:
+            if writer is not None:
+                writer.close()
+    return total
+
+
+def _iter_file(path: str, block_size: int = 1024 * 1024) -> Iterator[bytes]:
+    """파일을 블록 단위로 읽은 뒤 삭제"""
+    try:
+        with open(path, 'rb') as f:
+            while True:
+                block = f.read(block_size)
+                if not block:
+                    break
+                yield block
+    finally:
+        os.remove(path)
+
+
+class ExportEngine:
+    """
+    대용량 내보내기
+
+    Examples:
+        engine = ExportEngine(db_config)
+        body, media_type, filename = engine.stream('orders', 'csv', {'start_date': '2024-01-01'})
+        return StreamingResponse(body, media_type=media_type)
+    """
+
+    def __init__(self, db_config: Dict[str, Any], chunk_size: int = 5000,
+                 tmp_dir: Optional[str] = None):
+        """
+        Args:
+            db_config: 데이터베이스 연결 설정
+            chunk_size: 서버 사이드 커서에서 한 번에 읽을 행 수
+            tmp_dir: XLSX/Parquet 임시 파일 디렉토리 (기본: 시스템 임시 디렉토리)
+        """
+        self.db_config = db_config
+        self.chunk_size = chunk_size
+        self.tmp_dir = tmp_dir
+
+    def filename(self, dataset: str, format: str, gzip_output: bool = False) -> str:
+        extension = EXPORT_FORMATS[format][1]
+        suffix = '.gz' if gzip_output and format == 'csv' else ''
+        return f"{dataset}_{datetime.now().strftime('%Y%m%d%H%M%S')}.{extension}{suffix}"
+
+    def stream(self, dataset: str, format: str = 'csv', filters: Optional[Dict[str, Any]] = None,
+               gzip_output: bool = True) -> Tuple[Iterator[bytes], str, str]:
+        """
+        스트리밍 응답용 (바이트 이터레이터, 미디어 타입, 파일명)
+
+        잘못된 데이터셋/형식/필터는 이터레이터를 만들기 전에 ValueError 로 알림.
+        gzip 은 CSV 에만 적용 (XLSX 는 이미 zip, Parquet 은 자체 압축 사용)
+        """
+        query, params = self._prepare(dataset, format)(filters)
+        gzip_output = gzip_output and format == 'csv'
+        media_type = 'application/gzip' if gzip_output else EXPORT_FORMATS[format][0]
+        return (self._iter_export(dataset, format, query, params, gzip_output),
+                media_type, self.filename(dataset, format, gzip_output))
+
+    def export_to_file(self, dataset: str, path: str, format: str = 'csv',
+                       filters: Optional[Dict[str, Any]] = None,
+                       gzip_output: bool = False) -> Dict[str, Any]:
+        """파일로 내보내기 (스케줄 작업/배치용)"""
+        query, params = self._prepare(dataset, format)(filters)
+        started = time.time()
+        conn = psycopg2.connect(**self.db_config)
+        try:
+            if format == 'csv':
+                rows = write_csv(iter_chunks(conn, query, params, self.chunk_size), path, gzip_output)
+            elif format == 'xlsx':
+                rows = write_xlsx(iter_chunks(conn, query, params, self.chunk_size), path, dataset)
+            else:
+                rows = write_parquet(conn, query, params, path, self.chunk_size,
+                                     compression='gzip' if gzip_output else 'snappy')
+        finally:
+            conn.close()
+
+        result = {
+            'path': path,
+            'rows': rows,
+            'bytes': os.path.getsize(path),
+            'elapsed_seconds': round(time.time() - started, 2)
+        }
+        logger.info(f"{dataset} 내보내기 완료: {result}")
+        return result
+
+    def _prepare(self, dataset: str, format: str) -> Callable[[Optional[Dict[str, Any]]], Tuple[str, Dict]]:
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"지원하지 않는 내보내기 형식: {format}")
+        if format == 'xlsx' and Workbook is None:
+            raise ValueError("XLSX 내보내기에는 openpyxl 이 필요합니다")
+        if format == 'parquet' and pa is None:
+            raise ValueError("Parquet 내보내기에는 pyarrow 가 필요합니다")
+        return lambda filters: build_query(dataset, filters)
+
+    def _iter_export(self, dataset: str, format: str, query: str, params: Dict[str, Any],
+                     gzip_output: bool) -> Iterator[bytes]:
+        """
+        실제 내보내기 (응답 전송 시점에 실행)
+
+        클라이언트가 연결을 끊으면 제너레이터가 닫히면서 커서/연결/임시 파일도 정리됨
+        """
+        conn = psycopg2.connect(**self.db_config)
+        try:
+            if format == 'csv':
+                yield from iter_csv(iter_chunks(conn, query, params, self.chunk_size), gzip_output)
+                return
+
+            fd, path = tempfile.mkstemp(suffix=f".{EXPORT_FORMATS[format][1]}", dir=self.tmp_dir)
+            os.close(fd)
+            try:
+                if format == 'xlsx':
+                    write_xlsx(iter_chunks(conn, query, params, self.chunk_size), path, dataset)
+                else:
+                    write_parquet(conn, query, params, path, self.chunk_size)
+            except BaseException:
+                os.remove(path)
+                raise
+            conn.close()
+            yield from _iter_file(path)
+        finally:
+            conn.close()
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+실시간 대시보드 스냅샷 생성기
+- 오늘/어제 주문은 메모리에 보관하고 updated_at/created_at 워터마크 이후 변경분만 조회해 증분 집계
+- 지난 주간 추이는 전체 재동기화 때만 조회 (오늘 값은 메모리 집계로 채움)
+- 재고/시스템 지표는 주문량과 무관한 느린 주기로 갱신
+- Redis 리더 락을 가진 프로세스 하나만 계산하고, 결과를 Redis 키 + Pub/Sub 채널로 한 번 발행
+  → 대시보드 DB 부하는 접속자 수·주문량과 무관하게 일정
+"""
+import json
+import logging
+import os
+import time
+import uuid
+from collections import Counter
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_KEY = 'dashboard:realtime_snapshot'
+SNAPSHOT_CHANNEL = 'dashboard:realtime'
+LEADER_KEY = 'dashboard:realtime_snapshot:leader'
+
+MARKETS = ('coupang', 'naver', '11st')
+
+# (order_date, order_status, total_price, market_code, buyer_email)
+OrderRow = Tuple[datetime, Optional[str], Decimal, Optional[str], Optional[str]]
+
+_ZERO = Decimal(0)
+
+
+class OrderAggregates:
+    """
+    최근 주문 집계 (행 단위 증감으로 갱신)
+
+    같은 행을 여러 번 반영해도 결과가 같으므로 워터마크 구간이 겹쳐도 안전하다.
+    """
+
+    def __init__(self, today: date):
+        self.today = today
+        self.window_start = today - timedelta(days=1)
+        self.orders: Dict[int, OrderRow] = {}
+        self.today_orders = 0
+        self.today_revenue = _ZERO
+        self.customers: Counter = Counter()
+        self.hourly: Dict[int, List] = {}
+        self.by_market: Dict[Optional[str], List] = {}
+        self.status_counts: Counter = Counter()
+
+    def _apply(self, row: OrderRow, sign: int):
+        order_date, status, price, market_code, buyer_email = row
+        self.status_counts[status] += sign
+        if self.status_counts[status] == 0:
+            del self.status_counts[status]
+
+        if order_date.date() != self.today:
+            return
+        self.today_orders += sign
+        self.today_revenue += sign * price
+        if buyer_email is not None:
+            self.customers[buyer_email] += sign
+            if self.customers[buyer_email] == 0:
+                del self.customers[buyer_email]
+        for buckets, key in ((self.hourly, order_date.hour), (self.by_market, market_code)):
+            bucket = buckets.setdefault(key, [0, _ZERO])
+            bucket[0] += sign
+            bucket[1] += sign * price
+            if bucket[0] == 0:
+                del buckets[key]
+
+    def upsert(self, order_id: int, row: OrderRow) -> bool:
+        """주문 반영 (집계 구간 밖이면 제거), 변경되었으면 True"""
+        old = self.orders.get(order_id)
+        if old == row:
+            return False
+        if old is not None:
+            self._apply(old, -1)
+            del self.orders[order_id]
+        if row[0].date() >= self.window_start:
+            self._apply(row, 1)
+            self.orders[order_id] = row
+        return True
+
+
+def _order_row(record: Dict[str, Any]) -> OrderRow:
+    return (record['order_date'], record['order_status'], record['total_price'] or _ZERO,
+            record['market_code'], record['buyer_email'])
+
+
+def _to_float(value: Any) -> Any:
+    return float(value) if isinstance(value, Decimal) else value
+
+
+def _plain(row: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if row is None:
+        return None
+    return {key: _to_float(value) for key, value in row.items()}
+
+
+class RealtimeSnapshotProducer:
+    """
+    대시보드 스냅샷 생성/발행
+
+    Examples:
+        producer = RealtimeSnapshotProducer(db_config, redis_client)
+        snapshot = producer.refresh()      # 리더면 계산·발행, 아니면 Redis 의 최신 스냅샷
+        snapshot = read_snapshot(redis_client)  # 다른 API 에서 조회만
+    """
+
+    def __init__(self, db_config: Dict[str, Any], redis_client=None,
+                 full_refresh_interval: float = 600.0,
+                 slow_interval: float = 30.0,
+                 watermark_overlap: float = 5.0,
+                 snapshot_ttl: int = 60,
+                 leader_ttl: int = 15):
+        """
+        Args:
+            db_config: psycopg2 접속 정보
+            redis_client: redis.Redis (decode_responses=True), None 이면 단일 프로세스 모드
+            full_refresh_interval: 전체 재동기화 주기 (초) - 누락/삭제 보정
+            slow_interval: 재고/시스템 지표 갱신 주기 (초)
+            watermark_overlap: 늦게 커밋된 행을 놓치지 않도록 워터마크를 되돌리는 시간 (초)
+            snapshot_ttl: Redis 스냅샷 만료 시간 (초)
+            leader_ttl: 리더 락 유지 시간 (초) - 갱신 주기보다 길게
+        """
+        self.db_config = db_config
+        self.redis_client = redis_client
+        self.full_refresh_interval = full_refresh_interval
+        self.slow_interval = slow_interval
+        self.watermark_overlap = timedelta(seconds=watermark_overlap)
+        self.snapshot_ttl = snapshot_ttl
+        self.leader_ttl = leader_ttl
+        self.token = f"{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        self._conn = None
+        self._aggregates: Optional[OrderAggregates] = None
+        self._weekly_history: List[Dict[str, Any]] = []
+        self._watermark: Optional[datetime] = None
+        self._last_full_refresh = 0.0
+        self._last_slow_refresh = 0.0
+        self._slow_sections: Dict[str, Any] = {'inventory': None, 'system': {}}
+        self.latest: Optional[Dict[str, Any]] = None
+        self.stats = {'ticks': 0, 'full_refreshes': 0, 'delta_rows': 0, 'follower_reads': 0}
+
+    # -- DB ---------------------------------------------------------------
+
+    def _cursor(self):
+        if self._conn is None or self._conn.closed:
+            self._conn = psycopg2.connect(**self.db_config)
+            self._conn.autocommit = True
+        return self._conn.cursor(cursor_factory=RealDictCursor)
+
+    def close(self):
+        if self._conn is not None and not self._conn.closed:
+            self._conn.close()
+        self._conn = None
+
+    def _full_refresh(self, cursor, today: date, now: datetime):
+        """최근 주문 전체 재집계 + 지난 주간 추이 조회"""
+        aggregates = OrderAggregates(today)
+        cursor.execute("""
+            SELECT id, order_date, order_status, total_price, market_code, buyer_email
+            FROM market_orders
+            WHERE order_date >= %s
+        """, (aggregates.window_start,))
+        for record in cursor:
+            aggregates.upsert(record['id'], _order_row(record))
+
+        cursor.execute("""
+            SELECT
+                DATE(order_date) as date,
+                COUNT(*) as orders,
+                COALESCE(SUM(total_price), 0) as revenue
+            FROM market_orders
+            WHERE order_date >= %s AND order_date < %s
+            GROUP BY DATE(order_date)
+            ORDER BY date
+        """, (today - timedelta(days=7), today))
+        self._weekly_history = [_plain(row) for row in cursor.fetchall()]
+
+        self._aggregates = aggregates
+        self._watermark = now - self.watermark_overlap
+        self._last_full_refresh = time.monotonic()
+        self.stats['full_refreshes'] += 1
+
+    def _apply_delta(self, cursor, now: datetime):
+        """워터마크 이후 생성/변경된 주문만 반영"""
+        cursor.execute("""
+            SELECT id, order_date, order_status, total_price, market_code, buyer_email
+            FROM market_orders
+            WHERE (updated_at >= %s OR created_at >= %s)
+              AND order_date >= %s
+        """, (self._watermark, self._watermark, self._aggregates.window_start))
+        rows = cursor.fetchall()
+        for record in rows:
+            self._aggregates.upsert(record['id'], _order_row(record))
+        self._watermark = now - self.watermark_overlap
+        self.stats['delta_rows'] += len(rows)
+
+    def _refresh_slow_sections(self, cursor):
+        """재고/시스템 지표 (주문량과 무관한 주기)"""
+        cursor.execute("""
+            SELECT
+                COUNT(*) as total_products,
+                COUNT(*) FILTER (WHERE stock_quantity <= 10) as low_stock,
+                COUNT(*) FILTER (WHERE stock_quantity = 0) as out_of_stock,
+                COALESCE(SUM(stock_quantity * sale_price), 0) as inventory_value
+            FROM unified_products
+            WHERE status = 'active'
+        """)
+        inventory = _plain(cursor.fetchone())
+
+        cursor.execute("""
+            SELECT
+                level,
+                COUNT(*) as count
+            FROM system_logs
+            WHERE timestamp >= NOW() - INTERVAL '1 hour'
+            GROUP BY level
+        """)
+        log_counts = {row['level']: row['count'] for row in cursor.fetchall()}
+
+        cursor.execute("""
+            SELECT
+                AVG(execution_time) as avg_response_time,
+                MAX(execution_time) as max_response_time,
+                COUNT(*) as total_requests
+            FROM system_logs
+            WHERE execution_time IS NOT NULL
+            AND timestamp >= NOW() - INTERVAL '5 minutes'
+        """)
+        api_metrics = _plain(cursor.fetchone())
+
+        cursor.execute("""
+            SELECT
+                job_type,
+                status,
+                last_run_at,
+                next_run_at
+            FROM schedule_jobs
+            WHERE status = 'active'
+            ORDER BY next_run_at
+            LIMIT 10
+        """)
+        scheduled_jobs = cursor.fetchall()
+
+        self._slow_sections = {
+            'inventory': inventory,
+            'system': {
+                'error_rate': log_counts.get('ERROR', 0) + log_counts.get('CRITICAL', 0),
+                'warning_count': log_counts.get('WARNING', 0),
+                'api_metrics': api_metrics,
+                'scheduled_jobs': scheduled_jobs
+            }
+        }
+        self._last_slow_refresh = time.monotonic()
+
+    # -- 스냅샷 -----------------------------------------------------------
+
+    def _get_api_status(self) -> Dict[str, Any]:
+        """외부 API 상태 (api_health_checker 가 Redis 에 기록한 값)"""
+        unknown = {'status': 'unknown', 'last_check': None, 'response_time': None}
+        if self.redis_client is None:
+            return {market: dict(unknown) for market in MARKETS}
+        values = self.redis_client.mget([f"api_status:{market}" for market in MARKETS])
+        return {
+            market: json.loads(value) if value else dict(unknown)
+            for market, value in zip(MARKETS, values)
+        }
+
+    def build_snapshot(self) -> Dict[str, Any]:
+        """현재 집계 상태 → 대시보드 메트릭 (기존 get_realtime_metrics 와 같은 구조)"""
+        aggregates = self._aggregates
+        status_counts = dict(aggregates.status_counts)
+        weekly = list(self._weekly_history)
+        if aggregates.today_orders:
+            weekly.append({
+                'date': aggregates.today,
+                'orders': aggregates.today_orders,
+                'revenue': float(aggregates.today_revenue)
+            })
+
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'sales': {
+                'today': {
+                    'today_orders': aggregates.today_orders,
+                    'today_revenue': float(aggregates.today_revenue),
+                    'unique_customers': len(aggregates.customers)
+                },
+                'weekly_trend': weekly,
+                'hourly_trend': [
+                    {'hour': hour, 'orders': orders, 'revenue': float(revenue)}
+                    for hour, (orders, revenue) in sorted(aggregates.hourly.items())
+                ]
+            },
+            'orders': {
+                'status_counts': status_counts,
+                'by_market': [
+                    {'market_code': market_code, 'orders': orders, 'revenue': float(revenue)}
+                    for market_code, (orders, revenue) in aggregates.by_market.items()
+                ],
+                'pending': status_counts.get('pending', 0),
+                'processing': status_counts.get('processing', 0),
+                'completed': status_counts.get('completed', 0)
+            },
+            'inventory': self._slow_sections['inventory'],
+            'system': self._slow_sections['system'],
+            'api_status': self._get_api_status()
+        }
+
+    def compute(self) -> Dict[str, Any]:
+        """DB 에서 변경분을 반영해 스냅샷 계산"""
+        cursor = self._cursor()
+        try:
+            cursor.execute("SELECT CURRENT_DATE as today, LOCALTIMESTAMP as now")
+            clock = cursor.fetchone()
+            today, now = clock['today'], clock['now']
+
+            stale = time.monotonic() - self._last_full_refresh >= self.full_refresh_interval
+            if self._aggregates is None or self._aggregates.today != today or stale:
+                self._full_refresh(cursor, today, now)
+            else:
+                self._apply_delta(cursor, now)
+
+            if time.monotonic() - self._last_slow_refresh >= self.slow_interval:
+                self._refresh_slow_sections(cursor)
+        finally:
+            cursor.close()
+
+        self.stats['ticks'] += 1
+        return self.build_snapshot()
+
+    # -- 발행 -------------------------------------------------------------
+
+    def _is_leader(self) -> bool:
+        """Redis 리더 락 획득/연장 (Redis 가 없으면 항상 리더)"""
+        if self.redis_client is None:
+            return True
+        try:
+            if self.redis_client.set(LEADER_KEY, self.token, nx=True, ex=self.leader_ttl):
+                return True
+            if self.redis_client.get(LEADER_KEY) == self.token:
+                self.redis_client.expire(LEADER_KEY, self.leader_ttl)
+                return True
+            return False
+        except Exception as e:
+            logger.warning(f"스냅샷 리더 확인 실패, 로컬 계산: {e}")
+            return True
+
+    def publish(self, snapshot: Dict[str, Any]):
+        """Redis 키 갱신 + Pub/Sub 발행"""
+        if self.redis_client is None:
+            return
+        payload = json.dumps(snapshot, ensure_ascii=False, default=str)
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.set(SNAPSHOT_KEY, payload, ex=self.snapshot_ttl)
+            pipe.publish(SNAPSHOT_CHANNEL, payload)
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"스냅샷 발행 실패: {e}")
+
+    def refresh(self) -> Optional[Dict[str, Any]]:
+        """
+        틱 1회: 리더면 계산·발행, 팔로워면 Redis 의 최신 스냅샷 사용
+
+        Returns:
+            최신 스냅샷 (아직 없으면 None)
+        """
+        if self._is_leader():
+            try:
+                snapshot = self.compute()
+            except psycopg2.Error as e:
+                logger.error(f"대시보드 스냅샷 계산 실패: {e}")
+                self.close()
+                return self.latest
+            self.publish(snapshot)
+        else:
+            snapshot = read_snapshot(self.redis_client) or self.latest
+            self.stats['follower_reads'] += 1
+
+        self.latest = snapshot
+        return snapshot
+
+
+def read_snapshot(redis_client) -> Optional[Dict[str, Any]]:
+    """발행된 최신 대시보드 스냅샷 조회 (BI/대시보드 API 공용)"""
+    try:
+        payload = redis_client.get(SNAPSHOT_KEY)
+    except Exception as e:
+        logger.warning(f"스냅샷 조회 실패: {e}")
+        return None
+    return json.loads(payload) if payload else None
@@ -15,7 +15,6 @@ import psycopg2
 from psycopg2.extras import Json, RealDictCursor
 from datetime import datetime, timedelta
 import logging
-import time
 from typing import Dict, List, Any, Optional
 import hashlib
 import hmac
@@ -23,6 +22,14 @@ import base64
 from dataclasses import dataclass
 import traceback
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from collection_orchestrator import (
+    CollectionOrchestrator, BatchWriter, ChannelQuota, JobContext, RequestSlot
+)
+from core.tracing import aiohttp_trace_config, get_tracer
+from db.bulk_write import bulk_execute
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -50,28 +57,6 @@ class CollectionResult:
     errors: List[str]
     duration_seconds: float
 
-class RateLimiter:
-    """API 요청 율 제한기"""
-    
-    def __init__(self, max_requests_per_second: float = 5.0):
-        self.max_requests = max_requests_per_second
-        self.requests = []
-        
-    async def wait_if_needed(self):
-        """필요시 대기"""
-        now = time.time()
-        
-        # 1초 이내 요청들만 유지
-        self.requests = [req_time for req_time in self.requests if now - req_time < 1.0]
-        
-        if len(self.requests) >= self.max_requests:
-            # 가장 오래된 요청이 1초가 지날 때까지 대기
-            wait_time = 1.0 - (now - self.requests[0])
-            if wait_time > 0:
-                await asyncio.sleep(wait_time)
-                
-        self.requests.append(now)
-
 class APIIntegrationManager:
     """API 연동 통합 매니저"""
     
@@ -83,7 +68,11 @@ class APIIntegrationManager:
             user='postgres',
             password='postgres'
         )
-        self.rate_limiters = {}
+        # 공급사별 쿼터 (supplier_configs.settings 기준)
+        self.quotas: Dict[str, ChannelQuota] = {}
+        self._supplier_ids: Dict[str, int] = {}
+        # 진행 중(또는 마지막) 전체 수집 오케스트레이터
+        self.orchestrator: Optional[CollectionOrchestrator] = None
         
     def get_supplier_credentials(self, supplier_name: str) -> Optional[APICredentials]:
         """공급사 인증 정보 조회"""
@@ -105,9 +94,12 @@ class APIIntegrationManager:
                 settings = config.get('settings', {}) or {}
                 rate_limit = float(settings.get('rate_limit_per_second', 5.0))
                 
-                # 율 제한기 설정
-                if supplier_name not in self.rate_limiters:
-                    self.rate_limiters[supplier_name] = RateLimiter(rate_limit)
+                # 쿼터 설정
+                self.quotas[supplier_name] = ChannelQuota(
+                    max_concurrency=int(settings.get('max_concurrency', 4)),
+                    requests_per_second=rate_limit,
+                    account_concurrency=int(settings.get('account_concurrency', 2))
+                )
                 
                 return APICredentials(
                     api_key=config['api_key'],
@@ -123,81 +115,49 @@ class APIIntegrationManager:
     
     async def collect_ownerclan_products(self, credentials: APICredentials) -> CollectionResult:
         """오너클랜 상품 수집"""
-        start_time = time.time()
-        result = CollectionResult(
-            success=False, total_products=0, new_products=0, 
-            updated_products=0, failed_products=0, errors=[], duration_seconds=0
-        )
+        return await self._collect_single('오너클랜', credentials, self._collect_ownerclan)
+    
+    async def _collect_ownerclan(self, ctx: JobContext, credentials: APICredentials) -> Dict:
+        """오너클랜 상품 페이지 수집 → 공유 쓰기 단계로 전달"""
+        logger.info("🏪 오너클랜 실제 API 연동 시작")
         
-        try:
-            logger.info("🏪 오너클랜 실제 API 연동 시작")
-            
-            # 1. 인증 토큰 획득
-            auth_token = await self._authenticate_ownerclan(credentials)
-            if not auth_token:
-                result.errors.append("인증 실패")
-                return result
-            
-            # 2. 상품 목록 조회 (페이지네이션)
-            total_collected = 0
-            page_offset = 0
-            page_limit = 100
-            
-            while True:
-                await self.rate_limiters['오너클랜'].wait_if_needed()
-                
+        # 1. 인증 토큰 획득
+        async with ctx.request() as slot:
+            auth_token = await self._authenticate_ownerclan(credentials, slot)
+        if not auth_token:
+            return {'success': False, 'error': '인증 실패'}
+        
+        # 2. 상품 목록 조회 (페이지네이션)
+        page_offset = 0
+        page_limit = 100
+        
+        while True:
+            async with ctx.request() as slot:
                 products_data = await self._fetch_ownerclan_products(
-                    credentials, auth_token, page_limit, page_offset
+                    credentials, auth_token, page_limit, page_offset, slot
                 )
+            
+            if not products_data or not products_data.get('items'):
+                break
                 
-                if not products_data or not products_data.get('items'):
-                    break
-                    
-                # 3. 상품 데이터 저장
-                items = products_data['items']
-                total_count = products_data.get('totalCount', 0)
-                
-                logger.info(f"📦 페이지 처리: {page_offset + 1}-{page_offset + len(items)} / {total_count}")
-                
-                for product in items:
-                    try:
-                        save_result = self._save_product('오너클랜', product)
-                        if save_result == 'new':
-                            result.new_products += 1
-                        elif save_result == 'updated':
-                            result.updated_products += 1
-                        total_collected += 1
-                    except Exception as e:
-                        logger.error(f"상품 저장 실패: {e}")
-                        result.failed_products += 1
-                        result.errors.append(f"상품 저장 실패: {product.get('id', 'unknown')}")
-                
-                page_offset += page_limit
-                
-                # 모든 상품 수집 완료
-                if page_offset >= total_count:
-                    break
-                    
-                # API 부하 방지
-                await asyncio.sleep(0.2)
+            # 3. 상품 데이터 저장 (일괄)
+            items = products_data['items']
+            total_count = products_data.get('totalCount', 0)
             
-            result.total_products = total_collected
-            result.success = True
-            self.conn.commit()
+            logger.info(f"📦 페이지 처리: {page_offset + 1}-{page_offset + len(items)} / {total_count}")
+            await ctx.emit(items)
             
-            logger.info(f"✅ 오너클랜 수집 완료: {total_collected}개 상품")
+            page_offset += page_limit
             
-        except Exception as e:
-            logger.error(f"❌ 오너클랜 수집 실패: {e}")
-            result.errors.append(str(e))
-            self.conn.rollback()
-            
-        finally:
-            result.duration_seconds = time.time() - start_time
-            
-        return result
+            # 모든 상품 수집 완료
+            if page_offset >= total_count:
+                break
+        
+        logger.info(f"✅ 오너클랜 수집 완료: {ctx.progress.fetched}개 상품")
+        return {'success': True}
     
-    async def _authenticate_ownerclan(self, credentials: APICredentials) -> Optional[str]:
+    async def _authenticate_ownerclan(self, credentials: APICredentials,
+                                      slot: Optional[RequestSlot] = None) -> Optional[str]:
         """오너클랜 인증"""
         try:
             auth_url = "https://auth.ownerclan.com/auth"
@@ -207,8 +167,10 @@ class APIIntegrationManager:
                 'password': credentials.api_secret
             }
             
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=[aiohttp_trace_config('ownerclan')]) as session:
                 async with session.post(auth_url, json=auth_data) as response:
+                    if slot:
+                        slot.report(response.status)
                     if response.status != 200:
                         logger.error(f"인증 실패: {response.status}")
                         return None
@@ -228,7 +190,8 @@ class APIIntegrationManager:
             return None
     
     async def _fetch_ownerclan_products(self, credentials: APICredentials, 
-                                      token: str, limit: int, offset: int) -> Optional[Dict]:
+                                      token: str, limit: int, offset: int,
+                                      slot: Optional[RequestSlot] = None) -> Optional[Dict]:
         """오너클랜 상품 목록 조회"""
         try:
             query = """
@@ -283,9 +246,11 @@ class APIIntegrationManager:
                 }
             }
             
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=[aiohttp_trace_config('ownerclan')]) as session:
                 async with session.post(credentials.api_endpoint, 
                                       json=payload, headers=headers) as response:
+                    if slot:
+                        slot.report(response.status)
                     if response.status != 200:
                         logger.error(f"API 요청 실패: {response.status}")
                         return None
@@ -304,73 +269,42 @@ class APIIntegrationManager:
     
     async def collect_zentrade_products(self, credentials: APICredentials) -> CollectionResult:
         """젠트레이드 상품 수집"""
-        start_time = time.time()
-        result = CollectionResult(
-            success=False, total_products=0, new_products=0, 
-            updated_products=0, failed_products=0, errors=[], duration_seconds=0
-        )
+        return await self._collect_single('젠트레이드', credentials, self._collect_zentrade)
+    
+    async def _collect_zentrade(self, ctx: JobContext, credentials: APICredentials) -> Dict:
+        """젠트레이드 상품 페이지 수집 → 공유 쓰기 단계로 전달"""
+        logger.info("🏪 젠트레이드 실제 API 연동 시작")
         
-        try:
-            logger.info("🏪 젠트레이드 실제 API 연동 시작")
-            
-            # REST API 방식으로 수집
-            page = 1
-            per_page = 50
-            total_collected = 0
-            
-            while True:
-                await self.rate_limiters.get('젠트레이드', RateLimiter()).wait_if_needed()
-                
+        # REST API 방식으로 수집
+        page = 1
+        per_page = 50
+        
+        while True:
+            async with ctx.request() as slot:
                 products_data = await self._fetch_zentrade_products(
-                    credentials, page, per_page
+                    credentials, page, per_page, slot
                 )
-                
-                if not products_data or not products_data.get('data'):
-                    break
-                    
-                items = products_data['data']
-                total_count = products_data.get('total', 0)
-                
-                logger.info(f"📦 젠트레이드 페이지 {page}: {len(items)}개 상품")
-                
-                for product in items:
-                    try:
-                        save_result = self._save_product('젠트레이드', product)
-                        if save_result == 'new':
-                            result.new_products += 1
-                        elif save_result == 'updated':
-                            result.updated_products += 1
-                        total_collected += 1
-                    except Exception as e:
-                        logger.error(f"젠트레이드 상품 저장 실패: {e}")
-                        result.failed_products += 1
-                        result.errors.append(f"상품 저장 실패: {product.get('id', 'unknown')}")
-                
-                # 다음 페이지로
-                if len(items) < per_page:
-                    break
-                    
-                page += 1
-                await asyncio.sleep(0.1)  # API 부하 방지
-            
-            result.total_products = total_collected
-            result.success = True
-            self.conn.commit()
-            
-            logger.info(f"✅ 젠트레이드 수집 완료: {total_collected}개 상품")
             
-        except Exception as e:
-            logger.error(f"❌ 젠트레이드 수집 실패: {e}")
-            result.errors.append(str(e))
-            self.conn.rollback()
+            if not products_data or not products_data.get('data'):
+                break
+                
+            items = products_data['data']
             
-        finally:
-            result.duration_seconds = time.time() - start_time
+            logger.info(f"📦 젠트레이드 페이지 {page}: {len(items)}개 상품")
+            await ctx.emit(items)
             
-        return result
+            # 다음 페이지로
+            if len(items) < per_page:
+                break
+                
+            page += 1
+        
+        logger.info(f"✅ 젠트레이드 수집 완료: {ctx.progress.fetched}개 상품")
+        return {'success': True}
     
     async def _fetch_zentrade_products(self, credentials: APICredentials, 
-                                     page: int, per_page: int) -> Optional[Dict]:
+                                     page: int, per_page: int,
+                                     slot: Optional[RequestSlot] = None) -> Optional[Dict]:
         """젠트레이드 상품 목록 조회"""
         try:
             url = f"{credentials.api_endpoint}/products"
@@ -387,8 +321,10 @@ class APIIntegrationManager:
                 'status': 'active'
             }
             
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=[aiohttp_trace_config('zentrade')]) as session:
                 async with session.get(url, headers=headers, params=params) as response:
+                    if slot:
+                        slot.report(response.status)
                     if response.status != 200:
                         logger.error(f"젠트레이드 API 요청 실패: {response.status}")
                         return None
@@ -399,76 +335,106 @@ class APIIntegrationManager:
             logger.error(f"젠트레이드 조회 오류: {e}")
             return None
     
+    def _get_supplier_id(self, cursor, supplier_name: str) -> int:
+        """공급사 ID 조회 (캐시)"""
+        if supplier_name not in self._supplier_ids:
+            cursor.execute("SELECT id FROM suppliers WHERE name = %s", (supplier_name,))
+            supplier = cursor.fetchone()
+            if not supplier:
+                raise ValueError(f"공급사를 찾을 수 없습니다: {supplier_name}")
+            self._supplier_ids[supplier_name] = supplier[0]
+        return self._supplier_ids[supplier_name]
+    
+    def _to_product_record(self, supplier_id: int, product_data: Dict) -> Dict:
+        """상품 데이터 변환"""
+        return {
+            'supplier_id': supplier_id,
+            'supplier_product_id': str(product_data.get('id', product_data.get('product_id', ''))),
+            'product_name': product_data.get('name', ''),
+            'product_code': product_data.get('code'),
+            'barcode': product_data.get('barcode'),
+            'brand': product_data.get('brandName', product_data.get('brand')),
+            'manufacturer': product_data.get('manufacturerName', product_data.get('manufacturer')),
+            'origin': product_data.get('originCountry', product_data.get('origin')),
+            'description': product_data.get('description'),
+            'category': self._extract_category(product_data),
+            'price': float(product_data.get('price', 0)),
+            'cost_price': float(product_data.get('costPrice', product_data.get('cost_price', 0))),
+            'stock_quantity': int(product_data.get('stock', product_data.get('stock_quantity', 0))),
+            'weight': float(product_data.get('weight', 0)),
+            'status': 'active' if product_data.get('status') == 'ACTIVE' else 'inactive',
+            'image_url': self._extract_main_image(product_data),
+            'raw_data': Json(product_data),
+            'collected_at': datetime.now()
+        }
+    
     def _save_product(self, supplier_name: str, product_data: Dict) -> str:
-        """상품 데이터 저장"""
+        """상품 데이터 저장 (단건)"""
+        result = self._save_products_batch(supplier_name, [product_data])
+        if result['failed']:
+            raise ValueError(result['errors'][0])
+        return 'new' if result['new'] else 'updated'
+    
+    def _save_products_batch(self, supplier_name: str, products: List[Dict]) -> Dict:
+        """
+        상품 일괄 저장 (upsert 1회)
+        
+        변환 실패 행은 제외하고, 같은 배치 안의 중복 상품 ID 는 마지막 값만 저장한다.
+        DB 오류가 난 행은 세이브포인트로 걸러내고 나머지는 저장한다.
+        
+        Returns:
+            {'new': n, 'updated': n, 'failed': n, 'errors': [...]}
+        """
+        result = {'new': 0, 'updated': 0, 'failed': 0, 'errors': []}
+        
         try:
-            with self.conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                # 공급사 ID 조회
-                cursor.execute("SELECT id FROM suppliers WHERE name = %s", (supplier_name,))
-                supplier = cursor.fetchone()
-                
-                if not supplier:
-                    raise ValueError(f"공급사를 찾을 수 없습니다: {supplier_name}")
-                    
-                supplier_id = supplier['id']
+            with self.conn.cursor() as cursor:
+                supplier_id = self._get_supplier_id(cursor, supplier_name)
                 
-                # 기존 상품 확인
-                product_id = str(product_data.get('id', product_data.get('product_id', '')))
-                cursor.execute("""
-                    SELECT id FROM supplier_products 
-                    WHERE supplier_id = %s AND supplier_product_id = %s
-                """, (supplier_id, product_id))
-                
-                existing = cursor.fetchone()
-                
-                # 상품 데이터 변환
-                product_record = {
-                    'supplier_id': supplier_id,
-                    'supplier_product_id': product_id,
-                    'product_name': product_data.get('name', ''),
-                    'product_code': product_data.get('code'),
-                    'barcode': product_data.get('barcode'),
-                    'brand': product_data.get('brandName', product_data.get('brand')),
-                    'manufacturer': product_data.get('manufacturerName', product_data.get('manufacturer')),
-                    'origin': product_data.get('originCountry', product_data.get('origin')),
-                    'description': product_data.get('description'),
-                    'category': self._extract_category(product_data),
-                    'price': float(product_data.get('price', 0)),
-                    'cost_price': float(product_data.get('costPrice', product_data.get('cost_price', 0))),
-                    'stock_quantity': int(product_data.get('stock', product_data.get('stock_quantity', 0))),
-                    'weight': float(product_data.get('weight', 0)),
-                    'status': 'active' if product_data.get('status') == 'ACTIVE' else 'inactive',
-                    'image_url': self._extract_main_image(product_data),
-                    'raw_data': Json(product_data),
-                    'collected_at': datetime.now()
-                }
-                
-                if existing:
-                    # 업데이트
-                    update_fields = [f"{k} = %({k})s" for k in product_record.keys() if k != 'supplier_id']
-                    update_query = f"""
-                        UPDATE supplier_products SET
+                records = {}
+                for product_data in products:
+                    try:
+                        record = self._to_product_record(supplier_id, product_data)
+                        if not record['supplier_product_id']:
+                            raise ValueError("상품 ID 없음")
+                        records[record['supplier_product_id']] = record
+                    except Exception as e:
+                        result['failed'] += 1
+                        result['errors'].append(f"상품 변환 실패: {product_data.get('id', 'unknown')} ({e})")
+                
+                if not records:
+                    return result
+                
+                fields = list(next(iter(records.values())).keys())
+                update_fields = [f"{k} = EXCLUDED.{k}" for k in fields if k not in ('supplier_id', 'supplier_product_id')]
+                rows, failures = bulk_execute(
+                    cursor,
+                    f"""
+                        INSERT INTO supplier_products ({', '.join(fields)})
+                        VALUES %s
+                        ON CONFLICT (supplier_id, supplier_product_id) DO UPDATE SET
                             {', '.join(update_fields)},
                             updated_at = NOW()
-                        WHERE id = %(existing_id)s
-                    """
-                    product_record['existing_id'] = existing['id']
-                    cursor.execute(update_query, product_record)
-                    return 'updated'
-                else:
-                    # 신규 생성
-                    fields = list(product_record.keys())
-                    placeholders = [f"%({field})s" for field in fields]
-                    insert_query = f"""
-                        INSERT INTO supplier_products ({', '.join(fields)}) 
-                        VALUES ({', '.join(placeholders)})
-                    """
-                    cursor.execute(insert_query, product_record)
-                    return 'new'
-                    
+                        RETURNING (xmax = 0) AS inserted
+                    """,
+                    [tuple(record[k] for k in fields) for record in records.values()],
+                    list(records)
+                )
+                self.conn.commit()
+                
+                for product_id, error in failures:
+                    result['errors'].append(f"상품 저장 실패: {product_id} ({error})")
+                result['failed'] += len(failures)
+                result['new'] = sum(1 for row in rows if row[0])
+                result['updated'] = len(rows) - result['new']
+                
         except Exception as e:
-            logger.error(f"상품 저장 오류: {e}")
-            raise
+            logger.error(f"상품 일괄 저장 오류 ({supplier_name}): {e}")
+            self.conn.rollback()
+            result['failed'] = len(products)
+            result['errors'].append(str(e))
+            
+        return result
     
     def _extract_category(self, product_data: Dict) -> Optional[str]:
         """카테고리 정보 추출"""
@@ -486,8 +452,46 @@ class APIIntegrationManager:
             return main_image or images[0].get('url')
         return None
     
+    def _create_orchestrator(self) -> CollectionOrchestrator:
+        """공급사 수집 오케스트레이터 생성 (공유 쓰기 단계 = 이 매니저의 DB 연결)"""
+        return CollectionOrchestrator(
+            writer=BatchWriter(self._save_products_batch, batch_size=1000, flush_interval=2.0),
+            quotas=self.quotas
+        )
+    
+    def _collectors(self) -> Dict[str, Any]:
+        """공급사별 비동기 수집 함수"""
+        return {
+            '오너클랜': self._collect_ownerclan,
+            '젠트레이드': self._collect_zentrade
+        }
+    
+    def _to_collection_result(self, progress: Dict[str, Any]) -> CollectionResult:
+        return CollectionResult(
+            success=progress['status'] == 'success',
+            total_products=progress['fetched'],
+            new_products=progress['new'],
+            updated_products=progress['updated'],
+            failed_products=progress['failed'],
+            errors=progress['errors'],
+            duration_seconds=progress['elapsed_seconds']
+        )
+    
+    async def _collect_single(self, supplier_name: str, credentials: APICredentials,
+                              collector) -> CollectionResult:
+        """단일 공급사 수집 (하위 API 호출/DB 저장은 이 스팬의 자식으로 기록)"""
+        orchestrator = self._create_orchestrator()
+        orchestrator.add_job(
+            supplier_name, 'default',
+            lambda ctx: collector(ctx, credentials),
+            sink=supplier_name
+        )
+        with get_tracer().span(f"collect {supplier_name}", supplier=supplier_name):
+            results = await orchestrator.run()
+        return self._to_collection_result(results[f"{supplier_name}/default"])
+    
     async def collect_all_suppliers(self) -> Dict[str, CollectionResult]:
-        """모든 활성 공급사의 상품 수집"""
+        """모든 활성 공급사의 상품 수집 (공급사 동시 실행)"""
         results = {}
         
         try:
@@ -504,9 +508,10 @@ class APIIntegrationManager:
                 
             logger.info(f"🚀 활성 공급사 {len(suppliers)}개 수집 시작: {suppliers}")
             
+            orchestrator = self._create_orchestrator()
+            collectors = self._collectors()
+            
             for supplier_name in suppliers:
-                logger.info(f"📡 {supplier_name} 수집 중...")
-                
                 credentials = self.get_supplier_credentials(supplier_name)
                 if not credentials:
                     results[supplier_name] = CollectionResult(
@@ -516,31 +521,41 @@ class APIIntegrationManager:
                     )
                     continue
                 
-                # 공급사별 수집 메서드 호출
-                if supplier_name == '오너클랜':
-                    result = await self.collect_ownerclan_products(credentials)
-                elif supplier_name == '젠트레이드':
-                    result = await self.collect_zentrade_products(credentials)
-                else:
-                    result = CollectionResult(
+                collector = collectors.get(supplier_name)
+                if not collector:
+                    results[supplier_name] = CollectionResult(
                         success=False, total_products=0, new_products=0,
                         updated_products=0, failed_products=0,
                         errors=[f"지원되지 않는 공급사: {supplier_name}"], duration_seconds=0
                     )
+                    continue
                 
-                results[supplier_name] = result
+                orchestrator.add_job(
+                    supplier_name, 'default',
+                    lambda ctx, c=collector, cred=credentials: c(ctx, cred),
+                    sink=supplier_name
+                )
+            
+            # 진행 상황 조회용 (get_collection_progress)
+            self.orchestrator = orchestrator
+            job_results = await orchestrator.run()
+            
+            for progress in job_results.values():
+                supplier_name = progress['market']
+                results[supplier_name] = self._to_collection_result(progress)
                 
                 # 수집 로그 기록
-                self._log_collection_result(supplier_name, result)
-                
-                # 공급사 간 간격
-                await asyncio.sleep(1.0)
+                self._log_collection_result(supplier_name, results[supplier_name])
                 
         except Exception as e:
             logger.error(f"전체 수집 오류: {e}")
             
         return results
     
+    def get_collection_progress(self) -> Optional[Dict[str, Any]]:
+        """진행 중(또는 마지막) 전체 수집의 실시간 지표"""
+        return self.orchestrator.get_progress() if self.orchestrator else None
+    
     def _log_collection_result(self, supplier_name: str, result: CollectionResult):
         """수집 결과 로그 기록"""
         try:
@@ -10,9 +10,13 @@ import json
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from datetime import datetime
+import asyncio
 import logging
 import argparse
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from collection_orchestrator import CollectionOrchestrator, ChannelQuota
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -21,6 +25,15 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 class UnifiedSupplierCollector:
+    # 공급사 이름 → 수집 타입
+    SUPPLIER_TYPES = {
+        '쿠팡': 'coupang',
+        '오너클랜': 'ownerclan',
+        '젠트레이드': 'zentrade',
+        '네이버': 'naver',
+        '도매매': 'domemae'
+    }
+    
     def __init__(self):
         # 데이터베이스 연결
         self.conn = psycopg2.connect(
@@ -51,15 +64,7 @@ class UnifiedSupplierCollector:
             logger.info(f"수집 시작: {supplier['name']} (ID: {supplier_id})")
             
             # 수집 타입 결정 (이름 기반)
-            supplier_type_map = {
-                '쿠팡': 'coupang',
-                '오너클랜': 'ownerclan',
-                '젠트레이드': 'zentrade',
-                '네이버': 'naver',
-                '도매매': 'domemae'
-            }
-            
-            supplier_type = supplier_type_map.get(supplier['name'])
+            supplier_type = self.SUPPLIER_TYPES.get(supplier['name'])
             
             if not supplier_type:
                 raise ValueError(f"Unknown supplier name: {supplier['name']}")
@@ -216,7 +221,12 @@ class UnifiedSupplierCollector:
         }
         
     def collect_all(self):
-        """모든 활성 공급사 수집"""
+        """
+        모든 활성 공급사 수집 (공급사 동시 실행)
+        
+        기존 수집기들은 인증 정보를 환경변수로 받으므로 같은 타입은 한 번에 하나만,
+        서로 다른 타입은 동시에 실행한다. 전체 소요 시간은 가장 느린 공급사 기준이 된다.
+        """
         try:
             with self.conn.cursor(cursor_factory=RealDictCursor) as cursor:
                 cursor.execute("""
@@ -227,13 +237,34 @@ class UnifiedSupplierCollector:
                     ORDER BY s.id
                 """)
                 suppliers = cursor.fetchall()
-                
-            results = []
+            
+            orchestrator = CollectionOrchestrator(
+                default_quota=ChannelQuota(max_concurrency=1, account_concurrency=1)
+            )
             for supplier in suppliers:
-                logger.info(f"수집 중: {supplier['name']}")
-                result = self.collect_supplier(supplier['id'])
+                supplier_type = self.SUPPLIER_TYPES.get(supplier['name'], supplier['name'])
+                orchestrator.add_job(
+                    supplier_type, str(supplier['id']),
+                    lambda supplier_id=supplier['id']: self.collect_supplier(supplier_id),
+                    blocking=True
+                )
+            
+            logger.info(f"수집 시작: {len(suppliers)}개 공급사 동시 실행")
+            progress = asyncio.run(orchestrator.run())
+            
+            results = []
+            for supplier, job in zip(suppliers, orchestrator.jobs):
+                result = job.result if job.result is not None else {
+                    "success": False,
+                    "error": '; '.join(job.progress.errors) or 'unknown',
+                    "total_products": 0,
+                    "new_products": 0,
+                    "updated_products": 0,
+                    "failed_products": 0
+                }
                 result['supplier_name'] = supplier['name']
                 result['supplier_id'] = supplier['id']
+                result['duration_seconds'] = progress[f"{job.market}/{job.account}"]['elapsed_seconds']
                 results.append(result)
                 
             return results
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+멀티 마켓 수집 오케스트레이터
+- 모든 마켓/계정 수집 작업을 동시에 실행
+- 마켓별 / 계정별 동시성 및 초당 요청 수 제한 (쿼터, 429/5xx 응답에 따라 자동 조정)
+- 마켓별 서킷 브레이커
+- 공유 쓰기 단계: 작업들이 넘긴 레코드를 모아 일괄 저장 (단일 쓰기 작업)
+- 작업별 실시간 진행 지표
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.rate_control import TokenBucket, CircuitBreaker, CircuitOpenError, is_throttle_status
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChannelQuota:
+    """마켓(채널) 쿼터"""
+    max_concurrency: int = 4  # 마켓 전체 동시 요청 수
+    requests_per_second: float = 5.0  # 마켓 전체 초당 요청 수
+    account_concurrency: int = 2  # 계정별 동시 요청 수
+    account_requests_per_second: Optional[float] = None  # 계정별 초당 요청 수 (None 이면 제한 없음)
+    burst: Optional[float] = None  # 순간 허용 요청 수 (None 이면 초당 요청 수와 같음)
+    failure_threshold: int = 5  # 서킷 브레이커 연속 실패 임계값
+    recovery_timeout: float = 60.0  # 서킷 브레이커 복구 대기 (초)
+
+
+@dataclass
+class JobProgress:
+    """수집 작업 진행 지표"""
+    market: str
+    account: str
+    status: str = 'pending'  # pending, running, writing, success, failed
+    requests: int = 0
+    fetched: int = 0
+    written: int = 0
+    new: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: List[str] = field(default_factory=list)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = self.elapsed
+        return {
+            'market': self.market,
+            'account': self.account,
+            'status': self.status,
+            'requests': self.requests,
+            'fetched': self.fetched,
+            'written': self.written,
+            'new': self.new,
+            'updated': self.updated,
+            'failed': self.failed,
+            'errors': self.errors[:10],
+            'elapsed_seconds': round(elapsed, 2),
+            'items_per_second': round(self.fetched / elapsed, 2) if elapsed > 0 else 0.0
+        }
+
+
+class BatchWriter:
+    """
+    공유 쓰기 단계
+
+    작업들이 emit 한 레코드를 작업별 버퍼에 모아 batch_size 또는 flush_interval 마다
+    flush_fn 으로 일괄 저장한다. 쓰기 작업은 하나라서 DB 연결 하나로 직렬 처리되고,
+    큐가 가득 차면 수집 쪽이 대기한다 (back-pressure).
+
+    flush_fn(sink, records) 는 동기 함수이며 스레드에서 실행된다.
+    반환값: {'new': n, 'updated': n, 'failed': n, 'errors': [...]}
+    """
+
+    def __init__(self, flush_fn: Callable[[str, List[Dict]], Dict],
+                 batch_size: int = 1000, flush_interval: float = 1.0, max_queue: int = 100):
+        self.flush_fn = flush_fn
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._max_queue = max_queue
+        self._task: Optional[asyncio.Task] = None
+        self._buffers: Dict[int, tuple] = {}  # id(progress) -> (sink, progress, records)
+        self.batches = 0
+        self.records = 0
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self._max_queue)
+        self._task = asyncio.create_task(self._run())
+
+    async def put(self, sink: str, progress: JobProgress, records: List[Dict]):
+        await self._queue.put((sink, progress, records))
+
+    async def drain(self, progress: JobProgress):
+        """작업 종료 시 해당 작업 버퍼 즉시 저장 요청"""
+        done = asyncio.get_running_loop().create_future()
+        await self._queue.put(('__drain__', progress, done))
+        await done
+
+    async def close(self):
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    async def _run(self):
+        last_flush = time.monotonic()
+        while True:
+            timeout = max(0.0, self.flush_interval - (time.monotonic() - last_flush))
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                item = False
+
+            if item is None:
+                await self._flush_all()
+                return
+
+            if item:
+                sink, progress, payload = item
+                if sink == '__drain__':
+                    await self._flush(id(progress))
+                    payload.set_result(True)
+                    continue
+
+                key = id(progress)
+                if key not in self._buffers:
+                    self._buffers[key] = (sink, progress, [])
+                buffer = self._buffers[key][2]
+                buffer.extend(payload)
+                if len(buffer) >= self.batch_size:
+                    await self._flush(key)
+
+            if time.monotonic() - last_flush >= self.flush_interval:
+                await self._flush_all()
+                last_flush = time.monotonic()
+
+    async def _flush_all(self):
+        for key in list(self._buffers):
+            await self._flush(key)
+
+    async def _flush(self, key: int):
+        entry = self._buffers.pop(key, None)
+        if not entry or not entry[2]:
+            return
+        sink, progress, records = entry
+
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(None, self.flush_fn, sink, records)
+        except Exception as e:
+            logger.error(f"일괄 저장 실패 ({sink}, {len(records)}건): {e}")
+            result = {'new': 0, 'updated': 0, 'failed': len(records), 'errors': [str(e)]}
+
+        self.batches += 1
+        self.records += len(records)
+        progress.new += result.get('new', 0)
+        progress.updated += result.get('updated', 0)
+        progress.failed += result.get('failed', 0)
+        progress.written += result.get('new', 0) + result.get('updated', 0)
+        progress.errors.extend(result.get('errors', []))
+
+
+class RequestSlot:
+    """API 요청 1회 슬롯 - report() 로 응답 상태를 알려주면 율 제한기/서킷 브레이커에 반영"""
+
+    def __init__(self):
+        self.status_code: Optional[int] = None
+
+    def report(self, status_code: int):
+        self.status_code = status_code
+
+
+class JobContext:
+    """수집 작업에 전달되는 실행 컨텍스트 (쿼터 / 쓰기 / 진행 지표)"""
+
+    def __init__(self, orchestrator: 'CollectionOrchestrator', market: str, account: str,
+                 sink: str, progress: JobProgress):
+        self.orchestrator = orchestrator
+        self.market = market
+        self.account = account
+        self.sink = sink
+        self.progress = progress
+
+    @asynccontextmanager
+    async def request(self):
+        """
+        API 요청 1회 슬롯 (마켓/계정 동시성 + 초당 요청 수 제한 + 서킷 브레이커)
+
+        Examples:
+            async with ctx.request() as slot:
+                response = await session.get(url)
+                slot.report(response.status)
+        """
+        market_sem, market_limiter, account_sem, account_limiter = \
+            self.orchestrator._quota_handles(self.market, self.account)
+        breaker = self.orchestrator._circuit_breaker(self.market)
+        if not breaker.allow_request():
+            raise CircuitOpenError(f"{self.market} 서킷 브레이커 열림 - 요청 차단")
+
+        limiters = [limiter for limiter in (market_limiter, account_limiter) if limiter]
+        async with market_sem, account_sem:
+            for limiter in limiters:
+                await limiter.acquire_async()
+            self.progress.requests += 1
+
+            slot = RequestSlot()
+            try:
+                yield slot
+            except Exception:
+                breaker.record_failure()
+                raise
+
+        for limiter in limiters:
+            limiter.record(slot.status_code)
+        if is_throttle_status(slot.status_code):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+    async def emit(self, records: List[Dict]):
+        """수집한 레코드를 공유 쓰기 단계로 전달"""
+        if not records:
+            return
+        self.progress.fetched += len(records)
+        await self.orchestrator.writer.put(self.sink, self.progress, records)
+
+    def record_error(self, error: str):
+        self.progress.failed += 1
+        self.progress.errors.append(error)
+
+
+@dataclass
+class _Job:
+    market: str
+    account: str
+    sink: str
+    fn: Callable
+    blocking: bool
+    progress: JobProgress
+    result: Any = None
+
+
+class CollectionOrchestrator:
+    """
+    멀티 마켓 수집 오케스트레이터
+
+    작업 종류:
+        - 비동기 작업: async fn(ctx) - ctx.request() 로 요청 쿼터를 얻고 ctx.emit() 으로 저장
+        - 블로킹 작업 (blocking=True): 자체적으로 수집/저장하는 기존 동기 수집기.
+          스레드에서 실행되며 작업 전체가 마켓/계정 슬롯 하나를 점유한다.
+          작업 반환값(dict)의 total/new/updated/failed 를 진행 지표로 반영한다.
+
+    전체 실행 시간은 가장 느린 채널의 수집 시간에 수렴한다.
+
+    Examples:
+        orchestrator = CollectionOrchestrator(
+            writer=BatchWriter(manager._save_products_batch),
+            quotas={'ownerclan': ChannelQuota(max_concurrency=2, requests_per_second=3)}
+        )
+        orchestrator.add_job('ownerclan', 'main', collect_fn, sink='오너클랜')
+        results = await orchestrator.run()
+    """
+
+    def __init__(self, writer: Optional[BatchWriter] = None,
+                 quotas: Optional[Dict[str, ChannelQuota]] = None,
+                 default_quota: Optional[ChannelQuota] = None,
+                 progress_interval: float = 10.0, redis_client=None):
+        self.writer = writer
+        self.redis_client = redis_client  # 지정 시 율 제한 상태를 프로세스 간 공유
+        self.quotas = quotas or {}
+        self.default_quota = default_quota or ChannelQuota()
+        self.progress_interval = progress_interval
+        self.jobs: List[_Job] = []
+        self._market_handles: Dict[str, tuple] = {}
+        self._account_handles: Dict[tuple, tuple] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._started_at: Optional[float] = None
+
+    def add_job(self, market: str, account: str, fn: Callable,
+                blocking: bool = False, sink: Optional[str] = None) -> JobProgress:
+        """수집 작업 추가 (sink: 쓰기 단계 저장 대상 - 기본은 market)"""
+        progress = JobProgress(market=market, account=account)
+        self.jobs.append(_Job(market, account, sink or market, fn, blocking, progress))
+        return progress
+
+    def _quota_handles(self, market: str, account: str) -> tuple:
+        quota = self.quotas.get(market, self.default_quota)
+        if market not in self._market_handles:
+            self._market_handles[market] = (
+                asyncio.Semaphore(quota.max_concurrency),
+                TokenBucket(quota.requests_per_second, capacity=quota.burst,
+                            redis_client=self.redis_client, name=market)
+            )
+        key = (market, account)
+        if key not in self._account_handles:
+            self._account_handles[key] = (
+                asyncio.Semaphore(quota.account_concurrency),
+                TokenBucket(quota.account_requests_per_second,
+                            redis_client=self.redis_client, name=f"{market}:{account}")
+                if quota.account_requests_per_second else None
+            )
+        market_sem, market_limiter = self._market_handles[market]
+        account_sem, account_limiter = self._account_handles[key]
+        return market_sem, market_limiter, account_sem, account_limiter
+
+    def _circuit_breaker(self, market: str) -> CircuitBreaker:
+        if market not in self._breakers:
+            quota = self.quotas.get(market, self.default_quota)
+            self._breakers[market] = CircuitBreaker(
+                failure_threshold=quota.failure_threshold,
+                recovery_timeout=quota.recovery_timeout,
+                name=market
+            )
+        return self._breakers[market]
+
+    async def run(self) -> Dict[str, Dict[str, Any]]:
+        """모든 작업 동시 실행 후 작업별 결과 반환 ('market/account' 키)"""
+        self._started_at = time.time()
+        if self.writer:
+            await self.writer.start()
+        reporter = asyncio.create_task(self._report_progress())
+
+        try:
+            await asyncio.gather(*(self._run_job(job) for job in self.jobs))
+        finally:
+            if self.writer:
+                await self.writer.close()
+            reporter.cancel()
+
+        logger.info(f"전체 수집 완료: {len(self.jobs)}개 작업, {time.time() - self._started_at:.1f}초")
+        return {f"{job.market}/{job.account}": job.progress.to_dict() for job in self.jobs}
+
+    async def _run_job(self, job: _Job):
+        progress = job.progress
+        progress.status = 'running'
+        progress.started_at = time.time()
+
+        try:
+            if job.blocking:
+                result = await self._run_blocking(job)
+            else:
+                ctx = JobContext(self, job.market, job.account, job.sink, progress)
+                result = await job.fn(ctx)
+                if self.writer:
+                    progress.status = 'writing'
+                    await self.writer.drain(progress)
+
+            job.result = result
+            success = result.get('success', True) if isinstance(result, dict) else True
+            if isinstance(result, dict) and result.get('error'):
+                progress.errors.append(str(result['error']))
+            progress.status = 'success' if success else 'failed'
+
+        except Exception as e:
+            logger.error(f"수집 작업 실패 ({job.market}/{job.account}): {e}")
+            progress.errors.append(str(e))
+            progress.status = 'failed'
+        finally:
+            progress.finished_at = time.time()
+            logger.info(
+                f"작업 종료 ({job.market}/{job.account}): {progress.status}, "
+                f"수집 {progress.fetched}건, 저장 {progress.written}건, {progress.elapsed:.1f}초"
+            )
+
+    async def _run_blocking(self, job: _Job) -> Any:
+        market_sem, _, account_sem, _ = self._quota_handles(job.market, job.account)
+        async with market_sem, account_sem:
+            result = await asyncio.get_running_loop().run_in_executor(None, job.fn)
+
+        if isinstance(result, dict):
+            progress = job.progress
+            progress.fetched = result.get('total_products', 0)
+            progress.new = result.get('new_products', 0)
+            progress.updated = result.get('updated_products', 0)
+            progress.failed = result.get('failed_products', 0)
+            progress.written = progress.new + progress.updated
+            progress.errors.extend(result.get('errors', []) or [])
+        return result
+
+    async def _report_progress(self):
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            running = [j.progress for j in self.jobs if j.progress.status in ('running', 'writing')]
+            fetched = sum(j.progress.fetched for j in self.jobs)
+            written = sum(j.progress.written for j in self.jobs)
+            logger.info(
+                f"수집 진행: 실행 중 {len(running)}/{len(self.jobs)}, "
+                f"수집 {fetched}건, 저장 {written}건"
+            )
+
+    def get_progress(self) -> Dict[str, Any]:
+        """실시간 진행 지표"""
+        jobs = [job.progress.to_dict() for job in self.jobs]
+        return {
+            'elapsed_seconds': round(time.time() - self._started_at, 2) if self._started_at else 0.0,
+            'jobs': jobs,
+            'totals': {
+                key: sum(job[key] for job in jobs)
+                for key in ('requests', 'fetched', 'written', 'new', 'updated', 'failed')
+            },
+            'writer': {
+                'batches': self.writer.batches,
+                'records': self.writer.records
+            } if self.writer else None
+        }
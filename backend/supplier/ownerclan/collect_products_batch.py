@@ -6,17 +6,21 @@
 
 import os
 import sys
-import json
 import requests
 import psycopg2
-from psycopg2.extras import Json, RealDictCursor, execute_batch
+from psycopg2.extras import Json, RealDictCursor, execute_batch, execute_values
 from datetime import datetime, timedelta
 import logging
 import time
+import threading
 import multiprocessing
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
 import argparse
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from work_ledger import WorkLedger
+from product_query import build_offset_query, iter_product_pages
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -29,7 +33,9 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 class OwnerClanBatchCollector:
-    def __init__(self):
+    DEFAULT_RUN_ID = 'ownerclan_batch'
+
+    def __init__(self, run_id=None):
         self.api_url = "https://api.ownerclan.com/v1/graphql"
         self.auth_url = "https://auth.ownerclan.com/auth"
         self.access_token = None
@@ -38,6 +44,8 @@ class OwnerClanBatchCollector:
         # 데이터베이스 연결 풀
         self.conn_pool = []
         self.max_connections = 10
+        self.db_lock = threading.Lock()
+        self.stats_lock = threading.Lock()
         
         # 수집 통계
         self.stats = {
@@ -48,31 +56,18 @@ class OwnerClanBatchCollector:
             'start_time': datetime.now()
         }
         
-        # 체크포인트 파일
-        self.checkpoint_file = 'ownerclan_checkpoint.json'
-        self.checkpoint = self.load_checkpoint()
-        
-    def load_checkpoint(self):
-        """체크포인트 로드"""
-        if os.path.exists(self.checkpoint_file):
-            with open(self.checkpoint_file, 'r') as f:
-                return json.load(f)
-        return {'last_offset': 0, 'total_collected': 0}
+        # 작업 원장 (offset 구간별 진행 상태 - Postgres)
+        self.ledger = WorkLedger(
+            self.get_db_connection,
+            self.return_db_connection,
+            run_id=run_id or self.DEFAULT_RUN_ID
+        )
         
-    def save_checkpoint(self, offset, total):
-        """체크포인트 저장"""
-        self.checkpoint = {
-            'last_offset': offset,
-            'total_collected': total,
-            'timestamp': datetime.now().isoformat()
-        }
-        with open(self.checkpoint_file, 'w') as f:
-            json.dump(self.checkpoint, f)
-            
     def get_db_connection(self):
         """데이터베이스 연결 가져오기"""
-        if self.conn_pool:
-            return self.conn_pool.pop()
+        with self.db_lock:
+            if self.conn_pool:
+                return self.conn_pool.pop()
         
         conn = psycopg2.connect(
             host="localhost",
@@ -85,10 +80,11 @@ class OwnerClanBatchCollector:
         
     def return_db_connection(self, conn):
         """데이터베이스 연결 반환"""
-        if len(self.conn_pool) < self.max_connections:
-            self.conn_pool.append(conn)
-        else:
-            conn.close()
+        with self.db_lock:
+            if len(self.conn_pool) < self.max_connections:
+                self.conn_pool.append(conn)
+            else:
+                conn.close()
             
     def authenticate(self):
         """오너클랜 API 인증 (토큰 갱신 포함)"""
@@ -147,86 +143,166 @@ class OwnerClanBatchCollector:
             'Authorization': f'Bearer {self.access_token}'
         }
         
-    def get_products_query(self, limit=1000, offset=0):
+    def get_products_query(self):
         """상품 목록 조회 GraphQL 쿼리 (최적화)"""
-        return """
-        query GetProducts($limit: Int!, $offset: Int!) {
-            products(limit: $limit, offset: $offset) {
-                totalCount
-                items {
-                    id
-                    name
-                    code
-                    barcode
-                    brandName
-                    manufacturerName
-                    originCountry
-                    stock
-                    price
-                    costPrice
-                    weight
-                    status
-                    createdAt
-                    updatedAt
-                    category {
-                        id
-                        name
-                        fullPath
-                    }
-                    options {
-                        id
-                        name
-                        values
-                    }
-                    images {
-                        url
-                        isMain
-                    }
-                }
-            }
-        }
-        """
+        return build_offset_query()
         
-    def collect_batch(self, offset, limit):
-        """배치 단위로 상품 수집"""
+    def fetch_products_page(self, query, variables):
+        """GraphQL 상품 목록 요청 (실패 시 None)"""
+        position = variables.get('offset')
         try:
             # GraphQL 요청
             response = requests.post(
                 self.api_url,
                 headers=self.get_headers(),
                 json={
-                    'query': self.get_products_query(limit, offset),
-                    'variables': {
-                        'limit': limit,
-                        'offset': offset
-                    }
+                    'query': query,
+                    'variables': variables
                 },
                 timeout=30
             )
             
             if response.status_code != 200:
-                logger.error(f"API 요청 실패 (offset: {offset}): {response.status_code}")
+                logger.error(f"API 요청 실패 (위치: {position}): {response.status_code}")
                 return None
                 
             data = response.json()
             
             if 'errors' in data:
-                logger.error(f"GraphQL 에러 (offset: {offset}): {data['errors']}")
+                logger.error(f"GraphQL 에러 (위치: {position}): {data['errors']}")
                 return None
                 
             return data.get('data', {}).get('products', {})
             
         except Exception as e:
-            logger.error(f"배치 수집 오류 (offset: {offset}): {str(e)}")
+            logger.error(f"배치 수집 오류 (위치: {position}): {str(e)}")
             return None
             
-    def save_products_batch(self, products):
-        """상품 배치 저장 (최적화)"""
+    def collect_batch(self, offset, limit):
+        """배치 단위로 상품 수집"""
+        return self.fetch_products_page(
+            self.get_products_query(),
+            {'limit': limit, 'offset': offset}
+        )
+        
+    def save_price_stock_batch(self, products):
+        """가격/재고만 갱신 (price_stock 프로필 - 기존 상품만 대상)"""
         if not products:
             return {'new': 0, 'updated': 0, 'failed': 0}
             
+        now = datetime.now()
+        rows = [
+            (
+                f"W{p['id']}",
+                p.get('price', 0),
+                p.get('costPrice', 0),
+                p.get('stock', 0),
+                'in_stock' if (p.get('stock') or 0) > 0 else 'out_of_stock',
+                'active' if p.get('status') == 'ACTIVE' else 'inactive',
+                now
+            )
+            for p in products
+        ]
+        
         conn = self.get_db_connection()
         stats = {'new': 0, 'updated': 0, 'failed': 0}
+        try:
+            with conn.cursor() as cursor:
+                updated = execute_values(cursor, """
+                    UPDATE products AS p SET
+                        price = v.price,
+                        base_price = v.price,
+                        cost_price = v.cost_price,
+                        stock_quantity = v.stock_quantity,
+                        stock_status = v.stock_status,
+                        status = v.status,
+                        updated_at = v.checked_at,
+                        last_stock_check = v.checked_at
+                    FROM (VALUES %s) AS v (
+                        product_key, price, cost_price, stock_quantity,
+                        stock_status, status, checked_at
+                    )
+                    WHERE p.product_key = v.product_key
+                    RETURNING p.product_key
+                """, rows, template="(%s, %s::numeric, %s::numeric, %s::integer, %s, %s, %s::timestamp)",
+                    page_size=1000, fetch=True)
+            conn.commit()
+            stats['updated'] = len(updated)
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"가격/재고 저장 오류: {str(e)}")
+            stats['failed'] = len(products)
+        finally:
+            self.return_db_connection(conn)
+            
+        return stats
+        
+    def collect_by_profile(self, profile='price_stock', batch_size=1000, start_offset=0):
+        """
+        조회 프로필 순차 수집
+
+        price_stock: 가격/재고 필드만 받아 기존 상품 갱신 (전체 상품을 순회하되 응답이 가벼움)
+        full: 전체 상품 전체 필드 저장
+
+        중단되면 마지막으로 저장한 다음 offset 을 stats['next_offset'] 과 로그에 남기며,
+        start_offset 으로 넘기면 그 지점부터 재개한다.
+        """
+        if not self.authenticate():
+            logger.error("인증 실패")
+            return None
+            
+        logger.info(f"오너클랜 프로필 수집 시작 (프로필: {profile}, 배치 크기: {batch_size}, "
+                    f"시작 offset: {start_offset})")
+        save = self.save_price_stock_batch if profile == 'price_stock' else self.save_products_batch
+        next_offset = start_offset
+        self.stats['completed'] = False
+        
+        try:
+            for items, page_end in iter_product_pages(self.fetch_products_page, profile,
+                                                      limit=batch_size,
+                                                      start_offset=start_offset):
+                batch_stats = save(items)
+                if batch_stats['failed']:
+                    self.stats['failed_products'] += batch_stats['failed']
+                    raise RuntimeError(f"배치 저장 실패 (offset: {next_offset})")
+                next_offset = page_end
+                self.stats['total_products'] += len(items)
+                self.stats['new_products'] += batch_stats['new']
+                self.stats['updated_products'] += batch_stats['updated']
+                logger.info(f"프로필 수집 진행: {self.stats['total_products']:,}개 (다음 offset: {next_offset:,})")
+            self.stats['completed'] = True
+                
+        except Exception as e:
+            logger.error(f"프로필 수집 오류: {str(e)} - "
+                         f"--start-offset {next_offset} 로 재개할 수 있습니다")
+        finally:
+            for conn in self.conn_pool:
+                conn.close()
+            self.conn_pool.clear()
+            
+        self.stats['next_offset'] = next_offset
+        logger.info(f"""
+프로필 수집 {'완료' if self.stats['completed'] else '중단'} (프로필: {profile})
+- 저장 대상: {self.stats['total_products']:,}
+- 신규: {self.stats['new_products']:,}
+- 업데이트: {self.stats['updated_products']:,}
+- 실패: {self.stats['failed_products']:,}
+- 다음 offset: {next_offset:,}
+        """)
+        return self.stats
+            
+    def save_products_batch(self, products, work=None):
+        """
+        상품 배치 저장 (최적화)
+
+        work=(range_start, worker_id) 를 넘기면 작업 원장의 구간 완료 표시를
+        상품 저장과 같은 트랜잭션으로 커밋한다. 리스를 잃은 구간은 저장하지 않는다.
+        """
+        if not products:
+            return {'new': 0, 'updated': 0, 'failed': 0, 'committed': True}
+            
+        conn = self.get_db_connection()
+        stats = {'new': 0, 'updated': 0, 'failed': 0, 'committed': False}
         
         try:
             with conn.cursor() as cursor:
@@ -312,19 +388,36 @@ class OwnerClanBatchCollector:
                     """, update_products, page_size=500)
                     stats['updated'] = len(update_products)
                 
+                # 구간 완료 표시 (저장과 같은 트랜잭션)
+                if work and not self.ledger.mark_done(cursor, work[0], work[1], len(products)):
+                    conn.rollback()
+                    logger.warning(f"리스 만료로 구간 저장 취소 (offset: {work[0]})")
+                    stats['new'] = stats['updated'] = 0
+                    stats['lease_lost'] = True
+                    return stats
+                
                 conn.commit()
+                stats['committed'] = True
                 
         except Exception as e:
             conn.rollback()
             logger.error(f"배치 저장 오류: {str(e)}")
+            stats['new'] = stats['updated'] = 0
             stats['failed'] = len(products)
+            stats['error'] = str(e)
         finally:
             self.return_db_connection(conn)
             
         return stats
         
-    def collect_all_products(self, batch_size=1000, max_workers=5):
-        """전체 상품 수집 (병렬 처리)"""
+    def collect_all_products(self, batch_size=1000, max_workers=5, resume=False,
+                             retry_failed=False):
+        """
+        전체 상품 수집 (병렬 처리)
+
+        offset 구간은 작업 원장에 기록되며 resume=True 이면 이전 실행에서
+        완료되지 않은 구간만 이어서 수집한다.
+        """
         try:
             # 인증
             if not self.authenticate():
@@ -332,10 +425,7 @@ class OwnerClanBatchCollector:
                 return
                 
             logger.info(f"오너클랜 대량 수집 시작 (배치 크기: {batch_size}, 워커: {max_workers})")
-            
-            # 시작 offset (체크포인트에서 재개)
-            offset = self.checkpoint['last_offset']
-            total_collected = self.checkpoint['total_collected']
+            logger.info(f"실행 ID: {self.ledger.run_id} ({'재개' if resume else '신규'})")
             
             # 첫 번째 요청으로 전체 개수 확인
             initial_batch = self.collect_batch(0, 1)
@@ -346,56 +436,27 @@ class OwnerClanBatchCollector:
             total_count = initial_batch.get('totalCount', 0)
             logger.info(f"전체 상품 수: {total_count:,}개")
             
-            # 병렬 처리를 위한 스레드 풀
+            # 작업 원장 준비
+            self.ledger.ensure_table()
+            if not resume:
+                self.ledger.reset()
+            elif retry_failed:
+                logger.info(f"실패 구간 재시도: {self.ledger.retry_failed()}개")
+            self.ledger.plan(total_count, batch_size)
+            
+            # 병렬 처리를 위한 스레드 풀 (워커가 원장에서 구간을 직접 점유)
             with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                futures = []
+                futures = [
+                    executor.submit(self.worker_loop, f"batch_worker_{i}")
+                    for i in range(max_workers)
+                ]
                 
-                while offset < total_count:
-                    # 배치 작업 제출
-                    for i in range(max_workers):
-                        if offset + i * batch_size < total_count:
-                            future = executor.submit(
-                                self.process_batch,
-                                offset + i * batch_size,
-                                batch_size
-                            )
-                            futures.append(future)
-                    
-                    # 결과 수집
-                    for future in as_completed(futures):
-                        batch_stats = future.result()
-                        if batch_stats:
-                            self.stats['new_products'] += batch_stats['new']
-                            self.stats['updated_products'] += batch_stats['updated']
-                            self.stats['failed_products'] += batch_stats['failed']
-                            total_collected += batch_stats['total']
-                    
-                    futures.clear()
-                    
-                    # 진행 상황 업데이트
-                    offset += max_workers * batch_size
-                    self.stats['total_products'] = total_collected
-                    
-                    # 체크포인트 저장
-                    self.save_checkpoint(offset, total_collected)
-                    
-                    # 진행률 표시
-                    progress = (total_collected / total_count) * 100
-                    elapsed = datetime.now() - self.stats['start_time']
-                    rate = total_collected / elapsed.total_seconds() if elapsed.total_seconds() > 0 else 0
-                    eta = timedelta(seconds=(total_count - total_collected) / rate) if rate > 0 else timedelta(0)
-                    
-                    logger.info(f"""
-진행 상황: {total_collected:,} / {total_count:,} ({progress:.2f}%)
-- 신규: {self.stats['new_products']:,}
-- 업데이트: {self.stats['updated_products']:,}
-- 실패: {self.stats['failed_products']:,}
-- 속도: {rate:.2f} 상품/초
-- 남은 시간: {eta}
-                    """)
-                    
-                    # API 부하 방지
-                    time.sleep(0.1)
+                pending = futures
+                while pending:
+                    done, pending = wait(pending, timeout=60, return_when=FIRST_EXCEPTION)
+                    for future in done:
+                        future.result()
+                    self.print_progress(total_count)
             
             # 최종 통계
             elapsed = datetime.now() - self.stats['start_time']
@@ -412,9 +473,9 @@ class OwnerClanBatchCollector:
 ========================================
             """)
             
-            # 체크포인트 파일 삭제 (완료)
-            if os.path.exists(self.checkpoint_file):
-                os.remove(self.checkpoint_file)
+            failed = self.ledger.failed_ranges()
+            if failed:
+                logger.warning(f"재시도 한도를 넘긴 구간 {len(failed)}개 - --resume --retry-failed 로 재수집하세요")
                 
         except Exception as e:
             logger.error(f"전체 수집 오류: {str(e)}")
@@ -423,40 +484,109 @@ class OwnerClanBatchCollector:
             for conn in self.conn_pool:
                 conn.close()
                 
-    def process_batch(self, offset, limit):
-        """단일 배치 처리"""
+    def print_progress(self, total_count):
+        """진행 상황 출력"""
+        ledger_progress = self.ledger.get_progress()
+        total_collected = ledger_progress['items_done']
+        progress = (total_collected / total_count) * 100 if total_count > 0 else 0
+        elapsed = datetime.now() - self.stats['start_time']
+        rate = self.stats['total_products'] / elapsed.total_seconds() if elapsed.total_seconds() > 0 else 0
+        eta = timedelta(seconds=(total_count - total_collected) / rate) if rate > 0 else timedelta(0)
+        
+        logger.info(f"""
+진행 상황: {total_collected:,} / {total_count:,} ({progress:.2f}%)
+- 작업 구간: 완료 {ledger_progress['done']:,} / 처리 중 {ledger_progress['in_flight']:,} / 대기 {ledger_progress['pending']:,} / 실패 {ledger_progress['failed']:,}
+- 신규: {self.stats['new_products']:,}
+- 업데이트: {self.stats['updated_products']:,}
+- 실패: {self.stats['failed_products']:,}
+- 속도: {rate:.2f} 상품/초
+- 남은 시간: {eta}
+        """)
+        
+    def worker_loop(self, worker_id):
+        """워커 - 작업 원장에서 구간을 점유해 처리 (남은 구간이 없으면 종료)"""
+        while True:
+            work = self.ledger.claim(worker_id)
+            if work is None:
+                # 다른 워커가 처리 중이거나 재시도 대기 중인 구간이 남아 있으면 대기
+                if not self.ledger.has_remaining():
+                    return
+                time.sleep(5)
+                continue
+                
+            offset, end = work
+            batch_stats = self.process_batch(offset, end - offset, worker_id)
+            if batch_stats:
+                with self.stats_lock:
+                    self.stats['new_products'] += batch_stats['new']
+                    self.stats['updated_products'] += batch_stats['updated']
+                    self.stats['failed_products'] += batch_stats['failed']
+                    self.stats['total_products'] += batch_stats['total']
+                    
+            # API 부하 방지
+            time.sleep(0.1)
+                
+    def process_batch(self, offset, limit, worker_id):
+        """단일 배치 처리 (성공 시 원장 구간 완료, 실패 시 재시도 예약)"""
         try:
             # 배치 수집
             batch_data = self.collect_batch(offset, limit)
             if not batch_data:
+                self.ledger.fail(offset, worker_id, "배치 수집 실패")
                 return None
                 
             items = batch_data.get('items', [])
             if not items:
+                self.ledger.complete(offset, worker_id, 0)
                 return None
                 
-            # 배치 저장
-            stats = self.save_products_batch(items)
+            # 배치 저장 (구간 완료 표시 포함)
+            stats = self.save_products_batch(items, work=(offset, worker_id))
+            if stats.get('lease_lost'):
+                return None
+            if not stats['committed']:
+                self.ledger.fail(offset, worker_id, stats.get('error', '배치 저장 실패'))
             stats['total'] = len(items)
             
             return stats
             
         except Exception as e:
             logger.error(f"배치 처리 오류 (offset: {offset}): {str(e)}")
+            try:
+                self.ledger.fail(offset, worker_id, str(e))
+            except Exception as ledger_error:
+                logger.error(f"작업 원장 실패 기록 오류 (offset: {offset}): {str(ledger_error)}")
             return None
 
 def main():
     parser = argparse.ArgumentParser(description='오너클랜 대량 상품 수집')
     parser.add_argument('--batch-size', type=int, default=1000, help='배치 크기 (기본: 1000)')
     parser.add_argument('--workers', type=int, default=5, help='병렬 워커 수 (기본: 5)')
-    parser.add_argument('--resume', action='store_true', help='체크포인트에서 재개')
+    parser.add_argument('--resume', action='store_true', help='작업 원장에서 미완료 구간만 재개')
+    parser.add_argument('--retry-failed', action='store_true', help='재개 시 재시도 한도를 넘긴 구간도 다시 수집')
+    parser.add_argument('--run-id', default=None, help='작업 원장 실행 ID (기본: ownerclan_batch)')
+    parser.add_argument('--profile', choices=['offset', 'full', 'price_stock'],
+                        default='offset',
+                        help='offset: 작업 원장 병렬 수집 (기본), full/price_stock: 프로필 순차 수집')
+    parser.add_argument('--start-offset', type=int, default=0,
+                        help='프로필 순차 수집 재개 위치 (중단 시 로그의 다음 offset)')
     
     args = parser.parse_args()
     
-    collector = OwnerClanBatchCollector()
+    collector = OwnerClanBatchCollector(run_id=args.run_id)
+    if args.profile != 'offset':
+        collector.collect_by_profile(
+            profile=args.profile,
+            batch_size=args.batch_size,
+            start_offset=args.start_offset
+        )
+        return
+        
     collector.collect_all_products(
         batch_size=args.batch_size,
-        max_workers=args.workers
+        max_workers=args.workers,
+        resume=args.resume,
+        retry_failed=args.retry_failed
     )
 
 if __name__ == "__main__":
@@ -16,9 +16,12 @@ import time
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import argparse
-from queue import Queue
 import hashlib
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from work_ledger import WorkLedger
+from product_query import build_offset_query
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -31,7 +34,9 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 class OwnerClanMultiAccountCollector:
-    def __init__(self, accounts_file='accounts.json'):
+    DEFAULT_RUN_ID = 'ownerclan_multi_account'
+
+    def __init__(self, accounts_file='accounts.json', run_id=None):
         self.api_url = "https://api.ownerclan.com/v1/graphql"
         self.auth_url = "https://auth.ownerclan.com/auth"
         
@@ -44,8 +49,12 @@ class OwnerClanMultiAccountCollector:
         self.conn_pool = []
         self.max_connections = 20
         
-        # 작업 큐 (계정별로 분산)
-        self.work_queue = Queue()
+        # 작업 원장 (offset 구간별 진행 상태 - Postgres)
+        self.ledger = WorkLedger(
+            self.get_db_connection,
+            self.return_db_connection,
+            run_id=run_id or self.DEFAULT_RUN_ID
+        )
         
         # 수집 통계
         self.stats = {
@@ -66,10 +75,6 @@ class OwnerClanMultiAccountCollector:
                 'failed': 0
             }
         
-        # 체크포인트 파일
-        self.checkpoint_file = 'ownerclan_multi_checkpoint.json'
-        self.checkpoint = self.load_checkpoint()
-        
         # 스레드 안전을 위한 락
         self.stats_lock = threading.Lock()
         self.db_lock = threading.Lock()
@@ -139,31 +144,6 @@ class OwnerClanMultiAccountCollector:
         finally:
             conn.close()
             
-    def load_checkpoint(self):
-        """체크포인트 로드"""
-        if os.path.exists(self.checkpoint_file):
-            with open(self.checkpoint_file, 'r') as f:
-                return json.load(f)
-        return {
-            'last_offset': 0,
-            'total_collected': 0,
-            'account_offsets': {}  # 계정별 offset
-        }
-        
-    def save_checkpoint(self):
-        """체크포인트 저장"""
-        with self.stats_lock:
-            checkpoint = {
-                'last_offset': self.checkpoint['last_offset'],
-                'total_collected': self.stats['total_products'],
-                'account_offsets': self.checkpoint.get('account_offsets', {}),
-                'timestamp': datetime.now().isoformat(),
-                'stats': self.stats
-            }
-            
-        with open(self.checkpoint_file, 'w') as f:
-            json.dump(checkpoint, f, indent=2)
-            
     def get_db_connection(self):
         """데이터베이스 연결 가져오기"""
         with self.db_lock:
@@ -257,45 +237,9 @@ class OwnerClanMultiAccountCollector:
             'Authorization': f'Bearer {self.account_tokens[account_name]}'
         }
         
-    def get_products_query(self, limit=1000, offset=0):
+    def get_products_query(self):
         """상품 목록 조회 GraphQL 쿼리"""
-        return """
-        query GetProducts($limit: Int!, $offset: Int!) {
-            products(limit: $limit, offset: $offset) {
-                totalCount
-                items {
-                    id
-                    name
-                    code
-                    barcode
-                    brandName
-                    manufacturerName
-                    originCountry
-                    stock
-                    price
-                    costPrice
-                    weight
-                    status
-                    createdAt
-                    updatedAt
-                    category {
-                        id
-                        name
-                        fullPath
-                    }
-                    options {
-                        id
-                        name
-                        values
-                    }
-                    images {
-                        url
-                        isMain
-                    }
-                }
-            }
-        }
-        """
+        return build_offset_query()
         
     def collect_batch_for_account(self, account, offset, limit):
         """특정 계정으로 배치 수집"""
@@ -307,7 +251,7 @@ class OwnerClanMultiAccountCollector:
                 self.api_url,
                 headers=self.get_headers_for_account(account_name),
                 json={
-                    'query': self.get_products_query(limit, offset),
+                    'query': self.get_products_query(),
                     'variables': {
                         'limit': limit,
                         'offset': offset
@@ -338,13 +282,18 @@ class OwnerClanMultiAccountCollector:
             logger.error(f"{account['name']} 배치 수집 오류 (offset: {offset}): {str(e)}")
             return None
             
-    def save_products_batch(self, products, account_name):
-        """상품 배치 저장"""
+    def save_products_batch(self, products, account_name, work=None):
+        """
+        상품 배치 저장
+
+        work=(range_start, worker_id) 를 넘기면 작업 원장의 구간 완료 표시를
+        상품 저장과 같은 트랜잭션으로 커밋한다. 리스를 잃은 구간은 저장하지 않는다.
+        """
         if not products:
-            return {'new': 0, 'updated': 0, 'failed': 0}
+            return {'new': 0, 'updated': 0, 'failed': 0, 'committed': True}
             
         conn = self.get_db_connection()
-        stats = {'new': 0, 'updated': 0, 'failed': 0}
+        stats = {'new': 0, 'updated': 0, 'failed': 0, 'committed': False}
         
         try:
             with conn.cursor() as cursor:
@@ -433,42 +382,63 @@ class OwnerClanMultiAccountCollector:
                     """, update_products, page_size=500)
                     stats['updated'] = len(update_products)
                 
+                # 구간 완료 표시 (저장과 같은 트랜잭션)
+                if work and not self.ledger.mark_done(cursor, work[0], work[1], len(products)):
+                    conn.rollback()
+                    logger.warning(f"리스 만료로 구간 저장 취소 (offset: {work[0]})")
+                    stats['new'] = stats['updated'] = 0
+                    stats['lease_lost'] = True
+                    return stats
+                
                 conn.commit()
+                stats['committed'] = True
                 
         except Exception as e:
             conn.rollback()
             logger.error(f"배치 저장 오류: {str(e)}")
+            stats['new'] = stats['updated'] = 0
             stats['failed'] = len(products)
+            stats['error'] = str(e)
         finally:
             self.return_db_connection(conn)
             
         return stats
         
     def worker_thread(self, worker_id, account):
-        """워커 스레드 - 특정 계정으로 작업 처리"""
+        """워커 스레드 - 작업 원장에서 구간을 점유해 특정 계정으로 처리"""
         account_name = account['name']
         logger.info(f"워커 {worker_id} 시작 ({account_name})")
         
         while True:
             try:
-                # 작업 큐에서 가져오기
-                work_item = self.work_queue.get(timeout=5)
-                if work_item is None:  # 종료 신호
-                    break
+                work = self.ledger.claim(worker_id)
+                if work is None:
+                    # 다른 워커가 처리 중이거나 재시도 대기 중인 구간이 남아 있으면 대기
+                    if not self.ledger.has_remaining():
+                        break
+                    time.sleep(5)
+                    continue
                     
-                offset, limit = work_item
+                offset, end = work
+                limit = end - offset
                 
                 # 배치 수집
                 batch_data = self.collect_batch_for_account(account, offset, limit)
                 if not batch_data:
+                    self.ledger.fail(offset, worker_id, f"{account_name} 배치 수집 실패")
                     continue
                     
                 items = batch_data.get('items', [])
                 if not items:
+                    self.ledger.complete(offset, worker_id, 0)
                     continue
                     
-                # 배치 저장
-                stats = self.save_products_batch(items, account_name)
+                # 배치 저장 (구간 완료 표시 포함)
+                stats = self.save_products_batch(items, account_name, work=(offset, worker_id))
+                if stats.get('lease_lost'):
+                    continue
+                if not stats['committed']:
+                    self.ledger.fail(offset, worker_id, stats.get('error', '배치 저장 실패'))
                 
                 # 통계 업데이트
                 with self.stats_lock:
@@ -488,11 +458,18 @@ class OwnerClanMultiAccountCollector:
                 
             except Exception as e:
                 logger.error(f"워커 {worker_id} 오류: {str(e)}")
-            finally:
-                self.work_queue.task_done()
+                time.sleep(5)
                 
-    def collect_all_products(self, batch_size=1000, workers_per_account=3):
-        """전체 상품 수집 (멀티 계정 병렬 처리)"""
+        logger.info(f"워커 {worker_id} 종료 ({account_name})")
+                
+    def collect_all_products(self, batch_size=1000, workers_per_account=3, resume=False,
+                             retry_failed=False):
+        """
+        전체 상품 수집 (멀티 계정 병렬 처리)
+
+        offset 구간은 작업 원장에 기록되며 resume=True 이면 이전 실행에서
+        완료되지 않은 구간만 이어서 수집한다 (어느 계정이 처리했는지와 무관).
+        """
         try:
             # 모든 계정 인증
             active_accounts = self.authenticate_all_accounts()
@@ -501,6 +478,7 @@ class OwnerClanMultiAccountCollector:
             logger.info(f"- 활성 계정: {active_accounts}개")
             logger.info(f"- 배치 크기: {batch_size}")
             logger.info(f"- 계정당 워커: {workers_per_account}")
+            logger.info(f"- 실행 ID: {self.ledger.run_id} ({'재개' if resume else '신규'})")
             
             # 첫 번째 요청으로 전체 개수 확인
             first_account = self.accounts[0]
@@ -512,6 +490,14 @@ class OwnerClanMultiAccountCollector:
             total_count = initial_batch.get('totalCount', 0)
             logger.info(f"전체 상품 수: {total_count:,}개")
             
+            # 작업 원장 준비
+            self.ledger.ensure_table()
+            if not resume:
+                self.ledger.reset()
+            elif retry_failed:
+                logger.info(f"실패 구간 재시도: {self.ledger.retry_failed()}개")
+            self.ledger.plan(total_count, batch_size)
+            
             # 워커 스레드 시작
             threads = []
             for i, account in enumerate(self.accounts):
@@ -524,44 +510,20 @@ class OwnerClanMultiAccountCollector:
                     thread.start()
                     threads.append(thread)
                     
-            # 작업 분배
-            offset = self.checkpoint.get('last_offset', 0)
-            batch_count = 0
-            
-            while offset < total_count:
-                # 계정 수 * 워커 수만큼 작업 생성
-                for _ in range(len(self.accounts) * workers_per_account):
-                    if offset < total_count:
-                        self.work_queue.put((offset, batch_size))
-                        offset += batch_size
-                        batch_count += 1
-                        
-                # 주기적으로 체크포인트 저장 및 통계 출력
-                if batch_count % 100 == 0:
-                    self.checkpoint['last_offset'] = offset
-                    self.save_checkpoint()
-                    self.print_progress(total_count)
-                    
-                # 큐가 너무 커지지 않도록 대기
-                while self.work_queue.qsize() > 100:
-                    time.sleep(1)
-                    
-            # 모든 작업 완료 대기
-            self.work_queue.join()
-            
-            # 워커 종료
-            for _ in threads:
-                self.work_queue.put(None)
-                
-            for thread in threads:
-                thread.join()
+            # 주기적으로 진행 상황 출력하며 완료 대기
+            while any(thread.is_alive() for thread in threads):
+                for thread in threads:
+                    thread.join(timeout=60)
+                    if thread.is_alive():
+                        break
+                self.print_progress(total_count)
                 
             # 최종 통계
             self.print_final_stats()
             
-            # 체크포인트 파일 삭제 (완료)
-            if os.path.exists(self.checkpoint_file):
-                os.remove(self.checkpoint_file)
+            failed = self.ledger.failed_ranges()
+            if failed:
+                logger.warning(f"재시도 한도를 넘긴 구간 {len(failed)}개 - --resume --retry-failed 로 재수집하세요")
                 
         except Exception as e:
             logger.error(f"전체 수집 오류: {str(e)}")
@@ -572,6 +534,7 @@ class OwnerClanMultiAccountCollector:
                 
     def print_progress(self, total_count):
         """진행 상황 출력"""
+        ledger_progress = self.ledger.get_progress()
         with self.stats_lock:
             total_collected = self.stats['total_products']
             progress = (total_collected / total_count) * 100 if total_count > 0 else 0
@@ -582,6 +545,7 @@ class OwnerClanMultiAccountCollector:
             logger.info(f"""
 ========================================
 진행 상황: {total_collected:,} / {total_count:,} ({progress:.2f}%)
+작업 구간: 완료 {ledger_progress['done']:,} / 처리 중 {ledger_progress['in_flight']:,} / 대기 {ledger_progress['pending']:,} / 실패 {ledger_progress['failed']:,}
 ----------------------------------------
 전체 통계:
 - 신규: {self.stats['new_products']:,}
@@ -629,14 +593,18 @@ def main():
     parser.add_argument('--batch-size', type=int, default=1000, help='배치 크기 (기본: 1000)')
     parser.add_argument('--workers', type=int, default=3, help='계정당 워커 수 (기본: 3)')
     parser.add_argument('--accounts', default='accounts.json', help='계정 파일 경로')
-    parser.add_argument('--resume', action='store_true', help='체크포인트에서 재개')
+    parser.add_argument('--resume', action='store_true', help='작업 원장에서 미완료 구간만 재개')
+    parser.add_argument('--retry-failed', action='store_true', help='재개 시 재시도 한도를 넘긴 구간도 다시 수집')
+    parser.add_argument('--run-id', default=None, help='작업 원장 실행 ID (기본: ownerclan_multi_account)')
     
     args = parser.parse_args()
     
-    collector = OwnerClanMultiAccountCollector(accounts_file=args.accounts)
+    collector = OwnerClanMultiAccountCollector(accounts_file=args.accounts, run_id=args.run_id)
     collector.collect_all_products(
         batch_size=args.batch_size,
-        workers_per_account=args.workers
+        workers_per_account=args.workers,
+        resume=args.resume,
+        retry_failed=args.retry_failed
     )
 
 if __name__ == "__main__":
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+오너클랜 상품 GraphQL 쿼리 빌더
+- 조회 프로필: full(전체 필드), price_stock(가격/재고만) - 응답 필드만 줄이며 조회 범위는 같다
+- 페이지 순회는 기존 수집기와 같은 products(limit, offset) 인자만 사용하고,
+  다음 offset 을 함께 돌려줘 중단 지점부터 재개할 수 있게 한다
+"""
+
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# 상품 필드 (프로필별 선택)
+FULL_FIELDS = """
+                    id
+                    name
+                    code
+                    barcode
+                    brandName
+                    manufacturerName
+                    originCountry
+                    stock
+                    price
+                    costPrice
+                    weight
+                    status
+                    createdAt
+                    updatedAt
+                    category {
+                        id
+                        name
+                        fullPath
+                    }
+                    options {
+                        id
+                        name
+                        values
+                    }
+                    images {
+                        url
+                        isMain
+                    }"""
+
+PRICE_STOCK_FIELDS = """
+                    id
+                    stock
+                    price
+                    costPrice
+                    status
+                    updatedAt"""
+
+QUERY_PROFILES = {
+    'full': FULL_FIELDS,
+    'price_stock': PRICE_STOCK_FIELDS,
+}
+
+
+def build_offset_query(fields: str = FULL_FIELDS) -> str:
+    """limit/offset 상품 목록 쿼리 (오너클랜 수집기 공통 인자)"""
+    return """
+        query GetProducts($limit: Int!, $offset: Int!) {
+            products(limit: $limit, offset: $offset) {
+                totalCount
+                items {%s
+                }
+            }
+        }
+        """ % fields
+
+
+def build_profile_query(profile: str = 'full') -> str:
+    """조회 프로필의 필드만 요청하는 limit/offset 상품 목록 쿼리"""
+    if profile not in QUERY_PROFILES:
+        raise ValueError(f"지원하지 않는 조회 프로필: {profile} ({', '.join(QUERY_PROFILES)})")
+    return build_offset_query(QUERY_PROFILES[profile])
+
+
+def iter_product_pages(fetch_page: Callable[[str, Dict], Optional[Dict]],
+                       profile: str = 'full', limit: int = 1000,
+                       start_offset: int = 0) -> Iterator[Tuple[List[Dict], int]]:
+    """
+    프로필 쿼리로 상품 페이지 순회
+
+    Args:
+        fetch_page: (query, variables) 를 받아 products 응답(dict)을 돌려주는 함수, 실패 시 None
+        profile: 조회 프로필 (full / price_stock)
+        limit: 페이지 크기
+        start_offset: 이어서 조회할 offset
+
+    Yields:
+        (items, 다음 offset) - 다음 offset 을 start_offset 으로 넘기면 중단 지점부터 재개한다.
+    """
+    query = build_profile_query(profile)
+    offset = start_offset
+    while True:
+        page = fetch_page(query, {'limit': limit, 'offset': offset})
+        if page is None:
+            raise RuntimeError(f"상품 페이지 조회 실패 (offset: {offset})")
+
+        items = page.get('items') or []
+        if not items:
+            return
+
+        offset += len(items)
+        yield items, offset
+
+        if len(items) < limit:
+            return
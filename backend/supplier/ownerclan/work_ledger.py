@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+수집 작업 원장 (Postgres)
+- offset 구간별 상태 기록: pending → in_flight → done (재시도 한도 초과 시 failed)
+- 리스(lease): 워커가 구간을 점유하고, 만료되면 다른 워커가 다시 가져감
+- 실패 구간은 지수 백오프 후 재시도
+- 구간 완료 표시는 상품 저장과 같은 트랜잭션에서 커밋 (정확히 한 번 반영)
+- 재시작 시 완료되지 않은 구간만 이어서 수집 (계정 무관)
+"""
+
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+from psycopg2.extras import execute_values
+
+logger = logging.getLogger(__name__)
+
+
+class WorkLedger:
+    """
+    offset 구간 작업 원장
+
+    Examples:
+        ledger = WorkLedger(collector.get_db_connection, collector.return_db_connection,
+                            run_id='ownerclan_multi_account')
+        ledger.ensure_table()
+        ledger.plan(total_count, batch_size)
+
+        while True:
+            work = ledger.claim(worker_id)
+            if work is None:
+                break
+            start, end = work
+            ... 수집 ...
+            with conn.cursor() as cursor:
+                ... 상품 저장 ...
+                ledger.mark_done(cursor, start, worker_id, item_count)
+            conn.commit()
+    """
+
+    def __init__(self, get_connection: Callable, return_connection: Callable,
+                 run_id: str, lease_seconds: int = 300, max_attempts: int = 5,
+                 retry_backoff_seconds: int = 10):
+        self.get_connection = get_connection
+        self.return_connection = return_connection
+        self.run_id = run_id
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_backoff_seconds = retry_backoff_seconds
+
+    def _execute(self, query: str, params: tuple = (), fetch: bool = False):
+        conn = self.get_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(query, params)
+                result = cursor.fetchall() if fetch else cursor.rowcount
+            conn.commit()
+            return result
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.return_connection(conn)
+
+    def ensure_table(self):
+        """원장 테이블 초기화"""
+        self._execute("""
+            CREATE TABLE IF NOT EXISTS collection_work_ledger (
+                run_id VARCHAR(100) NOT NULL,
+                range_start INTEGER NOT NULL,
+                range_end INTEGER NOT NULL,
+                status VARCHAR(20) NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_owner VARCHAR(200),
+                lease_expires_at TIMESTAMP,
+                available_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                item_count INTEGER,
+                last_error TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                completed_at TIMESTAMP,
+                PRIMARY KEY (run_id, range_start)
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_work_ledger_claim
+                ON collection_work_ledger(run_id, status, available_at);
+        """)
+
+    def reset(self):
+        """실행 기록 삭제 (처음부터 다시 수집)"""
+        deleted = self._execute(
+            "DELETE FROM collection_work_ledger WHERE run_id = %s", (self.run_id,)
+        )
+        logger.info(f"작업 원장 초기화: {self.run_id} ({deleted}개 구간 삭제)")
+
+    def plan(self, total_count: int, batch_size: int) -> int:
+        """
+        구간 등록 (이미 있는 구간은 유지)
+
+        등록된 구간의 끝(MAX(range_end)) 이후만 추가하므로, 재개 시 batch_size 가
+        달라져도 기존 구간과 겹치지 않고 전체 개수가 늘어난 만큼만 새 구간이 생긴다.
+
+        Returns:
+            새로 등록된 구간 수
+        """
+        conn = self.get_connection()
+        try:
+            with conn.cursor() as cursor:
+                # 여러 프로세스가 동시에 plan 을 호출해도 같은 구간을 두 번 만들지 않도록
+                cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (self.run_id,))
+                cursor.execute("""
+                    SELECT COALESCE(MAX(range_end), 0)
+                    FROM collection_work_ledger
+                    WHERE run_id = %s
+                """, (self.run_id,))
+                covered = cursor.fetchone()[0]
+
+                ranges = [
+                    (self.run_id, start, min(start + batch_size, total_count))
+                    for start in range(covered, total_count, batch_size)
+                ]
+                if ranges:
+                    execute_values(
+                        cursor,
+                        """
+                        INSERT INTO collection_work_ledger (run_id, range_start, range_end)
+                        VALUES %s
+                        """,
+                        ranges,
+                        page_size=1000
+                    )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.return_connection(conn)
+
+        logger.info(f"작업 원장 계획: {self.run_id} 기존 구간 끝 {covered}, 신규 {len(ranges)}개 구간")
+        return len(ranges)
+
+    def claim(self, owner: str) -> Optional[Tuple[int, int]]:
+        """
+        구간 하나 점유 (pending 또는 리스 만료된 in_flight)
+
+        SKIP LOCKED 로 여러 워커/프로세스가 같은 구간을 동시에 가져가지 않는다.
+        리스 만료로 다시 가져가는 것도 시도로 세므로, 워커가 매번 죽는 구간은
+        재시도 한도에서 failed 로 넘어간다.
+
+        Returns:
+            (range_start, range_end) 또는 가져올 구간이 없으면 None
+        """
+        self._fail_exhausted_leases()
+
+        rows = self._execute("""
+            UPDATE collection_work_ledger l
+            SET status = 'in_flight',
+                lease_owner = %s,
+                lease_expires_at = NOW() + make_interval(secs => %s),
+                attempts = l.attempts + 1,
+                updated_at = NOW()
+            WHERE (l.run_id, l.range_start) IN (
+                SELECT run_id, range_start
+                FROM collection_work_ledger
+                WHERE run_id = %s
+                AND (
+                    (status = 'pending' AND available_at <= NOW())
+                    OR (status = 'in_flight' AND lease_expires_at < NOW() AND attempts < %s)
+                )
+                ORDER BY range_start
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING l.range_start, l.range_end
+        """, (owner, self.lease_seconds, self.run_id, self.max_attempts), fetch=True)
+
+        return (rows[0][0], rows[0][1]) if rows else None
+
+    def _fail_exhausted_leases(self) -> int:
+        """재시도 한도를 다 쓴 채 리스가 만료된 구간을 failed 로"""
+        failed = self._execute("""
+            UPDATE collection_work_ledger
+            SET status = 'failed',
+                lease_owner = NULL,
+                lease_expires_at = NULL,
+                last_error = COALESCE(last_error, '리스 만료 (재시도 한도 초과)'),
+                updated_at = NOW()
+            WHERE run_id = %s AND status = 'in_flight'
+            AND lease_expires_at < NOW() AND attempts >= %s
+        """, (self.run_id, self.max_attempts))
+        if failed:
+            logger.warning(f"작업 원장: 리스 만료 후 재시도 한도 초과 {failed}개 구간 failed 처리")
+        return failed
+
+    def mark_done(self, cursor, range_start: int, owner: str, item_count: int) -> bool:
+        """
+        구간 완료 표시 (호출자 트랜잭션 안에서 실행)
+
+        상품 저장과 같은 커서로 호출한 뒤 함께 커밋해야 저장과 완료 표시가
+        원자적으로 반영된다. 리스를 잃은 경우(만료 후 다른 워커가 점유) False.
+        """
+        cursor.execute("""
+            UPDATE collection_work_ledger
+            SET status = 'done',
+                item_count = %s,
+                lease_owner = NULL,
+                lease_expires_at = NULL,
+                last_error = NULL,
+                completed_at = NOW(),
+                updated_at = NOW()
+            WHERE run_id = %s AND range_start = %s
+            AND status = 'in_flight' AND lease_owner = %s
+        """, (item_count, self.run_id, range_start, owner))
+        return cursor.rowcount == 1
+
+    def complete(self, range_start: int, owner: str, item_count: int = 0) -> bool:
+        """구간 완료 표시 (저장할 상품이 없는 구간용 - 단독 트랜잭션)"""
+        conn = self.get_connection()
+        try:
+            with conn.cursor() as cursor:
+                done = self.mark_done(cursor, range_start, owner, item_count)
+            conn.commit()
+            return done
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.return_connection(conn)
+
+    def fail(self, range_start: int, owner: str, error: str):
+        """
+        구간 실패 기록
+
+        재시도 한도 전이면 지수 백오프 후 다시 pending, 한도에 도달하면 failed.
+        """
+        self._execute("""
+            UPDATE collection_work_ledger
+            SET status = CASE WHEN attempts >= %s THEN 'failed' ELSE 'pending' END,
+                available_at = NOW() + make_interval(secs => %s * power(2, GREATEST(attempts - 1, 0))),
+                lease_owner = NULL,
+                lease_expires_at = NULL,
+                last_error = %s,
+                updated_at = NOW()
+            WHERE run_id = %s AND range_start = %s
+            AND status = 'in_flight' AND lease_owner = %s
+        """, (self.max_attempts, self.retry_backoff_seconds, error[:1000],
+              self.run_id, range_start, owner))
+
+    def retry_failed(self) -> int:
+        """재시도 한도를 넘긴 구간을 다시 pending 으로 (시도 횟수 초기화)"""
+        return self._execute("""
+            UPDATE collection_work_ledger
+            SET status = 'pending', attempts = 0, available_at = NOW(), updated_at = NOW()
+            WHERE run_id = %s AND status = 'failed'
+        """, (self.run_id,))
+
+    def get_progress(self) -> Dict[str, int]:
+        """상태별 구간 수 및 완료 상품 수"""
+        rows = self._execute("""
+            SELECT status, COUNT(*), COALESCE(SUM(item_count), 0)
+            FROM collection_work_ledger
+            WHERE run_id = %s
+            GROUP BY status
+        """, (self.run_id,), fetch=True)
+
+        progress = {'pending': 0, 'in_flight': 0, 'done': 0, 'failed': 0, 'items_done': 0}
+        for status, count, items in rows:
+            progress[status] = count
+            if status == 'done':
+                progress['items_done'] = int(items)
+        return progress
+
+    def has_remaining(self) -> bool:
+        """아직 끝나지 않은 구간(pending / in_flight) 존재 여부"""
+        progress = self.get_progress()
+        return progress['pending'] + progress['in_flight'] > 0
+
+    def failed_ranges(self) -> List[Dict]:
+        """최종 실패 구간 목록"""
+        rows = self._execute("""
+            SELECT range_start, range_end, attempts, last_error
+            FROM collection_work_ledger
+            WHERE run_id = %s AND status = 'failed'
+            ORDER BY range_start
+        """, (self.run_id,), fetch=True)
+        return [
+            {'range_start': r[0], 'range_end': r[1], 'attempts': r[2], 'last_error': r[3]}
+            for r in rows
+        ]
@@ -184,6 +184,90 @@ class MockResponse:
             raise Exception(f"HTTP {self.status_code}")
 
 
+class FakeCursor:
+    """
+    실행된 쿼리를 기록하고 지정한 결과를 돌려주는 가짜 커서
+
+    results 의 항목 하나가 execute 한 번의 결과 행 목록이며,
+    fetch* 는 직전 execute 의 결과를 읽는다.
+    """
+    def __init__(self, results=(), columns=None, rowcount=1):
+        self.results = [list(rows) for rows in results]
+        self.description = [(name,) for name in columns] if columns else None
+        self.rowcount = rowcount
+        self.executed = []
+        self.fetch_sizes = []
+        self.closed = False
+        self._rows = []
+
+    @property
+    def statements(self):
+        return [query for query, _ in self.executed]
+
+    def execute(self, query, params=None):
+        self.executed.append((query, params))
+        self._rows = self.results.pop(0) if self.results else []
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchmany(self, size):
+        self.fetch_sizes.append(size)
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeConnection:
+    """커서 하나를 공유하고 커밋/롤백 횟수를 기록하는 가짜 연결"""
+    def __init__(self, cursor):
+        self.fake_cursor = cursor
+        self.cursor_names = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.autocommit = False
+        self.closed = False
+
+    def cursor(self, name=None, **kwargs):
+        self.cursor_names.append(name)
+        return self.fake_cursor
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_db():
+    """
+    가짜 DB 연결 팩토리
+
+    fake_db(results, columns=None, rowcount=1) → FakeConnection
+    (커서는 connection.fake_cursor)
+    """
+    def make(results=(), columns=None, rowcount=1):
+        return FakeConnection(FakeCursor(results, columns, rowcount))
+
+    return make
+
+
 @pytest.fixture(scope='function')
 def temp_config_file(tmp_path):
     """임시 설정 파일"""
@@ -0,0 +1,70 @@
+"""
+오너클랜 수집 작업 원장 통합 테스트 (Postgres)
+"""
+import pytest
+
+from supplier.ownerclan.work_ledger import WorkLedger
+
+
+@pytest.fixture
+def make_ledger(db_connection):
+    """테스트 DB 연결을 쓰는 원장 (run_id 별로 초기화)"""
+    def make(**kwargs):
+        ledger = WorkLedger(lambda: db_connection, lambda conn: None,
+                            run_id='integration_test', **kwargs)
+        ledger.ensure_table()
+        return ledger
+
+    make().reset()
+    return make
+
+
+@pytest.mark.integration
+class TestWorkLedgerIntegration:
+    """WorkLedger 리스/재개/정확히 한 번 반영 테스트"""
+
+    def test_expired_lease_is_reclaimed_and_stale_owner_loses(self, make_ledger, db_connection):
+        """리스 만료 구간은 다른 워커가 가져가고, 이전 워커의 완료 표시는 무시"""
+        ledger = make_ledger(lease_seconds=0)
+        ledger.plan(20, 10)
+
+        assert ledger.claim('worker_a') == (0, 10)
+        assert ledger.claim('worker_b') == (0, 10)
+
+        with db_connection.cursor() as cursor:
+            assert ledger.mark_done(cursor, 0, 'worker_a', 10) is False
+            assert ledger.mark_done(cursor, 0, 'worker_b', 10) is True
+        db_connection.commit()
+
+        progress = ledger.get_progress()
+        assert progress['done'] == 1
+        assert progress['items_done'] == 10
+
+    def test_reclaim_stops_at_max_attempts(self, make_ledger):
+        """워커가 계속 죽는 구간은 재시도 한도에서 failed"""
+        ledger = make_ledger(lease_seconds=0, max_attempts=2)
+        ledger.plan(10, 10)
+
+        assert ledger.claim('worker_a') == (0, 10)
+        assert ledger.claim('worker_b') == (0, 10)
+        assert ledger.claim('worker_c') is None
+
+        assert ledger.has_remaining() is False
+        failed = ledger.failed_ranges()
+        assert [(r['range_start'], r['attempts']) for r in failed] == [(0, 2)]
+        assert '리스 만료' in failed[0]['last_error']
+
+    def test_resume_keeps_done_ranges_with_new_batch_size(self, make_ledger):
+        """재개 시 완료 구간은 그대로 두고 늘어난 부분만 새 batch_size 로 등록"""
+        ledger = make_ledger()
+        assert ledger.plan(30, 10) == 3
+        assert ledger.claim('worker_a') == (0, 10)
+        assert ledger.complete(0, 'worker_a', 10) is True
+
+        resumed = make_ledger()
+        assert resumed.plan(45, 20) == 1
+
+        progress = resumed.get_progress()
+        assert progress['done'] == 1
+        assert progress['pending'] == 3
+        assert resumed.claim('worker_b') == (10, 20)
@@ -0,0 +1,122 @@
+"""
+core.broadcast_hub 테스트
+"""
+import asyncio
+import json
+
+import pytest
+
+from core.broadcast_hub import BroadcastHub
+
+
+class FakeSocket:
+    """전송 내용을 기록하는 가짜 연결 (gate 가 열릴 때까지 전송 지연 가능)"""
+
+    def __init__(self, blocked: bool = False):
+        self.received = []
+        self.gate = asyncio.Event()
+        if not blocked:
+            self.gate.set()
+
+    async def send(self, payload: str):
+        await self.gate.wait()
+        self.received.append(json.loads(payload))
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestBroadcastHub:
+    """토픽 팬아웃/느린 소비자 처리"""
+
+    async def test_publish_reaches_only_topic_subscribers(self):
+        """토픽 구독자에게만 전달되고 topic=None 은 전체 전달"""
+        hub = BroadcastHub()
+        a, b = FakeSocket(), FakeSocket()
+        hub.register(a, a.send, topics={'system'})
+        hub.register(b, b.send, topics={'api'})
+
+        assert hub.publish('system', {'v': 1}) == 1
+        assert hub.publish(None, {'v': 'all'}) == 2
+        await settle()
+
+        assert a.received == [{'v': 1}, {'v': 'all'}]
+        assert b.received == [{'v': 'all'}]
+        await hub.close()
+
+    async def test_slow_consumer_does_not_block_others(self):
+        """느린 연결은 최신 스냅샷만 받고 다른 연결은 모두 받는다"""
+        hub = BroadcastHub(coalesce_topics={'system'})
+        slow, fast = FakeSocket(blocked=True), FakeSocket()
+        hub.register(slow, slow.send, topics={'system'})
+        hub.register(fast, fast.send, topics={'system'})
+
+        for i in range(5):
+            hub.publish('system', {'v': i})
+            await settle()
+
+        assert [m['v'] for m in fast.received] == [0, 1, 2, 3, 4]
+        slow.gate.set()
+        await settle()
+        # 첫 메시지는 전송 중이었고, 이후 대기 중이던 스냅샷은 최신 값 하나로 합쳐짐
+        assert [m['v'] for m in slow.received] == [0, 4]
+        await hub.close()
+
+    async def test_overflow_drops_oldest(self):
+        """큐가 가득 차면 가장 오래된 메시지를 버린다"""
+        hub = BroadcastHub(max_queue=2)
+        slow = FakeSocket(blocked=True)
+        subscriber = hub.register(slow, slow.send, topics={'events'})
+        hub.publish('events', {'v': 0})
+        await settle()  # v=0 전송 중
+
+        for i in range(1, 5):
+            hub.publish('events', {'v': i})
+        assert subscriber.dropped == 2
+
+        slow.gate.set()
+        await settle()
+        assert [m['v'] for m in slow.received] == [0, 3, 4]
+        await hub.close()
+
+    async def test_stuck_connection_is_removed(self):
+        """send_timeout 안에 전송되지 않는 연결은 정리된다"""
+        closed = []
+        hub = BroadcastHub(send_timeout=0.01, on_disconnect=closed.append)
+        stuck = FakeSocket(blocked=True)
+        hub.register(stuck, stuck.send, topics={'system'})
+        hub.publish('system', {'v': 1})
+        await asyncio.sleep(0.05)
+
+        assert stuck not in hub
+        assert closed == [stuck]
+        assert hub.subscriber_count('system') == 0
+        await hub.close()
+
+
+class TestWebsocketHandler:
+    """monitoring.websocket_handler 연결 관리자 테스트"""
+
+    async def test_module_imports_and_manager_uses_hub(self):
+        """모듈 임포트 및 연결 등록/해제가 허브를 거치는지 테스트"""
+        pytest.importorskip('fastapi')
+        from monitoring.websocket_handler import ConnectionManager
+
+        class FakeWebSocket:
+            async def accept(self):
+                pass
+
+            async def send_text(self, payload: str):
+                pass
+
+        manager = ConnectionManager()
+        websocket = FakeWebSocket()
+
+        await manager.connect(websocket)
+        assert manager.active_connections == {websocket}
+
+        manager.disconnect(websocket)
+        assert manager.active_connections == set()
+        await manager.hub.close()
@@ -0,0 +1,54 @@
+"""
+db.bulk_write 일괄 쓰기 오류 격리 테스트
+"""
+import psycopg2
+import pytest
+
+from db import bulk_write
+from db.bulk_write import bulk_execute
+
+
+@pytest.fixture
+def fake_execute_values(monkeypatch):
+    """'bad' 가 들어 있는 행이 섞이면 문장 전체가 실패하는 execute_values"""
+    calls = []
+
+    def execute_values(cursor, query, rows, template=None, page_size=100, fetch=False):
+        calls.append(len(rows))
+        if any('bad' in row for row in rows):
+            raise psycopg2.DataError('invalid input')
+        return [(row[0],) for row in rows]
+
+    monkeypatch.setattr(bulk_write, 'execute_values', execute_values)
+    return calls
+
+
+class TestBulkExecute:
+    """bulk_execute 테스트 클래스"""
+
+    def test_single_statement_when_all_rows_are_valid(self, fake_execute_values, fake_db):
+        cursor = fake_db().fake_cursor
+        returned, failures = bulk_execute(cursor, 'INSERT', [(1, 'a'), (2, 'b')], [1, 2])
+
+        assert returned == [(1,), (2,)]
+        assert failures == []
+        assert fake_execute_values == [2]
+        assert cursor.statements == ['SAVEPOINT bulk_execute', 'RELEASE SAVEPOINT bulk_execute']
+
+    def test_bisects_to_isolate_bad_rows(self, fake_execute_values, fake_db):
+        """잘못된 행만 실패 처리하고 나머지는 입력 순서대로 저장"""
+        rows = [(i, 'bad' if i in (3, 6) else 'ok') for i in range(8)]
+        cursor = fake_db().fake_cursor
+
+        returned, failures = bulk_execute(cursor, 'INSERT', rows, [f'p{i}' for i in range(8)])
+
+        assert returned == [(i,) for i in range(8) if i not in (3, 6)]
+        assert [key for key, _ in failures] == ['p3', 'p6']
+        assert 'invalid input' in failures[0][1]
+        # 행 단위 재실행(8회)보다 적은 문장으로 격리
+        assert len(fake_execute_values) < 1 + 8 + 4
+        assert cursor.statements.count('SAVEPOINT bulk_execute') == len(fake_execute_values)
+
+    def test_empty_rows(self, fake_execute_values, fake_db):
+        assert bulk_execute(fake_db().fake_cursor, 'INSERT', [], []) == ([], [])
+        assert fake_execute_values == []
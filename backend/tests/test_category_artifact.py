@@ -0,0 +1,67 @@
+"""
+쿠팡 카테고리 컴파일 아티팩트 테스트
+"""
+import json
+import os
+import sys
+from pathlib import Path
+
+# market.coupang 패키지 __init__ 임포트를 거치지 않도록 모듈 디렉터리를 직접 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / 'market' / 'coupang' / 'category'))
+
+from category_artifact import (
+    artifact_path_for, is_artifact_fresh, load_category_artifact, save_category_artifact, source_stamp
+)
+from category_search_index import CategorySearchIndex, build_category_indexes
+
+CATEGORIES = {
+    '100': {'id': '100', 'path': '패션>의류>티셔츠', 'parent_path': '패션>의류', 'level': 3},
+    '200': {'id': '200', 'path': '가전>TV', 'parent_path': '가전', 'level': 2},
+}
+
+
+def _write_source(tmp_path):
+    source = tmp_path / 'categories.json'
+    source.write_text(json.dumps({'categories': CATEGORIES}, ensure_ascii=False), encoding='utf-8')
+    return str(source)
+
+
+class TestCategoryArtifact:
+    """카테고리 아티팩트 테스트 클래스"""
+
+    def test_round_trip_with_prebuilt_index(self, tmp_path):
+        """레코드 / 검색 인덱스 저장 후 재구축 없이 복원 테스트"""
+        source = _write_source(tmp_path)
+        categories_index, name_index, _ = build_category_indexes(CATEGORIES)
+        save_category_artifact(
+            artifact_path_for(source), CATEGORIES,
+            indexes={'categories_index': categories_index, 'name_index': name_index.to_state()},
+            source=source_stamp(source),
+        )
+
+        store, indexes = load_category_artifact(artifact_path_for(source), verify=True)
+        try:
+            assert len(store) == 2
+            assert store['100'] == CATEGORIES['100']
+            assert '999' not in store
+            assert indexes['categories_index']['by_level'][2] == ['200']
+            restored = CategorySearchIndex.from_state(indexes['name_index'])
+            assert restored.lookup('티셔츠') == ['100']
+            assert restored.autocomplete('티ㅅ') == ['티셔츠']
+        finally:
+            store.close()
+
+    def test_stale_artifact_detected(self, tmp_path):
+        """원본 변경 시 아티팩트 무효화 테스트"""
+        source = _write_source(tmp_path)
+        metadata = save_category_artifact(artifact_path_for(source), CATEGORIES, source=source_stamp(source))
+        assert is_artifact_fresh(metadata, source)
+
+        # 수정 시각만 바뀐 경우는 해시로 재확인해 유효
+        stat = os.stat(source)
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        assert is_artifact_fresh(metadata, source)
+
+        with open(source, 'a', encoding='utf-8') as f:
+            f.write(' ')
+        assert not is_artifact_fresh(metadata, source)
@@ -0,0 +1,179 @@
+"""
+쿠팡 카테고리 메타정보 캐시 테스트
+"""
+import importlib
+import json
+import sys
+import time
+import types
+import urllib.error
+from email.message import Message
+from pathlib import Path
+
+import pytest
+
+CATEGORY_DIR = Path(__file__).parent.parent / 'market' / 'coupang' / 'category'
+
+# market.coupang 패키지 __init__ 임포트를 거치지 않도록 모듈 디렉터리를 직접 추가
+sys.path.insert(0, str(CATEGORY_DIR))
+
+from metadata_cache import CategoryMetadataCache
+
+METADATA = {'code': 'SUCCESS', 'data': {'attributes': [{'attributeTypeName': '수량'}]}}
+
+
+def _load_category_module(name):
+    """category 패키지 __init__ 없이 모듈 로드 (클라이언트의 상대 임포트 유지)"""
+    if 'coupang_category' not in sys.modules:
+        package = types.ModuleType('coupang_category')
+        package.__path__ = [str(CATEGORY_DIR)]
+        sys.modules['coupang_category'] = package
+    return importlib.import_module(f'coupang_category.{name}')
+
+
+class FakeResponse:
+    """urlopen 응답 대역 (본문 + 헤더)"""
+
+    def __init__(self, payload, etag=None):
+        self.body = json.dumps(payload).encode('utf-8')
+        self.headers = Message()
+        if etag:
+            self.headers['ETag'] = etag
+
+    def read(self):
+        return self.body
+
+
+@pytest.fixture
+def make_client(tmp_path):
+    """_open 을 대체한 카테고리 클라이언트 (요청 경로/캐시 항목 기록)"""
+    category_client = _load_category_module('category_client')
+
+    def make(respond, ttl_seconds=3600, max_workers=4):
+        cache = CategoryMetadataCache(str(tmp_path), ttl_seconds=ttl_seconds)
+        client = category_client.CoupangCategoryClient(
+            'access', 'secret', 'A00000000', cache=cache, max_workers=max_workers
+        )
+        client.requests = []
+
+        def fake_open(api_path, cached=None):
+            client.requests.append((int(api_path.rsplit('/', 1)[1]), cached))
+            return respond(api_path, cached)
+
+        client._open = fake_open
+        return client
+
+    return make
+
+
+class TestCategoryMetadataCache:
+    """CategoryMetadataCache 테스트 클래스"""
+
+    def test_disk_cache_shared_across_instances(self, tmp_path):
+        """디스크 캐시 재사용 테스트 (프로세스 재시작 가정)"""
+        CategoryMetadataCache(str(tmp_path)).put('metadata', 78780, METADATA, etag='"v1"')
+
+        entry = CategoryMetadataCache(str(tmp_path)).get('metadata', 78780)
+
+        assert entry['fresh']
+        assert entry['payload'] == METADATA
+        assert entry['etag'] == '"v1"'
+
+    def test_expired_entry_revalidated_by_touch(self, tmp_path):
+        """TTL 만료 후 304 재검증 시 유효 시간 연장 테스트"""
+        cache = CategoryMetadataCache(str(tmp_path), ttl_seconds=0.05)
+        cache.put('metadata', 1, METADATA, etag='"v1"')
+        time.sleep(0.06)
+
+        stale = cache.get('metadata', 1)
+        assert not stale['fresh']
+        assert stale['etag'] == '"v1"'
+
+        assert cache.touch('metadata', 1) == METADATA
+        assert cache.get('metadata', 1)['fresh']
+
+    def test_invalidate_exact_code_only(self, tmp_path):
+        """특정 코드 무효화 시 접두어가 같은 다른 코드 유지 테스트"""
+        cache = CategoryMetadataCache(str(tmp_path))
+        cache.put('metadata', 12, METADATA)
+        cache.put('metadata', 123, METADATA)
+
+        cache.invalidate('metadata', 12)
+
+        assert cache.get('metadata', 12) is None
+        assert cache.get('metadata', 123) is not None
+        assert CategoryMetadataCache(str(tmp_path)).get('metadata', 12) is None
+
+    def test_cached_payload_is_copied(self, tmp_path):
+        """저장/조회/재검증 결과를 수정해도 캐시 항목은 그대로"""
+        cache = CategoryMetadataCache(str(tmp_path))
+        payload = {'code': 'SUCCESS', 'data': {'attributes': []}}
+        cache.put('metadata', 1, payload)
+        payload['data']['attributes'].append('caller')
+
+        cache.get('metadata', 1)['payload']['data']['attributes'].append('reader')
+        cache.touch('metadata', 1)['data']['attributes'].append('revalidator')
+
+        assert cache.get('metadata', 1)['payload'] == {'code': 'SUCCESS', 'data': {'attributes': []}}
+
+
+class TestCategoryClientCache:
+    """CoupangCategoryClient 캐시 재검증/장애 대응 테스트"""
+
+    def test_not_modified_keeps_cached_body(self, make_client):
+        """만료 항목은 ETag 조건부 요청을 보내고 304 면 touch 로 기존 응답 유지"""
+        def not_modified(api_path, cached):
+            raise urllib.error.HTTPError(api_path, 304, 'Not Modified', Message(), None)
+
+        client = make_client(not_modified, ttl_seconds=0.05)
+        client.cache.put('metadata', 78780, METADATA, etag='"v1"',
+                         last_modified='Wed, 01 May 2024 00:00:00 GMT')
+        time.sleep(0.06)
+
+        assert client.get_category_metadata(78780) == METADATA
+
+        (code, cached), = client.requests
+        assert code == 78780
+        assert cached['etag'] == '"v1"'
+        assert cached['last_modified'] == 'Wed, 01 May 2024 00:00:00 GMT'
+        assert client.cache.stats['revalidated'] == 1
+        assert client.cache.get('metadata', 78780)['fresh']
+
+    def test_network_error_serves_stale_copy(self, make_client):
+        """네트워크 장애 시 만료된 캐시 사본 반환, 캐시가 없으면 오류"""
+        def unreachable(api_path, cached):
+            raise urllib.error.URLError('connection refused')
+
+        client = make_client(unreachable, ttl_seconds=0.05)
+        client.cache.put('metadata', 78780, METADATA, etag='"v1"')
+        time.sleep(0.06)
+
+        stale = client.get_category_metadata(78780)
+        assert stale == METADATA
+        stale['data']['attributes'].clear()
+        assert client.cache.get('metadata', 78780)['payload'] == METADATA
+
+        with pytest.raises(Exception, match='URL 오류'):
+            client.get_category_metadata(1)
+
+    def test_validate_products_batch_prefetches_each_category_once(self, make_client):
+        """일괄 검증은 카테고리당 메타정보를 한 번만 조회하고 결과는 입력 순서"""
+        def respond(api_path, cached):
+            return FakeResponse(METADATA, etag='"v1"')
+
+        client = make_client(respond)
+        option_validator = _load_category_module('option_validator')
+        validator = option_validator.CoupangOptionValidator(category_client=client)
+
+        products = [
+            {'displayCategoryCode': 78780, 'options': [{'attributeTypeName': '수량'}]},
+            {'displayCategoryCode': 1, 'options': []},
+            {'displayCategoryCode': 78780, 'options': []},
+            {'displayCategoryCode': 'bad', 'options': []},
+        ]
+        result = validator.validate_products_batch(products)
+
+        assert sorted(code for code, _ in client.requests) == [1, 78780]
+        assert [r['displayCategoryCode'] for r in result['results']] == [78780, 1, 78780, 'bad']
+        assert result['results'][3]['isValid'] is False
+        assert client.cache.get('metadata', 1)['etag'] == '"v1"'
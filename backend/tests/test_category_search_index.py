@@ -0,0 +1,48 @@
+"""
+쿠팡 카테고리 검색 인덱스 테스트
+"""
+import sys
+from pathlib import Path
+
+# market.coupang 패키지 __init__ 임포트를 거치지 않도록 모듈 디렉터리를 직접 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / 'market' / 'coupang' / 'category'))
+
+from category_search_index import CategorySearchIndex, decompose_jamo
+
+
+def _make_index():
+    index = CategorySearchIndex()
+    for term, category_id in [
+        ('티셔츠', '1'), ('반팔 티셔츠', '2'), ('티셔츠', '3'),
+        ('셔츠', '4'), ('TV', '5'), ('스마트 TV', '6'), ('라면', '7'),
+    ]:
+        index.add(term, category_id)
+    index.build()
+    return index
+
+
+class TestCategorySearchIndex:
+    """CategorySearchIndex 테스트 클래스"""
+
+    def test_search_ranks_exact_then_prefix_then_substring(self):
+        """정확 > 접두어 > 부분 일치 순위 테스트"""
+        results = _make_index().search('셔츠')
+
+        assert [term for term, _, _ in results] == ['셔츠', '티셔츠', '반팔 티셔츠']
+        assert results[1][2] == ['1', '3']
+
+    def test_search_is_case_and_space_insensitive(self):
+        """대소문자 / 공백 무시 테스트"""
+        index = _make_index()
+
+        assert [term for term, _, _ in index.search('tv')] == ['TV', '스마트 TV']
+        assert [term for term, _, _ in index.search('반팔티')] == ['반팔 티셔츠']
+        assert index.search('냉장고') == []
+
+    def test_autocomplete_matches_partial_syllable(self):
+        """입력 중인 자모 자동완성 테스트"""
+        index = _make_index()
+
+        assert decompose_jamo('티셔츠') == 'ㅌㅣㅅㅕㅊㅡ'
+        assert index.autocomplete('티ㅅ') == ['티셔츠']
+        assert index.autocomplete('라') == ['라면']
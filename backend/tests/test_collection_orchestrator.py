@@ -0,0 +1,90 @@
+"""
+멀티 마켓 수집 오케스트레이터 테스트
+"""
+import asyncio
+import time
+
+from supplier.collection_orchestrator import CollectionOrchestrator, BatchWriter, ChannelQuota
+
+
+class TestCollectionOrchestrator:
+    """CollectionOrchestrator 테스트 클래스"""
+
+    async def test_markets_run_concurrently(self):
+        """마켓 동시 실행 테스트 (가장 느린 채널 시간에 수렴)"""
+        async def collect(ctx):
+            for _ in range(3):
+                async with ctx.request():
+                    await asyncio.sleep(0.05)
+
+        orchestrator = CollectionOrchestrator(default_quota=ChannelQuota(requests_per_second=100))
+        for market in ('coupang', 'naver', '11st', 'ownerclan'):
+            orchestrator.add_job(market, 'main', collect)
+
+        started = time.monotonic()
+        results = await orchestrator.run()
+        elapsed = time.monotonic() - started
+
+        assert elapsed < 0.4
+        assert all(r['status'] == 'success' and r['requests'] == 3 for r in results.values())
+
+    async def test_market_concurrency_quota(self):
+        """마켓별 동시 요청 수 제한 테스트"""
+        active = {'now': 0, 'max': 0}
+
+        async def collect(ctx):
+            for _ in range(4):
+                async with ctx.request():
+                    active['now'] += 1
+                    active['max'] = max(active['max'], active['now'])
+                    await asyncio.sleep(0.01)
+                    active['now'] -= 1
+
+        orchestrator = CollectionOrchestrator(
+            quotas={'coupang': ChannelQuota(max_concurrency=2, requests_per_second=1000,
+                                            account_concurrency=2)}
+        )
+        for account in ('a', 'b', 'c'):
+            orchestrator.add_job('coupang', account, collect)
+        await orchestrator.run()
+
+        assert active['max'] == 2
+
+    async def test_writer_batches_records(self):
+        """공유 쓰기 단계 일괄 저장 테스트"""
+        flushed = []
+
+        def flush(sink, records):
+            flushed.append((sink, len(records)))
+            return {'new': len(records), 'updated': 0, 'failed': 0, 'errors': []}
+
+        async def collect(ctx):
+            for page in range(5):
+                await ctx.emit([{'id': page * 10 + i} for i in range(10)])
+
+        writer = BatchWriter(flush, batch_size=20, flush_interval=10)
+        orchestrator = CollectionOrchestrator(writer=writer)
+        orchestrator.add_job('ownerclan', 'main', collect, sink='오너클랜')
+        results = await orchestrator.run()
+
+        assert flushed == [('오너클랜', 20), ('오너클랜', 20), ('오너클랜', 10)]
+        assert results['ownerclan/main']['fetched'] == 50
+        assert results['ownerclan/main']['written'] == 50
+
+    async def test_blocking_job_results(self):
+        """블로킹(기존 동기 수집기) 작업 테스트"""
+        def legacy():
+            return {'success': True, 'total_products': 7, 'new_products': 5,
+                    'updated_products': 2, 'failed_products': 0}
+
+        def broken():
+            raise RuntimeError('api down')
+
+        orchestrator = CollectionOrchestrator()
+        orchestrator.add_job('zentrade', '1', legacy, blocking=True)
+        orchestrator.add_job('naver', '2', broken, blocking=True)
+        results = await orchestrator.run()
+
+        assert results['zentrade/1']['written'] == 7
+        assert results['naver/2']['status'] == 'failed'
+        assert 'api down' in results['naver/2']['errors'][0]
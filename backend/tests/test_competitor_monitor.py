@@ -0,0 +1,47 @@
+"""
+bi.competitor_monitor 가격 포지션/대량 적재 테스트
+"""
+import csv
+
+from bi.competitor_monitor import PRICE_COLUMNS, build_copy_buffer, classify_price_position
+
+
+class TestClassifyPricePosition:
+    """시장 평균 대비 가격 포지션"""
+
+    def test_positions(self):
+        assert classify_price_position(90, 100, 90, 120)[0] == 'lowest'
+        assert classify_price_position(94, 100, 90, 120)[0] == 'below_average'
+        assert classify_price_position(104, 100, 90, 120)[0] == 'average'
+        assert classify_price_position(110, 100, 90, 120)[0] == 'above_average'
+        assert classify_price_position(130, 100, 90, 120)[0] == 'highest'
+
+    def test_price_gap_percent(self):
+        _, gap, _ = classify_price_position(110, 100, 90, 120)
+        assert gap == 10.0
+
+
+class TestCopyBuffer:
+    """COPY 적재용 CSV 버퍼"""
+
+    def test_last_price_per_competitor_wins(self):
+        prices = [
+            {'product_id': 1, 'competitor_name': 'coupang', 'competitor_price': 1000,
+             'competitor_url': 'https://a', 'shipping_fee': 0, 'availability': 'in_stock'},
+            {'product_id': 1, 'competitor_name': 'coupang', 'competitor_price': 900,
+             'competitor_url': 'https://a', 'shipping_fee': None, 'availability': 'in_stock'},
+            {'product_id': 2, 'competitor_name': 'naver', 'competitor_price': 500,
+             'competitor_url': 'https://b, c', 'shipping_fee': 2500, 'availability': 'out_of_stock'},
+        ]
+
+        buffer, count = build_copy_buffer(prices)
+        rows = list(csv.reader(buffer))
+
+        assert count == 2
+        assert len(rows[0]) == len(PRICE_COLUMNS)
+        assert rows[0] == ['1', 'coupang', '900', 'https://a', '', 'in_stock']
+        assert rows[1][3] == 'https://b, c'
+
+    def test_empty_batch(self):
+        _, count = build_copy_buffer([])
+        assert count == 0
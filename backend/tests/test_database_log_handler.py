@@ -0,0 +1,97 @@
+"""
+비동기 배치 DatabaseLogHandler 테스트
+"""
+import logging
+import threading
+
+import psycopg2
+import pytest
+
+from core.logger import DatabaseLogHandler
+
+
+class RecordingHandler(DatabaseLogHandler):
+    """INSERT 대신 배치를 메모리에 기록하는 핸들러"""
+
+    def __init__(self, *args, **kwargs):
+        self.batches = []
+        self.gate = threading.Event()
+        self.gate.set()
+        super().__init__({}, *args, **kwargs)
+
+    def _write_rows(self, rows):
+        self.gate.wait()
+        self.batches.append(list(rows))
+
+
+@pytest.fixture
+def connections(fake_db, monkeypatch):
+    """psycopg2.connect 가 만든 가짜 연결 목록"""
+    opened = []
+
+    def connect(**kwargs):
+        opened.append(fake_db())
+        return opened[-1]
+
+    monkeypatch.setattr(psycopg2, 'connect', connect)
+    return opened
+
+
+def _logger(handler, name):
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.handlers = [handler]
+    return logger
+
+
+class TestDatabaseLogHandler:
+    """DatabaseLogHandler 테스트 클래스"""
+
+    def test_records_written_in_batches(self, connections):
+        """여러 레코드를 배치 INSERT 로 기록 테스트"""
+        handler = RecordingHandler(batch_size=50, flush_interval=10)
+        logger = _logger(handler, 'test.db_handler.batch')
+
+        for i in range(120):
+            logger.warning('경고 %d', i, extra={'market_code': 'coupang'})
+        handler.flush()
+
+        rows = [row for batch in handler.batches for row in batch]
+        assert len(rows) == 120
+        assert max(len(batch) for batch in handler.batches) <= 50
+        assert rows[0][3] == '경고 0'
+        assert rows[0][8] == 'coupang'
+        handler.close()
+
+    def test_overload_drops_and_reports(self, connections):
+        """큐 가득 참 시 버림 및 요약 행 기록 테스트"""
+        handler = RecordingHandler(batch_size=10, flush_interval=10, max_queue_size=5,
+                                   sample_threshold=1.0, block_timeout=0)
+        handler.gate.clear()  # 기록 스레드 정지 → 큐가 참
+        logger = _logger(handler, 'test.db_handler.overload')
+
+        for i in range(50):
+            logger.info('정보 %d', i)
+        assert handler.stats['dropped'] > 0
+
+        handler.gate.set()
+        handler.close()
+
+        messages = [row[3] for batch in handler.batches for row in batch]
+        assert any('버림' in message for message in messages)
+        assert handler.stats['written'] == len(messages)
+
+    def test_close_flushes_pending_records(self, connections):
+        """종료 시 남은 레코드 기록 테스트"""
+        handler = RecordingHandler(batch_size=1000, flush_interval=60)
+        logger = _logger(handler, 'test.db_handler.close')
+
+        logger.error('오류')
+        handler.close()
+
+        assert [row[1] for batch in handler.batches for row in batch] == ['ERROR']
+        assert not handler._writer.is_alive()
+        # 테이블 초기화 연결과 기록 연결 모두 닫힘
+        assert 'CREATE TABLE IF NOT EXISTS system_logs' in connections[0].fake_cursor.statements[0]
+        assert all(conn.closed for conn in connections)
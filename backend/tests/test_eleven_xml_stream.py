@@ -0,0 +1,70 @@
+"""
+11번가 XML 스트리밍 파서 테스트
+"""
+import io
+import xml.etree.ElementTree as ET
+
+from market.eleven.base_client import iter_xml_elements, element_to_flat_dict
+
+
+PRODUCTS_XML = """<?xml version="1.0" encoding="EUC-KR"?>
+<ns2:Products xmlns:ns2="http://skt.tmall.business.openapi.spring.service.client.domain/">
+  <ns2:Product>
+    <prdNo>1001</prdNo>
+    <prdNm>테스트 상품</prdNm>
+    <selPrc>15000</selPrc>
+    <prdImage01>a.jpg</prdImage01>
+    <tag>A</tag>
+    <tag>B</tag>
+  </ns2:Product>
+  <ns2:Product>
+    <prdNo>1002</prdNo>
+    <prdNm>옵션 상품</prdNm>
+    <option code="X"><optNm>색상</optNm></option>
+    <brand/>
+  </ns2:Product>
+</ns2:Products>
+""".encode('euc-kr')
+
+
+class TestElevenXmlStream:
+    """iter_xml_elements 테스트 클래스"""
+
+    def test_yields_flat_dict_per_element(self):
+        """엘리먼트별 평탄한 딕셔너리 반환 테스트"""
+        products = list(iter_xml_elements(io.BytesIO(PRODUCTS_XML), 'Product'))
+
+        assert [p['prdNo'] for p in products] == ['1001', '1002']
+        assert products[0]['prdNm'] == '테스트 상품'
+        assert products[0]['tag'] == ['A', 'B']
+        assert products[1]['option'] == {'@code': 'X', 'optNm': '색상'}
+        assert products[1]['brand'] is None
+
+    def test_items_nested_under_wrapper(self):
+        """래퍼 엘리먼트 아래 다수 항목 스트리밍 테스트"""
+        items = b''.join(
+            b'<Product><prdNo>%d</prdNo></Product>' % i for i in range(1000)
+        )
+        source = io.BytesIO(b'<Response><Products>' + items + b'</Products></Response>')
+
+        prdnos = [p['prdNo'] for p in iter_xml_elements(source, 'Product')]
+
+        assert len(prdnos) == 1000
+        assert prdnos[-1] == '999'
+
+    def test_flat_dict_for_single_element(self):
+        """단일 엘리먼트 변환 테스트"""
+        element = ET.fromstring('<Order id="1"><ordNo>7</ordNo><qty>2</qty></Order>')
+
+        assert element_to_flat_dict(element) == {'@id': '1', 'ordNo': '7', 'qty': '2'}
+
+    def test_leaf_with_attributes_keeps_text(self):
+        """속성이 있는 리프 엘리먼트의 텍스트 보존 테스트"""
+        element = ET.fromstring(
+            '<Product><prdNo>1</prdNo><selPrc unit="KRW">10000</selPrc></Product>'
+        )
+
+        assert element_to_flat_dict(element) == {
+            'prdNo': '1',
+            'selPrc': {'@unit': 'KRW', '#text': '10000'},
+        }
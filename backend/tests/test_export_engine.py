@@ -0,0 +1,144 @@
+"""
+services.export_engine 스트리밍 내보내기 테스트
+"""
+import csv
+import gzip
+import io
+from collections import namedtuple
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from services import export_engine
+from services.export_engine import ExportEngine, build_query, iter_chunks, iter_csv, write_csv
+
+# psycopg2 커서 description 항목 (write_parquet 은 타입 OID/정밀도를 읽음)
+Column = namedtuple('Column', 'name type_code precision scale')
+
+
+class TestBuildQuery:
+    """데이터셋 쿼리 생성"""
+
+    def test_filters_become_conditions(self):
+        query, params = build_query('orders', {'start_date': '2024-01-01', 'status': None})
+        assert 'WHERE created_at >= %(start_date)s' in query
+        assert 'status' not in params
+        assert query.rstrip().endswith('ORDER BY id')
+
+    def test_unknown_dataset_or_filter_is_rejected(self):
+        with pytest.raises(ValueError):
+            build_query('users')
+        with pytest.raises(ValueError):
+            build_query('products', {'supplier_id': 1})
+
+
+class TestStreamingCsv:
+    """청크 단위 CSV 스트리밍"""
+
+    def test_reads_in_chunks_from_named_cursor(self, fake_db):
+        conn = fake_db(results=[[(i,) for i in range(5)]], columns=['id'])
+
+        chunks = list(iter_chunks(conn, 'SELECT id FROM orders', chunk_size=2))
+
+        assert [len(rows) for _, rows in chunks] == [2, 2, 1]
+        assert conn.cursor_names[0].startswith('export_')
+        assert set(conn.fake_cursor.fetch_sizes) == {2}
+
+    def test_empty_result_still_has_header(self, fake_db):
+        conn = fake_db(columns=['id', 'name'])
+        data = b''.join(iter_csv(iter_chunks(conn, 'SELECT 1')))
+        assert data.decode('utf-8-sig').splitlines() == ['id,name']
+
+    def test_gzip_stream_round_trip(self, fake_db):
+        rows = [
+            (1, '상품 A', Decimal('12000.50'), datetime(2024, 11, 1, 9, 30), {'color': '빨강'}),
+            (2, None, Decimal('0'), datetime(2024, 11, 2, 10, 0), None),
+        ]
+        columns = ['id', 'name', 'price', 'created_at', 'options']
+        conn = fake_db(results=[rows], columns=columns)
+
+        blocks = list(iter_csv(iter_chunks(conn, 'SELECT 1', chunk_size=1), gzip_output=True))
+        text = gzip.decompress(b''.join(blocks)).decode('utf-8-sig')
+        parsed = list(csv.reader(io.StringIO(text)))
+
+        assert parsed[0] == columns
+        assert parsed[1] == ['1', '상품 A', '12000.50', '2024-11-01 09:30:00', '{"color": "빨강"}']
+        assert parsed[2] == ['2', '', '0', '2024-11-02 10:00:00', '']
+        # 청크마다 압축 블록을 내보내고 마지막에 flush
+        assert len(blocks) >= 2
+
+
+class TestFileExport:
+    """파일 내보내기 행 수 / XLSX 시트 분할 / Parquet 스키마"""
+
+    def test_csv_row_count_is_returned_per_export(self, fake_db, tmp_path, monkeypatch):
+        """행 수는 인스턴스 상태가 아니라 내보내기마다 반환값으로 전달"""
+        conn = fake_db(results=[[(i,) for i in range(5)]], columns=['id'])
+        assert write_csv(iter_chunks(conn, 'SELECT 1', chunk_size=2), str(tmp_path / 'a.csv')) == 5
+
+        connections = [fake_db(results=[[(1,), (2,), (3,)]], columns=['id']),
+                       fake_db(results=[[(1,)]], columns=['id'])]
+        monkeypatch.setattr(export_engine.psycopg2, 'connect', lambda **config: connections.pop(0))
+        engine = ExportEngine({}, chunk_size=2)
+
+        first = engine.export_to_file('orders', str(tmp_path / 'b.csv'))
+        second = engine.export_to_file('orders', str(tmp_path / 'c.csv'), gzip_output=True)
+
+        assert (first['rows'], second['rows']) == (3, 1)
+        assert not hasattr(engine, '_last_count')
+
+    def test_xlsx_rolls_over_to_new_sheet(self, fake_db, tmp_path, monkeypatch):
+        """시트 최대 행 수를 넘으면 헤더를 다시 쓰고 다음 시트로 이어서 기록"""
+        openpyxl = pytest.importorskip('openpyxl')
+        monkeypatch.setattr(export_engine, 'XLSX_MAX_ROWS', 2)
+        conn = fake_db(results=[[(i, f'상품{i}') for i in range(5)]], columns=['id', 'name'])
+        path = str(tmp_path / 'orders.xlsx')
+
+        assert export_engine.write_xlsx(iter_chunks(conn, 'SELECT 1', chunk_size=3), path, 'orders') == 5
+
+        wb = openpyxl.load_workbook(path, read_only=True)
+        assert wb.sheetnames == ['orders', 'orders_2', 'orders_3']
+        sheets = [[list(row) for row in wb[name].iter_rows(values_only=True)] for name in wb.sheetnames]
+        assert [sheet[0] for sheet in sheets] == [['id', 'name']] * 3
+        assert [row[0] for sheet in sheets for row in sheet[1:]] == [0, 1, 2, 3, 4]
+
+    def test_parquet_maps_types_and_writes_row_group_per_chunk(self, fake_db, tmp_path):
+        """커서 타입 OID → Arrow 타입, 청크마다 row group 하나"""
+        pa = pytest.importorskip('pyarrow')
+        pq = pytest.importorskip('pyarrow.parquet')
+        rows = [
+            (i, Decimal(f'{i}.50'), Decimal('0.1'), datetime(2024, 11, i + 1, 9, 0),
+             date(2024, 11, i + 1), i % 2 == 0, f'상품{i}', {'color': '빨강'} if i == 0 else None)
+            for i in range(5)
+        ]
+        conn = fake_db(results=[rows])
+        conn.fake_cursor.description = [
+            Column('id', 23, None, None),
+            Column('price', 1700, 10, 2),
+            Column('ratio', 1700, None, None),
+            Column('created_at', 1114, None, None),
+            Column('order_date', 1082, None, None),
+            Column('active', 16, None, None),
+            Column('name', 25, None, None),
+            Column('options', 3802, None, None),
+        ]
+        path = str(tmp_path / 'orders.parquet')
+
+        assert export_engine.write_parquet(conn, 'SELECT 1', None, path, chunk_size=2) == 5
+
+        parquet = pq.ParquetFile(path)
+        assert parquet.metadata.num_row_groups == 3
+        schema = parquet.schema_arrow
+        assert schema.field('id').type == pa.int64()
+        assert schema.field('price').type == pa.decimal128(10, 2)
+        assert schema.field('ratio').type == pa.float64()
+        assert schema.field('created_at').type == pa.timestamp('us')
+        assert schema.field('order_date').type == pa.date32()
+        assert schema.field('active').type == pa.bool_()
+        assert schema.field('options').type == pa.string()
+
+        table = parquet.read()
+        assert table.column('price').to_pylist()[1] == Decimal('1.50')
+        assert table.column('ratio').to_pylist()[0] == pytest.approx(0.1)
+        assert table.column('options').to_pylist()[:2] == ['{"color": "빨강"}', None]
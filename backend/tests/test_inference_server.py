@@ -0,0 +1,189 @@
+"""
+추론 서버 (InferenceServer) 테스트
+"""
+import asyncio
+
+import numpy as np
+import pytest
+from ai.inference_server import InferenceServer, Histogram
+
+
+class TestInferenceServer:
+    """InferenceServer 테스트 클래스"""
+
+    async def test_concurrent_requests_are_batched(self):
+        """동시 요청 마이크로 배치 테스트"""
+        calls = []
+
+        def predict(X):
+            calls.append(len(X))
+            return X.sum(axis=1)
+
+        server = InferenceServer(max_batch_size=64, max_wait_ms=20)
+        await server.start()
+        server.register('model', predict)
+
+        inputs = [np.full((2, 3), i, dtype=float) for i in range(5)]
+        results = await asyncio.gather(*(server.predict('model', x) for x in inputs))
+        await server.shutdown()
+
+        assert calls == [10]
+        for i, result in enumerate(results):
+            assert result.tolist() == [3.0 * i, 3.0 * i]
+
+        stats = server.get_stats()['model']
+        assert stats['batches'] == 1
+        assert stats['requests'] == 5
+        assert stats['batch_size']['count'] == 1
+
+    async def test_tuple_outputs_are_split(self):
+        """튜플 결과 분할 테스트"""
+        server = InferenceServer(max_wait_ms=20)
+        await server.start()
+        server.register('detect', lambda X: (X[:, 0], X[:, 0] * 2))
+
+        a, b = await asyncio.gather(
+            server.predict('detect', np.array([[1.0]])),
+            server.predict('detect', np.array([[2.0], [3.0]]))
+        )
+        await server.shutdown()
+
+        assert a[0].tolist() == [1.0] and a[1].tolist() == [2.0]
+        assert b[0].tolist() == [2.0, 3.0] and b[1].tolist() == [4.0, 6.0]
+
+    async def test_errors_are_propagated(self):
+        """배치 실패 전파 테스트"""
+        def predict(X):
+            raise ValueError('boom')
+
+        server = InferenceServer()
+        await server.start()
+        server.register('broken', predict)
+
+        with pytest.raises(ValueError):
+            await server.predict('broken', np.zeros((1, 1)))
+        await server.shutdown()
+
+        assert server.get_stats()['broken']['errors'] == 1
+
+    async def test_versions_are_batched_separately(self):
+        """버전별 워커 분리 테스트 (한 배치에 다른 버전 입력이 섞이지 않음)"""
+        calls = []
+
+        def make_predict(version):
+            def predict(X):
+                calls.append((version, len(X)))
+                return X[:, 0] * version
+            return predict
+
+        server = InferenceServer(max_wait_ms=20)
+        await server.start()
+        server.register('model', make_predict(1), version='1')
+        server.register('model', make_predict(2), version='2')
+
+        a, b, c = await asyncio.gather(
+            server.predict('model', np.array([[1.0]]), version='1'),
+            server.predict('model', np.array([[1.0]]), version='2'),
+            server.predict('model', np.array([[3.0]]), version='1')
+        )
+        await server.shutdown()
+
+        assert sorted(calls) == [(1, 2), (2, 1)]
+        assert a.tolist() == [1.0] and b.tolist() == [2.0] and c.tolist() == [3.0]
+        assert set(server.get_stats()) == {'model@1', 'model@2'}
+
+    async def test_replaced_worker_drains_queued_requests(self):
+        """워커 교체 시 대기 중인 요청 처리 테스트"""
+        server = InferenceServer(max_wait_ms=50)
+        await server.start()
+        server.register('model', lambda X: X * 1)
+        await asyncio.sleep(0)
+
+        pending = asyncio.ensure_future(server.predict('model', np.array([1.0])))
+        await asyncio.sleep(0)
+        server.register('model', lambda X: X * 10)
+        replaced = await asyncio.wait_for(server.predict('model', np.array([1.0])), 1)
+
+        assert (await asyncio.wait_for(pending, 1)).tolist() == [1.0]
+        assert replaced.tolist() == [10.0]
+        await server.shutdown()
+
+    async def test_shutdown_fails_pending_requests(self):
+        """종료 시 대기 중인 요청 실패 처리 테스트"""
+        server = InferenceServer(max_wait_ms=1000)
+        await server.start()
+        server.register('model', lambda X: X)
+        await asyncio.sleep(0)
+
+        pending = asyncio.ensure_future(server.predict('model', np.array([1.0])))
+        await asyncio.sleep(0.01)
+        await server.shutdown()
+
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(pending, 1)
+
+    async def test_batch_predictions_are_recorded_to_monitor(self):
+        """배치 예측값 모니터 기록 테스트"""
+        class RecordingMonitor:
+            def __init__(self):
+                self.recorded = []
+
+            def record_predictions(self, model_id, predictions):
+                self.recorded.append((model_id, list(predictions)))
+
+        monitor = RecordingMonitor()
+        server = InferenceServer(max_wait_ms=20, monitor=monitor)
+        await server.start()
+        server.register('model', lambda X: X[:, 0] * 2, version='1')
+        server.register('detect', lambda X: (X[:, 0], X[:, 0]))
+
+        await asyncio.gather(
+            server.predict('model', np.array([[1.0]]), version='1'),
+            server.predict('model', np.array([[2.0]]), version='1'),
+            server.predict('detect', np.array([[1.0]]))
+        )
+        await server.shutdown()
+        server.executor.shutdown(wait=True)
+
+        # 튜플 결과는 기록하지 않음
+        assert monitor.recorded == [('model', [2.0, 4.0])]
+
+    def test_predict_sync_without_loop_calls_directly(self):
+        """이벤트 루프 없이 동기 호출 테스트"""
+        server = InferenceServer()
+        server.register('model', lambda X: X * 2)
+
+        assert server.predict_sync('model', np.array([1, 2])).tolist() == [2, 4]
+
+
+class TestHistogram:
+    """Histogram 테스트 클래스"""
+
+    def test_percentiles(self):
+        """버킷 기반 백분위수 테스트"""
+        histogram = Histogram((1, 10, 100))
+        for value in [0.5] * 90 + [50] * 10:
+            histogram.observe(value)
+
+        assert histogram.percentile(50) == 1
+        assert histogram.percentile(95) == 100
+        assert histogram.to_dict()['count'] == 100
+
+
+class TestAnalyticsEngineRegistration:
+    """분석 엔진의 추론 서버 등록 테스트"""
+
+    def test_only_row_independent_models_are_registered(self, tmp_path, monkeypatch):
+        """배치 의존 전처리를 하는 이상 탐지는 서버에 묶지 않고 직접 호출"""
+        from ai.analytics_engine import AIAnalyticsEngine
+
+        monkeypatch.chdir(tmp_path)
+        engine = AIAnalyticsEngine({})
+        server = InferenceServer()
+        engine.set_inference_server(server)
+
+        assert 'sales_prediction' in server.get_stats()
+        assert 'anomaly_detection' not in server.get_stats()
+
+        monkeypatch.setattr(engine.anomaly_model, 'detect', lambda data: ('direct', len(data)))
+        assert engine._detect_anomaly_rows([1, 2, 3]) == ('direct', 3)
@@ -0,0 +1,122 @@
+"""
+마켓 동기화 (MarketSync) 청크 파이프라인 테스트
+"""
+import psycopg2
+
+from market_manager.market_order import MarketOrder
+from market_manager.market_sync import MarketSync
+
+
+class FakeProductManager:
+    """save_products_batch 호출을 기록하는 가짜 매니저"""
+
+    def __init__(self):
+        self.connection = None
+        self.calls = []
+
+    def save_products_batch(self, market_code, account_name, products):
+        self.calls.append((market_code, account_name, [p['market_product_id'] for p in products]))
+        return {'created': len(products), 'updated': 0, 'failed': 0, 'skipped': 0, 'errors': []}
+
+
+def _make_sync(chunk_size=2):
+    sync = MarketSync.__new__(MarketSync)
+    sync.chunk_size = chunk_size
+    sync.product_manager = FakeProductManager()
+    return sync
+
+
+class TestMarketSync:
+    """MarketSync 테스트 클래스"""
+
+    def test_products_are_saved_per_chunk(self):
+        """청크당 일괄 저장 1회 테스트"""
+        sync = _make_sync(chunk_size=2)
+        products = ({'id': i, 'name': f'상품{i}', 'price': 1000} for i in range(1, 6))
+
+        result = sync.sync_eleven_products('계정', products)
+
+        assert [ids for _, _, ids in sync.product_manager.calls] == [['1', '2'], ['3', '4'], ['5']]
+        assert result['total'] == 5
+        assert result['created'] == 5
+        assert result['failed'] == 0
+
+    def test_conversion_errors_are_isolated(self):
+        """변환 실패 행 격리 테스트"""
+        sync = _make_sync(chunk_size=10)
+        products = [
+            {'id': 1, 'name': '정상'},
+            {'id': '', 'name': 'ID 없음'},
+            {'id': 3, 'name': '카테고리 오류', 'category': None},
+        ]
+
+        result = sync.sync_naver_products('계정', products)
+
+        assert sync.product_manager.calls == [('naver', '계정', ['1'])]
+        assert result['total'] == 3
+        assert result['created'] == 1
+        assert result['failed'] == 2
+        assert len(result['errors']) == 2
+
+    def test_saver_failure_marks_chunk_failed(self):
+        """저장 실패 시 청크 실패 처리 테스트"""
+        sync = _make_sync(chunk_size=2)
+
+        def broken_saver(market_code, account_name, products):
+            raise RuntimeError('db down')
+
+        sync.product_manager.save_products_batch = broken_saver
+
+        result = sync.sync_ownerclan_products('계정', [{'id': 1}, {'id': 2}, {'id': 3}])
+
+        assert result['total'] == 3
+        assert result['failed'] == 3
+        assert all('db down' in error for error in result['errors'])
+
+
+class TestSaveOrdersBatch:
+    """MarketOrder.save_orders_batch 결과 집계/상품 교체 격리 테스트"""
+
+    def test_item_failure_keeps_other_orders_and_every_input_is_counted(self, fake_db, monkeypatch):
+        """상품 저장 실패 주문만 되돌리고, 입력은 정확히 하나의 결과로 집계"""
+        manager = MarketOrder.__new__(MarketOrder)
+        manager.connection = fake_db()
+        monkeypatch.setattr(manager, 'get_market_account',
+                            lambda market_code, account_name: {'id': 1, 'market_id': 2})
+        # A, C 신규 / B, E 갱신 / D 주문 upsert 실패
+        monkeypatch.setattr(manager, '_bulk_execute', lambda cursor, query, values, keys, template=None: (
+            [(10, 'A', True), (11, 'B', False), (12, 'C', True), (13, 'E', False)],
+            [('D', 'invalid date')]
+        ))
+
+        def save_rows(cursor, values):
+            if any(row[1] == 'broken' for row in values):
+                raise psycopg2.DataError('invalid input syntax')
+
+        monkeypatch.setattr(manager, '_save_order_rows', save_rows)
+
+        orders = [
+            {'market_order_id': 'A', 'order_date': None, 'items': [{'market_product_id': 'old'}]},
+            {'market_order_id': 'A', 'order_date': None, 'items': [{'market_product_id': 'p1'}]},
+            {'market_order_id': 'B', 'order_date': None, 'items': [{'market_product_id': 'broken'}]},
+            {'market_order_id': 'C', 'order_date': None},
+            {'market_order_id': 'D', 'order_date': 'bad'},
+            {'market_order_id': 'E', 'order_date': None},
+        ]
+        result = manager.save_orders_batch('coupang', '계정', orders)
+
+        assert (result['created'], result['updated'], result['failed'], result['skipped']) == (2, 1, 2, 1)
+        assert sum(result[k] for k in ('created', 'updated', 'failed', 'skipped')) == len(orders)
+        assert any(error.startswith('Order B items:') for error in result['errors'])
+
+        # 일괄 교체 실패 → 주문별 세이브포인트로 재실행, B 의 삭제만 되돌림
+        cursor = manager.connection.fake_cursor
+        statements = [' '.join(query.split()[:2]) for query in cursor.statements]
+        assert statements == [
+            'SAVEPOINT order_items', 'DELETE FROM', 'ROLLBACK TO', 'RELEASE SAVEPOINT',
+            'SAVEPOINT order_items', 'DELETE FROM', 'RELEASE SAVEPOINT',
+            'SAVEPOINT order_items', 'DELETE FROM', 'ROLLBACK TO', 'RELEASE SAVEPOINT',
+        ]
+        deletes = [params for query, params in cursor.executed if query.startswith('DELETE')]
+        assert deletes == [([10, 11],), ([10],), ([11],)]
+        assert manager.connection.commits == 1
@@ -0,0 +1,143 @@
+"""
+메모리 캐시 (TTLCache) 테스트
+"""
+import threading
+import time
+
+import pytest
+from cache.memory_cache import TTLCache, make_key, get_memory_cache
+
+
+class TestTTLCache:
+    """TTLCache 테스트 클래스"""
+
+    def test_set_and_get(self):
+        """저장 및 조회 테스트"""
+        cache = TTLCache('test')
+        cache.set('a', 1)
+
+        assert cache.get('a') == 1
+        assert cache.get('missing') is None
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+    def test_expiration(self):
+        """TTL 만료 테스트"""
+        cache = TTLCache('test')
+        cache.set('a', 1, ttl=0.01)
+        time.sleep(0.02)
+
+        assert cache.get('a') is None
+        assert cache.stats.expirations == 1
+        assert len(cache) == 0
+
+    def test_lru_eviction_by_entries(self):
+        """항목 수 상한 초과 시 LRU 제거 테스트"""
+        cache = TTLCache('test', max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')  # a 를 최근 사용으로
+        cache.set('c', 3)
+
+        assert 'a' in cache
+        assert 'b' not in cache
+        assert 'c' in cache
+        assert cache.stats.evictions == 1
+
+    def test_eviction_by_bytes(self):
+        """메모리 상한 초과 시 제거 테스트"""
+        cache = TTLCache('test', max_bytes=100, sizeof=lambda value: 40)
+        for key in 'abc':
+            cache.set(key, key)
+
+        stats = cache.get_stats()
+        assert stats['entries'] == 2
+        assert stats['memory_bytes'] == 80
+        assert 'a' not in cache
+
+    def test_purge_expired(self):
+        """만료 항목 일괄 제거 테스트"""
+        cache = TTLCache('test')
+        cache.set('a', 1, ttl=0.01)
+        cache.set('b', 2, ttl=60)
+        time.sleep(0.02)
+
+        assert cache.purge_expired() == 1
+        assert len(cache) == 1
+
+    def test_get_or_load_coalesces_concurrent_calls(self):
+        """동시 요청 병합 테스트"""
+        cache = TTLCache('test')
+        calls = []
+        started = threading.Event()
+
+        def loader():
+            calls.append(1)
+            started.set()
+            time.sleep(0.05)
+            return 'value'
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_load('k', loader)))
+            for _ in range(5)
+        ]
+        threads[0].start()
+        started.wait()
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == ['value'] * 5
+        assert cache.stats.coalesced == 4
+
+    def test_get_or_load_respects_cache_if(self):
+        """캐싱 조건 테스트"""
+        cache = TTLCache('test')
+        cache.get_or_load('k', lambda: {'error': 'x'}, cache_if=lambda r: 'error' not in r)
+
+        assert 'k' not in cache
+
+    def test_get_or_load_propagates_errors(self):
+        """로더 예외 전파 테스트"""
+        cache = TTLCache('test')
+
+        def loader():
+            raise ValueError('boom')
+
+        with pytest.raises(ValueError):
+            cache.get_or_load('k', loader)
+        assert cache.stats.load_errors == 1
+        assert 'k' not in cache
+
+    def test_returned_values_are_copies(self):
+        """반환값을 수정해도 캐시 항목은 그대로인지 테스트"""
+        cache = TTLCache('test')
+        original = {'items': [1, 2]}
+        cache.set('a', original)
+        original['items'].append(3)
+
+        first = cache.get('a')
+        first['items'].append(4)
+        loaded = cache.get_or_load('a', lambda: None)
+        loaded['extra'] = True
+
+        assert cache.get('a') == {'items': [1, 2]}
+
+    def test_copy_values_disabled_shares_object(self):
+        cache = TTLCache('test', copy_values=False)
+        value = {'a': 1}
+        cache.set('k', value)
+
+        assert cache.get('k') is value
+
+    def test_make_key_is_order_independent(self):
+        """캐시 키 생성 테스트"""
+        assert make_key('op', a=1, b=2) == make_key('op', b=2, a=1)
+        assert make_key('op', a=1) != make_key('other', a=1)
+
+    def test_shared_registry(self):
+        """이름별 공유 캐시 테스트"""
+        assert get_memory_cache('shared_test') is get_memory_cache('shared_test')
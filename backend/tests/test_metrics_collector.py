@@ -0,0 +1,97 @@
+"""
+monitoring.metrics_collector 히스토그램 스케치/링 버퍼 테스트
+"""
+import pytest
+
+from monitoring import metrics_collector
+from monitoring.metrics_collector import MetricsCollector, OVERFLOW_TAGS
+
+
+@pytest.fixture
+def collector(monkeypatch):
+    """싱글톤을 비운 새 수집기"""
+    monkeypatch.setattr(MetricsCollector, '_instance', None)
+    return MetricsCollector()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """타임시리즈 기록 시각 (epoch 초)"""
+    now = [1_700_000_000.0]
+    monkeypatch.setattr(metrics_collector.time, 'time', lambda: now[0])
+    return now
+
+
+class TestHistogramSketch:
+    """히스토그램 분위수 스케치"""
+
+    def test_stats_within_relative_accuracy(self, collector):
+        for value in range(1, 1001):
+            collector.record_histogram('api.response_time', value, {'endpoint': '/a'})
+
+        stats = collector.get_histogram_stats('api.response_time,endpoint=/a')
+
+        assert stats['count'] == 1000
+        assert (stats['min'], stats['max']) == (1, 1000)
+        assert stats['avg'] == pytest.approx(500.5)
+        assert stats['p50'] == pytest.approx(500, rel=0.02)
+        assert stats['p99'] == pytest.approx(990, rel=0.02)
+        assert collector.get_histogram_stats('missing') is None
+
+    def test_flush_writes_stats_timeseries(self, collector, clock):
+        """플러시할 때만 통계를 타임시리즈에 기록"""
+        collector.record_histogram('job', 10.0)
+        collector.record_histogram('job', 30.0)
+        assert collector.get_metric_timeseries('job.p50') == []
+
+        collector.flush_histogram_timeseries()
+
+        points = collector.get_metric_timeseries('job.count')
+        assert [point['value'] for point in points] == [2]
+        assert points[0]['type'] == 'histogram'
+
+    def test_new_tag_combinations_overflow_after_max_series(self, collector):
+        collector.max_series = 2
+        for user in ('a', 'b', 'c', 'd'):
+            collector.record_histogram('latency', 1.0, {'user': user})
+
+        assert set(collector.histograms) == {
+            'latency,user=a', 'latency,user=b', collector._make_key('latency', OVERFLOW_TAGS)
+        }
+        assert collector.overflowed_series == 2
+        # 이미 있는 시리즈는 계속 기록
+        collector.record_histogram('latency', 1.0, {'user': 'a'})
+        assert collector.get_histogram_stats('latency,user=a')['count'] == 2
+
+
+class TestTimeseriesRingBuffer:
+    """시리즈당 고정 길이 링 버퍼"""
+
+    def test_keeps_only_latest_points(self, collector, clock):
+        collector.timeseries_points = 3
+        for value in range(5):
+            clock[0] += 1
+            collector.record_gauge('queue.depth', value)
+
+        points = collector.get_metric_timeseries('queue.depth')
+        assert [point['value'] for point in points] == [2, 3, 4]
+
+    def test_time_range_cutoff(self, collector, clock):
+        """조회 구간 이전 데이터포인트 제외"""
+        collector.record_counter('orders')
+        clock[0] += 30 * 60
+        collector.record_counter('orders', 2)
+        clock[0] += 20 * 60
+
+        recent = collector.get_metric_timeseries('orders', time_range_minutes=30)
+        assert [point['value'] for point in recent] == [3]
+        assert len(collector.get_metric_timeseries('orders', time_range_minutes=60)) == 2
+
+    def test_series_count_is_capped(self, collector, clock):
+        """타임시리즈 버퍼 시리즈 수 상한 (값은 계속 기록)"""
+        collector.max_timeseries = 1
+        collector.record_gauge('a', 1)
+        collector.record_gauge('b', 2)
+
+        assert list(collector.metrics_buffer) == ['a']
+        assert collector.gauges['b'] == 2
@@ -0,0 +1,98 @@
+"""
+모델 아티팩트 (model_artifacts) 테스트
+"""
+import os
+import shutil
+
+import numpy as np
+import pytest
+from ai.model_artifacts import (
+    save_artifact, load_artifact, read_manifest, manifest_path, file_sha256,
+    clear_loaded_artifacts, LazyArtifact, ArtifactIntegrityError
+)
+
+
+@pytest.fixture(autouse=True)
+def _clear_artifact_cache():
+    clear_loaded_artifacts()
+    yield
+    clear_loaded_artifacts()
+
+
+class TestModelArtifacts:
+    """모델 아티팩트 테스트 클래스"""
+
+    def test_save_writes_manifest_with_content_hash(self, tmp_path):
+        """매니페스트 저장 테스트"""
+        path = str(tmp_path / 'model.joblib')
+        manifest = save_artifact({'weights': np.arange(10.0)}, path, metadata={'v': 1})
+
+        assert read_manifest(path) == manifest
+        assert manifest['content_hash'] == file_sha256(path)
+        assert manifest['metadata'] == {'v': 1}
+
+    def test_arrays_are_memory_mapped(self, tmp_path):
+        """배열 mmap 로드 테스트"""
+        path = str(tmp_path / 'model.joblib')
+        save_artifact({'weights': np.arange(1000.0)}, path)
+
+        loaded = load_artifact(path)
+
+        assert isinstance(loaded['weights'], np.memmap)
+        assert loaded['weights'][999] == 999.0
+
+    def test_load_is_cached_per_content(self, tmp_path):
+        """같은 콘텐츠 재로드 시 캐시 사용 테스트"""
+        path = str(tmp_path / 'model.joblib')
+        save_artifact({'a': np.zeros(3)}, path)
+
+        first = load_artifact(path)
+        assert load_artifact(path) is first
+
+        save_artifact({'a': np.ones(3)}, path)
+        reloaded = load_artifact(path)
+        assert reloaded is not first
+        assert reloaded['a'][0] == 1.0
+
+    def test_expected_hash_mismatch_raises(self, tmp_path):
+        """콘텐츠 해시 불일치 테스트"""
+        path = str(tmp_path / 'model.joblib')
+        save_artifact({'a': 1}, path)
+
+        with pytest.raises(ArtifactIntegrityError):
+            load_artifact(path, expected_hash='0' * 64)
+
+    def test_verify_detects_modified_file(self, tmp_path):
+        """파일 변조 감지 테스트"""
+        path = str(tmp_path / 'model.joblib')
+        save_artifact({'a': np.arange(5.0)}, path)
+        with open(path, 'ab') as f:
+            f.write(b'tampered')
+
+        with pytest.raises(ArtifactIntegrityError):
+            load_artifact(path, verify=True)
+
+    def test_manifest_of_pending_save_is_ignored(self, tmp_path):
+        """매니페스트만 교체된 저장 도중에는 실제 데이터 파일 기준으로 로드"""
+        path = str(tmp_path / 'model.joblib')
+        pending = str(tmp_path / 'pending.joblib')
+        save_artifact({'n': 1}, path)
+        new_manifest = save_artifact({'n': 2}, pending)
+        shutil.copy(manifest_path(pending), manifest_path(path))
+
+        assert load_artifact(path)['n'] == 1
+        with pytest.raises(ArtifactIntegrityError):
+            load_artifact(path, expected_hash=new_manifest['content_hash'])
+
+        os.replace(pending, path)
+        assert load_artifact(path, expected_hash=new_manifest['content_hash'])['n'] == 2
+
+    def test_lazy_artifact_reloads_on_change(self, tmp_path):
+        """지연 로딩 테스트"""
+        path = str(tmp_path / 'index.joblib')
+        save_artifact({'n': 1}, path)
+        lazy = LazyArtifact(path)
+
+        assert lazy.get()['n'] == 1
+        save_artifact({'n': 2}, path)
+        assert lazy.get()['n'] == 2
@@ -0,0 +1,51 @@
+"""
+오너클랜 상품 쿼리 빌더 / 프로필 페이지 순회 테스트
+"""
+import pytest
+
+from supplier.ownerclan.product_query import build_profile_query, iter_product_pages
+
+
+class TestOwnerClanProductQuery:
+    """product_query 테스트 클래스"""
+
+    def test_price_stock_profile_skips_heavy_fields(self):
+        """price_stock 프로필 필드 선택 테스트"""
+        query = build_profile_query('price_stock')
+
+        assert 'stock' in query and 'price' in query
+        assert 'options' not in query
+        assert 'images' not in query
+        assert 'category' not in query
+        assert 'images' in build_profile_query('full')
+
+    def test_queries_use_only_limit_offset_arguments(self):
+        """기존 수집기와 같은 products(limit, offset) 인자만 사용"""
+        for profile in ('full', 'price_stock'):
+            assert 'products(limit: $limit, offset: $offset)' in build_profile_query(profile)
+
+    def test_pages_report_next_offset_for_resume(self):
+        """다음 offset 반환 및 재개 테스트"""
+        catalogue = [{'id': i, 'updatedAt': f'2024-01-01T00:00:{i:02d}'} for i in range(5)]
+        requests = []
+
+        def fetch_page(query, variables):
+            requests.append(variables['offset'])
+            return {'items': catalogue[variables['offset']:variables['offset'] + variables['limit']]}
+
+        pages = list(iter_product_pages(fetch_page, 'price_stock', limit=2))
+
+        assert [[p['id'] for p in items] for items, _ in pages] == [[0, 1], [2, 3], [4]]
+        assert [offset for _, offset in pages] == [2, 4, 5]
+        assert requests == [0, 2, 4]
+
+        resumed = list(iter_product_pages(fetch_page, 'full', limit=2, start_offset=4))
+        assert [[p['id'] for p in items] for items, _ in resumed] == [[4]]
+
+    def test_unknown_profile_is_rejected(self):
+        """지원하지 않는 프로필 테스트 (변경분 필터 인자가 없어 changed_since 는 제공하지 않음)"""
+        with pytest.raises(ValueError):
+            build_profile_query('changed_since')
+
+        with pytest.raises(ValueError):
+            list(iter_product_pages(lambda q, v: {'items': []}, 'unknown'))
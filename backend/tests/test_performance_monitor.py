@@ -0,0 +1,64 @@
+"""
+monitoring.performance_monitor 단계별 수집 테스트
+"""
+from monitoring import performance_monitor
+from monitoring.performance_monitor import CollectorTier, PerformanceMonitor
+
+
+class TestCollectorTier:
+    """예산 초과 시 주기 완화"""
+
+    def test_backoff_when_over_budget_and_recover(self, monkeypatch):
+        """예산 초과 시 주기를 두 배로 늘리고, 평균이 예산 절반 이하로 내려가면 복귀"""
+        clock = [0.0]
+        monkeypatch.setattr(performance_monitor.time, 'perf_counter', lambda: clock[0])
+        tier = CollectorTier('database', None, interval=30, budget_ms=10)
+
+        def run_with(seconds):
+            tier.func = lambda: clock.__setitem__(0, clock[0] + seconds)
+            tier.run(now=0)
+
+        run_with(0.02)
+        assert tier.effective_interval == 60
+        run_with(0.02)
+        assert tier.effective_interval == 120
+        assert tier.over_budget == 2
+
+        for _ in range(30):
+            run_with(0.0)
+        assert tier.effective_interval == 30
+
+    def test_errors_are_counted_not_raised(self):
+        def fail():
+            raise RuntimeError('db down')
+        tier = CollectorTier('database', fail, interval=30, budget_ms=100)
+        tier.run(now=100)
+        assert tier.errors == 1
+        assert tier.next_run == 130
+
+
+class TestStatementDiff:
+    """pg_stat_statements 스냅샷 차이"""
+
+    def test_metrics_from_snapshot_delta(self, fake_db, monkeypatch):
+        """pg_stat_statements(false) 스냅샷을 차례로 돌려주는 연결로 구간 값 계산"""
+        conn = fake_db(results=[
+            [(10, 1, 111, 100, 1000.0), (10, 1, 222, 5, 5000.0)],
+            # 111: 10회 +200ms, 222: 1회 +3000ms (느린 쿼리), 333: 새 쿼리 2회 +20ms
+            [(10, 1, 111, 110, 1200.0), (10, 1, 222, 6, 8000.0), (10, 1, 333, 2, 20.0)],
+            # 통계 초기화 → 현재 값을 그대로 구간 값으로 사용
+            [(10, 1, 111, 4, 40.0)],
+        ])
+        monkeypatch.setattr(performance_monitor.psycopg2, 'connect', lambda **kwargs: conn)
+        monitor = PerformanceMonitor()
+        assert conn.autocommit is True
+
+        assert monitor.get_statement_metrics()['query_count'] == 0
+
+        metrics = monitor.get_statement_metrics()
+        assert metrics['query_count'] == 3
+        assert metrics['slow_queries'] == 1
+        assert metrics['avg_query_time_ms'] == (200 + 3000 + 20) / 13
+
+        metrics = monitor.get_statement_metrics()
+        assert metrics == {'query_count': 1, 'avg_query_time_ms': 10.0, 'slow_queries': 0}
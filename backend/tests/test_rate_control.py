@@ -0,0 +1,95 @@
+"""
+공용 율 제한기 / 서킷 브레이커 테스트
+"""
+import asyncio
+import time
+
+import pytest
+
+from core.rate_control import TokenBucket, CircuitBreaker, CircuitOpenError
+
+
+class BrokenRedis:
+    """스크립트 실행이 항상 실패하는 가짜 Redis 클라이언트"""
+
+    def register_script(self, script):
+        def run(keys, args):
+            raise ConnectionError('redis down')
+        return run
+
+
+class TestTokenBucket:
+    """TokenBucket 테스트 클래스"""
+
+    async def test_concurrent_acquires_are_spaced(self):
+        """동시 코루틴 획득 시 슬롯 간격 유지 테스트"""
+        bucket = TokenBucket(rate=20, capacity=1)
+        start = time.monotonic()
+
+        await asyncio.gather(*(bucket.acquire_async() for _ in range(5)))
+
+        # 첫 요청은 즉시, 나머지 4개는 0.05초 간격
+        assert time.monotonic() - start >= 0.18
+
+    def test_aimd_adjusts_rate(self):
+        """429 응답 시 승산 감소, 성공 시 가산 증가 테스트"""
+        bucket = TokenBucket(rate=10, increase_step=1, decrease_cooldown=0)
+
+        bucket.record(429)
+        assert bucket.rate == 5
+        bucket.record(503)
+        assert bucket.rate == 2.5
+
+        for _ in range(20):
+            bucket.record(200)
+        assert bucket.rate == 10
+
+    def test_try_acquire_respects_capacity(self):
+        """버스트 용량 초과 시 즉시 획득 실패 테스트"""
+        bucket = TokenBucket(rate=1, capacity=2)
+
+        assert bucket.try_acquire()
+        assert bucket.try_acquire()
+        assert not bucket.try_acquire()
+        assert bucket.time_until_available() > 0
+
+    def test_redis_failure_falls_back_to_local_state(self):
+        """Redis 오류 시 로컬 상태 사용 테스트"""
+        bucket = TokenBucket(rate=1, capacity=1, redis_client=BrokenRedis(), name='test')
+
+        assert bucket.try_acquire()
+        assert not bucket.try_acquire()
+
+
+class TestUnifiedCircuitBreaker:
+    """CircuitBreaker 테스트 클래스"""
+
+    def test_half_open_limits_trial_calls(self):
+        """half-open 상태 시험 호출 수 제한 테스트"""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+        breaker.record_failure()
+        assert not breaker.allow_request()
+
+        time.sleep(0.06)
+
+        assert breaker.allow_request()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert not breaker.allow_request()
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    async def test_open_circuit_blocks_async_calls(self):
+        """열린 서킷의 비동기 호출 차단 테스트"""
+        breaker = CircuitBreaker(failure_threshold=2)
+
+        @breaker
+        async def failing():
+            raise ValueError('실패')
+
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                await failing()
+
+        with pytest.raises(CircuitOpenError):
+            await failing()
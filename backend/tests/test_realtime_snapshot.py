@@ -0,0 +1,69 @@
+"""
+services.realtime_snapshot 증분 집계 테스트
+"""
+from datetime import date, datetime
+from decimal import Decimal
+
+from services.realtime_snapshot import OrderAggregates, RealtimeSnapshotProducer
+
+TODAY = date(2024, 11, 11)
+
+
+def order(hour, status='pending', price='10000', market='coupang', email='a@x.com', day=TODAY):
+    return (datetime(day.year, day.month, day.day, hour), status, Decimal(price), market, email)
+
+
+class TestOrderAggregates:
+    """행 단위 증감 집계"""
+
+    def test_repeated_upsert_is_idempotent(self):
+        """워터마크 구간이 겹쳐 같은 행을 다시 받아도 집계가 변하지 않는다"""
+        aggregates = OrderAggregates(TODAY)
+        assert aggregates.upsert(1, order(9)) is True
+        assert aggregates.upsert(1, order(9)) is False
+        assert aggregates.today_orders == 1
+        assert aggregates.today_revenue == Decimal('10000')
+
+    def test_status_and_price_change_replaces_old_contribution(self):
+        """상태/금액 변경은 이전 기여분을 빼고 새 값을 더한다"""
+        aggregates = OrderAggregates(TODAY)
+        aggregates.upsert(1, order(9))
+        aggregates.upsert(2, order(10, email='b@x.com', market='naver'))
+        aggregates.upsert(1, order(9, status='completed', price='8000'))
+
+        assert aggregates.today_orders == 2
+        assert aggregates.today_revenue == Decimal('18000')
+        assert dict(aggregates.status_counts) == {'pending': 1, 'completed': 1}
+        assert aggregates.by_market['coupang'] == [1, Decimal('8000')]
+        assert len(aggregates.customers) == 2
+
+    def test_yesterday_counts_only_for_status(self):
+        """어제 주문은 상태 집계에만 포함되고, 구간 밖 주문은 제외된다"""
+        aggregates = OrderAggregates(TODAY)
+        aggregates.upsert(1, order(23, day=date(2024, 11, 10)))
+        aggregates.upsert(2, order(8, day=date(2024, 11, 1)))
+
+        assert aggregates.today_orders == 0
+        assert dict(aggregates.status_counts) == {'pending': 1}
+        assert 2 not in aggregates.orders
+
+
+class TestSnapshotShape:
+    """기존 get_realtime_metrics 와 같은 구조의 스냅샷"""
+
+    def test_build_snapshot(self):
+        producer = RealtimeSnapshotProducer({}, redis_client=None)
+        producer._aggregates = OrderAggregates(TODAY)
+        producer._aggregates.upsert(1, order(9))
+        producer._aggregates.upsert(2, order(14, email='b@x.com'))
+        producer._weekly_history = [{'date': date(2024, 11, 10), 'orders': 3, 'revenue': 30000.0}]
+
+        snapshot = producer.build_snapshot()
+
+        assert snapshot['sales']['today'] == {
+            'today_orders': 2, 'today_revenue': 20000.0, 'unique_customers': 2
+        }
+        assert [row['hour'] for row in snapshot['sales']['hourly_trend']] == [9, 14]
+        assert [row['orders'] for row in snapshot['sales']['weekly_trend']] == [3, 2]
+        assert snapshot['orders']['pending'] == 2
+        assert snapshot['api_status']['coupang']['status'] == 'unknown'
@@ -0,0 +1,168 @@
+"""
+reports.render_pipeline 작업 병합/공유 테스트
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+
+render_pipeline = pytest.importorskip('reports.render_pipeline')
+ReportRenderPipeline = render_pipeline.ReportRenderPipeline
+job_key = render_pipeline.job_key
+
+
+class StubExecutor:
+    """제출된 작업을 기록하고 완료는 테스트가 직접 정하는 실행기"""
+
+    def __init__(self):
+        self.jobs = []
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.jobs.append((args, future))
+        return future
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    pipeline = ReportRenderPipeline({}, max_workers=1)
+    executor = StubExecutor()
+    monkeypatch.setattr(pipeline, '_get_executor', lambda: executor)
+    return pipeline, executor
+
+
+def _request(fmt, report_type='sales', start_date='2024-11-01', end_date='2024-11-30'):
+    return {'report_type': report_type, 'start_date': start_date,
+            'end_date': end_date, 'format': fmt}
+
+
+class TestJobKey:
+    """데이터 조회 공유 키"""
+
+    def test_inventory_ignores_period_and_charts(self):
+        assert job_key('inventory', '2024-11-01', '2024-11-30') == job_key('inventory')
+
+    def test_charts_only_matter_for_sales(self):
+        assert job_key('sales', 'a', 'b', True) != job_key('sales', 'a', 'b', False)
+        assert job_key('customer', 'a', 'b', True) == job_key('customer', 'a', 'b', False)
+
+
+class TestSubmitMany:
+    """요청 병합 및 형식별 결과"""
+
+    def test_same_key_is_one_job_with_all_formats(self, pipeline):
+        pipeline, executor = pipeline
+
+        futures = pipeline.submit_many([
+            _request('pdf'), _request('excel'), _request('pdf'),
+            _request('html', report_type='inventory'),
+        ])
+
+        assert [args for args, _ in executor.jobs] == [
+            ('sales', '2024-11-01', '2024-11-30', ('pdf', 'excel'), True),
+            ('inventory', None, None, ('html',), False),
+        ]
+        executor.jobs[0][1].set_result({'pdf': 'sales.pdf', 'excel': 'sales.xlsx'})
+        executor.jobs[1][1].set_result({'html': 'inventory.html'})
+
+        assert [future.result() for future in futures] == [
+            'sales.pdf', 'sales.xlsx', 'sales.pdf', 'inventory.html'
+        ]
+        assert pipeline.stats['requests'] == 4
+        assert pipeline.stats['jobs'] == 2
+
+    def test_inflight_job_is_shared_until_done(self, pipeline):
+        """실행 중인 동일 작업은 새로 제출하지 않고 공유"""
+        pipeline, executor = pipeline
+
+        first = pipeline.submit('sales', '2024-11-01', '2024-11-30', 'pdf')
+        second = pipeline.submit('sales', '2024-11-01', '2024-11-30', 'pdf')
+        assert len(executor.jobs) == 1
+        assert pipeline.stats['shared'] == 1
+        assert pipeline.pending() == 1
+
+        executor.jobs[0][1].set_result({'pdf': 'sales.pdf'})
+        assert first.result() == second.result() == 'sales.pdf'
+        assert pipeline.pending() == 0
+
+        pipeline.submit('sales', '2024-11-01', '2024-11-30', 'pdf')
+        assert len(executor.jobs) == 2
+
+    def test_job_failure_reaches_every_request(self, pipeline):
+        pipeline, executor = pipeline
+        futures = pipeline.submit_many([_request('pdf'), _request('excel')])
+
+        executor.jobs[0][1].set_exception(RuntimeError('render failed'))
+
+        for future in futures:
+            with pytest.raises(RuntimeError):
+                future.result()
+        assert pipeline.stats['failed'] == 2
+
+
+@pytest.fixture
+def scheduler(pipeline, monkeypatch):
+    """스텁 파이프라인과 실제 전송 스레드를 쓰는 스케줄러 (DB 기록은 목록으로)"""
+    report_scheduler = pytest.importorskip('reports.report_scheduler')
+
+    scheduler = report_scheduler.ReportScheduler.__new__(report_scheduler.ReportScheduler)
+    scheduler.pipeline, executor = pipeline
+    scheduler.smtp_config = None
+    scheduler.running = False
+    scheduler.thread = None
+    scheduler._pending = []
+    scheduler._lock = threading.RLock()
+    scheduler._delivery = ThreadPoolExecutor(max_workers=1)
+    scheduler.schedules = [{
+        'id': 'daily_sales', 'name': '일일 매출', 'report_type': 'sales',
+        'schedule_time': '06:00', 'frequency': 'daily', 'recipients': [],
+        'params': {'format': 'pdf'}, 'enabled': True,
+    }]
+    scheduler.logs = []
+    monkeypatch.setattr(scheduler, 'save_schedules', lambda: None)
+    monkeypatch.setattr(scheduler, '_save_execution_log',
+                        lambda schedule_id, status, report_path=None, error=None:
+                        scheduler.logs.append((schedule_id, status)))
+    return scheduler, executor
+
+
+class TestReportScheduler:
+    """즉시 실행 완료 시점 / 중지 시 전송 마무리"""
+
+    def test_run_now_future_completes_after_delivery(self, scheduler, tmp_path):
+        """즉시 실행은 바로 반환하고, Future 는 실행 기록까지 끝나야 완료"""
+        scheduler, executor = scheduler
+        report = tmp_path / 'sales.pdf'
+        report.write_bytes(b'%PDF')
+
+        completion = scheduler.run_schedule_now('daily_sales')
+        assert not completion.done()
+        assert scheduler.run_schedule_now('missing') is None
+
+        (_, render), = executor.jobs
+        render.set_result({'pdf': str(report)})
+
+        assert completion.result(timeout=5) == str(report)
+        assert scheduler.logs == [('daily_sales', 'success')]
+        scheduler._delivery.shutdown()
+
+    def test_stop_drains_pipeline_then_delivery(self, scheduler, tmp_path, monkeypatch):
+        """중지 시 렌더링 완료를 기다린 뒤 전송 스레드의 실행 기록까지 마침"""
+        scheduler, executor = scheduler
+        report = tmp_path / 'sales.pdf'
+        report.write_bytes(b'%PDF')
+        completion = scheduler.run_schedule_now('daily_sales')
+
+        waits = []
+
+        def drain(wait=True):
+            waits.append(wait)
+            for _, render in executor.jobs:
+                render.set_result({'pdf': str(report)})
+
+        monkeypatch.setattr(scheduler.pipeline, 'shutdown', drain)
+        scheduler.stop()
+
+        assert waits == [True]
+        assert completion.done()
+        assert scheduler.logs == [('daily_sales', 'success')]
@@ -0,0 +1,122 @@
+"""
+database.rollup_manager 구간 계산 테스트
+"""
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from database.rollup_manager import (
+    CATALOG_ROLLUP, SALES_ROLLUP, SalesRollupManager, day_ranges, rollup_is_fresh, split_weeks, to_date, week_start
+)
+
+
+class TestRangeHelpers:
+    """재집계/조회 구간 계산"""
+
+    def test_day_ranges_groups_consecutive_days(self):
+        """연속된 날짜는 하나의 반열린 구간으로 묶는다"""
+        days = [date(2024, 11, 3), date(2024, 11, 1), date(2024, 11, 2),
+                date(2024, 11, 10), date(2024, 11, 2)]
+        assert day_ranges(days) == [
+            (date(2024, 11, 1), date(2024, 11, 4)),
+            (date(2024, 11, 10), date(2024, 11, 11)),
+        ]
+        assert day_ranges([]) == []
+
+    def test_week_start_is_monday(self):
+        assert week_start(date(2024, 11, 17)) == date(2024, 11, 11)
+        assert week_start(date(2024, 11, 11)) == date(2024, 11, 11)
+
+    def test_split_weeks_uses_full_weeks_and_daily_edges(self):
+        """완전한 주는 주간 롤업, 앞뒤 자투리는 일 롤업"""
+        # 2024-11-01(금) ~ 2024-11-30(토) 포함 → [11-01, 12-01)
+        weeks, edges = split_weeks(date(2024, 11, 1), date(2024, 12, 1))
+        assert weeks == (date(2024, 11, 4), date(2024, 11, 25))
+        assert edges == [
+            (date(2024, 11, 1), date(2024, 11, 4)),
+            (date(2024, 11, 25), date(2024, 12, 1)),
+        ]
+
+    def test_split_weeks_short_range_is_daily_only(self):
+        weeks, edges = split_weeks(date(2024, 11, 5), date(2024, 11, 9))
+        assert weeks is None
+        assert edges == [(date(2024, 11, 5), date(2024, 11, 9))]
+
+        weeks, edges = split_weeks(date(2024, 11, 11), date(2024, 11, 18))
+        assert weeks == (date(2024, 11, 11), date(2024, 11, 18))
+        assert edges == []
+
+    def test_to_date_accepts_strings_and_datetimes(self):
+        assert to_date('2024-11-30') == date(2024, 11, 30)
+        assert to_date('2024-11-30 23:59:59') == date(2024, 11, 30)
+        assert to_date(date(2024, 11, 30)) == date(2024, 11, 30)
+
+
+@pytest.fixture
+def is_fresh(fake_db):
+    """롤업 상태 조회 결과(존재 여부, covered_from, watermark, 현재 시각)를 지정해 판단"""
+    now = datetime(2024, 11, 30, 12, 0)
+
+    def check(covered_from, watermark, start, end=None):
+        cursor = fake_db(results=[[(True,)], [(covered_from, watermark, now)]]).fake_cursor
+        return rollup_is_fresh(cursor, SALES_ROLLUP, start, end)
+
+    return check
+
+
+class TestRollupFreshness:
+    """롤업 사용 가능 여부 판단"""
+
+    def test_uses_incremental_watermark(self, is_fresh):
+        """과거 구간 rebuild 만 있고 증분 갱신이 오래되었으면 최근 구간은 원본 조회"""
+        assert is_fresh(date(2024, 1, 1), datetime(2024, 11, 30, 11, 55), '2024-11-01')
+        assert not is_fresh(date(2024, 1, 1), datetime(2024, 11, 29, 0, 0), '2024-11-01')
+        assert not is_fresh(date(2024, 1, 1), None, '2024-11-01')
+
+    def test_closed_range_needs_watermark_past_range_end(self, is_fresh):
+        assert is_fresh(date(2024, 1, 1), datetime(2024, 11, 29, 0, 0),
+                        '2024-11-01', '2024-11-27')
+        assert not is_fresh(date(2024, 11, 5), datetime(2024, 11, 30, 11, 55),
+                            '2024-11-01', '2024-11-27')
+
+
+class TestIncrementalRefresh:
+    """증분 갱신 대상 날짜 결정"""
+
+    def test_refresh_recomputes_changed_sales_days_and_catalog_window(self, fake_db, monkeypatch):
+        """매출은 변경/삭제된 주문 날짜만, 카탈로그는 최근 구간 전체를 재집계"""
+        now = datetime(2024, 11, 30, 12, 0)
+        watermark = datetime(2024, 11, 30, 11, 55)
+        states = [(SALES_ROLLUP, watermark, date(2024, 1, 1), watermark),
+                  (CATALOG_ROLLUP, watermark, date(2024, 9, 1), watermark)]
+        changed = [(date(2024, 11, 30),), (date(2024, 10, 2),)]
+        changes = fake_db(results=[changed])
+        connections = [fake_db(results=[[(now,)], states]), changes]
+
+        manager = SalesRollupManager({'dsn': ''}, catalog_window_days=90)
+        calls = []
+        monkeypatch.setattr(manager, 'ensure_schema', lambda: None)
+        monkeypatch.setattr(manager, 'get_connection', lambda: connections.pop(0))
+        monkeypatch.setattr(manager, '_recompute',
+                            lambda name, days, now, **kwargs: calls.append((name, days, kwargs)))
+
+        manager.refresh()
+
+        (sales, sales_days, sales_kwargs), (catalog, catalog_days, catalog_kwargs) = calls
+        assert sales == SALES_ROLLUP
+        assert sales_days == [date(2024, 11, 30), date(2024, 10, 2)]
+        assert sales_kwargs == {'watermark': now}
+
+        # 재수집으로 collected_at 이 옮겨간 이전 날짜도 다시 집계되도록 구간 전체
+        window_start = date(2024, 11, 30) - timedelta(days=90)
+        assert catalog == CATALOG_ROLLUP
+        assert catalog_days[0] == window_start and catalog_days[-1] == date(2024, 11, 30)
+        assert len(catalog_days) == 91
+        assert catalog_kwargs == {'covered_from': window_start, 'watermark': now,
+                                  'prune_before': window_start}
+
+        # 주문 항목 변경은 트리거로 orders.updated_at 에, 삭제/이동은 rollup_dirty_days 에 남는다
+        (query, params), = changes.fake_cursor.executed
+        assert 'updated_at >= %(since)s' in query
+        assert 'rollup_dirty_days' in query
+        assert params == {'since': watermark - timedelta(minutes=5), 'name': SALES_ROLLUP}
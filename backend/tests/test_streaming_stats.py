@@ -0,0 +1,142 @@
+"""
+스트리밍 통계 (streaming_stats) 테스트
+"""
+import random
+import statistics
+
+import pytest
+from core.streaming_stats import RunningStats, QuantileSketch, Reservoir, WindowedHistogram
+
+
+class TestRunningStats:
+    """RunningStats 테스트 클래스"""
+
+    def test_matches_batch_statistics(self):
+        """Welford 평균/분산 정확도 테스트"""
+        values = [random.gauss(10, 3) for _ in range(1000)]
+        stats = RunningStats()
+        for value in values:
+            stats.update(value)
+
+        assert stats.mean == pytest.approx(statistics.fmean(values))
+        assert stats.std == pytest.approx(statistics.pstdev(values))
+        assert stats.min == min(values) and stats.max == max(values)
+
+    def test_merge(self):
+        """병합 테스트"""
+        values = list(range(100))
+        left, right = RunningStats(), RunningStats()
+        for value in values[:30]:
+            left.update(value)
+        for value in values[30:]:
+            right.update(value)
+
+        left.merge(right)
+
+        assert left.count == 100
+        assert left.mean == pytest.approx(49.5)
+        assert left.variance == pytest.approx(statistics.pvariance(values))
+
+
+class TestQuantileSketch:
+    """QuantileSketch 테스트 클래스"""
+
+    def test_relative_accuracy(self):
+        """분위수 상대오차 테스트"""
+        values = [random.lognormvariate(3, 1) for _ in range(10000)]
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        ordered = sorted(values)
+        for q in (0.5, 0.9, 0.99):
+            exact = ordered[int(q * (len(ordered) - 1))]
+            assert sketch.quantile(q) == pytest.approx(exact, rel=0.02)
+
+    def test_bucket_count_is_bounded(self):
+        """버킷 수 상한 테스트"""
+        sketch = QuantileSketch(max_buckets=64)
+        for i in range(1, 100000, 7):
+            sketch.add(float(i))
+
+        assert len(sketch.positive) <= 64
+        assert sketch.quantile(0.99) == pytest.approx(99000, rel=0.05)
+
+    def test_negative_and_zero_values(self):
+        """음수/0 값 테스트"""
+        sketch = QuantileSketch()
+        for value in [-10.0] * 10 + [0.0] * 10 + [10.0] * 10:
+            sketch.add(value)
+
+        assert sketch.quantile(0.1) == pytest.approx(-10, rel=0.02)
+        assert sketch.quantile(0.5) == 0.0
+        assert sketch.quantile(0.9) == pytest.approx(10, rel=0.02)
+
+    def test_copy_and_iter_buckets(self):
+        """독립 복사본 / 오름차순 버킷 순회 테스트 (익스포터 병합용)"""
+        sketch = QuantileSketch()
+        for value in [-5.0, 0.0, 1.0, 100.0, 100.0]:
+            sketch.add(value)
+        clone = sketch.copy()
+        clone.add(1000.0)
+
+        buckets = list(sketch.iter_buckets())
+        assert [count for _, count in buckets] == [1, 1, 1, 2]
+        assert [value for value, _ in buckets] == sorted(value for value, _ in buckets)
+        assert sketch.count == 5 and clone.count == 6
+
+
+class TestReservoir:
+    """Reservoir 테스트 클래스"""
+
+    def test_size_is_fixed(self):
+        """샘플 크기 고정 테스트"""
+        reservoir = Reservoir(size=100, seed=1)
+        for i in range(10000):
+            reservoir.add(i)
+
+        assert len(reservoir.samples) == 100
+        assert reservoir.seen == 10000
+        # 앞부분만 남지 않고 전체 구간에서 샘플링
+        assert max(reservoir.samples) > 5000
+
+
+class TestWindowedHistogram:
+    """WindowedHistogram 테스트 클래스"""
+
+    def _reference(self, histogram, values):
+        counts = [0] * (len(histogram.edges) + 1)
+        for value in values:
+            counts[histogram.bin_of(value)] += 1
+        return counts
+
+    def test_same_distribution_has_low_drift(self):
+        """동일 분포 드리프트 없음 테스트"""
+        rng = random.Random(0)
+        reference = [rng.gauss(0, 1) for _ in range(5000)]
+        histogram = WindowedHistogram.from_reference(reference, window_size=500, num_windows=4)
+        ref_counts = self._reference(histogram, reference)
+
+        for _ in range(2000):
+            histogram.add(rng.gauss(0, 1))
+
+        assert histogram.psi(ref_counts) < 0.1
+        assert histogram.ks(ref_counts) < 0.1
+
+    def test_shift_is_detected_and_old_windows_expire(self):
+        """분포 이동 감지 및 윈도 만료 테스트"""
+        rng = random.Random(0)
+        reference = [rng.gauss(0, 1) for _ in range(5000)]
+        histogram = WindowedHistogram.from_reference(reference, window_size=500, num_windows=4)
+        ref_counts = self._reference(histogram, reference)
+
+        for _ in range(2000):
+            histogram.add(rng.gauss(2, 1))
+        assert histogram.psi(ref_counts) > 0.25
+        assert histogram.ks(ref_counts) > 0.3
+
+        # 분포 복귀 후 오래된 윈도가 빠지면 드리프트 해소
+        for _ in range(2000):
+            histogram.add(rng.gauss(0, 1))
+        assert sum(histogram.counts()) == 2000
+        assert histogram.psi(ref_counts) < 0.1
@@ -0,0 +1,107 @@
+"""
+core.tracing 테스트
+"""
+import asyncio
+
+import pytest
+
+from core.tracing import Tracer, current_span, inject_headers, parse_traceparent, wrap_context
+
+
+def make_tracer(**options):
+    exported = []
+    options.setdefault('slow_threshold_ms', None)
+    tracer = Tracer(exporter=exported.extend, **options)
+    return tracer, exported
+
+
+class TestTracer:
+    """스팬 생성/전파/내보내기"""
+
+    def test_child_spans_share_trace_and_parent(self):
+        """중첩 스팬은 같은 trace_id 와 부모 span_id 를 가진다"""
+        tracer, exported = make_tracer()
+        with tracer.span('request', kind='server') as root:
+            with tracer.span('db.query', kind='client', statement='SELECT 1') as child:
+                assert current_span() is child
+            assert current_span() is root
+        assert current_span() is None
+
+        tracer.flush()
+        by_name = {span['name']: span for span in exported}
+        assert by_name['db.query']['trace_id'] == by_name['request']['trace_id']
+        assert by_name['db.query']['parent_id'] == by_name['request']['span_id']
+        assert by_name['db.query']['attributes'] == {'statement': 'SELECT 1'}
+
+    def test_error_is_recorded_and_reraised(self):
+        """블록 안 예외는 스팬 상태에 기록되고 그대로 전파된다"""
+        tracer, exported = make_tracer()
+        with pytest.raises(ValueError):
+            with tracer.span('fail'):
+                raise ValueError('boom')
+        tracer.flush()
+        assert exported[0]['status'] == 'error'
+        assert 'boom' in exported[0]['error']
+
+    def test_unsampled_traces_are_dropped_unless_slow(self):
+        """샘플링되지 않은 트레이스는 느린 스팬만 기록된다"""
+        tracer, exported = make_tracer(sample_rate=0.0, slow_threshold_ms=0.0)
+        with tracer.span('slow'):
+            pass
+        tracer.slow_threshold_ms = None
+        with tracer.span('fast'):
+            pass
+        tracer.flush()
+        assert [span['name'] for span in exported] == ['slow']
+
+    def test_buffer_drops_oldest_and_exports_in_batches(self):
+        """버퍼 초과 시 오래된 스팬을 버리고 배치 크기로 나눠 내보낸다"""
+        batches = []
+        tracer = Tracer(exporter=batches.append, buffer_size=5,
+                        export_batch_size=2, slow_threshold_ms=None)
+        for i in range(7):
+            with tracer.span(f"s{i}"):
+                pass
+        assert tracer.stats['dropped'] == 2
+        assert tracer.flush() == 5
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert batches[0][0]['name'] == 's2'
+
+    def test_context_propagates_to_threads_and_tasks(self):
+        """wrap_context 로 스레드, asyncio 태스크로 부모 스팬이 전파된다"""
+        tracer, _ = make_tracer()
+
+        async def child():
+            return current_span()
+
+        async def run():
+            with tracer.span('root') as root:
+                task_parent = await asyncio.create_task(child())
+                thread_parent = await asyncio.get_running_loop().run_in_executor(
+                    None, wrap_context(current_span)
+                )
+            return root, task_parent, thread_parent
+
+        root, task_parent, thread_parent = asyncio.run(run())
+        assert task_parent is root
+        assert thread_parent is root
+
+
+class TestTraceparent:
+    """W3C traceparent 전파"""
+
+    def test_inject_and_parse_round_trip(self):
+        tracer, _ = make_tracer()
+        with tracer.span('outbound') as span:
+            headers = inject_headers({})
+        context = parse_traceparent(headers['traceparent'])
+        assert (context.trace_id, context.span_id, context.sampled) == \
+            (span.trace_id, span.span_id, True)
+
+        with tracer.span('inbound', parent=context) as remote_child:
+            assert remote_child.trace_id == span.trace_id
+            assert remote_child.parent_id == span.span_id
+
+    def test_invalid_header_is_ignored(self):
+        assert parse_traceparent('garbage') is None
+        assert parse_traceparent(f"00-{'0' * 32}-{'1' * 16}-01") is None
@@ -0,0 +1,98 @@
+"""
+오너클랜 수집 작업 원장 (WorkLedger) 테스트
+"""
+import pytest
+
+from supplier.ownerclan import work_ledger
+from supplier.ownerclan.work_ledger import WorkLedger
+
+
+@pytest.fixture
+def make_ledger():
+    """가짜 연결을 쓰는 원장 (반환된 연결 목록 포함)"""
+    def make(conn, **kwargs):
+        returned = []
+        ledger = WorkLedger(lambda: conn, returned.append, run_id='test_run', **kwargs)
+        return ledger, returned
+
+    return make
+
+
+@pytest.fixture
+def inserted_ranges(monkeypatch):
+    """plan 이 INSERT 하는 구간을 기록"""
+    ranges = []
+
+    def execute_values(cursor, query, rows, page_size=100):
+        ranges.extend((start, end) for _, start, end in rows)
+
+    monkeypatch.setattr(work_ledger, 'execute_values', execute_values)
+    return ranges
+
+
+class TestWorkLedger:
+    """WorkLedger 테스트 클래스"""
+
+    def test_claim_returns_range_and_returns_connection(self, fake_db, make_ledger):
+        """구간 점유 결과 및 연결 반환 테스트"""
+        conn = fake_db(results=[[], [(2000, 3000)]])
+        ledger, returned = make_ledger(conn)
+
+        assert ledger.claim('worker_0') == (2000, 3000)
+        assert conn.commits == 2
+        assert returned == [conn, conn]
+
+    def test_expired_lease_reclaim_is_capped(self, fake_db, make_ledger):
+        """재시도 한도를 다 쓴 만료 리스는 다시 점유하지 않고 failed 처리"""
+        conn = fake_db(results=[[], []])
+        ledger, _ = make_ledger(conn, max_attempts=3)
+
+        assert ledger.claim('worker_0') is None
+
+        (expire_query, expire_params), (claim_query, claim_params) = conn.fake_cursor.executed
+        assert "SET status = 'failed'" in expire_query
+        assert 'attempts >= %s' in expire_query
+        assert expire_params == ('test_run', 3)
+        assert 'lease_expires_at < NOW() AND attempts < %s' in claim_query
+        assert claim_params[-1] == 3
+
+    def test_plan_first_run(self, fake_db, make_ledger, inserted_ranges):
+        conn = fake_db(results=[[], [(0,)]])
+        ledger, _ = make_ledger(conn)
+
+        assert ledger.plan(2500, 1000) == 3
+        assert inserted_ranges == [(0, 1000), (1000, 2000), (2000, 2500)]
+        assert conn.commits == 1
+
+    def test_plan_resume_with_different_batch_size(self, fake_db, make_ledger, inserted_ranges):
+        """재개 시 batch_size 가 바뀌어도 기존 구간과 겹치지 않음"""
+        # 이전 실행: batch_size 1000 으로 [0, 3000) 등록, 이후 전체 4200 개로 증가
+        conn = fake_db(results=[[], [(3000,)]])
+        ledger, _ = make_ledger(conn)
+
+        assert ledger.plan(4200, 500) == 3
+        assert inserted_ranges == [(3000, 3500), (3500, 4000), (4000, 4200)]
+
+    def test_plan_nothing_new(self, fake_db, make_ledger, inserted_ranges):
+        conn = fake_db(results=[[], [(3000,)]])
+        ledger, _ = make_ledger(conn)
+
+        assert ledger.plan(3000, 700) == 0
+        assert inserted_ranges == []
+
+    def test_mark_done_detects_lost_lease(self, fake_db, make_ledger):
+        """리스를 잃은 구간 완료 표시 실패 테스트"""
+        ledger, _ = make_ledger(fake_db())
+
+        assert ledger.mark_done(fake_db(rowcount=1).fake_cursor, 0, 'worker_0', 10) is True
+        assert ledger.mark_done(fake_db(rowcount=0).fake_cursor, 0, 'worker_0', 10) is False
+
+    def test_progress_counts_by_status(self, fake_db, make_ledger):
+        """상태별 진행 현황 집계 테스트"""
+        rows = [('done', 3, 2500), ('pending', 2, 0), ('failed', 1, 0)]
+        ledger, _ = make_ledger(fake_db(results=[rows, rows]))
+
+        progress = ledger.get_progress()
+
+        assert progress == {'pending': 2, 'in_flight': 0, 'done': 3, 'failed': 1, 'items_done': 2500}
+        assert ledger.has_remaining() is True